@@ -1,26 +1,16 @@
-import json
-import re
-from collections import Counter
+"""Twitter accounts linked from the blog, from the outbound link table.
 
-posts = []
-with open('/Users/owen.d.goode/Desktop/cookbook/data/johndcook_posts_enriched.jsonl', 'r') as f:
-    for line in f:
-        try:
-            posts.append(json.loads(line))
-        except:
-            pass
+The links are extracted once by `python -m cookbook.cli ingest index`;
+`python -m cookbook.cli stats links --domain twitter.com` gives the same counts.
+"""
 
-print(f'Loaded {len(posts)} posts')
+from cookbook import paths
+from cookbook.outlinks import LinkTable
 
-# Find all twitter URLs
-all_twitter = Counter()
-for p in posts:
-    content = str(p.get('content', '')) + ' ' + str(p.get('text', ''))
-    urls = re.findall(r'twitter\.com/([A-Za-z0-9_]+)', content)
-    for u in urls:
-        ul = u.lower()
-        if ul not in ['widgets', 'hashtag', 'share', 'intent', 'search', 'home']:
-            all_twitter[ul] += 1
+table = LinkTable.from_index(paths.data_path('johndcook_text_index.jsonl'))
+all_twitter = table.twitter_handles()
+
+print(f'Loaded {len(table)} outbound links from {len(set(table.post_ids))} posts')
 
 print('\nALL TWITTER ACCOUNTS LINKED FROM BLOG:')
 print('=' * 50)
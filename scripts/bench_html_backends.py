@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Conformance and speed check for the HTML parser backends.
+
+Runs every installed backend from cookbook.html_extract over the mirrored
+site (page blocks) and over post bodies (plain text and link/image counts),
+compares each result with the stdlib parser, and prints timings.
+
+    python scripts/bench_html_backends.py --source data/johndcook-live
+
+Differences where the blocks match but their order does not are reported
+separately: HTML5 tree builders close an unclosed <p> when the next one
+opens, while html.parser leaves it open until a later </p>. Exits non-zero
+on any difference, reordering and post text included, since the default
+backend may only change once the others match it exactly.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from cookbook import io
+from cookbook.html_extract import available_backends, extract_post_text, parse_page
+
+
+def _timed(fn, items, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = [fn(item) for item in items]
+        best = min(best, time.perf_counter() - start)
+    return out, best
+
+
+def _page_key(page):
+    return (page.canonical, page.title, page.description)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", type=Path, default=Path("data/johndcook-live"))
+    parser.add_argument("--posts", type=Path, default=Path("data/johndcook_posts_from_sql.jsonl"))
+    parser.add_argument("--repeat", type=int, default=3, help="Report the best of N runs.")
+    parser.add_argument(
+        "--show", type=int, default=3, help="Print up to N differing files per backend."
+    )
+    args = parser.parse_args()
+
+    paths = sorted(args.source.rglob("*.html"))
+    pages = [p.read_text(encoding="utf-8", errors="ignore") for p in paths]
+    bodies = []
+    if args.posts.exists():
+        bodies = [post.get("content") or "" for post in io.read_jsonl(args.posts)]
+    print(f"{len(pages)} pages ({sum(map(len, pages)) / 1e6:.1f} MB), {len(bodies)} post bodies")
+
+    failures = 0
+    ref_pages = ref_text = None
+    for backend in available_backends():
+        got_pages, page_secs = _timed(lambda h: parse_page(h, backend), pages, args.repeat)
+        got_text, text_secs = _timed(lambda h: extract_post_text(h, backend), bodies, args.repeat)
+        got_text = [(" ".join(t.text().split()), t.link_count, t.image_count) for t in got_text]
+        if ref_pages is None:
+            ref_pages, ref_text = got_pages, got_text
+
+        differ, reordered = [], []
+        for path, ref, page in zip(paths, ref_pages, got_pages):
+            if ref == page:
+                continue
+            same_blocks = sorted(map(str, ref.blocks)) == sorted(map(str, page.blocks))
+            if same_blocks and _page_key(ref) == _page_key(page):
+                reordered.append(path)
+            else:
+                differ.append(path)
+        text_differ = sum(1 for a, b in zip(ref_text, got_text) if a != b)
+        failures += len(differ) + len(reordered) + text_differ
+
+        print(
+            f"{backend:>10}: pages {page_secs * 1000:7.1f} ms "
+            f"({len(pages) / page_secs if page_secs else 0:6.0f}/s), "
+            f"posts {text_secs * 1000:7.1f} ms | "
+            f"pages differ {len(differ)}, reordered {len(reordered)}, "
+            f"post text differs {text_differ}"
+        )
+        for path in (differ + reordered)[: args.show]:
+            print(f"            {'reordered' if path in reordered else 'differs'}: {path}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 """
-Generate all 19 figures for the Methodical book.
+Generate all 20 figures for the Methodical book.
 
 Output: SVG files in book/figures/
-Data sources: data/posts_metadata.csv, data/johndcook_text_index.jsonl
+Data sources: data/posts_metadata.csv, data/johndcook_text_index.jsonl (and the
+entity mention counts and code blocks `ingest index` writes beside it)
 
 Usage:
     python scripts/generate_book_figures.py
@@ -13,14 +14,19 @@ Usage:
 import argparse
 import json
 from pathlib import Path
-from collections import Counter
 from datetime import datetime
+from functools import lru_cache
 
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import numpy as np
 
+from cookbook.code_blocks import CodeTable
+from cookbook.entities import EntityMatrix
+from cookbook.taxonomy import TermMatrix
+from cookbook.timeseries import WEEKDAYS, PostingSeries
+
 # Style configuration for print
 plt.rcParams.update({
     'font.family': 'serif',
@@ -64,6 +70,40 @@ def load_data():
     return df
 
 
+@lru_cache(maxsize=None)
+def load_terms(kind='categories'):
+    """Post x category (or tag) incidence matrix, built once per run."""
+    return TermMatrix.from_metadata(DATA_DIR / 'posts_metadata.csv', kind)
+
+
+@lru_cache(maxsize=None)
+def load_series():
+    """Daily post and word-count series, built once per run."""
+    return PostingSeries.from_metadata(DATA_DIR / 'posts_metadata.csv')
+
+
+def load_eras():
+    """The blog's eras, detected from the yearly post counts."""
+    return load_series().eras(3)
+
+
+@lru_cache(maxsize=None)
+def load_entities():
+    """Post x entity mention counts (titles and body text) from the text index build."""
+    return EntityMatrix.from_index(DATA_DIR / 'johndcook_text_index.jsonl')
+
+
+@lru_cache(maxsize=None)
+def load_code():
+    """Code blocks with their detected language, from the text index build."""
+    return CodeTable.from_index(DATA_DIR / 'johndcook_text_index.jsonl')
+
+
+def mention_dates(name):
+    """Publication dates of the posts mentioning an entity."""
+    return pd.to_datetime(pd.Series(load_entities().post_dates(name), dtype='object'))
+
+
 # =============================================================================
 # Chapter 1: The Shape of Seventeen Years
 # =============================================================================
@@ -167,16 +207,7 @@ def fig_02_category_treemap(df):
         print("  SKIPPED: ch02_category_treemap.svg (squarify not installed)")
         return
 
-    # Count categories
-    cat_counts = Counter()
-    for cats in df['categories'].dropna():
-        for cat in cats.replace(';', ',').split(','):
-            cat = cat.strip()
-            if cat:
-                cat_counts[cat] += 1
-
-    # Get top categories
-    top_cats = cat_counts.most_common(15)
+    top_cats = load_terms().most_common(15)
     labels = [f"{cat}\n({count})" for cat, count in top_cats]
     sizes = [count for _, count in top_cats]
 
@@ -198,15 +229,7 @@ def fig_02_category_treemap(df):
 
 def fig_02_category_packing(df):
     """Bubble chart with non-overlapping circles using force-directed placement."""
-    # Count categories
-    cat_counts = Counter()
-    for cats in df['categories'].dropna():
-        for cat in cats.replace(';', ',').split(','):
-            cat = cat.strip()
-            if cat:
-                cat_counts[cat] += 1
-
-    top_cats = cat_counts.most_common(10)  # Fewer for clarity
+    top_cats = load_terms().most_common(10)  # Fewer for clarity
 
     fig, ax = plt.subplots(figsize=(12, 10))
 
@@ -281,9 +304,8 @@ def fig_02_category_packing(df):
 
 def fig_03_weekday_radial(df):
     """Radial bar chart for day of week distribution."""
-    weekday_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    counts = df['weekday'].value_counts()
-    values = [counts.get(day, 0) for day in weekday_order]
+    weekday_order = list(WEEKDAYS)
+    values = load_series().weekday_counts().tolist()
 
     # Radial chart
     angles = np.linspace(0, 2 * np.pi, len(weekday_order), endpoint=False).tolist()
@@ -359,28 +381,21 @@ def fig_03_connected_scatterplot(df):
 
 def fig_04_pi_timeline(df):
     """Timeline of pi-related posts."""
-    # Find pi posts - broader search to capture more pi-related content
-    # Match: pi, π, 3.14, "pi day", "digits of pi", etc.
-    pi_pattern = r'\bpi\b|π|3\.14|circumference|pi day|digits of'
-    pi_posts = df[df['title'].str.contains(pi_pattern, case=False, na=False, regex=True)].copy()
-
-    # Also check tags for pi-related content
-    tag_pi = df[df['tags'].str.contains(r'\bpi\b|π', case=False, na=False, regex=True)]
-    pi_posts = pd.concat([pi_posts, tag_pi]).drop_duplicates()
-    pi_posts = pi_posts.sort_values('date')
+    # Posts mentioning pi or π anywhere in the title or body
+    pi_dates = mention_dates('Pi').sort_values()
 
     fig, ax = plt.subplots(figsize=(12, 4))
 
     # Plot timeline
-    years = pi_posts['date'].dt.year
-    ax.scatter(pi_posts['date'], [1] * len(pi_posts), c=years, cmap='viridis',
+    years = pi_dates.dt.year
+    ax.scatter(pi_dates, [1] * len(pi_dates), c=years, cmap='viridis',
                s=50, alpha=0.7)
 
     ax.axhline(y=1, color=COLORS['secondary'], linestyle='-', alpha=0.3)
     ax.set_ylim(0.5, 1.5)
     ax.set_yticks([])
     ax.set_xlabel('Year')
-    ax.set_title(f'Pi-Related Posts Over Time (n={len(pi_posts)})', fontweight='bold')
+    ax.set_title(f'Pi-Related Posts Over Time (n={len(pi_dates)})', fontweight='bold')
 
     # Format x-axis
     ax.xaxis.set_major_locator(mdates.YearLocator(2))
@@ -395,23 +410,15 @@ def fig_04_pi_timeline(df):
 
 def fig_04_constants_dumbbell(df):
     """Dumbbell chart: first/last appearance of mathematical constants."""
-    constants = {
-        'Pi': r'\bpi\b',
-        'Prime': r'prime',
-        'Random': r'random',
-        'Fibonacci': r'fibonacci',
-        'e (Euler)': r'\be\b|euler',
-        'Golden ratio': r'golden|phi',
-    }
+    entities = load_entities()
+    counts = dict(zip(entities.names(), entities.post_counts()))
 
     results = []
-    for name, pattern in constants.items():
-        matches = df[df['title'].str.contains(pattern, case=False, na=False, regex=True)]
-        if len(matches) > 0:
-            first = matches['date'].min().year
-            last = matches['date'].max().year
-            count = len(matches)
-            results.append({'name': name, 'first': first, 'last': last, 'count': count})
+    for name in entities.names('constant'):
+        span = entities.span(name)
+        if span:
+            results.append({'name': name, 'first': span[0], 'last': span[1],
+                            'count': int(counts[name])})
 
     results = sorted(results, key=lambda x: -x['count'])
 
@@ -443,27 +450,22 @@ def fig_04_constants_dumbbell(df):
 # Chapter 5: A Bestiary of Functions
 # =============================================================================
 
+FUNCTIONS = ['Gamma function', 'Fourier transform', 'Bessel functions', 'Laplace transform',
+             'Zeta function']
+
+
 def fig_05_functions_stacked_area(df):
     """Stacked area chart of special function mentions over time."""
-    functions = ['gamma', 'Fourier', 'Bessel', 'Laplace', 'zeta']
-
-    yearly_counts = {f: [] for f in functions}
     years = range(2008, 2026)
-
-    for year in years:
-        year_df = df[df['year'] == year]
-        for func in functions:
-            count = len(year_df[year_df['title'].str.contains(func, case=False, na=False)])
-            yearly_counts[func].append(count)
+    yearly_counts = load_entities().by_year(FUNCTIONS, years)
 
     fig, ax = plt.subplots(figsize=(12, 6))
 
-    ax.stackplot(years, *[yearly_counts[f] for f in functions],
-                 labels=functions, alpha=0.8)
+    ax.stackplot(years, *yearly_counts, labels=FUNCTIONS, alpha=0.8)
 
     ax.set_xlabel('Year')
     ax.set_ylabel('Posts')
-    ax.set_title('Special Functions in Post Titles Over Time', fontweight='bold')
+    ax.set_title('Special Functions in Posts Over Time', fontweight='bold')
     ax.legend(loc='upper left')
 
     plt.tight_layout()
@@ -475,16 +477,14 @@ def fig_05_functions_stacked_area(df):
 
 def fig_05_functions_bump(df):
     """Bump chart showing which function dominated which era."""
-    functions = ['gamma', 'Fourier', 'Bessel', 'Laplace', 'zeta']
-    eras = [('Early', 2008, 2012), ('Middle', 2013, 2017), ('Recent', 2018, 2025)]
+    functions = FUNCTIONS
+    eras = load_eras()
 
     era_ranks = {era[0]: {} for era in eras}
+    era_counts = load_entities().by_era(functions, eras)
 
-    for era_name, start, end in eras:
-        era_df = df[(df['year'] >= start) & (df['year'] <= end)]
-        counts = {}
-        for func in functions:
-            counts[func] = len(era_df[era_df['title'].str.contains(func, case=False, na=False)])
+    for i, (era_name, start, end) in enumerate(eras):
+        counts = dict(zip(functions, era_counts[:, i]))
 
         # Rank
         sorted_funcs = sorted(counts.keys(), key=lambda x: -counts[x])
@@ -493,7 +493,7 @@ def fig_05_functions_bump(df):
 
     fig, ax = plt.subplots(figsize=(10, 6))
 
-    era_positions = [0, 1, 2]
+    era_positions = list(range(len(eras)))
     era_labels = [e[0] for e in eras]
 
     for func in functions:
@@ -525,9 +525,8 @@ def fig_06_mathematicians_timeline(df):
     fig, ax = plt.subplots(figsize=(12, 6))
 
     for i, math_name in enumerate(mathematicians):
-        matches = df[df['title'].str.contains(math_name, case=False, na=False)]
-        if len(matches) > 0:
-            dates = matches['date']
+        dates = mention_dates(math_name)
+        if len(dates) > 0:
             ax.scatter(dates, [i] * len(dates), label=math_name, s=50, alpha=0.7)
 
     ax.set_yticks(range(len(mathematicians)))
@@ -547,24 +546,12 @@ def fig_06_mathematicians_timeline(df):
 
 def fig_06_mathematicians_lollipop(df):
     """Lollipop chart of total mentions per mathematician."""
-    mathematicians = {
-        'Fourier': 'Fourier',
-        'Gauss': 'Gauss',
-        'Laplace': 'Laplace',
-        'Bessel': 'Bessel',
-        'Newton': 'Newton',
-        'Euler': 'Euler',
-        'Ramanujan': 'Ramanujan',
-        'Fermat': 'Fermat',
-        'Riemann': 'Riemann',
-        'Knuth': 'Knuth',
-        'Cauchy': 'Cauchy',
-        'Hilbert': 'Hilbert',
-    }
+    mathematicians = ['Fourier', 'Gauss', 'Laplace', 'Bessel', 'Newton', 'Euler',
+                      'Ramanujan', 'Fermat', 'Riemann', 'Knuth', 'Cauchy', 'Hilbert']
 
-    counts = {}
-    for display_name, search_term in mathematicians.items():
-        counts[display_name] = len(df[df['title'].str.contains(search_term, case=False, na=False)])
+    entities = load_entities()
+    all_counts = dict(zip(entities.names(), entities.post_counts()))
+    counts = {name: int(all_counts[name]) for name in mathematicians}
 
     # Sort by count
     sorted_items = sorted(counts.items(), key=lambda x: x[1])
@@ -579,7 +566,7 @@ def fig_06_mathematicians_lollipop(df):
 
     ax.set_yticks(y_pos)
     ax.set_yticklabels(names)
-    ax.set_xlabel('Posts Mentioning Name in Title')
+    ax.set_xlabel('Posts Mentioning Name')
     ax.set_title('Mathematicians by Frequency of Mention', fontweight='bold')
 
     # Add count labels
@@ -601,26 +588,15 @@ def fig_07_languages_stacked(df):
     """Stacked area chart of programming language mentions."""
     languages = ['Python', 'Mathematica', 'PowerShell', 'C++', 'Perl', 'Haskell']
 
-    yearly_counts = {lang: [] for lang in languages}
     years = range(2008, 2026)
-
-    for year in years:
-        year_df = df[df['year'] == year]
-        for lang in languages:
-            # Check tags
-            count = 0
-            for tags in year_df['tags'].dropna():
-                if lang.lower() in tags.lower():
-                    count += 1
-            yearly_counts[lang].append(count)
+    yearly_counts = load_entities().by_year(languages, years)
 
     fig, ax = plt.subplots(figsize=(12, 6))
 
-    ax.stackplot(years, *[yearly_counts[lang] for lang in languages],
-                 labels=languages, alpha=0.8)
+    ax.stackplot(years, *yearly_counts, labels=languages, alpha=0.8)
 
     ax.set_xlabel('Year')
-    ax.set_ylabel('Posts (by tag)')
+    ax.set_ylabel('Posts mentioning')
     ax.set_title('Programming Languages Over Time', fontweight='bold')
     ax.legend(loc='upper right')
 
@@ -631,18 +607,41 @@ def fig_07_languages_stacked(df):
     print("  Created: ch07_languages_stacked.svg")
 
 
+def fig_07_code_languages(df):
+    """Stacked bars of posts with code listings in each detected language."""
+    code = load_code()
+    languages = [lang for lang, _ in code.language_posts().most_common(6)]
+
+    years = range(2008, 2026)
+    fig, ax = plt.subplots(figsize=(12, 6))
+
+    bottom = np.zeros(len(years))
+    for lang in languages:
+        per_year = code.per_year(lang)
+        counts = np.array([per_year[str(year)] for year in years])
+        ax.bar(years, counts, bottom=bottom, label=lang, alpha=0.8)
+        bottom += counts
+
+    ax.set_xlabel('Year')
+    ax.set_ylabel('Posts with code listings')
+    ax.set_title('Code Listings by Language', fontweight='bold')
+    ax.legend(loc='upper left')
+
+    plt.tight_layout()
+    plt.savefig(FIGURES_DIR / 'ch07_code_languages.svg')
+    plt.savefig(FIGURES_DIR / 'ch07_code_languages.png')
+    plt.close()
+    print("  Created: ch07_code_languages.svg")
+
+
 def fig_07_languages_bar(df):
     """Bar chart of total posts per language."""
     languages = ['Python', 'SciPy', 'Mathematica', 'PowerShell', 'C++', 'Perl',
                  'Haskell', 'SymPy', 'Emacs']
 
-    counts = {}
-    for lang in languages:
-        count = 0
-        for tags in df['tags'].dropna():
-            if lang.lower() in tags.lower():
-                count += 1
-        counts[lang] = count
+    entities = load_entities()
+    all_counts = dict(zip(entities.names(), entities.post_counts()))
+    counts = {lang: int(all_counts[lang]) for lang in languages}
 
     # Sort
     sorted_items = sorted(counts.items(), key=lambda x: -x[1])
@@ -652,7 +651,7 @@ def fig_07_languages_bar(df):
     fig, ax = plt.subplots(figsize=(10, 6))
 
     bars = ax.barh(names, values, color=COLORS['primary'], alpha=0.8)
-    ax.set_xlabel('Posts (by tag)')
+    ax.set_xlabel('Posts mentioning')
     ax.set_title('Programming Languages and Tools by Total Posts', fontweight='bold')
     ax.invert_yaxis()
 
@@ -674,20 +673,12 @@ def fig_07_languages_bar(df):
 def fig_08_crypto_line(df):
     """Line chart of crypto and privacy posts over time."""
     years = range(2008, 2026)
-    crypto_counts = []
-    privacy_counts = []
-
-    for year in years:
-        year_df = df[df['year'] == year]
-        crypto = 0
-        privacy = 0
-        for tags in year_df['tags'].dropna():
-            if 'cryptography' in tags.lower():
-                crypto += 1
-            if 'privacy' in tags.lower():
-                privacy += 1
-        crypto_counts.append(crypto)
-        privacy_counts.append(privacy)
+    tags = load_terms('tags')
+    crypto_tags = [t for t in tags.terms if 'cryptography' in t.lower()]
+    privacy_tags = [t for t in tags.terms if 'privacy' in t.lower()]
+    by_year = [tags.era(year, year) for year in years]
+    crypto_counts = [m.count_posts(crypto_tags) for m in by_year]
+    privacy_counts = [m.count_posts(privacy_tags) for m in by_year]
 
     fig, ax = plt.subplots(figsize=(12, 6))
 
@@ -719,23 +710,15 @@ def fig_08_crypto_line(df):
 
 def fig_08_crypto_dumbbell(df):
     """Dumbbell chart for crypto topics."""
-    topics = {
-        'RSA': 'RSA',
-        'Elliptic curves': 'elliptic curve',
-        'Bitcoin': 'bitcoin',
-        'Cryptocurrency': 'cryptocurrency',
-        'AES': 'AES',
-        'Diffie-Hellman': 'diffie',
-    }
+    entities = load_entities()
+    counts = dict(zip(entities.names(), entities.post_counts()))
 
     results = []
-    for display, search in topics.items():
-        matches = df[df['title'].str.contains(search, case=False, na=False)]
-        if len(matches) > 0:
-            first = matches['date'].min().year
-            last = matches['date'].max().year
-            count = len(matches)
-            results.append({'name': display, 'first': first, 'last': last, 'count': count})
+    for name in entities.names('crypto'):
+        span = entities.span(name)
+        if span:
+            results.append({'name': name, 'first': span[0], 'last': span[1],
+                            'count': int(counts[name])})
 
     results = sorted(results, key=lambda x: x['first'])
 
@@ -771,31 +754,22 @@ def fig_09_category_network(df):
         print("  SKIPPED: ch09_category_network.svg (networkx not installed)")
         return
 
-    # Count co-occurrences
-    cooccur = Counter()
-    cat_counts = Counter()
-
-    for cats in df['categories'].dropna():
-        cat_list = [c.strip() for c in cats.replace(';', ',').split(',') if c.strip()]
-        for cat in cat_list:
-            cat_counts[cat] += 1
-        for i, c1 in enumerate(cat_list):
-            for c2 in cat_list[i+1:]:
-                pair = tuple(sorted([c1, c2]))
-                cooccur[pair] += 1
+    # Co-occurrence counts come from the sparse category matrix (X.T @ X)
+    cats = load_terms()
 
     # Build graph
     G = nx.Graph()
 
     # Add top categories as nodes
-    top_cats = [c for c, _ in cat_counts.most_common(12)]
-    for cat in top_cats:
-        G.add_node(cat, size=cat_counts[cat])
+    top = cats.most_common(12)
+    top_cats = [c for c, _ in top]
+    for cat, count in top:
+        G.add_node(cat, size=count)
 
     # Add edges for co-occurrences
-    for (c1, c2), count in cooccur.most_common(30):
-        if c1 in top_cats and c2 in top_cats and count > 5:
-            G.add_edge(c1, c2, weight=count)
+    for pair in cats.pairs()[:30]:
+        if pair.a in top_cats and pair.b in top_cats and pair.count > 5:
+            G.add_edge(pair.a, pair.b, weight=pair.count)
 
     fig, ax = plt.subplots(figsize=(12, 10))
 
@@ -829,23 +803,19 @@ def fig_09_category_network(df):
 def fig_11_small_multiples(df):
     """Small multiples showing topic evolution across eras."""
     topics = ['Math', 'Computing', 'Statistics', 'Software development']
-    eras = [('Early\n2008-12', 2008, 2012), ('Middle\n2013-17', 2013, 2017),
-            ('Recent\n2018-25', 2018, 2025)]
+    eras = [(f'{name}\n{start}-{end % 100:02d}', start, end) for name, start, end in load_eras()]
 
     fig, axes = plt.subplots(1, len(topics), figsize=(14, 5), sharey=False)
 
-    # Calculate all counts first to determine shared y-max
+    # Calculate all counts first to determine shared y-max.
+    # A topic covers every category containing its name ("Computing" includes
+    # "Parallel computing").
+    cats = load_terms()
+    era_cats = [cats.era(start, end) for _, start, end in eras]
     all_counts = []
     for topic in topics:
-        counts = []
-        for _, start, end in eras:
-            era_df = df[(df['year'] >= start) & (df['year'] <= end)]
-            count = 0
-            for cats in era_df['categories'].dropna():
-                if topic.lower() in cats.lower():
-                    count += 1
-            counts.append(count)
-        all_counts.append(counts)
+        names = [c for c in cats.terms if topic.lower() in c.lower()]
+        all_counts.append([era.count_posts(names) for era in era_cats])
 
     for ax, topic, counts in zip(axes, topics, all_counts):
         bars = ax.bar([e[0] for e in eras], counts, color=COLORS['primary'], alpha=0.8)
@@ -871,22 +841,20 @@ def fig_11_small_multiples(df):
 
 def fig_11_scatterplot_eras(df):
     """Connected scatterplot with era annotations."""
-    yearly = df.groupby('year').agg({
-        'word_count': ['count', 'mean']
-    })
-    yearly.columns = ['posts', 'avg_words']
+    years, posts, words = load_series().by_year()
 
     fig, ax = plt.subplots(figsize=(10, 8))
 
-    years = yearly.index.tolist()
-    x = yearly['posts'].tolist()
-    y = yearly['avg_words'].tolist()
+    years = years.tolist()
+    x = posts.tolist()
+    y = (words / np.maximum(posts, 1)).tolist()
 
-    # Define eras
+    # Eras detected from the yearly post counts
+    palette = ['#3498db', '#f39c12', '#2ecc71', '#9b59b6', '#e74c3c']
+    eras = load_eras()
     era_colors = {
-        'Early (2008-2012)': '#3498db',
-        'Middle (2013-2017)': '#f39c12',
-        'Recent (2018-2025)': '#2ecc71',
+        f'{name} ({start}-{end})': palette[i % len(palette)]
+        for i, (name, start, end) in enumerate(eras)
     }
 
     # Plot connecting line
@@ -894,12 +862,8 @@ def fig_11_scatterplot_eras(df):
 
     # Plot points colored by era
     for i, year in enumerate(years):
-        if year <= 2012:
-            color = era_colors['Early (2008-2012)']
-        elif year <= 2017:
-            color = era_colors['Middle (2013-2017)']
-        else:
-            color = era_colors['Recent (2018-2025)']
+        color = next(c for c, (_, start, end) in zip(era_colors.values(), eras)
+                     if start <= year <= end)
 
         ax.scatter(x[i], y[i], c=color, s=100, zorder=2, edgecolors='white', linewidth=1)
 
@@ -951,7 +915,7 @@ def main():
         4: [fig_04_pi_timeline, fig_04_constants_dumbbell],
         5: [fig_05_functions_stacked_area, fig_05_functions_bump],
         6: [fig_06_mathematicians_timeline, fig_06_mathematicians_lollipop],
-        7: [fig_07_languages_stacked, fig_07_languages_bar],
+        7: [fig_07_languages_stacked, fig_07_languages_bar, fig_07_code_languages],
         8: [fig_08_crypto_line, fig_08_crypto_dumbbell],
         9: [fig_09_category_network],
         11: [fig_11_small_multiples, fig_11_scatterplot_eras],
@@ -4,7 +4,6 @@ Generate ~3000 calendar facts from johndcook.com blog posts.
 Output file: data/johndcook_calendar_candidates_v3.csv
 """
 
-import json
 import csv
 import re
 import html
@@ -13,8 +12,19 @@ from datetime import datetime
 from pathlib import Path
 import random
 
+from cookbook import io
+from cookbook.code_blocks import CODE_SUFFIX, CodeTable, iter_code_facts
+from cookbook.corpus import DateIndex
+from cookbook.entities import ENTITIES_SUFFIX, EntityMatrix
+from cookbook.graph import LINKS_SUFFIX, link_keys, read_links
+from cookbook.html_extract import extract_post_text
+from cookbook.math_index import MATH_SUFFIX, MathTable
+from cookbook.timeseries import PostingSeries
+from cookbook.token_store import side_path, store_base
+
 DATA_DIR = Path(__file__).parent.parent / "data"
 POSTS_FILE = DATA_DIR / "johndcook_posts_enriched.jsonl"
+TEXT_INDEX_FILE = DATA_DIR / "johndcook_text_index.jsonl"
 OUTPUT_FILE = DATA_DIR / "johndcook_calendar_candidates_v3.csv"
 
 
@@ -29,23 +39,49 @@ def strip_html(text):
 def load_posts():
     """Load all posts from JSONL file."""
     posts = []
-    with open(POSTS_FILE, 'r', encoding='utf-8') as f:
-        for line in f:
-            post = json.loads(line)
-            # Parse date
-            post['date_obj'] = datetime.fromisoformat(post['date'].replace('Z', '+00:00').split('+')[0])
-            post['year'] = post['date_obj'].year
-            post['month'] = post['date_obj'].month
-            post['day'] = post['date_obj'].day
-            post['doy'] = post['date_obj'].timetuple().tm_yday
-            post['weekday'] = post['date_obj'].strftime('%A')
-            # Clean content
-            post['plain_content'] = strip_html(post.get('content', ''))
-            post['plain_title'] = strip_html(post.get('title', ''))
-            posts.append(post)
+    for post in io.read_jsonl(POSTS_FILE):
+        # Parse date
+        post['date_obj'] = datetime.fromisoformat(post['date'].replace('Z', '+00:00').split('+')[0])
+        post['year'] = post['date_obj'].year
+        post['month'] = post['date_obj'].month
+        post['day'] = post['date_obj'].day
+        post['doy'] = post['date_obj'].timetuple().tm_yday
+        post['weekday'] = post['date_obj'].strftime('%A')
+        # Clean content
+        post['plain_content'] = strip_html(post.get('content', ''))
+        post['plain_title'] = strip_html(post.get('title', ''))
+        posts.append(post)
     return posts
 
 
+def load_internal_links(posts):
+    """Post ID -> keys of the blog posts it links to.
+
+    Uses the links the text index build extracted when present; otherwise
+    extracts them from the post bodies here.
+    """
+    links_path = side_path(store_base(TEXT_INDEX_FILE), LINKS_SUFFIX)
+    if links_path.exists():
+        return {post_id: keys for post_id, _, keys in read_links(links_path)}
+    return {p['id']: link_keys(extract_post_text(p.get('content', '')).hrefs) for p in posts}
+
+
+def load_entity_posts(posts):
+    """Entity name -> IDs of the posts mentioning it, in post order.
+
+    Uses the mention counts the text index build wrote when present;
+    otherwise matches the entity dictionary against the posts here.
+    """
+    entities_path = side_path(store_base(TEXT_INDEX_FILE), ENTITIES_SUFFIX)
+    if entities_path.exists():
+        matrix = EntityMatrix.load(entities_path)
+    else:
+        matrix = EntityMatrix.from_texts(
+            (p['id'], p['date'], p['plain_title'] + '\n' + p['plain_content']) for p in posts
+        )
+    return matrix, {name: matrix.posts(name) for name in matrix.names()}
+
+
 def count_links(content):
     """Count href links in HTML content."""
     return len(re.findall(r'href=', content, re.IGNORECASE))
@@ -56,22 +92,14 @@ def count_images(content):
     return len(re.findall(r'<img\s', content, re.IGNORECASE))
 
 
-def count_code_blocks(content):
-    """Count pre/code blocks."""
-    return len(re.findall(r'<pre[^>]*>', content, re.IGNORECASE))
-
-
-def longest_code_block(content):
-    """Find longest code block length."""
-    blocks = re.findall(r'<pre[^>]*>(.*?)</pre>', content, re.IGNORECASE | re.DOTALL)
-    if not blocks:
-        return 0
-    return max(len(strip_html(b)) for b in blocks)
-
-
-def has_math_symbol(text, symbol):
-    """Check if text contains a math symbol."""
-    return symbol in text
+def load_code_table(posts):
+    """Code blocks with their language, from the text index build when present."""
+    code_path = side_path(store_base(TEXT_INDEX_FILE), CODE_SUFFIX)
+    if code_path.exists():
+        return CodeTable.load(code_path)
+    return CodeTable.from_spans(
+        (p['id'], p['date'], extract_post_text(p.get('content', '')).code_blocks) for p in posts
+    )
 
 
 def term_appears(text, term, case_insensitive=True):
@@ -96,9 +124,16 @@ def extract_numbers(text):
     return re.findall(r'\b\d+(?:\.\d+)?\b', text)
 
 
-def has_equation(content):
-    """Check if post has LaTeX-style equations."""
-    return bool(re.search(r'\$.*?\$|\\begin\{|\\frac|\\sum|\\int', content))
+def load_math_table(posts):
+    """Math symbol, LaTeX command and equation counts, from the text index build when present."""
+    math_path = side_path(store_base(TEXT_INDEX_FILE), MATH_SUFFIX)
+    if math_path.exists():
+        return MathTable.load(math_path)
+    rows = []
+    for p in posts:
+        extracted = extract_post_text(p.get('content', ''))
+        rows.append((p['id'], p['date'], p['plain_title'] + '\n' + extracted.text(), extracted.image_alts))
+    return MathTable.from_texts(rows)
 
 
 def generate_facts(posts):
@@ -120,6 +155,8 @@ def generate_facts(posts):
 
     # Sort posts by date
     posts_sorted = sorted(posts, key=lambda p: p['date_obj'])
+    by_id = {p['id']: p for p in posts}
+    date_index = DateIndex.build((p['id'], p['date_obj']) for p in posts)
 
     # Build indices
     term_index = defaultdict(list)  # term -> [(post, count)]
@@ -279,11 +316,6 @@ def generate_facts(posts):
             if count > 0:
                 term_index[term.lower()].append((post, count))
 
-        # Track math symbols
-        for sym in math_symbols:
-            if sym in full_text:
-                math_symbol_index[sym].append(post)
-
         # Track rare words
         for word in rare_word_candidates:
             if re.search(r'\b' + re.escape(word) + r'\b', full_text, re.IGNORECASE):
@@ -370,6 +402,11 @@ def generate_facts(posts):
                 )
 
     # === MATH SYMBOL FACTS ===
+    math_table = load_math_table(posts)
+    for sym in math_symbols:
+        sym_posts = math_table.posts('symbol', sym)
+        if sym_posts:
+            math_symbol_index[sym] = [by_id[i] for i in sym_posts]
     for sym, sym_posts in math_symbol_index.items():
         if len(sym_posts) == 1:
             post = sym_posts[0]
@@ -446,8 +483,11 @@ def generate_facts(posts):
             )
 
     # Most code blocks
+    code_table = load_code_table(posts)
+    code_counts = code_table.blocks_per_post()
+    longest_code = code_table.longest_per_post()
     for post in posts:
-        post['code_count'] = count_code_blocks(post.get('content', ''))
+        post['code_count'] = code_counts[post['id']]
     posts_by_code = sorted(posts, key=lambda p: p['code_count'], reverse=True)
     for i, post in enumerate(posts_by_code[:20]):
         if post['code_count'] > 1:
@@ -461,7 +501,8 @@ def generate_facts(posts):
 
     # Longest code block
     for post in posts:
-        post['longest_code'] = longest_code_block(post.get('content', ''))
+        block = longest_code.get(post['id'])
+        post['longest_code'] = block.chars if block else 0
     posts_by_longest_code = sorted(posts, key=lambda p: p['longest_code'], reverse=True)
     for i, post in enumerate(posts_by_longest_code[:15]):
         if post['longest_code'] > 200:
@@ -550,14 +591,9 @@ def generate_facts(posts):
             )
 
     # === ON THIS DAY FACTS - EXPANDED ===
-    # Group posts by month-day
-    doy_posts = defaultdict(list)
-    for post in posts:
-        key = (post['month'], post['day'])
-        doy_posts[key].append(post)
-
     # For each day of year with posts, generate multiple facts
-    for (month, day), day_posts in doy_posts.items():
+    for month, day in date_index.month_days():
+        day_posts = [by_id[pid] for pid in date_index.on_this_day(month, day)]
         month_name = datetime(2000, month, day).strftime('%B')
 
         # Best post by word count
@@ -571,9 +607,9 @@ def generate_facts(posts):
                 best_post['slug']
             )
 
-        # Oldest post on this day
+        # Oldest post on this day (day_posts is in publication order)
         if len(day_posts) >= 2:
-            oldest_post = min(day_posts, key=lambda p: p['date_obj'])
+            oldest_post = day_posts[0]
             add_fact(
                 'otd',
                 f"The earliest {month_name} {day} post was \"{oldest_post['plain_title']}\" in {oldest_post['year']}.",
@@ -584,7 +620,7 @@ def generate_facts(posts):
 
         # Newest post on this day
         if len(day_posts) >= 2:
-            newest_post = max(day_posts, key=lambda p: p['date_obj'])
+            newest_post = day_posts[-1]
             add_fact(
                 'otd',
                 f"The most recent {month_name} {day} post was \"{newest_post['plain_title']}\" in {newest_post['year']}.",
@@ -595,10 +631,9 @@ def generate_facts(posts):
 
         # If multiple posts on same day of year across years, note that
         if len(day_posts) >= 3:
-            years = sorted(set(p['year'] for p in day_posts))
             add_fact(
                 'otd',
-                f"{month_name} {day} has seen {len(day_posts)} blog posts over the years ({years[0]}-{years[-1]}).",
+                f"{month_name} {day} has seen {len(day_posts)} blog posts over the years ({day_posts[0]['year']}-{day_posts[-1]['year']}).",
                 day_posts[0]['link']
             )
 
@@ -819,36 +854,18 @@ def generate_facts(posts):
             )
 
     # === MATHEMATICIAN/SCIENTIST MENTIONS ===
-    mathematicians = [
-        'Euler', 'Gauss', 'Riemann', 'Ramanujan', 'Erdős', 'Knuth', 'Feynman',
-        'Newton', 'Leibniz', 'Fermat', 'Cauchy', 'Laplace', 'Fourier', 'Hilbert',
-        'Gödel', 'Turing', 'Shannon', 'von Neumann', 'Poincaré', 'Kolmogorov',
-        'Bayes', 'Fisher', 'Pearson', 'Student', 'Gosset', 'Galton',
-        'Bernoulli', 'Chebyshev', 'Markov', 'Poisson', 'Weierstrass',
-        'Cantor', 'Dedekind', 'Peano', 'Russell', 'Whitehead', 'Frege',
-        'Boole', 'de Morgan', 'Venn', 'Cayley', 'Hamilton', 'Sylvester',
-        'Noether', 'Hardy', 'Littlewood', 'Wiener', 'Mandelbrot', 'Penrose',
-        'Hawking', 'Einstein', 'Dirac', 'Schrödinger', 'Heisenberg', 'Bohr',
-        'Maxwell', 'Boltzmann', 'Planck', 'Curie', 'Lorentz', 'Minkowski',
-        'Archimedes', 'Pythagoras', 'Euclid', 'Apollonius', 'Diophantus',
-        'al-Khwarizmi', 'Fibonacci', 'Cardano', 'Vieta', 'Descartes', 'Pascal',
-        'Huygens', 'Hooke', 'Napier', 'Briggs', 'Wallis', 'Barrow',
-        'L\'Hôpital', 'Taylor', 'Maclaurin', 'Stirling', 'Lagrange', 'Legendre',
-        'Abel', 'Galois', 'Jacobi', 'Dirichlet', 'Kummer', 'Kronecker',
-        'Klein', 'Lie', 'Cartan', 'Weyl', 'Weil', 'Grothendieck', 'Serre',
-        'Atiyah', 'Singer', 'Milnor', 'Smale', 'Thurston', 'Perelman',
-        'Wiles', 'Tao', 'Villani', 'Mirzakhani', 'Scholze',
-    ]
+    entity_matrix, entity_posts = load_entity_posts(posts)
+    mathematicians = entity_matrix.names('mathematician')
     for mathematician in mathematicians:
-        mentions = term_index.get(mathematician.lower(), [])
+        mentions = [by_id[i] for i in entity_posts[mathematician]]
         if len(mentions) >= 5:
             add_fact(
                 'quirk',
                 f"{mathematician} is mentioned in {len(mentions)} posts on the blog.",
-                mentions[0][0]['link']
+                mentions[0]['link']
             )
         elif len(mentions) == 1:
-            post = mentions[0][0]
+            post = mentions[0]
             add_fact(
                 'rarity',
                 f"{mathematician} is mentioned in only one post: \"{post['plain_title']}\" ({post['date_obj'].strftime('%Y')}).",
@@ -860,29 +877,21 @@ def generate_facts(posts):
             add_fact(
                 'rarity',
                 f"{mathematician} appears in exactly {len(mentions)} posts on the blog.",
-                mentions[0][0]['link']
+                mentions[0]['link']
             )
 
     # === PROGRAMMING LANGUAGE FACTS ===
-    prog_languages = [
-        'Python', 'R', 'Mathematica', 'MATLAB', 'Fortran', 'C++', 'C#',
-        'Haskell', 'Lisp', 'Scheme', 'Clojure', 'Julia', 'Perl', 'Ruby',
-        'JavaScript', 'TypeScript', 'PowerShell', 'Bash', 'Shell',
-        'Java', 'Scala', 'Kotlin', 'Go', 'Rust', 'Swift', 'Objective-C',
-        'PHP', 'SQL', 'Assembly', 'COBOL', 'Pascal', 'Ada', 'Prolog',
-        'Erlang', 'Elixir', 'F#', 'OCaml', 'SML', 'Racket',
-        'Lua', 'Tcl', 'AWK', 'Sed', 'Vim', 'Emacs',
-    ]
+    prog_languages = entity_matrix.names('language')
     for lang in prog_languages:
-        lang_posts = term_index.get(lang.lower(), [])
+        lang_posts = [by_id[i] for i in entity_posts[lang]]
         if len(lang_posts) >= 10:
             add_fact(
                 'quirk',
                 f"{lang} code or discussion appears in {len(lang_posts)} posts.",
-                lang_posts[0][0]['link']
+                lang_posts[0]['link']
             )
         elif 1 <= len(lang_posts) <= 5:
-            for post, _ in lang_posts[:3]:
+            for post in lang_posts[:3]:
                 add_fact(
                     'rarity',
                     f"{lang} is mentioned in \"{post['plain_title']}\" ({post['date_obj'].strftime('%Y')}).",
@@ -891,6 +900,15 @@ def generate_facts(posts):
                     post['slug']
                 )
 
+    # Code listings by detected language
+    titles = {p['id']: p['plain_title'] for p in posts}
+    for fact in iter_code_facts(code_table, titles):
+        post = by_id.get(fact.get('post_id'))
+        if post:
+            add_fact('code', fact['fact'], post['link'], post['date'], post['slug'])
+        else:
+            add_fact('code', fact['fact'], 'https://www.johndcook.com/blog/')
+
     # === SPECIAL DATE FACTS ===
     special_dates = [
         ((3, 14), "Pi Day", "π ≈ 3.14"),
@@ -915,7 +933,7 @@ def generate_facts(posts):
     ]
 
     for (month, day), name, reason in special_dates:
-        special_posts = [p for p in posts if p['month'] == month and p['day'] == day]
+        special_posts = [by_id[pid] for pid in date_index.on_this_day(month, day)]
         if special_posts:
             add_fact(
                 'otd',
@@ -1097,32 +1115,18 @@ def generate_facts(posts):
         )
 
     # === CONSECUTIVE POSTING STREAKS ===
-    dates = sorted(set(p['date_obj'].date() for p in posts))
-    max_streak = 1
-    current_streak = 1
-    streak_start = dates[0]
-    best_streak_start = dates[0]
-
-    for i in range(1, len(dates)):
-        if (dates[i] - dates[i-1]).days == 1:
-            current_streak += 1
-            if current_streak > max_streak:
-                max_streak = current_streak
-                best_streak_start = streak_start
-        else:
-            current_streak = 1
-            streak_start = dates[i]
-
-    if max_streak >= 5:
+    series = PostingSeries.build((p['date_obj'], p.get('word_count', 0)) for p in posts)
+    streaks = series.streaks(min_days=5)
+    if streaks:
         add_fact(
             'quirk',
-            f"The longest consecutive posting streak was {max_streak} days, starting {best_streak_start.strftime('%B %d, %Y')}.",
+            f"The longest consecutive posting streak was {streaks[0].days} days, starting {streaks[0].start.strftime('%B %d, %Y')}.",
             posts_sorted[-1]['link']
         )
 
     # === POSTS WITH SPECIFIC PATTERNS ===
     # Posts with equations/formulas
-    equation_posts = [p for p in posts if has_equation(p.get('content', ''))]
+    equation_posts = math_table.posts('equation')
     add_fact(
         'quirk',
         f"Approximately {len(equation_posts)} posts contain mathematical equations or formulas.",
@@ -1131,17 +1135,19 @@ def generate_facts(posts):
 
     # Posts mentioning specific constants
     constants = [
-        ('pi', 'π', '3.14159'),
+        ('Pi', 'π', '3.14159'),
         ('e', "Euler's number", '2.71828'),
-        ('phi', 'golden ratio', '1.61803'),
-        ('sqrt2', '√2', '1.41421'),
-        ('sqrt3', '√3', '1.73205'),
-        ('ln2', 'ln(2)', '0.69314'),
-        ('gamma', 'Euler-Mascheroni', '0.57721'),
+        ('Golden ratio', 'golden ratio', '1.61803'),
+        ('Square root of 2', '√2', '1.41421'),
+        ('Square root of 3', '√3', '1.73205'),
+        ('Natural log of 2', 'ln(2)', '0.69314'),
+        ('Euler-Mascheroni constant', 'Euler-Mascheroni', '0.57721'),
     ]
 
     for const_name, display_name, value in constants:
-        const_posts = [p for p in posts if value in p['plain_content'] or display_name.lower() in p['plain_content'].lower()]
+        # Posts naming the constant, plus posts quoting its leading digits
+        named = set(entity_posts[const_name])
+        const_posts = [p for p in posts if p['id'] in named or value in p['plain_content']]
         if const_posts:
             add_fact(
                 'constant',
@@ -1206,8 +1212,9 @@ def generate_facts(posts):
 
     # === RELATED POSTS CHAINS ===
     # Posts that reference each other
-    posts_with_links = [(p, re.findall(r'johndcook\.com/blog/\d{4}/\d{2}/\d{2}/([^/"]+)', p.get('content', ''))) for p in posts]
-    for post, referenced_slugs in posts_with_links:
+    referenced = load_internal_links(posts)
+    for post in posts:
+        referenced_slugs = referenced.get(post['id'], [])
         if len(referenced_slugs) >= 3:
             add_fact(
                 'quirk',
@@ -1222,12 +1229,9 @@ def generate_facts(posts):
     recent_posts = [p for p in posts if p['year'] >= 2020]
     for recent in recent_posts[:50]:
         for years_ago in [5, 10, 15]:
-            anniversary_posts = [p for p in posts
-                               if p['month'] == recent['month']
-                               and p['day'] == recent['day']
-                               and p['year'] == recent['year'] - years_ago]
-            if anniversary_posts:
-                old_post = anniversary_posts[0]
+            anniversary_ids = date_index.anniversaries(recent['id'], years_ago)
+            if anniversary_ids:
+                old_post = by_id[anniversary_ids[0]]
                 add_fact(
                     'otd',
                     f"\"{recent['plain_title']}\" ({recent['year']}) was published exactly {years_ago} years after \"{old_post['plain_title']}\" ({old_post['year']}).",
@@ -18,9 +18,11 @@ import seaborn as sns
 from collections import Counter
 import re
 import os
-import json
 from datetime import datetime
 import textwrap
+from pathlib import Path
+
+from cookbook import io
 
 # --- Configuration ---
 DATA_DIR = "data"
@@ -28,6 +30,9 @@ OUTPUT_DIR = "book/visual_sampler_v2/images"
 CALENDAR_FACTS_PATH = f"{DATA_DIR}/johndcook_calendar_candidates_filtered.csv"
 METADATA_PATH = f"{DATA_DIR}/posts_metadata.csv"
 ENRICHED_POSTS_PATH = f"{DATA_DIR}/johndcook_posts_enriched.jsonl"
+TEXT_INDEX_PATH = f"{DATA_DIR}/johndcook_text_index.jsonl"
+TOPICS_PATH = f"{DATA_DIR}/topics.npz"
+QUOTES_PATH = f"{DATA_DIR}/quote_candidates.csv"
 
 # Professional color palettes
 ENDEAVOUR_COLORS = {
@@ -82,10 +87,7 @@ def load_data():
     metadata_df['date'] = pd.to_datetime(metadata_df['date'])
 
     # Load enriched posts
-    posts = []
-    with open(ENRICHED_POSTS_PATH, 'r') as f:
-        for line in f:
-            posts.append(json.loads(line))
+    posts = list(io.read_jsonl(Path(ENRICHED_POSTS_PATH)))
     enriched_df = pd.DataFrame(posts)
 
     return facts_df, metadata_df, enriched_df
@@ -340,36 +342,35 @@ def viz_04_word_distribution(metadata_df):
 # =============================================================================
 # VISUALIZATION 5: Topic Evolution (Streamgraph-style)
 # =============================================================================
-def viz_05_topic_evolution(metadata_df):
-    """Area chart showing evolution of major topics over time."""
-    print("5. Topic Evolution...")
+def load_topics():
+    """The fitted topic model from `cookbook stats topics`, or a fresh fit of the index."""
+    from cookbook.topics import TopicModel
 
-    # Get top categories
-    top_cats = ['Math', 'Computing', 'Statistics', 'Science']
+    if os.path.exists(TOPICS_PATH):
+        return TopicModel.load(Path(TOPICS_PATH))
+    return TopicModel.from_index(Path(TEXT_INDEX_PATH))
 
-    yearly_cats = []
-    for year in range(2008, 2026):
-        year_data = metadata_df[metadata_df['year'] == year]
-        row = {'year': year}
-        for cat in top_cats:
-            row[cat] = year_data['categories'].str.contains(cat, na=False).sum()
-        yearly_cats.append(row)
 
-    df = pd.DataFrame(yearly_cats)
+def viz_05_topic_evolution():
+    """Area chart of each year's share of NMF topics."""
+    print("5. Topic Evolution...")
+
+    model = load_topics()
+    years, shares = model.per_year(range(2008, 2026))
+    labels = model.labels(n=3)
 
     fig, ax = plt.subplots(figsize=(14, 6))
 
-    colors = [ENDEAVOUR_COLORS['primary'], ENDEAVOUR_COLORS['accent'],
-              ENDEAVOUR_COLORS['accent2'], ENDEAVOUR_COLORS['accent3']]
+    colors = endeavour_cmap(np.linspace(0, 1, model.n_topics))
 
-    ax.stackplot(df['year'], [df[cat] for cat in top_cats],
-                 labels=top_cats, colors=colors, alpha=0.8)
+    ax.stackplot(years, shares.T, labels=labels, colors=colors, alpha=0.85)
 
     ax.set_xlim(2008, 2025)
+    ax.set_ylim(0, 1)
     ax.set_xlabel('Year', fontsize=12)
-    ax.set_ylabel('Number of Posts', fontsize=12)
+    ax.set_ylabel('Share of Posts', fontsize=12)
     ax.set_title('Topic Evolution: The Rise and Flow of Ideas', fontsize=14, fontweight='bold')
-    ax.legend(loc='upper left', frameon=False)
+    ax.legend(loc='upper left', bbox_to_anchor=(1.01, 1), frameon=False, fontsize=9)
 
     # Add subtle grid
     ax.yaxis.grid(True, alpha=0.3, linestyle='--')
@@ -629,10 +630,25 @@ def viz_10_dumbbell_chart(facts_df):
 # =============================================================================
 # VISUALIZATION 11: Stylized Quote Card
 # =============================================================================
-def viz_11_quote_card(enriched_df):
-    """Stylized quote card for memorable excerpts."""
+def top_quote():
+    """The best-ranked quote from `cookbook stats quotes`, or one mined from the index."""
+    if os.path.exists(QUOTES_PATH):
+        best = pd.read_csv(QUOTES_PATH, nrows=1).iloc[0]
+        return best['quote'], best['title'], str(best['date'])[:4]
+
+    from cookbook.quotes import mine_index
+
+    best = mine_index(Path(TEXT_INDEX_PATH))[0]
+    titles = {rec['id']: rec.get('title', '') for rec in io.read_jsonl(Path(TEXT_INDEX_PATH))}
+    return best.text, titles.get(best.post_id, ''), best.date[:4]
+
+
+def viz_11_quote_card():
+    """Stylized quote card for the top-ranked mined quote."""
     print("11. Quote Card...")
 
+    text, title, year = top_quote()
+
     fig, ax = plt.subplots(figsize=(10, 6))
     ax.set_xlim(0, 10)
     ax.set_ylim(0, 6)
@@ -651,13 +667,14 @@ def viz_11_quote_card(enriched_df):
            alpha=0.3, fontfamily='serif', fontweight='bold')
 
     # Quote text
-    quote = "The intersection of mathematics and computing\nis where the most interesting problems live."
+    quote = "\n".join(textwrap.wrap(text, width=50))
     ax.text(5, 3.2, quote, fontsize=14, ha='center', va='center',
            color=ENDEAVOUR_COLORS['text'], style='italic', fontfamily='serif',
            linespacing=1.5)
 
     # Attribution
-    ax.text(7, 1.2, "— John D. Cook", fontsize=12, ha='right',
+    attribution = f"— John D. Cook, “{title}” ({year})" if title else "— John D. Cook"
+    ax.text(9, 1.2, attribution, fontsize=12, ha='right',
            color=ENDEAVOUR_COLORS['muted'], fontweight='bold')
 
     # Accent line
@@ -740,13 +757,13 @@ def main():
     viz_02_category_treemap(metadata_df)
     viz_03_posting_rhythm(metadata_df)
     viz_04_word_distribution(metadata_df)
-    viz_05_topic_evolution(metadata_df)
+    viz_05_topic_evolution()
     viz_06_lollipop_chart(metadata_df)
     viz_07_bump_chart(metadata_df)
     viz_08_waffle_chart(facts_df)
     viz_09_connected_scatter(metadata_df)
     viz_10_dumbbell_chart(facts_df)
-    viz_11_quote_card(enriched_df)
+    viz_11_quote_card()
     viz_12_circular_packing(metadata_df)
 
     print("\n" + "="*60)
@@ -4,56 +4,59 @@
 Outputs JSONL with:
 - id, title, link, date, slug
 - plain_text (HTML stripped)
-- word_count (from plain text)
+- word_count (from plain text: runs of letters, so digits do not count and
+  hyphenated terms count as two words, unlike tokens)
 - link_count, image_count (from HTML)
-- symbols: counts of π, φ, Φ, ∞ in text
-- tokens: lowercased alphabetic tokens (no stopword filtering here)
+- symbols: counts of π, φ, Φ, ∞ in text (from the math scan below)
+- phrases: counts of multi-word terms from the phrase vocabulary
+
+Tokens (casefolded Unicode tokens keeping digits and hyphenated terms, no
+stopword filtering) are interned into a global vocabulary and written as
+uint32 arrays to the token store beside the index; see cookbook.token_store.
+The BM25 search files (postings, snippet text, titles) are written last from
+the finished store; see cookbook.search. Links to other posts and to other
+sites go to their own side files, as do entity mention counts, code blocks
+and math symbol/LaTeX/equation counts; see cookbook.graph,
+cookbook.outlinks, cookbook.entities, cookbook.code_blocks and
+cookbook.math_index.
 """
 
 from __future__ import annotations
 
-import json
-import re
+import html
+from contextlib import ExitStack
 from dataclasses import dataclass
-from html.parser import HTMLParser
 from pathlib import Path
-from typing import List
+from typing import Iterable, List
+
+from cookbook import io
+from cookbook.code_blocks import CodeWriter
+from cookbook.entities import EntitiesWriter
+from cookbook.graph import LinksWriter
+from cookbook.html_extract import extract_post_text
+from cookbook.math_index import MathWriter, index_symbols, scan_math
+from cookbook.outlinks import OutlinksWriter
+from cookbook.search import SearchIndexWriter
+from cookbook.token_store import (
+    IndexedPost,
+    SideFileWriter,
+    TokenStore,
+    TokenStoreWriter,
+    store_base,
+)
+from cookbook.tokenizer import DEFAULT_PHRASES, Tokenizer, count_words
 
 SRC = Path("data/johndcook_posts_enriched.jsonl")
 OUT = Path("data/johndcook_text_index.jsonl")
-
-
-class TextExtractor(HTMLParser):
-    def __init__(self) -> None:
-        super().__init__(convert_charrefs=True)
-        self.parts: List[str] = []
-        self.link_count = 0
-        self.image_count = 0
-
-    def handle_starttag(self, tag, attrs):
-        if tag == "a":
-            self.link_count += 1
-        if tag == "img":
-            self.image_count += 1
-
-    def handle_data(self, data):
-        self.parts.append(data)
-
-    def text(self) -> str:
-        return " ".join(self.parts)
+TOKENIZER = Tokenizer(phrases=DEFAULT_PHRASES)
+# The other backends do not extract identical text yet; see cookbook.html_extract.
+HTML_BACKEND = "stdlib"
+# Tables written beside the index, each fed every parsed post.
+SIDE_WRITERS = (LinksWriter, OutlinksWriter, EntitiesWriter, CodeWriter, MathWriter)
 
 
 def tokenize(text: str) -> List[str]:
-    return [t for t in re.split(r"[^A-Za-z]+", text.lower()) if t]
-
-
-def symbol_counts(text: str) -> dict:
-    return {
-        "pi": text.count("π"),
-        "phi": text.count("φ"),
-        "Phi": text.count("Φ"),
-        "infty": text.count("∞"),
-    }
+    return TOKENIZER.tokenize(text)
 
 
 @dataclass
@@ -68,38 +71,61 @@ class PostIndex:
     link_count: int
     image_count: int
     symbols: dict
-    tokens: List[str]
+    phrases: dict
+
+
+def build_records(
+    posts,
+    store: TokenStoreWriter,
+    search: SearchIndexWriter,
+    writers: Iterable[SideFileWriter] = (),
+):
+    writers = list(writers)
+    for obj in posts:
+        content = obj.get("content") or ""
+        extracted = extract_post_text(content, HTML_BACKEND)
+        text = extracted.text()
+        analysis = TOKENIZER.analyze(text)
+        tokens = analysis.tokens
+        store.add(obj.get("id"), tokens)
+        search.add(obj.get("title"), obj.get("date"), obj.get("link"), text.strip())
+        post = IndexedPost(
+            obj.get("id"),
+            obj.get("date") or "",
+            obj.get("slug") or "",
+            obj.get("link") or "",
+            html.unescape(obj.get("title") or ""),
+            text,
+            extracted,
+            scan_math(text),
+        )
+        for writer in writers:
+            writer.add_post(post)
+        yield {
+            "id": obj.get("id"),
+            "title": obj.get("title") or "",
+            "link": obj.get("link") or "",
+            "date": obj.get("date") or "",
+            "slug": obj.get("slug") or "",
+            "plain_text": text.strip(),
+            "word_count": count_words(text),
+            "link_count": extracted.link_count,
+            "image_count": extracted.image_count,
+            "symbols": index_symbols(post.math),
+            "phrases": dict(analysis.phrases),
+        }
 
 
 def main() -> None:
-    OUT.parent.mkdir(parents=True, exist_ok=True)
-    written = 0
-    with SRC.open() as f_in, OUT.open("w", encoding="utf-8") as f_out:
-        for line in f_in:
-            obj = json.loads(line)
-            content = obj.get("content") or ""
-            parser = TextExtractor()
-            parser.feed(content)
-            parser.close()
-            text = parser.text()
-            tokens = tokenize(text)
-            wc = len(tokens)
-            sym = symbol_counts(text)
-            record = {
-                "id": obj.get("id"),
-                "title": obj.get("title") or "",
-                "link": obj.get("link") or "",
-                "date": obj.get("date") or "",
-                "slug": obj.get("slug") or "",
-                "plain_text": text.strip(),
-                "word_count": wc,
-                "link_count": parser.link_count,
-                "image_count": parser.image_count,
-                "symbols": sym,
-                "tokens": tokens,
-            }
-            f_out.write(json.dumps(record, ensure_ascii=False) + "\n")
-            written += 1
+    base = store_base(OUT)
+    search = SearchIndexWriter(base)
+    with TokenStoreWriter(base) as store, ExitStack() as stack:
+        writers = [stack.enter_context(writer(base)) for writer in SIDE_WRITERS]
+        posts = io.read_jsonl(SRC)
+        records = build_records(posts, store, search, writers)
+        written = io.write_jsonl(OUT, records)
+    with TokenStore(base) as store:
+        search.finish(store)
     print(f"Wrote {written} records to {OUT}")
 
 
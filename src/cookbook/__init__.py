@@ -1,5 +1,32 @@
 """Shared tooling for the johndcook.com calendar, book, and bot projects."""
 
-__all__ = ["paths", "models", "io"]
+__all__ = [
+    "paths",
+    "models",
+    "io",
+    "posts",
+    "corpus",
+    "tokenizer",
+    "token_store",
+    "stats",
+    "search",
+    "rewrite",
+    "html_extract",
+    "http_cache",
+    "pipeline",
+    "reconcile",
+    "graph",
+    "outlinks",
+    "taxonomy",
+    "entities",
+    "code_blocks",
+    "math_index",
+    "count_table",
+    "timeseries",
+    "topics",
+    "gsc",
+    "hn",
+    "quotes",
+]
 
 __version__ = "0.1.0"
@@ -30,6 +30,24 @@ def load_facts_json(path: Path) -> list[dict]:
     return facts
 
 
+def add_facts(path: Path, new_facts: Iterable[dict], max_length: int = 260) -> int:
+    """Append facts to a facts JSON with fresh IDs, skipping repeats and over-long texts."""
+    facts = load_facts_json(path) if path.exists() else []
+    texts = {fact.get("text") for fact in facts}
+    next_id = max((int(fact["id"]) for fact in facts), default=0) + 1
+    added = 0
+    for fact in new_facts:
+        text = fact.get("text", "")
+        if not text or text in texts or len(text) > max_length:
+            continue
+        facts.append({**fact, "id": next_id})
+        texts.add(text)
+        next_id += 1
+        added += 1
+    write_facts_json(facts, path)
+    return added
+
+
 RECENCY_WINDOW = 50  # Don't repeat a fact within this many days
 
 
@@ -6,6 +6,7 @@ import csv
 import hashlib
 import json
 from pathlib import Path
+from typing import Iterable
 
 import typer
 
@@ -16,6 +17,7 @@ app = typer.Typer(help="Cookbook utilities for calendar, bot, and book workflows
 calendar_app = typer.Typer(help="Calendar validation and curation utilities.")
 bot_app = typer.Typer(help="Bot fact utilities.")
 ingest_app = typer.Typer(help="Ingestion and indexing helpers.")
+stats_app = typer.Typer(help="Corpus statistics (Zipf, Heaps, entropy, intervals).")
 
 
 def _sha256(path: Path) -> str:
@@ -42,6 +44,36 @@ def _fail_if_errors(errors: list[str]) -> None:
         raise typer.Exit(code=1)
 
 
+FACT_FIELDS = ["id", "type", "fact", "source_link"]
+
+
+def _index_posts(index_path: Path) -> tuple[dict[int, dict], dict[int, str]]:
+    """Text index records and titles, both keyed by post ID."""
+    from . import io
+
+    posts = {rec["id"]: rec for rec in io.read_jsonl(index_path)}
+    titles = {post_id: rec.get("title") or "" for post_id, rec in posts.items()}
+    return posts, titles
+
+
+def _write_facts(output: Path, facts: Iterable[dict], posts: dict | None = None) -> int:
+    """Write numbered facts to a CSV and echo them; returns how many were written.
+
+    A fact's ``post_id`` is turned into its ``source_link`` through ``posts``
+    (post ID to text index record).
+    """
+    output.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with output.open("w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=FACT_FIELDS)
+        writer.writeheader()
+        for count, fact in enumerate(facts, start=1):
+            link = (posts or {}).get(fact.pop("post_id", None), {}).get("link") or ""
+            writer.writerow({"id": count, "source_link": link, **fact})
+            typer.echo(fact["fact"])
+    return count
+
+
 @calendar_app.command("validate", help="Validate the canonical 365 calendar file.")
 def calendar_validate(
     calendar_path: Path = typer.Option(
@@ -361,9 +393,17 @@ def ingest_wp_api(
         "--verify-ssl",
         help="Verify SSL certificates.",
     ),
+    cache_dir: Path = typer.Option(
+        paths.data_path("http_cache"),
+        "--cache-dir",
+        help="HTTP cache directory (responses are revalidated with ETag/Last-Modified).",
+    ),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Always download in full."),
+    offline: bool = typer.Option(False, "--offline", help="Replay the HTTP cache without network."),
 ) -> None:
-    out = ingest_utils.fetch_wp_api(base_url=base_url, output=output, verify_ssl=verify_ssl)
-    typer.secho(f"Wrote posts to {out}", fg=typer.colors.GREEN)
+    cache = ingest_utils.http_cache(verify_ssl, cache_dir, offline=offline, no_cache=no_cache)
+    out = ingest_utils.fetch_wp_api(base_url=base_url, output=output, verify_ssl=verify_ssl, cache=cache)
+    typer.secho(f"Wrote posts to {out} ({cache.summary()})", fg=typer.colors.GREEN)
 
 
 @ingest_app.command("taxonomies", help="Fetch WP categories and tags.")
@@ -384,9 +424,19 @@ def ingest_taxonomies(
         "--verify-ssl",
         help="Verify SSL certificates.",
     ),
+    cache_dir: Path = typer.Option(
+        paths.data_path("http_cache"),
+        "--cache-dir",
+        help="HTTP cache directory (responses are revalidated with ETag/Last-Modified).",
+    ),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Always download in full."),
+    offline: bool = typer.Option(False, "--offline", help="Replay the HTTP cache without network."),
 ) -> None:
-    out = ingest_utils.fetch_taxonomies(base_url=base_url, output_dir=output_dir, verify_ssl=verify_ssl)
-    typer.secho(f"Wrote taxonomies to {out}", fg=typer.colors.GREEN)
+    cache = ingest_utils.http_cache(verify_ssl, cache_dir, offline=offline, no_cache=no_cache)
+    out = ingest_utils.fetch_taxonomies(
+        base_url=base_url, output_dir=output_dir, verify_ssl=verify_ssl, cache=cache
+    )
+    typer.secho(f"Wrote taxonomies to {out} ({cache.summary()})", fg=typer.colors.GREEN)
 
 
 @ingest_app.command("enrich", help="Enrich posts with taxonomy names.")
@@ -427,15 +477,743 @@ def ingest_index(
         "--output",
         "-o",
         help="Output text index path.",
-    )
+    ),
+    parser: str = typer.Option(
+        "stdlib",
+        "--parser",
+        help="HTML parser backend: stdlib, auto, selectolax or lxml.",
+    ),
 ) -> None:
-    out = ingest_utils.build_text_index(output_path=output)
+    out = ingest_utils.build_text_index(output_path=output, html_backend=parser)
     typer.secho(f"Wrote text index to {out}", fg=typer.colors.GREEN)
 
 
+@ingest_app.command("metadata", help="Build posts_metadata.csv from the enriched posts.")
+def ingest_metadata(
+    posts: Path = typer.Option(
+        paths.data_path("johndcook_posts_enriched.jsonl"),
+        "--posts",
+        exists=True,
+        readable=True,
+        help="Enriched posts JSONL.",
+    ),
+    output: Path = typer.Option(
+        paths.data_path("posts_metadata.csv"),
+        "--output",
+        "-o",
+        help="Output metadata CSV.",
+    ),
+) -> None:
+    out, skipped = ingest_utils.build_posts_metadata(posts_path=posts, output_path=output)
+    if skipped:
+        typer.secho(f"Skipped {skipped:,} posts with a missing or bad date", fg=typer.colors.YELLOW)
+    typer.secho(f"Wrote post metadata to {out}", fg=typer.colors.GREEN)
+
+
+@ingest_app.command("decode", help="Load posts JSONL into typed Posts and report throughput.")
+def ingest_decode(
+    posts: Path = typer.Option(
+        paths.data_path("johndcook_posts_enriched.jsonl"),
+        "--posts",
+        exists=True,
+        readable=True,
+        help="Posts JSONL (.gz/.zst allowed).",
+    ),
+    content: bool = typer.Option(False, "--content", help="Also decode post bodies."),
+) -> None:
+    from .posts import LoadStats, load_posts
+
+    stats = LoadStats()
+    load_posts(posts, include_content=content, stats=stats)
+    typer.echo(str(stats))
+
+
+@ingest_app.command("reconcile", help="Join the SQL, API and HTML post sources and report drift.")
+def ingest_reconcile(
+    sql: Path = typer.Option(
+        paths.data_path("johndcook_posts_from_sql.jsonl"), "--sql", help="SQL dump posts JSONL."
+    ),
+    api: Path = typer.Option(
+        paths.data_path("johndcook_posts_api.jsonl"), "--api", help="REST API posts JSONL."
+    ),
+    html: Path = typer.Option(
+        paths.data_path("johndcook_posts.jsonl"), "--html", help="HTML mirror posts JSONL."
+    ),
+    output: Path = typer.Option(
+        paths.data_path("reconcile_report.csv"),
+        "--output",
+        "-o",
+        help="CSV of issues (missing, duplicate, content, word_count, title).",
+    ),
+    tolerance: float = typer.Option(
+        0.1, "--tolerance", help="Relative word count difference to report."
+    ),
+) -> None:
+    from .reconcile import reconcile, write_report
+
+    sources = {}
+    for name, path in (("sql", sql), ("api", api), ("html", html)):
+        if path.exists():
+            sources[name] = path
+        else:
+            typer.secho(f"Skipping {name}: {path} not found", fg=typer.colors.YELLOW)
+    if len(sources) < 2:
+        _fail_if_errors(["Need at least two post sources to reconcile."])
+    result = reconcile(sources, tolerance=tolerance)
+    typer.echo(result.summary())
+    count = write_report(output, result)
+    typer.secho(f"Wrote {count} issues to {output}", fg=typer.colors.GREEN)
+
+
+@ingest_app.command("hn", help="Join an offline Hacker News item dump to the posts.")
+def ingest_hn(
+    dump: Path = typer.Argument(
+        ..., exists=True, readable=True, help="HN items as JSONL (.gz/.zst) or Parquet."
+    ),
+    index_path: Path = typer.Option(
+        paths.data_path("johndcook_text_index.jsonl"),
+        "--index",
+        "-i",
+        exists=True,
+        readable=True,
+        help="Text index JSONL, to join submission URLs to posts.",
+    ),
+    output: Path = typer.Option(
+        paths.data_path("hn_submissions.jsonl"),
+        "--output",
+        "-o",
+        help="Output JSONL of the site's submissions.",
+    ),
+    posts_output: Path = typer.Option(
+        paths.data_path("hn_posts.csv"), "--posts", help="Output CSV, one row per post."
+    ),
+) -> None:
+    import time
+
+    start = time.perf_counter()
+    submissions, posts = ingest_utils.build_hn(dump, index_path, output, posts_output)
+    typer.secho(
+        f"Wrote {submissions} and {posts} in {time.perf_counter() - start:.1f}s",
+        fg=typer.colors.GREEN,
+    )
+
+
+@ingest_app.command("all", help="Run fetch → enrich → metadata/index, skipping up-to-date stages.")
+def ingest_all(
+    force: bool = typer.Option(False, "--force", help="Rerun every stage."),
+    offline: bool = typer.Option(False, "--offline", help="Replay the HTTP cache without network."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Download in full, bypassing the cache."),
+    cache_dir: Path = typer.Option(
+        paths.data_path("http_cache"),
+        "--cache-dir",
+        help="HTTP cache directory.",
+    ),
+    verify_ssl: bool = typer.Option(False, "--verify-ssl", help="Verify SSL certificates."),
+    parser: str = typer.Option("stdlib", "--parser", help="HTML parser backend for the index."),
+    hn_dump: Path = typer.Option(
+        None,
+        "--hn-dump",
+        exists=True,
+        readable=True,
+        help="Offline Hacker News item dump to join to the index (adds the hn stage).",
+    ),
+) -> None:
+    from .pipeline import format_table
+
+    cache = ingest_utils.http_cache(verify_ssl, cache_dir, offline=offline, no_cache=no_cache)
+    pipeline = ingest_utils.ingest_pipeline(cache=cache, html_backend=parser, hn_dump=hn_dump)
+    results = pipeline.run(force=force)
+    typer.echo(format_table(results, pipeline.wall_seconds))
+    typer.echo(cache.summary())
+    _fail_if_errors([f"{r.name}: {r.detail}" for r in results if r.status == "failed"])
+
+
+@stats_app.command("facts", help="Compute corpus statistics and write stats facts CSV.")
+def stats_facts(
+    index_path: Path = typer.Option(
+        paths.data_path("johndcook_text_index.jsonl"),
+        "--index",
+        "-i",
+        exists=True,
+        readable=True,
+        help="Text index JSONL (token store files live beside it).",
+    ),
+    state_path: Path = typer.Option(
+        None,
+        "--state",
+        "-s",
+        help="Saved statistics to resume from and update (only new posts are added).",
+    ),
+    output: Path = typer.Option(
+        paths.data_path("stats_facts.csv"),
+        "--output",
+        "-o",
+        help="Output CSV of stats facts.",
+    ),
+) -> None:
+    from . import io, stats
+    from .token_store import TokenStore
+
+    resume = stats.CorpusStats.load(state_path) if state_path and state_path.exists() else None
+    before = len(resume.post_ids) if resume else 0
+    dates = stats.load_post_dates(io.read_jsonl(index_path))
+    with TokenStore.for_index(index_path) as store:
+        try:
+            corpus = stats.CorpusStats.from_store(store, dates, resume=resume)
+        except ValueError as e:
+            _fail_if_errors([str(e)])
+    if state_path:
+        corpus.save(state_path)
+
+    count = _write_facts(output, stats.iter_stats_facts(corpus))
+    typer.secho(
+        f"Wrote {count} stats facts to {output} "
+        f"({len(corpus.post_ids) - before} new posts, {len(corpus.post_ids)} total).",
+        fg=typer.colors.GREEN,
+    )
+
+
+@stats_app.command("graph", help="Internal link graph facts: most-cited posts, PageRank, reach.")
+def stats_graph(
+    index_path: Path = typer.Option(
+        paths.data_path("johndcook_text_index.jsonl"),
+        "--index",
+        "-i",
+        exists=True,
+        readable=True,
+        help="Text index JSONL (the graph links file lives beside it).",
+    ),
+    state_path: Path = typer.Option(
+        None,
+        "--state",
+        "-s",
+        help="Saved graph to extend with new posts; PageRank warm-starts from it.",
+    ),
+    output: Path = typer.Option(
+        paths.data_path("graph_facts.csv"),
+        "--output",
+        "-o",
+        help="Output CSV of graph facts.",
+    ),
+) -> None:
+    from .graph import LINKS_SUFFIX, LinkGraph, iter_graph_facts, read_links
+    from .token_store import side_path, store_base
+
+    links_path = side_path(store_base(index_path), LINKS_SUFFIX)
+    if not links_path.exists():
+        _fail_if_errors([f"{links_path} not found; rebuild the index with `ingest index`."])
+    graph = LinkGraph.load(state_path) if state_path and state_path.exists() else LinkGraph.empty()
+    before = len(graph)
+    graph = graph.add_posts(read_links(links_path))
+    posts, titles = _index_posts(index_path)
+
+    count = _write_facts(output, iter_graph_facts(graph, titles), posts)
+    if state_path:
+        graph.save(state_path)
+    typer.secho(
+        f"Wrote {count} graph facts to {output} "
+        f"({len(graph) - before} new posts, {len(graph)} total, {graph.edge_count} links).",
+        fg=typer.colors.GREEN,
+    )
+
+
+@stats_app.command("links", help="Outbound links by domain, path and year.")
+def stats_links(
+    index_path: Path = typer.Option(
+        paths.data_path("johndcook_text_index.jsonl"),
+        "--index",
+        "-i",
+        exists=True,
+        readable=True,
+        help="Text index JSONL (the outlinks file lives beside it).",
+    ),
+    domain: str = typer.Option(
+        None,
+        "--domain",
+        "-d",
+        help="Break down one domain (and its subdomains) by first path segment, e.g. twitter.com.",
+    ),
+    top: int = typer.Option(20, "--top", "-n", help="Rows to print per table."),
+    output: Path = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Write links and linking posts per domain to this CSV.",
+    ),
+) -> None:
+    from . import io
+    from .outlinks import OUTLINKS_SUFFIX, LinkTable
+    from .token_store import side_path, store_base
+
+    links_path = side_path(store_base(index_path), OUTLINKS_SUFFIX)
+    if not links_path.exists():
+        _fail_if_errors([f"{links_path} not found; rebuild the index with `ingest index`."])
+    table = LinkTable.load(links_path)
+    links = table.domain_counts()
+    posts = table.domain_counts(distinct_posts=True)
+    typer.echo(f"{len(table):,} outbound links to {len(links):,} domains")
+
+    if domain:
+        heads = table.path_heads(domain)
+        total = len(table.rows(domain))
+        typer.echo(f"\n{domain}: {total:,} links from {len(table.posts(domain)):,} posts")
+        for head, count in heads.most_common(top):
+            typer.echo(f"  /{head:<40} {count:>6}")
+        counts = table.per_year(domain)
+    else:
+        typer.echo("")
+        for name, count in links.most_common(top):
+            typer.echo(f"  {name:<40} {count:>6} links {posts[name]:>6} posts")
+        counts = table.per_year()
+    typer.echo("\nLinks per year:")
+    for year in sorted(counts):
+        typer.echo(f"  {year} {counts[year]:>6}")
+
+    if output:
+        rows = (
+            {"domain": name, "links": count, "posts": posts[name]}
+            for name, count in links.most_common()
+        )
+        io.write_csv_rows(output, ["domain", "links", "posts"], rows)
+        typer.secho(f"Wrote {len(links)} domains to {output}", fg=typer.colors.GREEN)
+
+
+@stats_app.command("taxonomy", help="Category/tag co-occurrence, lift and era facts.")
+def stats_taxonomy(
+    metadata: Path = typer.Option(
+        paths.data_path("posts_metadata.csv"),
+        "--metadata",
+        "-m",
+        exists=True,
+        readable=True,
+        help="posts_metadata.csv from `ingest metadata`.",
+    ),
+    min_count: int = typer.Option(
+        10, "--min-count", help="Shared posts a pair needs before its lift is reported."
+    ),
+    top: int = typer.Option(10, "--top", "-n", help="Category pairs to print."),
+    eras: int = typer.Option(3, "--eras", help="Number of detected eras to compare."),
+    output: Path = typer.Option(
+        paths.data_path("taxonomy_facts.csv"),
+        "--output",
+        "-o",
+        help="Output CSV of taxonomy facts.",
+    ),
+) -> None:
+    from .taxonomy import TermMatrix, iter_taxonomy_facts
+    from .timeseries import PostingSeries
+
+    # The same changepoint eras as `stats rhythm` and the book figures.
+    spans = PostingSeries.from_metadata(metadata).eras(eras)
+    categories = TermMatrix.from_metadata(metadata, "categories")
+    tags = TermMatrix.from_metadata(metadata, "tags")
+    typer.echo(
+        f"{len(categories)} posts, {len(categories.terms)} categories, {len(tags.terms)} tags"
+    )
+    for pair in categories.pairs()[:top]:
+        typer.echo(
+            f"  {pair.a} + {pair.b}: {pair.count} posts, lift {pair.lift:.2f}, PMI {pair.pmi:.2f}"
+        )
+
+    typer.echo("Eras: " + ", ".join(f"{name} {a}–{b}" for name, a, b in spans))
+    count = _write_facts(output, iter_taxonomy_facts(categories, tags, spans, min_count))
+    typer.secho(f"Wrote {count} taxonomy facts to {output}", fg=typer.colors.GREEN)
+
+
+@stats_app.command("code", help="Code listings by language and year, from the index build.")
+def stats_code(
+    index_path: Path = typer.Option(
+        paths.data_path("johndcook_text_index.jsonl"),
+        "--index",
+        "-i",
+        exists=True,
+        readable=True,
+        help="Text index JSONL (the code blocks file lives beside it).",
+    ),
+    min_posts: int = typer.Option(
+        3, "--min-posts", help="Posts a language needs before it gets a fact."
+    ),
+    output: Path = typer.Option(
+        paths.data_path("code_facts.csv"),
+        "--output",
+        "-o",
+        help="Output CSV of code facts.",
+    ),
+) -> None:
+    from .code_blocks import CODE_SUFFIX, CodeTable, iter_code_facts
+    from .token_store import side_path, store_base
+
+    code_path = side_path(store_base(index_path), CODE_SUFFIX)
+    if not code_path.exists():
+        _fail_if_errors([f"{code_path} not found; rebuild the index with `ingest index`."])
+    table = CodeTable.load(code_path)
+    listings = table.listings()
+    typer.echo(
+        f"{len(listings):,} code listings in {len(table.blocks_per_post()):,} posts, "
+        f"{len(table) - len(listings):,} inline code spans"
+    )
+    for language, count in table.language_posts().most_common():
+        first, last = table.span(language)
+        typer.echo(f"  {language:<12} {count:>6} posts  {first}–{last}")
+
+    posts, titles = _index_posts(index_path)
+    count = _write_facts(output, iter_code_facts(table, titles, min_posts), posts)
+    typer.secho(f"Wrote {count} code facts to {output}", fg=typer.colors.GREEN)
+
+
+@stats_app.command("math", help="Math symbols, LaTeX commands and equations, from the index build.")
+def stats_math(
+    index_path: Path = typer.Option(
+        paths.data_path("johndcook_text_index.jsonl"),
+        "--index",
+        "-i",
+        exists=True,
+        readable=True,
+        help="Text index JSONL (the math counts file lives beside it).",
+    ),
+    top: int = typer.Option(10, "--top", "-n", help="Symbols and commands to print."),
+    output: Path = typer.Option(
+        paths.data_path("math_facts.csv"),
+        "--output",
+        "-o",
+        help="Output CSV of symbol and equation facts.",
+    ),
+) -> None:
+    from .math_index import EQUATION_KINDS, MATH_SUFFIX, MathTable, iter_math_facts
+    from .token_store import side_path, store_base
+
+    math_path = side_path(store_base(index_path), MATH_SUFFIX)
+    if not math_path.exists():
+        _fail_if_errors([f"{math_path} not found; rebuild the index with `ingest index`."])
+    table = MathTable.load(math_path)
+    equations = table.post_counts("equation")
+    typer.echo(
+        f"{len(table)} posts with math; equations in {len(table.posts('equation'))} posts ("
+        + ", ".join(f"{kind} {equations[kind]}" for kind in EQUATION_KINDS)
+        + ")"
+    )
+    for kind in ("symbol", "command"):
+        totals, posts = table.totals(kind), table.post_counts(kind)
+        typer.echo(f"\nTop {kind}s:")
+        for name, count in totals.most_common(top):
+            typer.echo(f"  {name:<12} {count:>6} uses {posts[name]:>6} posts")
+
+    posts, titles = _index_posts(index_path)
+    count = _write_facts(output, iter_math_facts(table, titles), posts)
+    typer.secho(f"Wrote {count} math facts to {output}", fg=typer.colors.GREEN)
+
+
+@stats_app.command("rhythm", help="Posting streaks, gaps, weekly cycle and detected eras.")
+def stats_rhythm(
+    metadata: Path = typer.Option(
+        paths.data_path("posts_metadata.csv"),
+        "--metadata",
+        "-m",
+        exists=True,
+        readable=True,
+        help="posts_metadata.csv from `ingest metadata`.",
+    ),
+    eras: int = typer.Option(3, "--eras", help="Number of eras to split the years into."),
+    output: Path = typer.Option(
+        paths.data_path("rhythm_facts.csv"),
+        "--output",
+        "-o",
+        help="Output CSV of posting-rhythm facts.",
+    ),
+) -> None:
+    from .timeseries import PostingSeries, iter_rhythm_facts
+
+    series = PostingSeries.from_metadata(metadata)
+    typer.echo(
+        f"{int(series.posts.sum())} posts over {len(series)} days "
+        f"({series.start} to {series.end}), {len(series.posting_days())} posting days"
+    )
+    changes = ", ".join(str(month) for month in series.changepoints("month", min_size=12))
+    typer.echo(f"Shifts in monthly output lasting a year or more: {changes or 'none'}")
+
+    count = _write_facts(output, iter_rhythm_facts(series, eras))
+    typer.secho(f"Wrote {count} rhythm facts to {output}", fg=typer.colors.GREEN)
+
+
+@stats_app.command("gsc", help="Search Console exports: concentration, CTR by rank, post traffic.")
+def stats_gsc(
+    exports: Path = typer.Option(
+        paths.data_path("gsc_exports"),
+        "--exports",
+        exists=True,
+        file_okay=False,
+        help="Directory of Search Console export folders (one per snapshot).",
+    ),
+    search_type: str = typer.Option("Search", "--type", help="Search or Discover."),
+    index_path: Path = typer.Option(
+        paths.data_path("johndcook_text_index.jsonl"),
+        "--index",
+        "-i",
+        exists=True,
+        readable=True,
+        help="Text index JSONL, to join page URLs to posts.",
+    ),
+    output: Path = typer.Option(
+        paths.data_path("gsc_facts.csv"),
+        "--output",
+        "-o",
+        help="Output CSV of Search Console facts.",
+    ),
+) -> None:
+    from .graph import PostUrls
+    from .gsc import Snapshots, iter_gsc_facts, per_post
+
+    snapshots = Snapshots.load(exports, search_type)
+    if not len(snapshots):
+        _fail_if_errors([f"No {search_type} exports found in {exports}."])
+    days, clicks, _ = snapshots.daily()
+    if len(days):
+        typer.echo(
+            f"{len(snapshots)} {search_type} snapshot(s); daily data {days[0]} to {days[-1]}, "
+            f"{int(clicks.sum()):,} clicks"
+        )
+    latest = snapshots.latest
+    posts, titles = _index_posts(index_path)
+    urls = PostUrls(
+        (post_id, rec.get("slug") or "", rec.get("link") or "") for post_id, rec in posts.items()
+    )
+    for name in ("Queries", "Pages"):
+        if name in latest:
+            table = latest[name]
+            typer.echo(
+                f"{name}: {len(table):,} rows, top 1 {table.top_share(1):.1%}, "
+                f"top 10 {table.top_share(10):.1%}, Gini {table.gini():.3f}"
+            )
+    if "Pages" in latest:
+        traffic = per_post(latest["Pages"], urls)
+        typer.echo(f"{len(traffic):,} posts among the exported pages")
+    if "Queries" in latest:
+        positions, ctr, shown = latest["Queries"].ctr_curve(10)
+        typer.echo("\nCTR by position (queries):")
+        for position, rate, impressions in zip(positions, ctr, shown):
+            if impressions:
+                typer.echo(f"  {position:>2} {rate:>7.2%} of {impressions:,} impressions")
+
+    count = _write_facts(output, iter_gsc_facts(latest, urls, titles), posts)
+    typer.secho(f"Wrote {count} Search Console facts to {output}", fg=typer.colors.GREEN)
+
+
+@stats_app.command("hn", help="Hacker News facts from `ingest hn` submissions.")
+def stats_hn(
+    submissions_path: Path = typer.Option(
+        paths.data_path("hn_submissions.jsonl"),
+        "--submissions",
+        "-s",
+        exists=True,
+        readable=True,
+        help="Submissions JSONL from `ingest hn`.",
+    ),
+    index_path: Path = typer.Option(
+        paths.data_path("johndcook_text_index.jsonl"),
+        "--index",
+        "-i",
+        exists=True,
+        readable=True,
+        help="Text index JSONL, for post titles and links.",
+    ),
+    top: int = typer.Option(10, "--top", "-n", help="Posts to print."),
+    output: Path = typer.Option(
+        paths.data_path("hn_dump_facts.csv"),
+        "--output",
+        "-o",
+        help="Output CSV of Hacker News facts.",
+    ),
+) -> None:
+    from .hn import iter_hn_facts, per_post, read_submissions
+
+    submissions = list(read_submissions(submissions_path))
+    table = per_post(submissions)
+    posts, titles = _index_posts(index_path)
+    typer.echo(f"{len(submissions):,} submissions, {len(table):,} posts")
+    for row in list(table.values())[:top]:
+        typer.echo(
+            f"  {row.points:>6} pts {row.comments:>5} comments {row.submissions:>3}x  "
+            f"{titles.get(row.post_id, row.post_id)}"
+        )
+
+    count = _write_facts(output, iter_hn_facts(submissions, table, titles), posts)
+    typer.secho(f"Wrote {count} Hacker News facts to {output}", fg=typer.colors.GREEN)
+
+
+@stats_app.command("quotes", help="Mine and rank quotable sentences from the posts.")
+def stats_quotes(
+    index_path: Path = typer.Option(
+        paths.data_path("johndcook_text_index.jsonl"),
+        "--index",
+        "-i",
+        exists=True,
+        readable=True,
+        help="Text index JSONL.",
+    ),
+    top: int = typer.Option(10, "--top", "-n", help="Quotes to print."),
+    per_post: int = typer.Option(2, "--per-post", help="Most quotes to keep from one post."),
+    output: Path = typer.Option(
+        paths.data_path("quote_candidates.csv"),
+        "--output",
+        "-o",
+        help="Output CSV of ranked quote candidates.",
+    ),
+    bot: int = typer.Option(0, "--bot", help="Add the top N quotes to the bot's facts."),
+    bot_facts: Path = typer.Option(
+        paths.BOT_DIR / "facts.json", "--bot-facts", help="Bot facts JSON to add quotes to."
+    ),
+) -> None:
+    import time
+
+    from . import io
+    from .quotes import mine_index, quote_fact
+
+    start = time.perf_counter()
+    quotes = mine_index(index_path, per_post=per_post or None)
+    typer.echo(f"{len(quotes):,} candidate quotes in {time.perf_counter() - start:.1f}s")
+    posts, _ = _index_posts(index_path)
+    rows = []
+    for rank, quote in enumerate(quotes, start=1):
+        rec = posts.get(quote.post_id, {})
+        rows.append(
+            {
+                "rank": rank,
+                "post_id": quote.post_id,
+                "date": quote.date,
+                "score": quote.score,
+                "words": quote.words,
+                "quote": quote.text,
+                "title": rec.get("title") or "",
+                "link": rec.get("link") or "",
+            }
+        )
+    for row in rows[:top]:
+        typer.echo(f"  {row['score']:>6.2f}  {row['quote']}")
+    io.write_csv_rows(output, list(rows[0]) if rows else ["rank"], rows)
+    typer.secho(f"Wrote {len(rows):,} quote candidates to {output}", fg=typer.colors.GREEN)
+
+    if bot:
+        facts = (
+            {
+                "type": "quote",
+                "text": quote_fact(quote, row["title"]),
+                "source_link": row["link"],
+                "slug": posts.get(quote.post_id, {}).get("slug") or "",
+            }
+            for quote, row in zip(quotes[:bot], rows)
+        )
+        added = bot_utils.add_facts(bot_facts, facts)
+        typer.secho(f"Added {added} quotes to {bot_facts}", fg=typer.colors.GREEN)
+
+
+@stats_app.command("topics", help="Fit an NMF topic model on TF-IDF of the token store.")
+def stats_topics(
+    index_path: Path = typer.Option(
+        paths.data_path("johndcook_text_index.jsonl"),
+        "--index",
+        "-i",
+        exists=True,
+        readable=True,
+        help="Text index JSONL (the token store lives beside it).",
+    ),
+    topics: int = typer.Option(12, "--topics", "-k", help="Number of topics."),
+    seed: int = typer.Option(0, "--seed", help="Random seed for the initial topics."),
+    batch_size: int = typer.Option(
+        0, "--batch-size", help="Posts per mini-batch (0 fits on all posts at once)."
+    ),
+    terms: int = typer.Option(8, "--terms", "-n", help="Top terms to print per topic."),
+    model_path: Path = typer.Option(
+        paths.data_path("topics.npz"), "--model", help="Where to save the fitted model."
+    ),
+    output: Path = typer.Option(
+        paths.data_path("topic_shares.csv"),
+        "--output",
+        "-o",
+        help="Output CSV of per-year topic shares.",
+    ),
+    weights_path: Path = typer.Option(
+        paths.data_path("post_topics.csv"), "--weights", help="Output CSV of per-post topic shares."
+    ),
+) -> None:
+    import time
+
+    from .token_store import TokenStore
+    from .topics import TopicModel
+
+    if not TokenStore.exists(index_path):
+        _fail_if_errors([f"{index_path} has no token store; rebuild it with `ingest index`."])
+    start = time.perf_counter()
+    model = TopicModel.from_index(
+        index_path, n_topics=topics, seed=seed, batch_size=batch_size or None
+    )
+    typer.echo(
+        f"{model.n_topics} topics over {len(model)} posts and {len(model.terms)} terms "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+    dominant = model.dominant()
+    for topic in range(model.n_topics):
+        posts = int((dominant == topic).sum())
+        typer.echo(f"  {topic:>2} {posts:>5} posts  {', '.join(model.top_terms(topic, terms))}")
+    model.save(model_path)
+
+    labels = model.labels()
+    years, shares = model.per_year()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["year", *labels])
+        for year, row in zip(years, shares):
+            writer.writerow([year, *(f"{share:.4f}" for share in row)])
+    weights_path.parent.mkdir(parents=True, exist_ok=True)
+    with weights_path.open("w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["id", "year", "topic", *labels])
+        for post_id, year, topic, row in zip(
+            model.post_ids.tolist(), model.years.tolist(), dominant.tolist(), model.shares()
+        ):
+            writer.writerow([post_id, year, topic, *(f"{share:.4f}" for share in row)])
+    typer.secho(
+        f"Wrote {model_path}, per-year shares to {output} and per-post shares to {weights_path}",
+        fg=typer.colors.GREEN,
+    )
+
+
+@app.command("search", help="Search posts (BM25) with phrases, OR and NOT/-word.")
+def search(
+    query: str = typer.Argument(..., help='Query, e.g. \'"golden ratio" OR fibonacci -prime\'.'),
+    limit: int = typer.Option(10, "--limit", "-n", help="Number of results to show."),
+    index_path: Path = typer.Option(
+        paths.data_path("johndcook_text_index.jsonl"),
+        "--index",
+        "-i",
+        exists=True,
+        readable=True,
+        help="Text index JSONL (search files live beside it).",
+    ),
+) -> None:
+    import time
+
+    from . import io
+    from .search import SearchIndex, build_search_index, search_index_exists
+
+    if not search_index_exists(index_path):
+        typer.secho("Search index missing; building it from the text index.", err=True)
+        build_search_index(index_path, io.read_jsonl(index_path))
+    start = time.perf_counter()
+    with SearchIndex(index_path) as index:
+        hits = index.search(query, limit=limit)
+        elapsed = (time.perf_counter() - start) * 1000
+        for rank, hit in enumerate(hits, start=1):
+            typer.secho(f"{rank:2d}. {hit.date[:10]}  {hit.title}", bold=True)
+            typer.echo(f"    {hit.link}")
+            typer.echo(f"    {hit.snippet}")
+    typer.secho(f"{len(hits)} results in {elapsed:.1f} ms", fg=typer.colors.GREEN, err=True)
+
+
 app.add_typer(calendar_app, name="calendar")
 app.add_typer(bot_app, name="bot")
 app.add_typer(ingest_app, name="ingest")
+app.add_typer(stats_app, name="stats")
 
 
 def main() -> None:
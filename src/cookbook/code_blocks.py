@@ -0,0 +1,357 @@
+"""Code blocks from blog posts, with a guessed language, as a precomputed table.
+
+The text index build collects every outermost ``<pre>`` and inline
+``<code>`` element once (see ``cookbook.html_extract.PostText``). It writes
+them beside the index as ``johndcook_text_index.code_blocks.jsonl``. Each
+row holds the post ID and date, the tag, the block's character offset in
+the post text, its line and character counts, a language label and the
+block text. JSONL is used rather than TSV because code contains tabs and
+newlines.
+
+``classify`` is a keyword heuristic. Each language has a few weighted
+regexes, and a block gets the label with the highest total score, or
+``"unknown"`` when nothing reaches ``MIN_SCORE``. Console output and
+tables of numbers are therefore ``"unknown"``. ``CodeTable`` answers the
+code-evolution questions (posts with Python code per year, the last post
+with Perl code, the longest listing) from the rows without reparsing the
+HTML.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Optional
+
+from . import io
+from .html_extract import CodeSpan
+from .token_store import IndexedPost, SideFileWriter, side_path, store_base
+
+CODE_SUFFIX = ".code_blocks.jsonl"
+UNKNOWN = "unknown"
+MIN_SCORE = 3
+
+_M = re.MULTILINE
+# (pattern, weight) per language; the first language listed wins a tie.
+FEATURES: dict[str, tuple[tuple[str, int], ...]] = {
+    "Python": (
+        (r"^\s*(?:from\s+[\w.]+\s+)?import\s+(?:\*|[\w.]+(?:\s+as\s+\w+)?(?:,\s*\w+)*)\s*$", 3),
+        (r"^\s*def\s+\w+\(.*\)\s*:", 3),
+        (r"^\s*>>> ", 3),
+        (r"\bprint\(", 1),
+        (r"\b(?:np|plt|scipy|sympy|mpmath)\.\w", 3),
+        (r"^\s*(?:el)?if\s.*:\s*$", 1),
+        (r"^\s*for\s+\w+(?:,\s*\w+)*\s+in\s+.+:\s*$", 2),
+        (r"\b(?:None|True|False|elif|lambda)\b", 1),
+        (r"\brange\(", 1),
+    ),
+    "Mathematica": (
+        (
+            r"\b(?:Plot|Table|Solve|NSolve|Integrate|NIntegrate|Simplify|FullSimplify|Series"
+            r"|Module|Entity|Sum|Limit|Expand|Factor|FindRoot|ListPlot|Manipulate)\[",
+            3,
+        ),
+        (r"\b[A-Z][a-zA-Z]+\[[^\]\n]*\]", 1),
+        (r"\[\[", 1),
+        (r"\b\w+_\s*[\],:]", 2),
+        (r"\bIn\[\d+\]:=", 4),
+        (r"\b[A-Z]\w+\s*->\s*\"", 2),
+        (r"#\[\"|&\s*[\],]", 2),
+    ),
+    "PowerShell": (
+        (r"\b(?:Get|Set|New|Select|Where|ForEach|Write|Remove|Invoke)-[A-Z]\w+", 4),
+        (r"\s-(?:eq|ne|ge|le|gt|lt|match|like|contains)\s", 3),
+        (r"\$_\.", 2),
+        (r"^\s*\$\w+\s*=", 1),
+        (r"^PS [A-Z]:\\", 4),
+        (r"\$(?:env:|pwd\b|host\.)", 3),
+    ),
+    "C++": (
+        (r"\bstd::", 4),
+        (r"\bcout\s*<<", 4),
+        (r"#include\s*<(?:iostream|vector|string|cmath|map|algorithm|random)>", 4),
+        (r"\btemplate\s*<", 3),
+        (r"\bnamespace\s+\w+", 2),
+    ),
+    "C": (
+        (r"#include\s*[<\"]", 3),
+        (r"\bint\s+main\s*\(", 2),
+        (r"\bprintf\s*\(", 2),
+        (r"\b(?:malloc|sizeof)\s*\(", 2),
+        (r"\b(?:int|double|float|void|unsigned|long)\s+\**\w+\s*(?:\(|=|;)", 1),
+        (r";\s*$", 1),
+    ),
+    "C#": (
+        (r"\busing\s+System\b", 5),
+        (r"\bConsole\.Write", 4),
+        (r"\b(?:public|private|static)\s+(?:static\s+)?(?:double|int|void|string)\s+\w+\(", 2),
+    ),
+    "Perl": (
+        (r"\bmy\s+[$@%]", 3),
+        (r"=~\s*(?:s|m|tr)?/", 3),
+        (r"^#!.*\bperl\b", 5),
+        (r"\buse\s+(?:strict|warnings)\b", 3),
+        (r"\$_\b", 1),
+        (r"\bsub\s+\w+\s*\{", 2),
+        (r"^\s*perl\s+-\w", 4),
+    ),
+    "R": (
+        (r"\w\s*<-\s*(?:\w|c\()", 2),
+        (r"\blibrary\(\w+\)", 3),
+        (r"\b(?:rnorm|runif|dnorm|pnorm|qnorm|rbinom|data\.frame|sapply|lapply)\(", 3),
+        (r"\bc\(\s*[\d\"']", 2),
+    ),
+    "Haskell": (
+        (r"^\s*\w+\s*::\s*[A-Z\[(a-z]", 3),
+        (r"\bimport\s+(?:qualified\s+)?Data\.", 4),
+        (r"^\s*(?:main\s*=\s*do|where)\b", 2),
+        (r"\b(?:foldr|foldl|zipWith|putStrLn)\b", 2),
+    ),
+    "Lisp": (
+        (r"^\s*\((?:defun|define|defvar|setq|let\*?|lambda|require|global-set-key)\b", 4),
+        (r"\)\)\)", 1),
+    ),
+    "JavaScript": (
+        (r"\b(?:var|let|const)\s+\w+\s*=", 2),
+        (r"\bconsole\.log\(", 4),
+        (r"\bdocument\.\w+", 3),
+        (r"\bfunction\s*\w*\s*\([^)]*\)\s*\{", 2),
+    ),
+    "SQL": (
+        (r"\bSELECT\b[\s\S]+?\bFROM\b", 4),
+        (r"\b(?:INSERT INTO|CREATE TABLE|GROUP BY|ORDER BY|WHERE)\b", 2),
+    ),
+    "LaTeX": (
+        (r"\\(?:begin|end)\{\w+\*?\}", 4),
+        (r"\\(?:frac|sum|int|sqrt|alpha|beta|gamma|left|right|mathbb|usepackage)\b", 2),
+    ),
+    "Shell": (
+        (r"^#!/(?:usr/)?bin/(?:env\s+)?(?:ba|z)?sh\b", 5),
+        (r"^\s*\$ \w", 3),
+        (r"\|\s*(?:grep|sort|uniq|awk|sed|wc|head|tail|xargs|cut|tr)\b", 3),
+        (r"^\s*(?:echo|export|sudo|cd|ls|grep|find|curl|wget)\s", 1),
+    ),
+    "MATLAB": (
+        (r"^\s*function\s+(?:\[[^\]]*\]|\w+)\s*=\s*\w+\(", 4),
+        (r"\b(?:zeros|ones|linspace|disp|fprintf|numel)\(", 1),
+        (r"\w\.(?:\*|\^|/)", 2),
+        (r"^\s*%", 1),
+    ),
+    "Fortran": (
+        (r"(?im)^\s*(?:program|subroutine|module)\s+\w+\s*$", 4),
+        (r"(?i)\bimplicit\s+none\b", 5),
+        (r"(?i)\b(?:real|integer)(?:\*\d|\s*\(\w+\))?\s*::", 3),
+    ),
+    "Julia": (
+        (r"^\s*using\s+[A-Z]\w+", 2),
+        (r"\bprintln\(", 2),
+        (r"^\s*end\s*$", 1),
+        (r"\bfunction\s+\w+\(", 1),
+    ),
+    "Rust": (
+        (r"\bfn\s+\w+\s*[<(]", 3),
+        (r"\blet\s+mut\b", 4),
+        (r"\bprintln!\(", 4),
+    ),
+}
+_COMPILED = {
+    language: tuple((re.compile(pattern, _M), weight) for pattern, weight in features)
+    for language, features in FEATURES.items()
+}
+LANGUAGES = tuple(FEATURES)
+
+
+def score(text: str) -> dict[str, int]:
+    """Heuristic score per language; a matched feature counts once."""
+    return {
+        language: sum(weight for pattern, weight in features if pattern.search(text))
+        for language, features in _COMPILED.items()
+    }
+
+
+def classify(text: str, min_score: int = MIN_SCORE) -> str:
+    """The best-scoring language for a code block, or ``UNKNOWN``."""
+    scores = score(text)
+    best = max(scores, key=scores.__getitem__)
+    return best if scores[best] >= min_score else UNKNOWN
+
+
+def count_lines(text: str) -> int:
+    """Non-blank lines in a block, ignoring leading and trailing blank lines."""
+    return sum(1 for line in text.splitlines() if line.strip())
+
+
+@dataclass(slots=True)
+class CodeBlock:
+    post_id: int
+    date: str
+    tag: str  # "pre" for listings, "code" for inline code outside a <pre>
+    offset: int
+    lines: int
+    chars: int
+    language: str
+    text: str
+
+    @classmethod
+    def from_span(cls, post_id: int, date: str, span: CodeSpan) -> CodeBlock:
+        text = span.text.strip("\r\n")
+        return cls(
+            int(post_id),
+            date,
+            span.tag,
+            span.offset,
+            count_lines(text),
+            len(text),
+            classify(text),
+            text,
+        )
+
+    @property
+    def year(self) -> str:
+        return self.date[:4]
+
+
+class CodeWriter(SideFileWriter):
+    """Write each post's code blocks beside a text index while it is built."""
+
+    SUFFIX = CODE_SUFFIX
+
+    def _open(self) -> IO[bytes]:
+        return io.open_binary(self.path, "wb")
+
+    def add(self, post_id: int, date: str, spans: Iterable[CodeSpan]) -> None:
+        for span in spans:
+            self._fh.write(io.dumps(asdict(CodeBlock.from_span(post_id, date, span))) + b"\n")
+
+    def add_post(self, post: IndexedPost) -> None:
+        self.add(post.id, post.date, post.page.code_blocks)
+
+
+def read_code_blocks(path: Path) -> Iterator[CodeBlock]:
+    for row in io.read_jsonl(path):
+        yield CodeBlock(**row)
+
+
+class CodeTable:
+    """The code blocks of the blog, in post order, grouped by language."""
+
+    def __init__(self, blocks: Iterable[CodeBlock]) -> None:
+        self.blocks = list(blocks)
+        self.by_language: dict[str, list[CodeBlock]] = {}
+        for block in self.blocks:
+            self.by_language.setdefault(block.language, []).append(block)
+
+    @classmethod
+    def load(cls, path: Path) -> CodeTable:
+        return cls(read_code_blocks(path))
+
+    @classmethod
+    def from_index(cls, index_path: Path) -> CodeTable:
+        return cls.load(side_path(store_base(index_path), CODE_SUFFIX))
+
+    @classmethod
+    def from_spans(cls, posts: Iterable[tuple[int, str, Iterable[CodeSpan]]]) -> CodeTable:
+        """From ``(post_id, date, spans)`` triples, e.g. when no index has been built."""
+        return cls(
+            CodeBlock.from_span(post_id, date, span)
+            for post_id, date, spans in posts
+            for span in spans
+        )
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def listings(self, language: Optional[str] = None) -> list[CodeBlock]:
+        """``<pre>`` blocks, optionally only those in ``language``."""
+        blocks = self.by_language.get(language, []) if language else self.blocks
+        return [b for b in blocks if b.tag == "pre"]
+
+    def language_posts(self, include_inline: bool = False) -> Counter:
+        """Distinct posts with code in each language (``UNKNOWN`` left out)."""
+        counts = Counter()
+        for language, blocks in self.by_language.items():
+            posts = {b.post_id for b in blocks if include_inline or b.tag == "pre"}
+            if language != UNKNOWN and posts:
+                counts[language] = len(posts)
+        return counts
+
+    def per_year(self, language: str, include_inline: bool = False) -> Counter:
+        """Distinct posts per year with code in ``language``."""
+        posts = {
+            (b.year, b.post_id)
+            for b in self.by_language.get(language, [])
+            if include_inline or b.tag == "pre"
+        }
+        return Counter(year for year, _ in posts)
+
+    def span(self, language: str) -> Optional[tuple[str, str]]:
+        """First and last year with a ``language`` listing."""
+        years = sorted(b.year for b in self.listings(language))
+        return (years[0], years[-1]) if years else None
+
+    def blocks_per_post(self) -> Counter:
+        """``<pre>`` blocks per post ID."""
+        return Counter(b.post_id for b in self.listings())
+
+    def longest_per_post(self) -> dict[int, CodeBlock]:
+        """The longest ``<pre>`` block (by characters) of each post."""
+        longest: dict[int, CodeBlock] = {}
+        for block in self.listings():
+            best = longest.get(block.post_id)
+            if best is None or block.chars > best.chars:
+                longest[block.post_id] = block
+        return longest
+
+
+def iter_code_facts(table: CodeTable, titles: dict[int, str], min_posts: int = 3) -> Iterator[dict]:
+    """Yield code-evolution facts; each has ``post_id`` where it is about one post."""
+    counts = table.language_posts()
+    for language, posts in counts.most_common():
+        if posts < min_posts:
+            break
+        first, last = table.span(language)
+        per_year = table.per_year(language)
+        peak = max(sorted(per_year), key=per_year.__getitem__)
+        yield {
+            "type": "code",
+            "fact": f"{language} code listings appear in {posts} posts, from {first} to {last}, "
+            f"most often in {peak} ({per_year[peak]} posts).",
+        }
+    languages = [language for language, posts in counts.most_common(2)]
+    if len(languages) == 2 and all(counts[lang] >= min_posts for lang in languages):
+        spans = {lang: table.span(lang) for lang in languages}
+        old, new = sorted(languages, key=lambda lang: spans[lang])
+        old_years, new_years = table.per_year(old), table.per_year(new)
+        # The first year after which every year has more posts with the newer language.
+        crossed = None
+        for year in sorted(set(old_years) | set(new_years), reverse=True):
+            if new_years[year] <= old_years[year]:
+                break
+            crossed = year
+        if crossed and crossed > spans[old][0]:
+            yield {
+                "type": "code",
+                "fact": f"From {crossed} on, more posts carry {new} listings than {old} ones; "
+                f"{old} code first appeared in {spans[old][0]}, {new} code in {spans[new][0]}.",
+            }
+    per_post = table.blocks_per_post()
+    if per_post:
+        post_id, count = per_post.most_common(1)[0]
+        yield {
+            "type": "code",
+            "fact": f"“{titles.get(post_id, post_id)}” has more code listings than any other "
+            f"post: {count}.",
+            "post_id": post_id,
+        }
+    listings = table.listings()
+    if listings:
+        longest = max(listings, key=lambda b: b.lines)
+        label = "" if longest.language == UNKNOWN else f" {longest.language}"
+        yield {
+            "type": "code",
+            "fact": f"The longest{label} listing on the blog runs to {longest.lines} lines, "
+            f"in “{titles.get(longest.post_id, longest.post_id)}”.",
+            "post_id": longest.post_id,
+        }
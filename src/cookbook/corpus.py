@@ -0,0 +1,78 @@
+"""Corpus-level indexes shared by the fact generators.
+
+Indexes here are built once per run from the loaded posts and then queried
+by every fact family, instead of each generator rescanning the post list.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Hashable, Iterable
+
+MonthDay = tuple[int, int]
+YearMonthDay = tuple[int, int, int]
+
+
+class DateIndex:
+    """Lookup of post IDs by calendar day, with and without the year.
+
+    Build it from ``(post_id, datetime)`` pairs. Every lookup is a dict access
+    and returns post IDs in publication order (ties broken by ID).
+    """
+
+    __slots__ = ("_by_month_day", "_by_date", "_dates")
+
+    def __init__(self) -> None:
+        self._by_month_day: dict[MonthDay, list[Hashable]] = {}
+        self._by_date: dict[YearMonthDay, list[Hashable]] = {}
+        self._dates: dict[Hashable, datetime] = {}
+
+    @classmethod
+    def build(cls, items: Iterable[tuple[Hashable, datetime]]) -> DateIndex:
+        index = cls()
+        by_month_day: dict[MonthDay, list[tuple[datetime, Hashable]]] = defaultdict(list)
+        by_date: dict[YearMonthDay, list[tuple[datetime, Hashable]]] = defaultdict(list)
+        for post_id, dt in items:
+            index._dates[post_id] = dt
+            by_month_day[(dt.month, dt.day)].append((dt, post_id))
+            by_date[(dt.year, dt.month, dt.day)].append((dt, post_id))
+        index._by_month_day = {k: _ordered_ids(v) for k, v in sorted(by_month_day.items())}
+        index._by_date = {k: _ordered_ids(v) for k, v in sorted(by_date.items())}
+        return index
+
+    def __len__(self) -> int:
+        return len(self._dates)
+
+    def date_of(self, post_id: Hashable) -> datetime:
+        return self._dates[post_id]
+
+    def on_this_day(self, month: int, day: int) -> list[Hashable]:
+        """Post IDs published on ``month``/``day`` in any year."""
+        return self._by_month_day.get((month, day), [])
+
+    def on_date(self, year: int, month: int, day: int) -> list[Hashable]:
+        """Post IDs published on one exact date."""
+        return self._by_date.get((year, month, day), [])
+
+    def anniversaries(self, post_id: Hashable, years_ago: int) -> list[Hashable]:
+        """Post IDs published exactly ``years_ago`` years before ``post_id``."""
+        dt = self._dates[post_id]
+        return self.on_date(dt.year - years_ago, dt.month, dt.day)
+
+    def month_days(self) -> list[MonthDay]:
+        """Every ``(month, day)`` with at least one post, in calendar order."""
+        return list(self._by_month_day)
+
+    def month_day_counts(self) -> dict[MonthDay, int]:
+        """Number of posts per ``(month, day)``, in calendar order."""
+        return {k: len(v) for k, v in self._by_month_day.items()}
+
+    def days(self) -> list[date]:
+        """Every distinct publication date, ascending."""
+        return [date(y, m, d) for (y, m, d) in self._by_date]
+
+
+def _ordered_ids(entries: list[tuple[datetime, Hashable]]) -> list[Hashable]:
+    entries.sort(key=lambda e: (e[0], e[1]))
+    return [post_id for _, post_id in entries]
@@ -0,0 +1,84 @@
+"""Sparse post × key count tables loaded from the side files of a text index.
+
+``cookbook.entities.EntityMatrix`` (entity names) and
+``cookbook.math_index.MathTable`` (``(kind, name)`` pairs) both load rows of
+post ID, date, key and count into a SciPy CSR matrix with one row per post
+that has any count. ``CountTable`` holds that matrix with the post IDs,
+dates and years of its rows and does the shared aggregation by year.
+"""
+
+from __future__ import annotations
+
+from typing import Hashable, Iterable, Optional
+
+
+def _np_sparse():
+    try:
+        import numpy as np
+        from scipy import sparse
+    except ImportError as e:
+        raise ImportError(
+            "NumPy and SciPy are required for count tables (EntityMatrix, MathTable). "
+            "Install with: pip install -e .[analysis]"
+        ) from e
+    return np, sparse
+
+
+def build_counts(
+    rows: Iterable[tuple[int, str, Hashable, int]], keys: Optional[Iterable[Hashable]] = None
+):
+    """``(keys, matrix, post_ids, dates)`` from ``(post_id, date, key, count)`` rows.
+
+    With ``keys`` the columns are fixed and rows for other keys are dropped;
+    without, columns are the keys in first-seen order.
+    """
+    np, sparse = _np_sparse()
+    fixed = keys is not None
+    columns = {key: j for j, key in enumerate(keys or ())}
+    post_rows: dict[int, int] = {}
+    dates: list[str] = []
+    r, c, v = [], [], []
+    for post_id, date, key, count in rows:
+        j = columns.get(key) if fixed else columns.setdefault(key, len(columns))
+        if j is None:
+            continue
+        if post_id not in post_rows:
+            post_rows[post_id] = len(post_rows)
+            dates.append(date)
+        r.append(post_rows[post_id])
+        c.append(j)
+        v.append(count)
+    matrix = sparse.csr_matrix(
+        (np.array(v, dtype=np.int32), (np.array(r, dtype=np.int64), np.array(c, np.int64))),
+        shape=(len(post_rows), len(columns)),
+    )
+    post_ids = np.fromiter(post_rows, dtype=np.int64, count=len(post_rows))
+    return list(columns), matrix, post_ids, dates
+
+
+class CountTable:
+    """Sparse post × key counts; rows are posts with at least one count."""
+
+    def __init__(self, keys: list, matrix, post_ids, dates: list[str]) -> None:
+        np, _ = _np_sparse()
+        self.keys = keys
+        self.index = {key: j for j, key in enumerate(keys)}
+        self.matrix = matrix  # CSR int32, posts × keys
+        self.post_ids = post_ids
+        self.dates = dates
+        self.years = np.array([int(d[:4]) if d[:4].isdigit() else 0 for d in dates], np.int32)
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def posts_by_year(self, columns: list[int], years: Iterable[int]):
+        """``len(columns) × len(years)`` array of posts with a nonzero count per year."""
+        np, sparse = _np_sparse()
+        lookup = {int(year): i for i, year in enumerate(years)}
+        slot = np.array([lookup.get(int(year), -1) for year in self.years], dtype=np.int64)
+        keep = np.flatnonzero(slot >= 0)
+        year_rows = sparse.csr_matrix(
+            (np.ones(len(keep), dtype=np.int32), (slot[keep], keep)), shape=(len(lookup), len(self))
+        )
+        present = self.matrix[:, columns] > 0
+        return (year_rows @ present.astype(np.int32)).toarray().T
@@ -0,0 +1,316 @@
+"""Mentions of named entities (mathematicians, languages, constants, ...) per post.
+
+``ENTITIES`` is a curated dictionary: each entity has a kind, a canonical
+name and its aliases (``Erdős``/``Erdos``, ``C++``, ``Runge-Kutta``).
+``EntityMatcher`` compiles every alias into one regular expression, factored
+as a trie so shared prefixes are tried once, and counts matches per entity
+in a single pass. Aliases match case-insensitively on word boundaries,
+except those listed as ``exact``, which must match case too: acronyms such
+as ``RSA`` and names that are also common words (``Hardy``, ``Ruby``).
+Symbols, Greek letters included, need no boundary, so ``2π`` counts as π.
+Overlapping aliases resolve to the longest match
+at a position, so ``Fourier transform`` counts as the transform and not as
+Fourier himself.
+
+The text index build runs the matcher over each post's title and plain
+text and writes the counts beside the index as
+``johndcook_text_index.entities.tsv``: post ID, date, entity, count. That
+part needs nothing beyond the standard library. ``EntityMatrix`` loads the
+file as a SciPy CSR post × entity count matrix, and figures and facts
+aggregate it by year or era with NumPy instead of rescanning text.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from .count_table import CountTable, _np_sparse, build_counts
+from .token_store import IndexedPost, SideFileWriter, side_path, store_base
+
+ENTITIES_SUFFIX = ".entities.tsv"
+KINDS = ("mathematician", "constant", "function", "language", "crypto")
+
+
+@dataclass(frozen=True, slots=True)
+class Entity:
+    name: str
+    kind: str  # one of KINDS
+    aliases: tuple[str, ...] = ()  # case-insensitive
+    exact: tuple[str, ...] = ()  # case-sensitive
+    match_name: bool = True  # False for names too ambiguous to match alone ("R", "e")
+
+
+# Mathematicians matched by surname alone.
+SURNAMES = """
+Euler Gauss Riemann Ramanujan Knuth Feynman Newton Leibniz Fermat Cauchy Laplace
+Fourier Hilbert Turing Shannon Kolmogorov Bayes Chebyshev Markov Poisson Weierstrass
+Cantor Littlewood Wiener Mandelbrot Archimedes Euclid Pythagoras Fibonacci
+Pascal Lagrange Legendre Galois Jacobi Dirichlet Bessel Hamming Grothendieck Noether
+Conway Wolfram Kahan Dijkstra
+""".split()
+
+ENTITIES: tuple[Entity, ...] = (
+    *(Entity(name, "mathematician") for name in SURNAMES),
+    Entity("Erdős", "mathematician", ("Erdos", "Erdös")),
+    Entity("Gödel", "mathematician", ("Godel", "Goedel")),
+    Entity("Poincaré", "mathematician", ("Poincare",)),
+    Entity("von Neumann", "mathematician"),
+    Entity("Bernoulli", "mathematician", ("Bernoullis",)),
+    Entity("Hardy", "mathematician", ("G. H. Hardy",), exact=("Hardy",)),
+    Entity("Fisher", "mathematician", ("R. A. Fisher", "Ronald Fisher")),
+    Entity("Gosset", "mathematician", ("Student's t",)),
+    Entity("Pi", "constant", ("π",)),
+    Entity("e", "constant", ("Euler's number", "exp(1)"), match_name=False),
+    Entity("Golden ratio", "constant", ("golden mean",)),
+    Entity("Euler-Mascheroni constant", "constant", ("Euler's constant", "Euler-Mascheroni")),
+    Entity("Square root of 2", "constant", ("√2", "sqrt(2)", "root 2")),
+    Entity("Square root of 3", "constant", ("√3", "sqrt(3)", "root 3")),
+    Entity("Natural log of 2", "constant", ("ln(2)", "ln 2")),
+    Entity("Catalan's constant", "constant"),
+    Entity("Feigenbaum constant", "constant", ("Feigenbaum constants",)),
+    Entity("Gamma function", "function", ("gamma functions", "Γ function")),
+    Entity("Zeta function", "function", ("zeta functions", "Riemann zeta", "ζ function")),
+    Entity("Bessel functions", "function", ("Bessel function",)),
+    Entity("Fourier transform", "function", ("Fourier transforms", "Fourier series", "FFT")),
+    Entity("Laplace transform", "function", ("Laplace transforms",)),
+    Entity("Beta function", "function", ("beta functions",)),
+    Entity("Error function", "function", ("erf", "erfc")),
+    Entity("Elliptic integrals", "function", ("elliptic integral",)),
+    Entity("Hypergeometric functions", "function", ("hypergeometric function",)),
+    Entity("Runge-Kutta", "function", ("Runge Kutta",)),
+    Entity("Python", "language"),
+    Entity(
+        "R",
+        "language",
+        ("R language", "R programming"),
+        exact=("R code", "R package"),
+        match_name=False,
+    ),
+    Entity("Mathematica", "language", ("Wolfram Language",)),
+    Entity("MATLAB", "language", ("GNU Octave",), exact=("Octave",)),
+    Entity("Fortran", "language"),
+    Entity("C++", "language"),
+    Entity("C#", "language"),
+    Entity("Haskell", "language"),
+    Entity("Lisp", "language", ("Common Lisp",)),
+    Entity("Scheme", "language", exact=("Scheme",)),
+    Entity("Julia", "language", ("Julia language", "JuliaLang"), match_name=False),
+    Entity("Perl", "language"),
+    Entity("Ruby", "language", exact=("Ruby",)),
+    Entity("JavaScript", "language"),
+    Entity("PowerShell", "language"),
+    Entity("Bash", "language", exact=("Bash", "bash script", "bash shell")),
+    Entity("Rust", "language", exact=("Rust",)),
+    Entity("SQL", "language", exact=("SQL",)),
+    Entity("awk", "language", exact=("awk", "AWK")),
+    Entity("LaTeX", "language", ("TeX",)),
+    Entity("SciPy", "language"),
+    Entity("SymPy", "language"),
+    Entity("Emacs", "language"),
+    Entity("RSA", "crypto", exact=("RSA",)),
+    Entity("AES", "crypto", ("Advanced Encryption Standard",), exact=("AES",)),
+    Entity("Elliptic curve cryptography", "crypto", ("elliptic curve", "elliptic curves", "ECC")),
+    Entity("Diffie-Hellman", "crypto", ("Diffie Hellman",)),
+    Entity("Bitcoin", "crypto"),
+    Entity("Monero", "crypto"),
+    Entity("Ethereum", "crypto"),
+    Entity("SHA-256", "crypto", ("SHA256", "SHA-2")),
+    Entity("Cryptocurrency", "crypto", ("cryptocurrencies",)),
+    Entity("Post-quantum cryptography", "crypto", ("post-quantum",)),
+)
+
+# Typographic apostrophes and en dashes are folded before matching.
+_FOLD = str.maketrans({"’": "'", "‘": "'", "–": "-"})
+# Word characters that take a \b boundary. Greek letters are symbols, so "2π" counts as π.
+_WORD = re.compile(r"(?![\u0370-\u03ff])\w")
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """A regex matching any of ``words``, longest first, with shared prefixes factored."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = word
+
+    def emit(node: dict) -> str:
+        branches = []
+        for ch in sorted(k for k in node if k):
+            branches.append(re.escape(ch) + emit(node[ch]))
+        if "" in node:
+            # Word-final aliases need a boundary; the empty branch goes last so longer wins.
+            branches.append(r"\b" if _WORD.match(node[""][-1]) else "")
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return emit(trie)
+
+
+class EntityMatcher:
+    """Count mentions of every entity in a text with one compiled regex."""
+
+    def __init__(self, entities: Iterable[Entity] = ENTITIES) -> None:
+        self.entities = list(entities)
+        # alias folded to lower case -> [(alias, entity name, exact)]
+        self._aliases: dict[str, list[tuple[str, str, bool]]] = {}
+        for entity in self.entities:
+            names = (entity.name,) if entity.match_name else ()
+            for alias in dict.fromkeys((*names, *entity.aliases)):
+                if alias not in entity.exact:
+                    self._add(alias, entity.name, False)
+            for alias in entity.exact:
+                self._add(alias, entity.name, True)
+        words = {alias for options in self._aliases.values() for alias, _, _ in options}
+        symbols = [w for w in words if not _WORD.match(w)]
+        pattern = r"\b" + _trie_pattern(w for w in words if _WORD.match(w))
+        if symbols:
+            pattern += "|" + _trie_pattern(symbols)
+        self._regex = re.compile(pattern, re.IGNORECASE)
+
+    def _add(self, alias: str, name: str, exact: bool) -> None:
+        alias = alias.translate(_FOLD)
+        options = self._aliases.setdefault(alias.lower(), [])
+        if (alias, name, exact) not in options:
+            # Exact aliases are checked first, so "Scheme" beats a case-insensitive "scheme".
+            options.insert(0 if exact else len(options), (alias, name, exact))
+
+    def _resolve(self, text: str) -> Optional[str]:
+        for alias, name, exact in self._aliases.get(text.lower(), ()):
+            if not exact or text == alias:
+                return name
+        return None
+
+    def finditer(self, text: str) -> Iterator[tuple[str, int, int]]:
+        """Yield ``(entity name, start, end)`` for each mention in ``text``."""
+        for match in self._regex.finditer(text.translate(_FOLD)):
+            name = self._resolve(match.group())
+            if name is not None:
+                yield name, match.start(), match.end()
+
+    def count(self, text: str) -> Counter:
+        """Mentions per entity name."""
+        return Counter(name for name, _, _ in self.finditer(text))
+
+
+_DEFAULT_MATCHER: Optional[EntityMatcher] = None
+
+
+def default_matcher() -> EntityMatcher:
+    global _DEFAULT_MATCHER
+    if _DEFAULT_MATCHER is None:
+        _DEFAULT_MATCHER = EntityMatcher()
+    return _DEFAULT_MATCHER
+
+
+class EntitiesWriter(SideFileWriter):
+    """Write entity mention counts beside a text index while it is built."""
+
+    SUFFIX = ENTITIES_SUFFIX
+
+    def __init__(self, base: Path, matcher: Optional[EntityMatcher] = None) -> None:
+        self.matcher = matcher or default_matcher()
+        super().__init__(base)
+
+    def add(self, post_id: int, date: str, text: str) -> None:
+        for name, count in self.matcher.count(text).items():
+            self._fh.write(f"{int(post_id)}\t{date}\t{name}\t{count}\n")
+
+    def add_post(self, post: IndexedPost) -> None:
+        self.add(post.id, post.date, f"{post.title}\n{post.text}")
+
+
+def read_entities(path: Path) -> Iterator[tuple[int, str, str, int]]:
+    """Yield ``(post_id, date, entity, count)`` rows from an ``.entities.tsv`` file."""
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            post_id, date, name, count = line.rstrip("\n").split("\t")
+            yield int(post_id), date, name, int(count)
+
+
+class EntityMatrix(CountTable):
+    """Sparse post × entity mention counts; rows are posts with at least one mention."""
+
+    def __init__(self, entities: list[Entity], matrix, post_ids, dates: list[str]) -> None:
+        super().__init__([entity.name for entity in entities], matrix, post_ids, dates)
+        self.entities = entities
+
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[tuple[int, str, str, int]], entities: Iterable[Entity] = ENTITIES
+    ) -> EntityMatrix:
+        """Build from ``(post_id, date, entity, count)`` rows; unknown entities are dropped."""
+        entities = list(entities)
+        _, matrix, post_ids, dates = build_counts(rows, [entity.name for entity in entities])
+        return cls(entities, matrix, post_ids, dates)
+
+    @classmethod
+    def from_texts(
+        cls, posts: Iterable[tuple[int, str, str]], matcher: Optional[EntityMatcher] = None
+    ) -> EntityMatrix:
+        """Match ``(post_id, date, text)`` directly, for callers without a text index."""
+        matcher = matcher or default_matcher()
+        rows = (
+            (post_id, date, name, count)
+            for post_id, date, text in posts
+            for name, count in matcher.count(text).items()
+        )
+        return cls.from_rows(rows, matcher.entities)
+
+    @classmethod
+    def load(cls, path: Path) -> EntityMatrix:
+        return cls.from_rows(read_entities(path))
+
+    @classmethod
+    def from_index(cls, index_path: Path) -> EntityMatrix:
+        return cls.load(side_path(store_base(index_path), ENTITIES_SUFFIX))
+
+    def names(self, kind: Optional[str] = None) -> list[str]:
+        return [e.name for e in self.entities if kind is None or e.kind == kind]
+
+    def _columns(self, names: Iterable[str]) -> list[int]:
+        return [self.index[name] for name in names]
+
+    def mentions(self):
+        """Total mentions per entity, in column order."""
+        np, _ = _np_sparse()
+        return np.asarray(self.matrix.sum(axis=0)).ravel()
+
+    def post_counts(self):
+        """Posts mentioning each entity, in column order."""
+        return self.matrix.getnnz(axis=0)
+
+    def posts(self, name: str) -> list[int]:
+        """IDs of the posts mentioning ``name``, in index order."""
+        column = self.matrix[:, self.index[name]]
+        return self.post_ids[column.nonzero()[0]].tolist()
+
+    def post_dates(self, name: str) -> list[str]:
+        column = self.matrix[:, self.index[name]]
+        return [self.dates[i] for i in column.nonzero()[0]]
+
+    def by_year(self, names: Iterable[str], years: Iterable[int]):
+        """``len(names) × len(years)`` array of posts mentioning each entity per year."""
+        return self.posts_by_year(self._columns(names), years)
+
+    def by_era(self, names: Iterable[str], eras):
+        """``len(names) × len(eras)`` array of posts per ``(label, start, end)`` era."""
+        np, _ = _np_sparse()
+        present = self.matrix[:, self._columns(names)] > 0
+        columns = []
+        for _, start, end in eras:
+            rows = (self.years >= start) & (self.years <= end)
+            columns.append(np.asarray(present[rows].sum(axis=0)).ravel())
+        return np.column_stack(columns)
+
+    def span(self, name: str) -> Optional[tuple[int, int]]:
+        """First and last year ``name`` is mentioned."""
+        years = self.years[self.matrix[:, self.index[name]].nonzero()[0]]
+        if not len(years):
+            return None
+        return int(years.min()), int(years.max())
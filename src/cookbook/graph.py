@@ -0,0 +1,383 @@
+"""Internal citation graph between blog posts.
+
+The text index build extracts every ``<a href>`` once and keeps the links
+that point at other blog posts, written beside the index as
+``johndcook_text_index.graph_links.tsv``. Each line holds a post ID, the
+post's slug and the space-separated keys of the posts it links to: a slug
+from ``/blog/YYYY/MM/DD/<slug>/`` or ``/blog/<slug>/``, or ``p:<id>`` for
+``?p=<id>`` links. That part needs no NumPy, and neither does ``PostUrls``,
+which resolves any blog URL to a post ID through the same keys (for joining
+Search Console pages or Hacker News submissions).
+
+``LinkGraph`` resolves the keys to post IDs and stores the graph as
+compressed sparse rows (``offsets``/``targets`` over node numbers, with
+duplicate and self links dropped). In-degree, PageRank (vectorized power
+iteration with ``np.bincount``) and reachability (breadth-first over CSR
+frontiers) run on those arrays. ``add_posts`` appends new posts, resolves
+their links and retries links that did not resolve before, so a link to a
+post that arrives later is picked up. ``pagerank`` can warm-start from the
+previous ranks.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from .token_store import IndexedPost, SideFileWriter, side_path
+
+LINKS_SUFFIX = ".graph_links.tsv"
+# The site and the WP Engine host that older post bodies link through.
+SITE_HOSTS = ("johndcook.com", "johndcook1.wpenginepowered.com")
+# /blog/<segment>/ pages that are listings, not posts.
+NON_POST_SEGMENTS = {
+    "category",
+    "tag",
+    "page",
+    "feed",
+    "author",
+    "wp-content",
+    "wp-json",
+    "comments",
+}
+
+
+def _np():
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError(
+            "NumPy is required for cookbook.graph. Install with: pip install -e .[analysis]"
+        ) from e
+    return np
+
+
+def link_key(href: str) -> Optional[str]:
+    """Key of the blog post ``href`` points at, or ``None`` for other links."""
+    try:
+        parts = urlsplit(href.strip())
+    except ValueError:
+        return None
+    host = parts.netloc.lower().split(":")[0]
+    if host and not any(host == h or host.endswith("." + h) for h in SITE_HOSTS):
+        return None
+    segments = [s for s in parts.path.split("/") if s]
+    if not segments or segments[0] != "blog":
+        return None
+    post_id = parse_qs(parts.query).get("p", [""])[0]
+    if post_id.isdigit():
+        return f"p:{post_id}"
+    rest = segments[1:]
+    if len(rest) == 4 and all(s.isdigit() for s in rest[:3]):
+        return rest[3]
+    if len(rest) == 1 and rest[0] not in NON_POST_SEGMENTS and "." not in rest[0]:
+        return rest[0]
+    return None
+
+
+def link_keys(hrefs: Iterable[str]) -> list[str]:
+    """Distinct post keys among ``hrefs``, in first-seen order."""
+    keys = dict.fromkeys(key for key in map(link_key, hrefs) if key)
+    return list(keys)
+
+
+def post_keys(post_id: int, slug: str, link: str = "") -> list[str]:
+    """Keys under which other posts can refer to this one."""
+    keys = [f"p:{post_id}"]
+    if slug:
+        keys.append(slug)
+    own = link_key(link) if link else None
+    if own and own not in keys:
+        keys.append(own)
+    return keys
+
+
+class PostUrls:
+    """Hash index from blog URLs to post IDs, through ``link_key``/``post_keys``."""
+
+    def __init__(self, records: Iterable[tuple[int, str, str]] = ()) -> None:
+        self.by_key: dict[str, int] = {}
+        for post_id, slug, link in records:
+            self.add(post_id, slug, link)
+
+    def add(self, post_id: int, slug: str, link: str = "") -> None:
+        for key in post_keys(post_id, slug, link):
+            self.by_key.setdefault(key, int(post_id))
+
+    @classmethod
+    def from_index(cls, index_path: Path) -> PostUrls:
+        from . import io
+
+        return cls(
+            (rec["id"], rec.get("slug") or "", rec.get("link") or "")
+            for rec in io.read_jsonl(index_path)
+        )
+
+    def __len__(self) -> int:
+        return len(self.by_key)
+
+    def post_id(self, url: str) -> Optional[int]:
+        key = link_key(url)
+        return self.by_key.get(key) if key else None
+
+    def join(self, urls: Iterable[str]):
+        """Post ID per URL, -1 where the URL is not a known post."""
+        np = _np()
+        ids = [self.post_id(url) for url in urls]
+        return np.array([-1 if i is None else i for i in ids], dtype=np.int64)
+
+
+class LinksWriter(SideFileWriter):
+    """Write each post's keys and link keys beside a text index while it is built."""
+
+    SUFFIX = LINKS_SUFFIX
+
+    def add(self, post_id: int, slug: str, link: str, hrefs: Iterable[str]) -> None:
+        own = post_keys(post_id, slug, link)
+        keys = [k for k in link_keys(hrefs) if k not in own]
+        # A post whose own link yields a different slug keeps it as an alias.
+        aliases = " ".join(k for k in own[1:] if k != slug)
+        self._fh.write(f"{int(post_id)}\t{slug}\t{aliases}\t{' '.join(keys)}\n")
+
+    def add_post(self, post: IndexedPost) -> None:
+        self.add(post.id, post.slug, post.link, post.page.hrefs)
+
+
+def read_links(path: Path) -> Iterator[tuple[int, list[str], list[str]]]:
+    """Yield ``(post_id, own_keys, link_keys)`` from a ``.graph_links.tsv`` file."""
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            post_id, slug, aliases, keys = line.rstrip("\n").split("\t")
+            own = [f"p:{post_id}"] + ([slug] if slug else []) + aliases.split()
+            yield int(post_id), own, keys.split()
+
+
+def _csr(np, n: int, src, dst):
+    keep = src != dst
+    pairs = np.unique(np.stack([src[keep], dst[keep]]), axis=1)
+    counts = np.bincount(pairs[0], minlength=n)
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets, pairs[1].astype(np.int32)
+
+
+def _ranges(np, starts, lengths):
+    """Concatenate ``arange(s, s + l)`` for every start/length pair."""
+    total = int(lengths.sum())
+    if not total:
+        return np.zeros(0, dtype=np.int64)
+    shift = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return shift + np.arange(total)
+
+
+@dataclass
+class LinkGraph:
+    post_ids: object  # int64 array, one entry per node
+    offsets: object  # int64 array, n + 1 entries
+    targets: object  # int32 node numbers
+    key_index: dict[str, int] = field(default_factory=dict)
+    pending: list[tuple[int, str]] = field(default_factory=list)  # (node, unresolved key)
+    ranks: object = None
+
+    @classmethod
+    def empty(cls) -> LinkGraph:
+        np = _np()
+        return cls(np.zeros(0, np.int64), np.zeros(1, np.int64), np.zeros(0, np.int32))
+
+    @classmethod
+    def from_links(cls, rows: Iterable[tuple[int, list[str], list[str]]]) -> LinkGraph:
+        return cls.empty().add_posts(rows)
+
+    @classmethod
+    def from_index(cls, index_path: Path) -> LinkGraph:
+        from .token_store import store_base
+
+        return cls.from_links(read_links(side_path(store_base(index_path), LINKS_SUFFIX)))
+
+    def __len__(self) -> int:
+        return len(self.post_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def node(self, post_id: int) -> Optional[int]:
+        return self.key_index.get(f"p:{int(post_id)}")
+
+    def add_posts(self, rows: Iterable[tuple[int, list[str], list[str]]]) -> LinkGraph:
+        """Return a graph with ``rows`` added; earlier unresolved links are retried."""
+        np = _np()
+        key_index = dict(self.key_index)
+        new_ids: list[int] = []
+        wanted = list(self.pending)
+        for post_id, own, keys in rows:
+            if f"p:{post_id}" in key_index:
+                continue  # already in the graph
+            node = len(self.post_ids) + len(new_ids)
+            new_ids.append(int(post_id))
+            for key in own:
+                key_index.setdefault(key, node)
+            wanted.extend((node, key) for key in keys)
+
+        src, dst, pending = [], [], []
+        for node, key in wanted:
+            target = key_index.get(key)
+            if target is None:
+                pending.append((node, key))
+            else:
+                src.append(node)
+                dst.append(target)
+        n = len(self.post_ids) + len(new_ids)
+        old_src = np.repeat(np.arange(len(self.post_ids)), np.diff(self.offsets))
+        offsets, targets = _csr(
+            np,
+            n,
+            np.concatenate([old_src, np.array(src, dtype=np.int64)]),
+            np.concatenate([self.targets.astype(np.int64), np.array(dst, dtype=np.int64)]),
+        )
+        post_ids = np.concatenate([self.post_ids, np.array(new_ids, dtype=np.int64)])
+        return LinkGraph(post_ids, offsets, targets, key_index, pending, self.ranks)
+
+    def out_degree(self):
+        return _np().diff(self.offsets)
+
+    def in_degree(self):
+        return _np().bincount(self.targets, minlength=len(self))
+
+    def cited_by(self, node: int) -> list[int]:
+        """Nodes linking to ``node``."""
+        np = _np()
+        sources = np.repeat(np.arange(len(self)), self.out_degree())
+        return sources[self.targets == node].tolist()
+
+    def pagerank(self, damping: float = 0.85, tol: float = 1e-10, max_iter: int = 200):
+        """PageRank by power iteration; dangling posts spread their rank uniformly.
+
+        Starts from the previous result (padded for new posts) when there is one.
+        """
+        np = _np()
+        n = len(self)
+        if n == 0:
+            return np.zeros(0)
+        out = self.out_degree()
+        sources = np.repeat(np.arange(n), out)
+        dangling = out == 0
+        inv_out = np.divide(1.0, out, out=np.zeros(n), where=~dangling)
+        rank = np.full(n, 1.0 / n)
+        if self.ranks is not None and 0 < len(self.ranks) <= n:
+            rank[: len(self.ranks)] = self.ranks
+            rank /= rank.sum()
+        for _ in range(max_iter):
+            flow = np.bincount(self.targets, weights=(rank * inv_out)[sources], minlength=n)
+            new = damping * (flow + rank[dangling].sum() / n) + (1.0 - damping) / n
+            delta = np.abs(new - rank).sum()
+            rank = new
+            if delta < tol:
+                break
+        self.ranks = rank
+        return rank
+
+    def reachable(self, node: int) -> int:
+        """Number of other posts reachable from ``node`` by following links."""
+        np = _np()
+        seen = np.zeros(len(self), dtype=bool)
+        seen[node] = True
+        frontier = np.array([node])
+        out = self.out_degree()
+        while frontier.size:
+            nxt = self.targets[_ranges(np, self.offsets[frontier], out[frontier])]
+            nxt = np.unique(nxt[~seen[nxt]])
+            seen[nxt] = True
+            frontier = nxt
+        return int(seen.sum()) - 1
+
+    def save(self, path: Path) -> None:
+        np = _np()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        keys = sorted(self.key_index.items(), key=lambda kv: kv[1])
+        with path.open("wb") as fh:
+            np.savez_compressed(
+                fh,
+                post_ids=self.post_ids,
+                offsets=self.offsets,
+                targets=self.targets,
+                key_names=np.array([k for k, _ in keys], dtype=str),
+                key_nodes=np.array([v for _, v in keys], dtype=np.int64),
+                pending_nodes=np.array([n for n, _ in self.pending], dtype=np.int64),
+                pending_keys=np.array([k for _, k in self.pending], dtype=str),
+                ranks=self.ranks if self.ranks is not None else np.zeros(0),
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> LinkGraph:
+        np = _np()
+        with np.load(path) as data:
+            key_index = dict(zip(data["key_names"].tolist(), data["key_nodes"].tolist()))
+            pending = list(zip(data["pending_nodes"].tolist(), data["pending_keys"].tolist()))
+            ranks = data["ranks"].copy() if data["ranks"].size else None
+            return cls(
+                data["post_ids"].copy(),
+                data["offsets"].copy(),
+                data["targets"].copy(),
+                key_index,
+                pending,
+                ranks,
+            )
+
+
+def iter_graph_facts(graph: LinkGraph, titles: dict[int, str]) -> Iterator[dict]:
+    """Yield ``graph`` facts; ``titles`` maps post ID to title."""
+    if not graph.edge_count:
+        return
+    np = _np()
+    ids = graph.post_ids
+
+    def title(node: int) -> str:
+        return titles.get(int(ids[node]), f"post {int(ids[node])}")
+
+    in_deg = graph.in_degree()
+    out_deg = graph.out_degree()
+    linked = int((out_deg > 0).sum())
+    yield {
+        "type": "graph",
+        "fact": (
+            f"{linked:,} of {len(graph):,} posts link to other posts on the blog, "
+            f"{graph.edge_count:,} internal links in all."
+        ),
+    }
+    top = int(in_deg.argmax())
+    yield {
+        "type": "graph",
+        "fact": f'The most-cited post is "{title(top)}", linked from {int(in_deg[top])} other posts.',
+        "post_id": int(ids[top]),
+    }
+    rank = graph.pagerank()
+    central = int(rank.argmax())
+    if central != top:
+        yield {
+            "type": "graph",
+            "fact": (
+                "By PageRank, which weights each citation by the citing post's own rank, "
+                f'the most central post is "{title(central)}".'
+            ),
+            "post_id": int(ids[central]),
+        }
+    hub = int(out_deg.argmax())
+    yield {
+        "type": "graph",
+        "fact": f'"{title(hub)}" links to {int(out_deg[hub])} other blog posts, more than any other.',
+        "post_id": int(ids[hub]),
+    }
+    # Reachability is a BFS per post; check the best-connected candidates only.
+    candidates = np.argsort(-out_deg, kind="stable")[:25]
+    reach = {int(node): graph.reachable(int(node)) for node in candidates if out_deg[node]}
+    far = max(reach, key=reach.get)
+    yield {
+        "type": "graph",
+        "fact": (
+            f'Following internal links from "{title(far)}" leads to {reach[far]:,} different posts.'
+        ),
+        "post_id": int(ids[far]),
+    }
@@ -0,0 +1,348 @@
+"""Google Search Console performance exports.
+
+An export is a directory such as
+``https___www.johndcook.com_-Performance-on-Search-2025-11-28``. It holds
+one CSV per dimension (``Queries.csv``, ``Pages.csv``, ``Countries.csv``,
+``Dates.csv``, ``Devices.csv``, ...) and a ``Filters.csv``. ``Snapshot.load``
+reads a directory, and each dimension becomes a ``Table`` of typed NumPy
+columns. Rows are streamed into column lists and then converted in one pass
+per column. CTR strings such as ``"13.72%"`` become fractions, and the
+average position (rank) becomes a float. Discover exports have no Position
+column, so there it is NaN.
+
+``cookbook.graph.PostUrls`` is a hash index from post keys to post IDs
+(slug or ``p:<id>``), so page URLs join to posts the same way internal
+links do. ``per_post`` sums a Pages table per post, and
+``non_post_share`` measures the traffic to URLs that are not post URLs at
+all (the standalone tools), whether or not the join finds them.
+
+``gini`` and ``top_share`` measure how concentrated clicks are.
+``ctr_curve`` pools clicks and impressions by rounded position, which
+gives CTR as a function of rank. ``Snapshots`` orders exports by date for
+time series: merged daily totals and per-post clicks per snapshot.
+
+Shares computed from Queries and Pages are shares of the exported rows.
+Search Console caps those tables at 1,000 rows.
+"""
+
+from __future__ import annotations
+
+import csv
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - optional dependency
+    raise ImportError(
+        "NumPy is required for cookbook.gsc. Install with: pip install -e .[analysis]"
+    ) from e
+
+from .graph import PostUrls, link_key
+
+DIMENSIONS = (
+    "Queries",
+    "Pages",
+    "Countries",
+    "Dates",
+    "Devices",
+    "Search appearance",
+    "Discover appearance",
+)
+_EXPORT_NAME = re.compile(r"-Performance-on-(?P<type>[A-Za-z]+)-(?P<date>\d{4}-\d{2}-\d{2})$")
+
+
+def parse_percent(values: Iterable[str]):
+    """``"13.72%"`` → 0.1372, vectorized; blanks become NaN."""
+    text = np.char.strip(np.asarray(list(values), dtype=str))
+    text = np.char.rstrip(text, "%")
+    out = np.full(text.shape, np.nan)
+    filled = text != ""
+    out[filled] = text[filled].astype(np.float64) / 100
+    return out
+
+
+def _parse_numbers(values: list[str], dtype):
+    text = np.char.strip(np.asarray(values, dtype=str))
+    if dtype is np.float64:
+        out = np.full(text.shape, np.nan)
+        filled = text != ""
+        out[filled] = text[filled].astype(np.float64)
+        return out
+    return np.where(text == "", "0", text).astype(dtype)
+
+
+@dataclass
+class Table:
+    """One dimension of an export; rows keep the export's order (by clicks)."""
+
+    dimension: str
+    keys: list[str]
+    clicks: np.ndarray
+    impressions: np.ndarray
+    ctr: np.ndarray
+    position: np.ndarray  # average rank in results; NaN when not exported
+
+    @classmethod
+    def from_csv(cls, path: Path, dimension: Optional[str] = None) -> Table:
+        with path.open(newline="", encoding="utf-8-sig") as fh:
+            reader = csv.reader(fh)
+            header = next(reader, [])
+            columns: list[list[str]] = [[] for _ in header]
+            for row in reader:
+                if row:
+                    for column, value in zip(columns, row):
+                        column.append(value)
+        by_name = {name.strip(): values for name, values in zip(header, columns)}
+        keys = columns[0] if columns else []
+        n = len(keys)
+        return cls(
+            dimension or path.stem,
+            keys,
+            _parse_numbers(by_name.get("Clicks", ["0"] * n), np.int64),
+            _parse_numbers(by_name.get("Impressions", ["0"] * n), np.int64),
+            parse_percent(by_name.get("CTR", [""] * n)),
+            _parse_numbers(by_name.get("Position", [""] * n), np.float64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def ranks(self):
+        """1-based rank of each row by clicks, as exported."""
+        return np.arange(1, len(self) + 1)
+
+    def row(self, key: str) -> Optional[int]:
+        try:
+            return self.keys.index(key)
+        except ValueError:
+            return None
+
+    def top_share(self, k: int) -> float:
+        return top_share(self.clicks, k)
+
+    def gini(self) -> float:
+        return gini(self.clicks)
+
+    def share_matching(self, pattern: str) -> float:
+        """Share of clicks on rows whose key matches the regular expression ``pattern``."""
+        regex = re.compile(pattern, re.I)
+        mask = np.fromiter((bool(regex.search(k)) for k in self.keys), dtype=bool, count=len(self))
+        total = self.clicks.sum()
+        return float(self.clicks[mask].sum() / total) if total else 0.0
+
+    def ctr_curve(self, max_position: int = 20):
+        return ctr_curve(self.clicks, self.impressions, self.position, max_position)
+
+
+def gini(values) -> float:
+    """Gini coefficient of nonnegative ``values``: 0 is even, near 1 is one row taking all."""
+    x = np.sort(np.asarray(values, dtype=np.float64))
+    n, total = len(x), x.sum()
+    if n == 0 or total == 0:
+        return 0.0
+    return float((2 * np.arange(1, n + 1) - n - 1) @ x / (n * total))
+
+
+def top_share(values, k: int) -> float:
+    """Share of the total held by the ``k`` largest values."""
+    x = np.asarray(values, dtype=np.float64)
+    total = x.sum()
+    if total == 0:
+        return 0.0
+    return float(np.sort(x)[::-1][:k].sum() / total)
+
+
+def ctr_curve(clicks, impressions, position, max_position: int = 20):
+    """``(positions, ctr, impressions)`` pooled over rows by rounded position.
+
+    Position ``p`` covers average positions in ``[p - 0.5, p + 0.5)``; rows
+    past ``max_position`` or without a position are left out. CTR is total
+    clicks over total impressions in each bin, NaN for empty bins.
+    """
+    position = np.asarray(position, dtype=np.float64)
+    known = ~np.isnan(position)
+    bins = np.zeros(len(position), dtype=np.int64)
+    bins[known] = np.floor(position[known] + 0.5).astype(np.int64)
+    keep = known & (bins >= 1) & (bins <= max_position)
+    shown = np.bincount(bins[keep], np.asarray(impressions)[keep], max_position + 1)[1:]
+    clicked = np.bincount(bins[keep], np.asarray(clicks)[keep], max_position + 1)[1:]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ctr = np.where(shown > 0, clicked / shown, np.nan)
+    return np.arange(1, max_position + 1), ctr, shown.astype(np.int64)
+
+
+@dataclass
+class Snapshot:
+    """One export directory: its search type, export date, filters and tables."""
+
+    path: Path
+    search_type: str  # "Search" or "Discover"
+    date: Optional[date]
+    filters: dict[str, str] = field(default_factory=dict)
+    tables: dict[str, Table] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> Snapshot:
+        m = _EXPORT_NAME.search(path.name)
+        filters: dict[str, str] = {}
+        filters_path = path / "Filters.csv"
+        if filters_path.exists():
+            with filters_path.open(newline="", encoding="utf-8-sig") as fh:
+                filters = {row[0]: row[1] for row in list(csv.reader(fh))[1:] if len(row) >= 2}
+        tables = {
+            name: Table.from_csv(path / f"{name}.csv", name)
+            for name in DIMENSIONS
+            if (path / f"{name}.csv").exists()
+        }
+        return cls(
+            path,
+            m["type"] if m else filters.get("Search type", ""),
+            date.fromisoformat(m["date"]) if m else None,
+            filters,
+            tables,
+        )
+
+    def __getitem__(self, dimension: str) -> Table:
+        return self.tables[dimension]
+
+    def __contains__(self, dimension: str) -> bool:
+        return dimension in self.tables
+
+    def totals(self) -> tuple[int, int]:
+        """Total ``(clicks, impressions)``, from the Dates table (which is not capped)."""
+        for name in ("Dates", "Devices", "Countries"):
+            if name in self.tables:
+                table = self.tables[name]
+                return int(table.clicks.sum()), int(table.impressions.sum())
+        return 0, 0
+
+    def daily(self):
+        """``(dates, clicks, impressions)`` in date order; dates are ``datetime64[D]``."""
+        table = self.tables["Dates"]
+        days = np.array(table.keys, dtype="datetime64[D]")
+        order = np.argsort(days, kind="stable")
+        return days[order], table.clicks[order], table.impressions[order]
+
+
+def per_post(pages: Table, urls: PostUrls) -> dict[int, tuple[int, int]]:
+    """``post_id -> (clicks, impressions)``, summed over the URLs of each post."""
+    ids = urls.join(pages.keys)
+    matched = ids >= 0
+    posts, inverse = np.unique(ids[matched], return_inverse=True)
+    clicks = np.bincount(inverse, pages.clicks[matched], len(posts))
+    shown = np.bincount(inverse, pages.impressions[matched], len(posts))
+    return {
+        int(p): (int(c), int(s))
+        for p, c, s in sorted(zip(posts, clicks, shown), key=lambda r: (-r[1], r[0]))
+    }
+
+
+def non_post_share(pages: Table) -> float:
+    """Share of page clicks on URLs that are not blog posts (tools, PDFs, index pages).
+
+    Post URLs that are missing from the index still count as posts.
+    """
+    total = pages.clicks.sum()
+    if not total:
+        return 0.0
+    non_post = np.fromiter((link_key(url) is None for url in pages.keys), bool, len(pages))
+    return float(pages.clicks[non_post].sum() / total)
+
+
+class Snapshots:
+    """Exports of one search type, oldest first, as a time series."""
+
+    def __init__(self, snapshots: Iterable[Snapshot]) -> None:
+        self.snapshots = sorted(snapshots, key=lambda s: (s.date or date.min, s.path.name))
+
+    @classmethod
+    def load(cls, root: Path, search_type: str = "Search") -> Snapshots:
+        return cls(
+            snapshot
+            for path in sorted(root.iterdir())
+            if path.is_dir()
+            for snapshot in [Snapshot.load(path)]
+            if snapshot.search_type.lower() == search_type.lower()
+        )
+
+    def __len__(self) -> int:
+        return len(self.snapshots)
+
+    def __iter__(self) -> Iterator[Snapshot]:
+        return iter(self.snapshots)
+
+    @property
+    def latest(self) -> Snapshot:
+        return self.snapshots[-1]
+
+    def daily(self):
+        """``(dates, clicks, impressions)`` over all snapshots; newer exports win overlaps."""
+        merged: dict = {}
+        for snapshot in self.snapshots:
+            if "Dates" in snapshot:
+                for day, c, s in zip(*snapshot.daily()):
+                    merged[day.item()] = (c, s)
+        keys = sorted(merged)
+        values = np.array([merged[day] for day in keys], dtype=np.int64).reshape(-1, 2)
+        return np.array(keys, dtype="datetime64[D]"), values[:, 0], values[:, 1]
+
+    def post_clicks(self, urls: PostUrls):
+        """``(post_ids, clicks)`` with clicks as snapshots × posts, from each Pages table."""
+        tables = [per_post(s["Pages"], urls) if "Pages" in s else {} for s in self.snapshots]
+        post_ids = np.array(sorted({p for t in tables for p in t}), dtype=np.int64)
+        column = {int(p): j for j, p in enumerate(post_ids)}
+        clicks = np.zeros((len(tables), len(post_ids)), dtype=np.int64)
+        for i, table in enumerate(tables):
+            for post_id, (c, _) in table.items():
+                clicks[i, column[post_id]] = c
+        return post_ids, clicks
+
+
+def iter_gsc_facts(snapshot: Snapshot, urls: PostUrls, titles: dict[int, str]) -> Iterator[dict]:
+    """Yield concentration, CTR and per-post traffic facts; ``post_id`` marks post facts."""
+    clicks, shown = snapshot.totals()
+    if clicks:
+        period = snapshot.filters.get("Date")
+        yield {
+            "type": "gsc",
+            "fact": f"Google {snapshot.search_type} brought {clicks:,} clicks from "
+            f"{shown:,} impressions ({clicks / shown:.2%} CTR)"
+            + (f" over the {period.lower()}." if period else "."),
+        }
+    if "Queries" in snapshot:
+        queries = snapshot["Queries"]
+        yield {
+            "type": "gsc",
+            "fact": f"The top 10 of {len(queries):,} search queries take "
+            f"{queries.top_share(10):.1%} of their clicks (Gini {queries.gini():.2f}).",
+        }
+    if "Pages" in snapshot:
+        pages = snapshot["Pages"]
+        yield {
+            "type": "gsc",
+            "fact": f"“{pages.keys[0]}” alone draws {pages.top_share(1):.1%} of clicks to the "
+            f"top {len(pages):,} pages; pages that are not blog posts draw "
+            f"{non_post_share(pages):.1%}.",
+        }
+        traffic = per_post(pages, urls)
+        if traffic:
+            post_id, (c, s) = next(iter(traffic.items()))
+            yield {
+                "type": "gsc",
+                "fact": f"“{titles.get(post_id, post_id)}” is the most-clicked blog post from "
+                f"search: {c:,} clicks from {s:,} impressions.",
+                "post_id": post_id,
+            }
+    if "Queries" in snapshot:
+        positions, ctr, _ = snapshot["Queries"].ctr_curve(10)
+        if not np.isnan(ctr[0]) and not np.isnan(ctr[-1]):
+            yield {
+                "type": "gsc",
+                "fact": f"Queries where the blog ranks first are clicked {ctr[0]:.1%} of the time; "
+                f"at position {positions[-1]} it is {ctr[-1]:.1%}.",
+            }
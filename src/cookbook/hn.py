@@ -0,0 +1,234 @@
+"""Hacker News submissions of the blog, from an offline dump of HN items.
+
+``iter_items`` streams a dump once. The dump can be JSONL (plain, ``.gz`` or
+``.zst``) or Parquet, which needs pyarrow. For JSONL, each line is first
+checked for one of the site's domains as raw bytes, and only the lines that
+match are decoded. A multi-gigabyte dump of every HN item therefore costs
+about one read, while the few thousand relevant stories are parsed in
+batches. Both the Firebase item schema (``id``, ``time``, ``score``,
+``descendants``, ``by``) and Algolia's (``objectID``, ``created_at_i``,
+``points``, ``num_comments``, ``author``) are accepted.
+
+``Submission.from_item`` keeps live stories whose URL is on the site and
+canonicalizes that URL (``canonical_url``). ``filter_dump`` then joins each
+submission to a post through ``cookbook.graph.PostUrls``, the same URL
+index used for internal links and Search Console pages. ``per_post``
+reduces the submissions to one ``HNPost`` row per post: submissions,
+points, comments and the first submission. ``iter_hn_facts`` regenerates
+the ``hn`` facts from them.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from . import io
+from .graph import SITE_HOSTS, PostUrls, link_key
+
+POST_FIELDS = [
+    "post_id",
+    "submissions",
+    "points",
+    "comments",
+    "best_points",
+    "first_id",
+    "first_time",
+]
+_TRACKING = {"ref", "source", "fbclid", "gclid"}  # and any utm_* parameter
+
+
+def canonical_url(url: str, hosts: Iterable[str] = SITE_HOSTS) -> Optional[str]:
+    """``host/path[?query]`` for a URL on one of ``hosts``, else ``None``.
+
+    The scheme, ``www.``, port, fragment, trailing slash and tracking query
+    parameters are dropped and the host is lowercased, so ``http://`` and
+    ``https://www.`` forms of a page compare equal.
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return None
+    host = parts.netloc.lower().rsplit("@", 1)[-1].split(":")[0].removeprefix("www.")
+    if not any(host == h or host.endswith("." + h) for h in hosts):
+        return None
+    query = [
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in _TRACKING and not k.lower().startswith("utm_")
+    ]
+    path = parts.path.rstrip("/")
+    return host + path + (f"?{urlencode(sorted(query))}" if query else "")
+
+
+@dataclass(slots=True)
+class Submission:
+    id: int
+    time: str  # UTC, ISO 8601
+    title: str
+    url: str
+    canonical: str
+    points: int
+    comments: int
+    by: str
+    post_id: Optional[int] = None
+
+    @classmethod
+    def from_item(cls, item: dict, hosts: Iterable[str] = SITE_HOSTS) -> Optional[Submission]:
+        """A live story linking to the site, from a Firebase or Algolia item."""
+        if item.get("deleted") or item.get("dead"):
+            return None
+        kind = item.get("type")
+        if kind is None and "_tags" in item:
+            kind = "story" if "story" in item["_tags"] else None
+        if kind != "story":
+            return None
+        url = item.get("url") or ""
+        canonical = canonical_url(url, hosts) if url else None
+        if canonical is None:
+            return None
+        when = item.get("time", item.get("created_at_i"))
+        if when is not None and not isinstance(when, datetime):  # Parquet may hold timestamps
+            when = datetime.fromtimestamp(int(when), timezone.utc)
+        return cls(
+            id=int(item.get("id", item.get("objectID", 0))),
+            time=when.astimezone(timezone.utc).isoformat().replace("+00:00", "Z") if when else "",
+            title=item.get("title") or "",
+            url=url,
+            canonical=canonical,
+            points=int(item.get("score", item.get("points")) or 0),
+            comments=int(item.get("descendants", item.get("num_comments")) or 0),
+            by=item.get("by", item.get("author")) or "",
+        )
+
+
+def _iter_parquet(path: Path, batch_size: int) -> Iterator[dict]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Reading Parquet HN dumps needs pyarrow. Install with: pip install pyarrow"
+        ) from e
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+        yield from batch.to_pylist()
+
+
+def iter_items(
+    path: Path, hosts: Iterable[str] = SITE_HOSTS, batch_size: int = 4096
+) -> Iterator[dict]:
+    """Stream the items of a dump that may mention ``hosts``; other lines are not decoded."""
+    if path.suffix == ".parquet":
+        yield from _iter_parquet(path, batch_size)
+        return
+    needles = [host.encode() for host in hosts]
+    for lines, linenos in io.iter_line_batches(path, batch_size):
+        keep = [i for i, line in enumerate(lines) if any(n in line for n in needles)]
+        if keep:
+            yield from io.decode_batch(path, [lines[i] for i in keep], [linenos[i] for i in keep])
+
+
+def filter_dump(
+    path: Path, urls: PostUrls, hosts: Iterable[str] = SITE_HOSTS
+) -> Iterator[Submission]:
+    """Submissions to the site in ``path``, joined to post IDs, in dump order."""
+    hosts = tuple(hosts)
+    for item in iter_items(path, hosts):
+        submission = Submission.from_item(item, hosts)
+        if submission is not None:
+            submission.post_id = urls.post_id(submission.url)
+            yield submission
+
+
+def write_submissions(path: Path, submissions: Iterable[Submission]) -> int:
+    return io.write_jsonl(path, (asdict(s) for s in submissions))
+
+
+def read_submissions(path: Path) -> Iterator[Submission]:
+    for row in io.read_jsonl(path):
+        yield Submission(**row)
+
+
+@dataclass(slots=True)
+class HNPost:
+    post_id: int
+    submissions: int
+    points: int
+    comments: int
+    best_points: int
+    first_id: int
+    first_time: str
+
+
+def per_post(submissions: Iterable[Submission]) -> dict[int, HNPost]:
+    """One row per post with submissions, most points first."""
+    posts: dict[int, HNPost] = {}
+    for s in submissions:
+        if s.post_id is None:
+            continue
+        row = posts.get(s.post_id)
+        if row is None:
+            posts[s.post_id] = HNPost(s.post_id, 1, s.points, s.comments, s.points, s.id, s.time)
+            continue
+        row.submissions += 1
+        row.points += s.points
+        row.comments += s.comments
+        row.best_points = max(row.best_points, s.points)
+        if (s.time, s.id) < (row.first_time, row.first_id):
+            row.first_id, row.first_time = s.id, s.time
+    return dict(sorted(posts.items(), key=lambda kv: (-kv[1].points, kv[0])))
+
+
+def write_hn_posts(path: Path, posts: dict[int, HNPost]) -> None:
+    io.write_csv_rows(path, POST_FIELDS, (asdict(row) for row in posts.values()))
+
+
+def iter_hn_facts(
+    submissions: list[Submission], posts: dict[int, HNPost], titles: dict[int, str]
+) -> Iterator[dict]:
+    """Yield totals, top-post and first-submission facts; ``post_id`` marks post facts."""
+    if not submissions:
+        return
+    points = sum(s.points for s in submissions)
+    comments = sum(s.comments for s in submissions)
+    years = sorted(s.time[:4] for s in submissions if s.time)
+    span = f" from {years[0]} to {years[-1]}" if years else ""
+    yield {
+        "type": "hn",
+        "fact": f"The site has been submitted to Hacker News {len(submissions):,} times{span}: "
+        f"{points:,} points and {comments:,} comments, {points / len(submissions):.0f} points "
+        "per submission on average.",
+    }
+    # Classified by URL, not by the join, so posts missing from the index still count as posts.
+    off_blog = sum(1 for s in submissions if link_key(s.url) is None)
+    yield {
+        "type": "hn",
+        "fact": f"{len(submissions) - off_blog:,} of the submissions link to blog posts "
+        f"({len(posts):,} distinct post(s) in the index); {off_blog:,} link to tools and "
+        "other pages.",
+    }
+    big = [row for row in posts.values() if row.best_points >= 500]
+    if big:
+        names = ", ".join(f"“{titles.get(r.post_id, r.post_id)}” ({r.best_points})" for r in big)
+        yield {
+            "type": "hn",
+            "fact": f"Posts past 500 points in one submission ({len(big)}): {names}.",
+        }
+    if posts:
+        top = next(iter(posts.values()))
+        yield {
+            "type": "hn",
+            "fact": f"“{titles.get(top.post_id, top.post_id)}” has the most Hacker News points: "
+            f"{top.points:,} over {top.submissions} submission(s), with {top.comments:,} comments.",
+            "post_id": top.post_id,
+        }
+        most = max(posts.values(), key=lambda r: (r.submissions, r.points))
+        if most.submissions > 1:
+            yield {
+                "type": "hn",
+                "fact": f"“{titles.get(most.post_id, most.post_id)}” has been submitted "
+                f"{most.submissions} times, first on {most.first_time[:10]}.",
+                "post_id": most.post_id,
+            }
@@ -0,0 +1,347 @@
+"""HTML extraction for mirrored site pages and WordPress post bodies.
+
+Both extractors are written as small event handlers (``start``/``end``/
+``data``) so the same logic can be driven by different parsers:
+
+- ``stdlib``: ``html.parser`` (always available, pure Python)
+- ``selectolax``: the Lexbor HTML5 parser, ``pip install selectolax``
+- ``lxml``: libxml2, ``pip install lxml``
+
+The C-backed parsers build a tree first; only the parts the handlers care
+about (the head fields and ``div#main`` for site pages) are walked, which is
+where the speed-up comes from. ``backend="auto"`` picks the first installed
+backend in ``AUTO_ORDER``. The default is ``stdlib``: on the mirrored site
+the C-backed parsers still change or reorder the blocks of a few pages, and
+the index should not depend on which optional packages are installed.
+``scripts/bench_html_backends.py`` compares every backend with ``stdlib``
+and fails on any difference.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Callable, List, Optional
+
+BLOCK_TAGS = {"p", "li", "h1", "h2", "h3", "pre", "blockquote"}
+SKIP_TAGS = {"script", "style"}
+CODE_TAGS = {"pre", "code"}
+BACKENDS = ("stdlib", "selectolax", "lxml")
+AUTO_ORDER = ("selectolax", "lxml", "stdlib")
+
+
+@dataclass
+class ParsedPage:
+    canonical: Optional[str]
+    title: Optional[str]
+    description: Optional[str]
+    blocks: List[dict]
+
+
+class MainContent:
+    """Collects title, description, canonical URL and ``div#main`` text blocks."""
+
+    def __init__(self) -> None:
+        self.in_title = False
+        self.title_parts: List[str] = []
+        self.description: Optional[str] = None
+        self.canonical: Optional[str] = None
+        self.in_main = False
+        self.main_depth = 0
+        self.skip_depth = 0
+        self.block_stack: List[dict] = []
+        self.blocks: List[dict] = []
+
+    def start(self, tag: str, attrs: dict) -> None:
+        if tag == "title":
+            self.in_title = True
+
+        if tag == "meta" and (attrs.get("name") or "").lower() == "description":
+            self.description = attrs.get("content")
+
+        if tag == "link" and (attrs.get("rel") or "").lower() == "canonical":
+            href = attrs.get("href")
+            if href:
+                if self.canonical is None or "/blog/" in href:
+                    self.canonical = href
+
+        if tag == "div" and attrs.get("id") == "main":
+            self.in_main = True
+            self.main_depth = 1
+            return
+
+        if self.in_main and tag == "div":
+            self.main_depth += 1
+
+        if not self.in_main:
+            return
+
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+            return
+
+        if self.skip_depth > 0:
+            return
+
+        if tag in BLOCK_TAGS:
+            self.block_stack.append({"tag": tag, "parts": []})
+        elif tag == "br" and self.block_stack:
+            self.block_stack[-1]["parts"].append("\n")
+
+    def end(self, tag: str) -> None:
+        if tag == "title":
+            self.in_title = False
+
+        if tag in SKIP_TAGS and self.skip_depth > 0:
+            self.skip_depth -= 1
+            return
+
+        if self.in_main and tag == "div":
+            self.main_depth -= 1
+            if self.main_depth <= 0:
+                self.in_main = False
+            return
+
+        if not self.in_main or self.skip_depth > 0:
+            return
+
+        if tag in BLOCK_TAGS and self.block_stack:
+            block = self.block_stack.pop()
+            text = "".join(block["parts"])
+            if block["tag"] != "pre":
+                text = " ".join(text.split())
+            else:
+                text = text.strip("\n")
+            if text.strip():
+                self.blocks.append({"tag": block["tag"], "text": text.strip()})
+
+    def data(self, data: str) -> None:
+        if self.in_title:
+            self.title_parts.append(data.strip())
+
+        if not self.in_main or self.skip_depth > 0 or not self.block_stack:
+            return
+
+        self.block_stack[-1]["parts"].append(data)
+
+    def page(self) -> ParsedPage:
+        title = " ".join(part for part in self.title_parts if part).strip() or None
+        return ParsedPage(
+            canonical=self.canonical,
+            title=title,
+            description=self.description,
+            blocks=self.blocks,
+        )
+
+
+@dataclass
+class CodeSpan:
+    """An outermost ``<pre>`` or ``<code>`` element of a post body."""
+
+    tag: str
+    offset: int  # character offset of the block in ``PostText.text()``
+    text: str
+
+
+@dataclass
+class PostText:
+    """Text runs, link targets, code blocks and images from a post's HTML body."""
+
+    parts: List[str] = field(default_factory=list)
+    hrefs: List[str] = field(default_factory=list)
+    image_alts: List[str] = field(default_factory=list)
+    code_blocks: List[CodeSpan] = field(default_factory=list)
+    link_count: int = 0
+    image_count: int = 0
+    _chars: int = 0
+    _code_depth: int = 0
+    _code: Optional[CodeSpan] = None
+    _code_parts: List[str] = field(default_factory=list)
+
+    def start(self, tag: str, attrs: dict) -> None:
+        if tag == "a":
+            self.link_count += 1
+            if attrs.get("href"):
+                self.hrefs.append(attrs["href"])
+        if tag == "img":
+            self.image_count += 1
+            if attrs.get("alt"):
+                self.image_alts.append(attrs["alt"])
+        if tag in CODE_TAGS:
+            if self._code is None:
+                self._code = CodeSpan(tag, self._chars, "")
+                self._code_parts = []
+            self._code_depth += 1
+        elif tag == "br" and self._code is not None:
+            self._code_parts.append("\n")
+
+    def end(self, tag: str) -> None:
+        if tag in CODE_TAGS and self._code is not None:
+            self._code_depth -= 1
+            if self._code_depth == 0:
+                self._code.text = "".join(self._code_parts)
+                if self._code.text.strip():
+                    self.code_blocks.append(self._code)
+                self._code = None
+
+    def data(self, data: str) -> None:
+        self.parts.append(data)
+        # text() joins the parts with single spaces.
+        self._chars += len(data) + 1
+        if self._code is not None:
+            self._code_parts.append(data)
+
+    def text(self) -> str:
+        return " ".join(self.parts)
+
+
+class EventParser(HTMLParser):
+    """``html.parser`` front end forwarding events to a handler."""
+
+    def __init__(self, handler) -> None:
+        super().__init__(convert_charrefs=True)
+        self.handler = handler
+
+    def handle_starttag(self, tag, attrs):
+        self.handler.start(tag, {k.lower(): v for k, v in attrs})
+
+    def handle_endtag(self, tag):
+        self.handler.end(tag)
+
+    def handle_data(self, data):
+        self.handler.data(data)
+
+
+def _inside_main(node, parent, attributes) -> bool:
+    # A nested div#main is reached by walking the outer one; do not walk it twice.
+    while node is not None:
+        if attributes(node).get("id") == "main":
+            return True
+        node = parent(node)
+    return False
+
+
+def _stdlib(html: str, handler, main_only: bool) -> None:
+    parser = EventParser(handler)
+    parser.feed(html)
+    parser.close()
+
+
+def _selectolax(html: str, handler, main_only: bool) -> None:
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+
+    def walk(node) -> None:
+        for child in node.iter(include_text=True):
+            tag = child.tag
+            if tag == "-text":
+                handler.data(child.text_content)
+            elif tag[0] not in "-_#!":
+                handler.start(tag, {k.lower(): v for k, v in child.attributes.items()})
+                walk(child)
+                handler.end(tag)
+
+    if not main_only:
+        walk(tree.root)
+        return
+    for node in tree.css("title, meta, link"):
+        handler.start(node.tag, {k.lower(): v for k, v in node.attributes.items()})
+        if node.tag == "title":
+            handler.data(node.text())
+        handler.end(node.tag)
+    for node in tree.css("div#main"):
+        if _inside_main(node.parent, lambda n: n.parent, lambda n: n.attributes):
+            continue
+        handler.start("div", {"id": "main"})
+        walk(node)
+        handler.end("div")
+
+
+def _lxml(html: str, handler, main_only: bool) -> None:
+    from lxml import html as lxml_html
+
+    if not html.strip():
+        return
+    # lxml refuses str input carrying an XML/meta encoding declaration.
+    parser = lxml_html.HTMLParser(encoding="utf-8")
+    root = lxml_html.document_fromstring(html.encode("utf-8"), parser=parser)
+
+    def walk(el) -> None:
+        for child in el:
+            if isinstance(child.tag, str):
+                tag = child.tag.lower()
+                handler.start(tag, {k.lower(): v for k, v in child.attrib.items()})
+                if child.text:
+                    handler.data(child.text)
+                walk(child)
+                handler.end(tag)
+            if child.tail:
+                handler.data(child.tail)
+
+    if not main_only:
+        handler.start(root.tag, dict(root.attrib))
+        if root.text:
+            handler.data(root.text)
+        walk(root)
+        handler.end(root.tag)
+        return
+    for node in root.iter("title", "meta", "link"):
+        handler.start(node.tag, {k.lower(): v for k, v in node.attrib.items()})
+        if node.tag == "title":
+            handler.data(node.text_content())
+        handler.end(node.tag)
+    for node in root.iterfind(".//div[@id='main']"):
+        if _inside_main(node.getparent(), lambda n: n.getparent(), lambda n: n.attrib):
+            continue
+        handler.start("div", {"id": "main"})
+        if node.text:
+            handler.data(node.text)
+        walk(node)
+        handler.end("div")
+
+
+_DRIVERS: dict[str, Callable] = {"stdlib": _stdlib, "selectolax": _selectolax, "lxml": _lxml}
+_MODULES = {"selectolax": "selectolax.lexbor", "lxml": "lxml.html"}
+
+
+def backend_available(name: str) -> bool:
+    if name == "stdlib":
+        return True
+    try:
+        __import__(_MODULES[name])
+    except ImportError:
+        return False
+    return True
+
+
+def available_backends() -> list[str]:
+    return [name for name in BACKENDS if backend_available(name)]
+
+
+def resolve_backend(name: str = "auto") -> str:
+    """Map ``auto`` to the fastest installed backend; validate explicit names."""
+    if name == "auto":
+        return next(b for b in AUTO_ORDER if backend_available(b))
+    if name not in _DRIVERS:
+        choices = ", ".join(BACKENDS)
+        raise ValueError(f"Unknown HTML backend {name!r}; choose from {choices} or auto")
+    if not backend_available(name):
+        raise ImportError(
+            f"The {name} HTML backend is not installed. Install with: pip install {name}"
+        )
+    return name
+
+
+def parse_page(html: str, backend: str = "stdlib") -> ParsedPage:
+    """Extract head fields and ``div#main`` blocks from a full site page."""
+    handler = MainContent()
+    _DRIVERS[resolve_backend(backend)](html, handler, True)
+    return handler.page()
+
+
+def extract_post_text(html: str, backend: str = "stdlib") -> PostText:
+    """Collect the text runs, links, code blocks and image count of a post body."""
+    handler = PostText()
+    _DRIVERS[resolve_backend(backend)](html, handler, False)
+    return handler
@@ -0,0 +1,157 @@
+"""On-disk HTTP cache with conditional requests for the WordPress fetchers.
+
+Each URL is stored under ``data/http_cache`` as two files named by the
+SHA-256 of the URL: ``<key>.json`` (status, headers, ``ETag`` and
+``Last-Modified`` validators) and ``<key>.body.gz`` (the gzip-compressed
+body). A cached URL is revalidated with ``If-None-Match`` /
+``If-Modified-Since``; a ``304 Not Modified`` is answered from disk. In
+offline mode the cache is replayed without touching the network, which is
+also how tests run against recorded responses.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import ssl
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from . import io, paths
+
+USER_AGENT = "Mozilla/5.0"
+
+
+class CacheMiss(LookupError):
+    """Raised in offline mode when a URL has never been fetched."""
+
+
+@dataclass(slots=True)
+class Response:
+    url: str
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    source: str  # "network", "revalidated" (304) or "cache" (offline)
+
+    def json(self):
+        return io.loads(self.body)
+
+
+def default_cache_dir() -> Path:
+    return paths.data_path("http_cache")
+
+
+class HttpCache:
+    """Fetch URLs through an optional on-disk cache.
+
+    ``root=None`` disables storage (plain requests). ``offline=True`` serves
+    only from the cache and raises ``CacheMiss`` for unknown URLs.
+    """
+
+    def __init__(
+        self,
+        root: Path | None = None,
+        offline: bool = False,
+        verify_ssl: bool = False,
+        timeout: float = 60.0,
+    ) -> None:
+        if offline and root is None:
+            raise ValueError("Offline mode needs a cache directory.")
+        self.root = root
+        self.offline = offline
+        self.timeout = timeout
+        self.context = ssl.create_default_context()
+        if not verify_ssl:
+            self.context.check_hostname = False
+            self.context.verify_mode = ssl.CERT_NONE
+        self.stats: Counter = Counter()
+        self._lock = threading.Lock()
+        if root is not None:
+            root.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.root / f"{key}.json", self.root / f"{key}.body.gz"
+
+    def _load(self, url: str) -> tuple[dict, bytes] | None:
+        if self.root is None:
+            return None
+        meta_path, body_path = self._paths(url)
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        return meta, gzip.decompress(body_path.read_bytes())
+
+    @staticmethod
+    def _replace(path: Path, data: bytes) -> None:
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def _store_meta(self, url: str, status: int, headers: dict[str, str]) -> None:
+        meta = {"url": url, "status": status, "headers": headers, "fetched_at": time.time()}
+        self._replace(self._paths(url)[0], json.dumps(meta, ensure_ascii=False, indent=2).encode())
+
+    def _store(self, url: str, status: int, headers: dict[str, str], body: bytes) -> None:
+        if self.root is None:
+            return
+        # Write the body first and rename into place so readers never see a torn entry.
+        self._replace(self._paths(url)[1], gzip.compress(body, mtime=0))
+        self._store_meta(url, status, headers)
+
+    def _count(self, source: str) -> None:
+        with self._lock:
+            self.stats[source] += 1
+
+    def get(self, url: str) -> Response:
+        cached = self._load(url)
+        if self.offline:
+            if cached is None:
+                raise CacheMiss(f"Not in the HTTP cache (offline mode): {url}")
+            meta, body = cached
+            self._count("cache")
+            return Response(url, meta["status"], meta["headers"], body, "cache")
+
+        request_headers = {"User-Agent": USER_AGENT}
+        if cached is not None:
+            validators = cached[0]["headers"]
+            if validators.get("etag"):
+                request_headers["If-None-Match"] = validators["etag"]
+            if validators.get("last-modified"):
+                request_headers["If-Modified-Since"] = validators["last-modified"]
+        request = Request(url, headers=request_headers)
+        try:
+            with urlopen(request, context=self.context, timeout=self.timeout) as resp:
+                status = resp.status
+                headers = {k.lower(): v for k, v in resp.getheaders()}
+                body = resp.read()
+        except HTTPError as e:
+            if e.code != 304 or cached is None:
+                raise
+            meta, body = cached
+            # A 304 may carry fresh validators (ETag, Last-Modified, Date); keep them.
+            fresh = {k.lower(): v for k, v in e.headers.items() if k.lower() != "content-length"}
+            headers = {**meta["headers"], **fresh}
+            self._store_meta(url, meta["status"], headers)
+            self._count("revalidated")
+            return Response(url, meta["status"], headers, body, "revalidated")
+        self._store(url, status, headers, body)
+        self._count("network")
+        return Response(url, status, headers, body, "network")
+
+    def get_json(self, url: str) -> tuple[object, dict[str, str]]:
+        response = self.get(url)
+        return response.json(), response.headers
+
+    def summary(self) -> str:
+        sources = ("network", "revalidated", "cache")
+        parts = [f"{self.stats[k]} {k}" for k in sources if self.stats[k]]
+        return "HTTP: " + (", ".join(parts) or "no requests")
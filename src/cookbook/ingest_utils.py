@@ -5,28 +5,34 @@ from __future__ import annotations
 from pathlib import Path
 import json
 
-from . import paths
+from . import io, paths
+
+
+def http_cache(
+    verify_ssl: bool = False,
+    cache_dir: Path | None = None,
+    offline: bool = False,
+    no_cache: bool = False,
+):
+    """Shared HTTP cache for the fetchers (``data/http_cache`` by default)."""
+    from .http_cache import HttpCache, default_cache_dir
+
+    root = None if no_cache else (cache_dir or default_cache_dir())
+    return HttpCache(root, offline=offline, verify_ssl=verify_ssl)
 
 
 def fetch_wp_api(
     base_url: str = "https://www.johndcook.com/blog/wp-json/wp/v2/posts",
     output: Path | None = None,
     verify_ssl: bool = False,
+    cache=None,
 ) -> Path:
     from src import fetch_wp_api as script
 
     output_path = output or paths.data_path("johndcook_posts_api.jsonl")
-    script.main = getattr(script, "main")  # type: ignore
-    # Reuse script functions directly
-    posts = []
-    for post in script.iter_posts(base_url, verify_ssl):
-        posts.append(script.normalize(post))
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8") as fh:
-        import json
-
-        for post in posts:
-            fh.write(json.dumps(post, ensure_ascii=False) + "\n")
+    cache = cache or http_cache(verify_ssl)
+    posts = [script.normalize(post) for post in script.iter_posts(base_url, verify_ssl, cache)]
+    io.write_jsonl(output_path, posts)
     return output_path
 
 
@@ -34,14 +40,16 @@ def fetch_taxonomies(
     base_url: str = "https://www.johndcook.com/blog/wp-json/wp/v2",
     output_dir: Path | None = None,
     verify_ssl: bool = False,
+    cache=None,
 ) -> Path:
     from src import fetch_wp_taxonomies as script
 
     out_dir = output_dir or paths.data_path("wp_taxonomies")
     out_dir.mkdir(parents=True, exist_ok=True)
+    cache = cache or http_cache(verify_ssl)
     for kind in ("categories", "tags"):
         url = f"{base_url}/{kind}"
-        items = script.fetch_all(url, verify_ssl=verify_ssl)
+        items = script.fetch_all(url, verify_ssl=verify_ssl, cache=cache)
         (out_dir / f"{kind}.json").write_text(
             json.dumps(items, ensure_ascii=False, indent=2), encoding="utf-8"
         )
@@ -61,30 +69,162 @@ def enrich_posts(
     tags = tags_path or paths.data_path("wp_taxonomies", "tags.json")
     output = output_path or paths.data_path("johndcook_posts_enriched.jsonl")
 
-    script.main = getattr(script, "main")  # type: ignore
-    # Reuse script logic
-    posts_data = script.load_jsonl(posts)
-    cat_map = script.load_taxonomy(categories)
-    tag_map = script.load_taxonomy(tags)
-    enriched = []
-    for post in posts_data:
-        post["category_names"] = [cat_map.get(int(cid), str(cid)) for cid in post.get("categories", [])]
-        post["tag_names"] = [tag_map.get(int(tid), str(tid)) for tid in post.get("tags", [])]
-        enriched.append(post)
-    output.parent.mkdir(parents=True, exist_ok=True)
-    with output.open("w", encoding="utf-8") as fh:
-        import json
-
-        for post in enriched:
-            fh.write(json.dumps(post, ensure_ascii=False) + "\n")
+    script.write_enriched(posts, categories, tags, output)
     return output
 
 
-def build_text_index(output_path: Path | None = None) -> Path:
+def build_text_index(output_path: Path | None = None, html_backend: str = "stdlib") -> Path:
     from src import build_post_text_index as script
 
     out_path = output_path or paths.data_path("johndcook_text_index.jsonl")
     script.SRC = paths.data_path("johndcook_posts_enriched.jsonl")
     script.OUT = out_path
+    script.HTML_BACKEND = html_backend
     script.main()
     return out_path
+
+
+METADATA_FIELDS = [
+    "id", "slug", "title", "link", "date", "year", "month", "day", "doy", "weekday",
+    "word_count", "categories", "tags",
+]
+
+
+def build_posts_metadata(
+    posts_path: Path | None = None, output_path: Path | None = None
+) -> tuple[Path, int]:
+    """Write ``posts_metadata.csv`` (one row per post) from the enriched posts JSONL.
+
+    Posts with a missing or malformed date are left out; returns the output
+    path and how many were skipped.
+    """
+    from .posts import parse_dates
+
+    posts = posts_path or paths.data_path("johndcook_posts_enriched.jsonl")
+    output = output_path or paths.data_path("posts_metadata.csv")
+    skipped = 0
+
+    def rows():
+        nonlocal skipped
+        for post in io.read_jsonl(posts):
+            (when,) = parse_dates([post.get("date")])
+            if when is None:
+                skipped += 1
+                continue
+            yield {
+                "id": post.get("id"),
+                "slug": post.get("slug") or "",
+                "title": post.get("title") or "",
+                "link": post.get("link") or "",
+                "date": when.isoformat(),
+                "year": when.year,
+                "month": when.month,
+                "day": when.day,
+                "doy": when.timetuple().tm_yday,
+                "weekday": when.strftime("%A"),
+                "word_count": post.get("word_count", 0),
+                "categories": ";".join(post.get("category_names") or []),
+                "tags": ";".join(post.get("tag_names") or []),
+            }
+
+    io.write_csv_rows(output, METADATA_FIELDS, rows())
+    return output, skipped
+
+
+def build_hn(
+    dump_path: Path,
+    index_path: Path | None = None,
+    submissions_path: Path | None = None,
+    posts_path: Path | None = None,
+) -> tuple[Path, Path]:
+    """Stream an HN item dump into the site's submissions and a per-post HN table."""
+    from .graph import PostUrls
+    from .hn import filter_dump, per_post, write_hn_posts, write_submissions
+
+    index = index_path or paths.data_path("johndcook_text_index.jsonl")
+    submissions_out = submissions_path or paths.data_path("hn_submissions.jsonl")
+    posts_out = posts_path or paths.data_path("hn_posts.csv")
+
+    submissions = list(filter_dump(dump_path, PostUrls.from_index(index)))
+    write_submissions(submissions_out, submissions)
+    write_hn_posts(posts_out, per_post(submissions))
+    return submissions_out, posts_out
+
+
+def ingest_pipeline(cache=None, html_backend: str = "stdlib", hn_dump: Path | None = None):
+    """The full ingest DAG: fetch posts and taxonomies, enrich, then metadata and index.
+
+    With ``hn_dump``, an ``hn`` stage joins that Hacker News dump to the index.
+    """
+    from .code_blocks import CODE_SUFFIX
+    from .entities import ENTITIES_SUFFIX
+    from .graph import LINKS_SUFFIX
+    from .math_index import MATH_SUFFIX
+    from .outlinks import OUTLINKS_SUFFIX
+    from .pipeline import Pipeline, Stage
+    from .search import POSTINGS_OFFSETS_SUFFIX
+    from .token_store import VOCAB_SUFFIX, side_path, store_base
+
+    cache = cache or http_cache()
+    posts_api = paths.data_path("johndcook_posts_api.jsonl")
+    taxonomy_dir = paths.data_path("wp_taxonomies")
+    categories = taxonomy_dir / "categories.json"
+    tags = taxonomy_dir / "tags.json"
+    enriched = paths.data_path("johndcook_posts_enriched.jsonl")
+    metadata = paths.data_path("posts_metadata.csv")
+    text_index = paths.data_path("johndcook_text_index.jsonl")
+
+    stages = [
+        Stage(
+            "wp-api",
+            lambda: fetch_wp_api(output=posts_api, cache=cache),
+            outputs=[posts_api],
+            volatile=True,
+        ),
+        Stage(
+            "taxonomies",
+            lambda: fetch_taxonomies(output_dir=taxonomy_dir, cache=cache),
+            outputs=[categories, tags],
+            volatile=True,
+        ),
+        Stage(
+            "enrich",
+            lambda: enrich_posts(posts_api, categories, tags, enriched),
+            inputs=[posts_api, categories, tags],
+            outputs=[enriched],
+        ),
+        Stage(
+            "metadata",
+            lambda: build_posts_metadata(enriched, metadata),
+            inputs=[enriched],
+            outputs=[metadata],
+        ),
+        Stage(
+            "index",
+            lambda: build_text_index(text_index, html_backend=html_backend),
+            inputs=[enriched],
+            outputs=[
+                text_index,
+                side_path(store_base(text_index), VOCAB_SUFFIX),
+                side_path(store_base(text_index), POSTINGS_OFFSETS_SUFFIX),
+                side_path(store_base(text_index), LINKS_SUFFIX),
+                side_path(store_base(text_index), OUTLINKS_SUFFIX),
+                side_path(store_base(text_index), ENTITIES_SUFFIX),
+                side_path(store_base(text_index), CODE_SUFFIX),
+                side_path(store_base(text_index), MATH_SUFFIX),
+            ],
+            params=f"html_backend={html_backend}",
+        ),
+    ]
+    if hn_dump is not None:
+        hn_submissions = paths.data_path("hn_submissions.jsonl")
+        hn_posts = paths.data_path("hn_posts.csv")
+        stages.append(
+            Stage(
+                "hn",
+                lambda: build_hn(hn_dump, text_index, hn_submissions, hn_posts),
+                inputs=[hn_dump, text_index],
+                outputs=[hn_submissions, hn_posts],
+            )
+        )
+    return Pipeline(stages, paths.data_path(".ingest_state.json"))
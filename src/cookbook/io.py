@@ -1,29 +1,208 @@
-"""Common file IO helpers."""
+"""Common file IO helpers.
+
+JSONL files may be plain, gzip (``.gz``) or Zstandard (``.zst``) compressed;
+the format is chosen from the file suffix. JSON is encoded and decoded with
+orjson or msgspec when one is installed, falling back to the stdlib ``json``
+module (set ``COOKBOOK_JSON=stdlib`` to force it). Every backend writes the
+same compact, UTF-8, one-object-per-line form.
+"""
 
 from __future__ import annotations
 
 import csv
+import gzip
+import io
 import json
+import os
 from pathlib import Path
-from typing import Iterable, Iterator
+from typing import IO, Iterable, Iterator
 
+JSON_BACKENDS = ("orjson", "msgspec", "stdlib")
 
-def read_jsonl(path: Path) -> Iterator[dict]:
-    """Yield JSON objects from a JSONL file."""
-    with path.open(encoding="utf-8") as fh:
-        for line in fh:
+
+def _orjson():
+    import orjson
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    return orjson.loads, dumps
+
+
+def _msgspec():
+    import msgspec
+
+    return msgspec.json.decode, msgspec.json.Encoder().encode
+
+
+def _stdlib():
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def dumps(obj) -> bytes:
+        return encoder.encode(obj).encode("utf-8")
+
+    return json.loads, dumps
+
+
+_JSON_LOADERS = {"orjson": _orjson, "msgspec": _msgspec, "stdlib": _stdlib}
+
+
+def _select_backend():
+    forced = os.environ.get("COOKBOOK_JSON")
+    if forced and forced not in _JSON_LOADERS:
+        raise ValueError(f"Unknown COOKBOOK_JSON backend {forced!r}; choose from {JSON_BACKENDS}")
+    for name in (forced,) if forced else JSON_BACKENDS:
+        try:
+            return (name, *_JSON_LOADERS[name]())
+        except ImportError:
+            if forced:
+                raise
+    raise AssertionError("the stdlib backend is always available")
+
+
+JSON_BACKEND, loads, dumps = _select_backend()
+
+
+def _zstd():
+    try:
+        from compression import zstd  # Python 3.14+
+
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "Reading or writing .zst files needs zstandard. Install with: pip install zstandard"
+        ) from e
+    return zstandard
+
+
+def open_binary(path: Path, mode: str = "rb") -> IO[bytes]:
+    """Open ``path`` for binary reading or writing, (de)compressing by suffix."""
+    if mode not in ("rb", "wb"):
+        raise ValueError(f"mode must be 'rb' or 'wb', not {mode!r}")
+    if mode == "wb":
+        path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".gz":
+        # mtime=0 keeps compressed output byte-identical across runs.
+        return gzip.GzipFile(filename=str(path), mode=mode, mtime=0)
+    if path.suffix == ".zst":
+        zstd = _zstd()
+        if hasattr(zstd, "ZstdFile"):
+            return zstd.ZstdFile(path, mode)
+        fh = path.open(mode)
+        if mode == "rb":
+            return io.BufferedReader(zstd.ZstdDecompressor().stream_reader(fh, closefd=True))
+        return zstd.ZstdCompressor().stream_writer(fh, closefd=True)
+    return path.open(mode)
+
+
+def iter_line_batches(
+    path: Path, batch_size: int = 1024
+) -> Iterator[tuple[list[bytes], list[int]]]:
+    """Yield ``(lines, line_numbers)`` for up to ``batch_size`` non-blank lines at a time."""
+    lines: list[bytes] = []
+    linenos: list[int] = []
+    with open_binary(path) as fh:
+        for lineno, line in enumerate(fh, start=1):
             line = line.strip()
             if not line:
                 continue
-            yield json.loads(line)
+            lines.append(line)
+            linenos.append(lineno)
+            if len(lines) >= batch_size:
+                yield lines, linenos
+                lines, linenos = [], []
+    if lines:
+        yield lines, linenos
 
 
-def write_jsonl(path: Path, rows: Iterable[dict]) -> None:
-    """Write an iterable of objects to JSONL."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as fh:
+def iter_line_chunks(path: Path, chunk_size: int = 1 << 20) -> Iterator[tuple[bytes, int]]:
+    """Yield ``(chunk, first_line_number)`` blocks of whole lines, about ``chunk_size`` bytes each.
+
+    For decoders with their own newline-delimited mode (msgspec's ``decode_lines``).
+    """
+    lineno = 1
+    tail = b""
+    with open_binary(path) as fh:
+        while True:
+            block = fh.read(chunk_size)
+            if not block:
+                break
+            block = tail + block
+            cut = block.rfind(b"\n") + 1
+            if not cut:
+                tail = block
+                continue
+            chunk, tail = block[:cut], block[cut:]
+            yield chunk, lineno
+            lineno += chunk.count(b"\n")
+    if tail.strip():
+        yield tail, lineno
+
+
+def decode_batch(
+    path: Path, lines: list[bytes], linenos: list[int], decode=None, decode_one=None
+) -> list:
+    """Decode JSON lines as one array; on failure, name the first bad line.
+
+    ``decode`` parses the joined array and ``decode_one`` a single line; both
+    default to ``loads``.
+    """
+    decode = decode or loads
+    decode_one = decode_one or loads
+    try:
+        return decode(b"[" + b",".join(lines) + b"]")
+    except ValueError:
+        pass
+    # Decode line by line to report where the bad record is.
+    rows = []
+    for line, lineno in zip(lines, linenos):
+        try:
+            rows.append(decode_one(line))
+        except ValueError as e:
+            raise ValueError(f"{path}:{lineno}: invalid JSON: {e}") from e
+    return rows
+
+
+def iter_jsonl_batches(path: Path, batch_size: int = 1024) -> Iterator[list[dict]]:
+    """Yield lists of up to ``batch_size`` decoded objects, one decoder call per batch."""
+    for lines, linenos in iter_line_batches(path, batch_size):
+        yield decode_batch(path, lines, linenos)
+
+
+def read_jsonl(path: Path) -> Iterator[dict]:
+    """Yield JSON objects from a JSONL file."""
+    for batch in iter_jsonl_batches(path):
+        yield from batch
+
+
+def write_jsonl(path: Path, rows: Iterable[dict]) -> int:
+    """Write an iterable of objects to JSONL; return the number written."""
+    count = 0
+    with open_binary(path, "wb") as fh:
         for row in rows:
-            fh.write(json.dumps(row, ensure_ascii=False) + "\n")
+            fh.write(dumps(row) + b"\n")
+            count += 1
+    return count
+
+
+def temp_path(path: Path) -> Path:
+    """A sibling temp path that keeps ``path``'s suffix (and so its compression)."""
+    return path.with_name(f".tmp-{os.getpid()}-{path.name}")
+
+
+def write_jsonl_atomic(path: Path, rows: Iterable[dict]) -> int:
+    """Like ``write_jsonl`` but via a temp file, so readers never see a partial file."""
+    tmp = temp_path(path)
+    try:
+        count = write_jsonl(tmp, rows)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return count
 
 
 def read_csv_rows(path: Path) -> list[dict]:
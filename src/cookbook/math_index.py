@@ -0,0 +1,229 @@
+"""Math symbols, LaTeX commands and equations per post, as a count table.
+
+The text index build scans each post once with ``scan_math``. A single
+regular expression finds three things in the plain text: ``$$...$$`` and
+``\\[...\\]`` display equations, ``$...$`` and ``\\(...\\)`` inline
+equations, and math symbols. Math symbols are Greek letters, the
+Mathematical Operators block (∞, ∑, √, ≈, ...), blackboard-bold sets and
+a few others. The blog mostly typesets equations as images whose ``alt``
+text is the LaTeX source, so alt texts that look like LaTeX count as
+``image`` equations (see ``scan_equation_images``). LaTeX commands
+(``\\frac``, ``\\sum``) are counted inside equations only, so backslash
+escapes in code listings are not mistaken for them.
+
+The counts go beside the index as ``johndcook_text_index.math.tsv``. Each
+row is post ID, date, kind (``symbol``, ``command`` or ``equation``),
+name and count. ``MathTable`` loads the file as a SciPy CSR post × name
+matrix (a ``cookbook.count_table.CountTable``), like
+``cookbook.entities.EntityMatrix``.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from .count_table import CountTable, _np_sparse, build_counts
+from .token_store import IndexedPost, SideFileWriter, side_path, store_base
+
+MATH_SUFFIX = ".math.tsv"
+KINDS = ("symbol", "command", "equation")
+EQUATION_KINDS = ("image", "display", "inline")
+# Keys of the ``symbols`` field of text index records.
+INDEX_SYMBOLS = {"pi": "π", "phi": "φ", "Phi": "Φ", "infty": "∞"}
+
+_SYMBOLS = (
+    "\u0391-\u03a9\u03b1-\u03c9\u03d1\u03d5\u03f5"  # Greek, with the ϑ ϕ ϵ variants
+    "\u2200-\u2211\u2213-\u22ff"  # Mathematical Operators, except the typographic minus
+    "\u2102\u2115\u211a\u211d\u2124\u2135"  # ℂ ℕ ℚ ℝ ℤ ℵ
+    "±×÷"
+)
+_SCAN = re.compile(
+    r"(?P<display>\$\$[^$]+?\$\$|\\\[.+?\\\])"
+    r"|(?P<inline>\$(?=[^\s$])[^$\n]+?(?<=\S)\$(?!\w)|\\\(.+?\\\))"
+    rf"|(?P<symbol>[{_SYMBOLS}])",
+    re.S,
+)
+_INNER = re.compile(rf"(?P<command>\\[A-Za-z]+)|(?P<symbol>[{_SYMBOLS}])")
+_LATEX_ALT = re.compile(r"\\[A-Za-z]+|[_^]\{|\w\^[\w(]")
+
+
+def _scan_equation(source: str, counts: Counter) -> None:
+    for m in _INNER.finditer(source):
+        counts[m.lastgroup, m.group()] += 1
+
+
+def scan_math(text: str) -> Counter:
+    """``(kind, name) -> count`` for the symbols and equations in ``text``."""
+    counts: Counter = Counter()
+    for m in _SCAN.finditer(text):
+        kind = m.lastgroup
+        if kind == "symbol":
+            counts["symbol", m.group()] += 1
+        else:
+            counts["equation", kind] += 1
+            _scan_equation(m.group(), counts)
+    return counts
+
+
+def scan_equation_images(alts: Iterable[str]) -> Counter:
+    """Count image ``alt`` texts that are LaTeX source as ``image`` equations."""
+    counts: Counter = Counter()
+    for alt in alts:
+        if _LATEX_ALT.search(alt):
+            counts["equation", "image"] += 1
+            _scan_equation(alt, counts)
+    return counts
+
+
+def index_symbols(counts: Counter) -> dict:
+    """The ``symbols`` field of a text index record, from ``scan_math`` counts."""
+    return {key: counts["symbol", symbol] for key, symbol in INDEX_SYMBOLS.items()}
+
+
+class MathWriter(SideFileWriter):
+    """Write math counts beside a text index while it is built."""
+
+    SUFFIX = MATH_SUFFIX
+
+    def add(self, post_id: int, date: str, counts: Counter) -> None:
+        for (kind, name), count in counts.items():
+            if count:
+                self._fh.write(f"{int(post_id)}\t{date}\t{kind}\t{name}\t{count}\n")
+
+    def add_post(self, post: IndexedPost) -> None:
+        counts = post.math + scan_math(post.title) + scan_equation_images(post.page.image_alts)
+        self.add(post.id, post.date, counts)
+
+
+def read_math(path: Path) -> Iterator[tuple[int, str, str, str, int]]:
+    """Yield ``(post_id, date, kind, name, count)`` rows from a ``.math.tsv`` file."""
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            post_id, date, kind, name, count = line.rstrip("\n").split("\t")
+            yield int(post_id), date, kind, name, int(count)
+
+
+class MathTable(CountTable):
+    """Sparse post × ``(kind, name)`` counts; rows are posts with any math."""
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[int, str, str, str, int]]) -> MathTable:
+        """Build from ``(post_id, date, kind, name, count)`` rows; columns in first-seen order."""
+        keyed = ((post_id, date, (kind, name), count) for post_id, date, kind, name, count in rows)
+        return cls(*build_counts(keyed))
+
+    @classmethod
+    def from_texts(cls, posts: Iterable[tuple[int, str, str, Iterable[str]]]) -> MathTable:
+        """Scan ``(post_id, date, text, image_alts)`` directly, for callers without an index."""
+        rows = (
+            (post_id, date, kind, name, count)
+            for post_id, date, text, alts in posts
+            for (kind, name), count in (scan_math(text) + scan_equation_images(alts)).items()
+        )
+        return cls.from_rows(rows)
+
+    @classmethod
+    def load(cls, path: Path) -> MathTable:
+        return cls.from_rows(read_math(path))
+
+    @classmethod
+    def from_index(cls, index_path: Path) -> MathTable:
+        return cls.load(side_path(store_base(index_path), MATH_SUFFIX))
+
+    def names(self, kind: str) -> list[str]:
+        return [name for k, name in self.keys if k == kind]
+
+    def _columns(self, kind: str, names: Optional[Iterable[str]] = None) -> list[int]:
+        if names is None:
+            return [j for j, (k, _) in enumerate(self.keys) if k == kind]
+        return [self.index[kind, name] for name in names if (kind, name) in self.index]
+
+    def totals(self, kind: str) -> Counter:
+        """Total count per name of ``kind``."""
+        np, _ = _np_sparse()
+        columns = self._columns(kind)
+        sums = np.asarray(self.matrix[:, columns].sum(axis=0)).ravel()
+        return Counter({self.keys[j][1]: int(n) for j, n in zip(columns, sums)})
+
+    def post_counts(self, kind: str) -> Counter:
+        """Posts containing each name of ``kind``."""
+        columns = self._columns(kind)
+        nnz = self.matrix[:, columns].getnnz(axis=0)
+        return Counter({self.keys[j][1]: int(n) for j, n in zip(columns, nnz)})
+
+    def posts(self, kind: str, name: Optional[str] = None) -> list[int]:
+        """IDs of the posts with ``name`` (or any name of ``kind``), in index order."""
+        columns = self._columns(kind, None if name is None else [name])
+        rows = self.matrix[:, columns].getnnz(axis=1).nonzero()[0]
+        return self.post_ids[rows].tolist()
+
+    def per_post(self, kind: str) -> Counter:
+        """Total count of ``kind`` per post ID."""
+        np, _ = _np_sparse()
+        sums = np.asarray(self.matrix[:, self._columns(kind)].sum(axis=1)).ravel()
+        return Counter({int(p): int(n) for p, n in zip(self.post_ids, sums) if n})
+
+    def by_year(self, kind: str, names: Iterable[str], years: Iterable[int]):
+        """``len(names) × len(years)`` array of posts containing each name per year."""
+        np, _ = _np_sparse()
+        names, years = list(names), list(years)
+        found = [
+            (i, self.index[kind, name])
+            for i, name in enumerate(names)
+            if (kind, name) in self.index
+        ]
+        counts = np.zeros((len(names), len(years)), dtype=np.int32)
+        if found:
+            rows = [i for i, _ in found]
+            counts[rows] = self.posts_by_year([j for _, j in found], years)
+        return counts
+
+
+def iter_math_facts(table: MathTable, titles: dict[int, str], max_rare: int = 5) -> Iterator[dict]:
+    """Yield equation, LaTeX command and symbol facts; ``post_id`` marks single-post facts."""
+    equations = table.post_counts("equation")
+    equation_posts = table.posts("equation")
+    if equation_posts:
+        kinds = ", ".join(
+            f"{equations[kind]} with {label}"
+            for kind, label in (
+                ("image", "equation images"),
+                ("display", "display LaTeX"),
+                ("inline", "inline LaTeX"),
+            )
+            if equations[kind]
+        )
+        yield {
+            "type": "equation",
+            "fact": f"{len(equation_posts)} posts contain typeset equations ({kinds}).",
+        }
+        post_id, count = table.per_post("equation").most_common(1)[0]
+        yield {
+            "type": "equation",
+            "fact": f"“{titles.get(post_id, post_id)}” has more equations than any other "
+            f"post: {count}.",
+            "post_id": post_id,
+        }
+    commands = table.totals("command")
+    if commands:
+        command, posts = table.post_counts("command").most_common(1)[0]
+        yield {
+            "type": "equation",
+            "fact": f"{command} is the most widely used LaTeX command: {posts} posts, "
+            f"{commands[command]} uses.",
+        }
+    symbols = table.post_counts("symbol")
+    for symbol, posts in symbols.most_common(3):
+        yield {"type": "symbol", "fact": f"The symbol {symbol} appears in {posts} posts."}
+    rare = sorted(symbol for symbol, posts in symbols.items() if posts == 1)
+    for symbol in rare[:max_rare]:
+        (post_id,) = table.posts("symbol", symbol)
+        yield {
+            "type": "symbol",
+            "fact": f"The symbol {symbol} appears in only one post: "
+            f"“{titles.get(post_id, post_id)}”.",
+            "post_id": post_id,
+        }
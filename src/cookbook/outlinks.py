@@ -0,0 +1,134 @@
+"""Outbound links from blog posts as a precomputed table.
+
+The text index build extracts every ``<a href>`` once (see
+``cookbook.html_extract.PostText``) and writes the links that leave the site
+beside the index as ``johndcook_text_index.outlinks.tsv``. There is one row
+per link: post ID, post date, domain and path. Domains are lower-cased
+without a port or a leading ``www.``. Paths drop the query, fragment and
+trailing slash. Links to the blog itself are left to ``cookbook.graph``.
+
+``LinkTable`` loads the rows once and indexes them by domain. Questions
+such as the most-linked Twitter handles, the arXiv links per year or the
+posts that cite OEIS are then grouped lookups on that index, with no new
+pass over the post bodies.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+
+from .graph import SITE_HOSTS
+from .token_store import IndexedPost, SideFileWriter, side_path, store_base
+
+OUTLINKS_SUFFIX = ".outlinks.tsv"
+# First path segments on twitter.com that are site pages, not accounts.
+TWITTER_NON_HANDLES = {"widgets", "hashtag", "share", "intent", "search", "home", "i"}
+
+
+def normalize_href(href: str) -> Optional[tuple[str, str]]:
+    """``(domain, path)`` for an external http(s) link, else ``None``."""
+    try:
+        parts = urlsplit(href.strip())
+        host = parts.hostname
+    except ValueError:
+        return None
+    if parts.scheme not in ("http", "https", "") or not host:
+        return None
+    host = host.removeprefix("www.")
+    if any(host == h or host.endswith("." + h) for h in SITE_HOSTS):
+        return None
+    return host, parts.path.rstrip("/") or "/"
+
+
+class OutlinksWriter(SideFileWriter):
+    """Write each post's external links beside a text index while it is built."""
+
+    SUFFIX = OUTLINKS_SUFFIX
+
+    def add(self, post_id: int, date: str, hrefs: Iterable[str]) -> None:
+        for href in hrefs:
+            link = normalize_href(href)
+            if link is None:
+                continue
+            domain, path = link  # urlsplit strips tabs and newlines
+            self._fh.write(f"{int(post_id)}\t{date}\t{domain}\t{path}\n")
+
+    def add_post(self, post: IndexedPost) -> None:
+        self.add(post.id, post.date, post.page.hrefs)
+
+
+def _head(path: str) -> str:
+    return path.lstrip("/").split("/", 1)[0]
+
+
+@dataclass
+class LinkTable:
+    """Columns of an outlinks file, with row numbers grouped by domain."""
+
+    post_ids: list[int] = field(default_factory=list)
+    dates: list[str] = field(default_factory=list)
+    domains: list[str] = field(default_factory=list)
+    paths: list[str] = field(default_factory=list)
+    by_domain: dict[str, list[int]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> LinkTable:
+        table = cls()
+        with path.open(encoding="utf-8") as fh:
+            for row, line in enumerate(fh):
+                post_id, date, domain, link_path = line.rstrip("\n").split("\t")
+                table.post_ids.append(int(post_id))
+                table.dates.append(date)
+                table.domains.append(domain)
+                table.paths.append(link_path)
+                table.by_domain.setdefault(domain, []).append(row)
+        return table
+
+    @classmethod
+    def from_index(cls, index_path: Path) -> LinkTable:
+        return cls.load(side_path(store_base(index_path), OUTLINKS_SUFFIX))
+
+    def __len__(self) -> int:
+        return len(self.post_ids)
+
+    def rows(self, domain: str) -> list[int]:
+        """Row numbers of links to ``domain`` or any of its subdomains."""
+        domain = domain.lower().removeprefix("www.")
+        suffix = "." + domain
+        matched = [
+            rows for name, rows in self.by_domain.items() if name == domain or name.endswith(suffix)
+        ]
+        return sorted(row for rows in matched for row in rows)
+
+    def domain_counts(self, distinct_posts: bool = False) -> Counter:
+        """Links per domain, or the number of posts linking to each domain."""
+        if not distinct_posts:
+            return Counter({name: len(rows) for name, rows in self.by_domain.items()})
+        return Counter(
+            {name: len({self.post_ids[r] for r in rows}) for name, rows in self.by_domain.items()}
+        )
+
+    def posts(self, domain: str) -> set[int]:
+        """IDs of the posts linking to ``domain``."""
+        return {self.post_ids[r] for r in self.rows(domain)}
+
+    def path_heads(self, domain: str, exclude: Iterable[str] = ()) -> Counter:
+        """Links per first path segment (e.g. the account on twitter.com), case-folded."""
+        skip = set(exclude)
+        heads = (_head(self.paths[r]).lower() for r in self.rows(domain))
+        return Counter(head for head in heads if head and head not in skip)
+
+    def per_year(self, domain: Optional[str] = None) -> Counter:
+        """Links per post year, for one domain or for all external links."""
+        rows = self.rows(domain) if domain else range(len(self))
+        return Counter(self.dates[r][:4] for r in rows if self.dates[r][:4].isdigit())
+
+    def twitter_handles(self) -> Counter:
+        """Links per Twitter account, across twitter.com and x.com."""
+        return self.path_heads("twitter.com", TWITTER_NON_HANDLES) + self.path_heads(
+            "x.com", TWITTER_NON_HANDLES
+        )
@@ -0,0 +1,155 @@
+"""A small file-based DAG runner with input hashing.
+
+Each ``Stage`` declares the files it reads and writes. A stage depends on
+whichever stages produce its inputs, and stages whose dependencies are done
+run concurrently in a thread pool. Before running a stage, the runner hashes
+its inputs (plus a ``params`` string). If that key and the output hashes
+match the state file from the last successful run, the stage is skipped.
+``volatile`` stages, such as network fetches, always run. Their outputs are
+hashed like any others, so unchanged downloads still let the downstream
+stages skip.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+_BROKEN = ("failed", "blocked")
+
+
+@dataclass(slots=True)
+class Stage:
+    name: str
+    run: Callable[[], object]
+    inputs: list[Path] = field(default_factory=list)
+    outputs: list[Path] = field(default_factory=list)
+    params: str = ""
+    volatile: bool = False
+
+
+@dataclass(slots=True)
+class StageResult:
+    name: str
+    status: str  # "ran", "skipped", "failed" or "blocked"
+    seconds: float = 0.0
+    detail: str = ""
+
+
+def file_digest(path: Path) -> str | None:
+    if not path.exists():
+        return None
+    hasher = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class Pipeline:
+    def __init__(self, stages: Iterable[Stage], state_path: Path) -> None:
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_path = state_path
+        self.wall_seconds = 0.0
+        producers = {out: stage.name for stage in self.stages.values() for out in stage.outputs}
+        self.deps = {
+            stage.name: sorted({producers[p] for p in stage.inputs if p in producers} - {stage.name})
+            for stage in self.stages.values()
+        }
+
+    def _load_state(self) -> dict:
+        if not self.state_path.exists():
+            return {}
+        return json.loads(self.state_path.read_text(encoding="utf-8"))
+
+    def _save_state(self, state: dict) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.state_path.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
+
+    def _key(self, stage: Stage) -> str:
+        hasher = hashlib.sha256(stage.params.encode("utf-8"))
+        for path in stage.inputs:
+            hasher.update(f"{path}={file_digest(path)}\n".encode("utf-8"))
+        return hasher.hexdigest()
+
+    def _up_to_date(self, stage: Stage, key: str, saved: dict | None) -> bool:
+        if stage.volatile or saved is None or saved.get("key") != key:
+            return False
+        outputs = saved.get("outputs", {})
+        for path in stage.outputs:
+            digest = file_digest(path)
+            if digest is None or outputs.get(str(path)) != digest:
+                return False
+        return True
+
+    def _execute(
+        self, stage: Stage, saved: dict | None, force: bool
+    ) -> tuple[StageResult, dict | None]:
+        start = time.perf_counter()
+        key = self._key(stage)
+        if not force and self._up_to_date(stage, key, saved):
+            elapsed = time.perf_counter() - start
+            return StageResult(stage.name, "skipped", elapsed, "inputs unchanged"), saved
+        stage.run()
+        outputs = {str(p): file_digest(p) for p in stage.outputs}
+        changed = saved is None or saved.get("outputs") != outputs
+        detail = "outputs changed" if changed else "outputs unchanged"
+        return StageResult(stage.name, "ran", time.perf_counter() - start, detail), {
+            "key": key,
+            "outputs": outputs,
+        }
+
+    def run(self, force: bool = False, max_workers: int = 4) -> list[StageResult]:
+        """Run every stage in dependency order; returns one result per stage."""
+        started = time.perf_counter()
+        state = self._load_state()
+        results: dict[str, StageResult] = {}
+        pending = dict(self.stages)
+        running: dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while pending or running:
+                progressed = True
+                while progressed:
+                    progressed = False
+                    for name in list(pending):
+                        deps = self.deps[name]
+                        if any(results.get(d) and results[d].status in _BROKEN for d in deps):
+                            results[name] = StageResult(name, "blocked", detail="dependency failed")
+                            del pending[name]
+                            progressed = True
+                        elif all(d in results for d in deps):
+                            stage = pending.pop(name)
+                            running[pool.submit(self._execute, stage, state.get(name), force)] = name
+                if not running:
+                    if pending:
+                        raise ValueError(f"Stages form a cycle: {', '.join(sorted(pending))}")
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        result, entry = future.result()
+                    except Exception as e:  # noqa: BLE001 - reported in the table
+                        results[name] = StageResult(name, "failed", detail=f"{type(e).__name__}: {e}")
+                        continue
+                    results[name] = result
+                    if entry is not None:
+                        state[name] = entry
+                        self._save_state(state)
+        self.wall_seconds = time.perf_counter() - started
+        return [results[name] for name in self.stages]
+
+
+def format_table(results: list[StageResult], wall_seconds: float | None = None) -> str:
+    width = max([len("stage")] + [len(r.name) for r in results])
+    lines = [f"{'stage':<{width}}  {'status':<8} {'seconds':>8}  detail"]
+    for r in results:
+        lines.append(f"{r.name:<{width}}  {r.status:<8} {r.seconds:8.2f}  {r.detail}")
+    total = sum(r.seconds for r in results) if wall_seconds is None else wall_seconds
+    lines.append(f"{'total':<{width}}  {'':<8} {total:8.2f}  wall clock")
+    return "\n".join(lines)
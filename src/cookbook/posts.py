@@ -0,0 +1,156 @@
+"""Typed loading of post JSONL into ``cookbook.models.Post``.
+
+With msgspec installed, the file is read in blocks of whole lines and each
+block is decoded by ``decode_lines`` straight into a struct that declares
+only the fields ``Post`` needs. ``content`` and the other large fields are
+skipped by the decoder, so no per-post dicts are built. Without msgspec,
+batches come from ``cookbook.io`` as dicts and are mapped field by field.
+Dates are parsed once per batch, after decoding, and posts without a
+parseable date are skipped and counted in ``LoadStats``.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+from . import io
+from .models import Post
+
+# Field order shared by both decoders; ``category_names``/``tag_names`` fill
+# ``Post.categories``/``Post.tags``.
+FIELDS = ("id", "title", "link", "date", "word_count", "category_names", "tag_names", "slug")
+
+
+@dataclass(slots=True)
+class LoadStats:
+    records: int = 0
+    skipped: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+    decoder: str = ""
+
+    def __str__(self) -> str:
+        seconds = self.seconds or float("nan")
+        return (
+            f"{self.records} posts ({self.skipped} skipped, {self.bytes / 1e6:.1f} MB) "
+            f"in {self.seconds * 1000:.1f} ms via {self.decoder}: "
+            f"{self.records / seconds:,.0f} posts/s, {self.bytes / 1e6 / seconds:.0f} MB/s"
+        )
+
+
+def parse_dates(values: Sequence[Optional[str]]) -> list[Optional[datetime]]:
+    """Parse ISO dates as naive UTC; empty or malformed values become ``None``.
+
+    A ``Z`` suffix or UTC offset is converted away, so the results always
+    compare with each other whatever the Python version.
+    """
+    parsed: list[Optional[datetime]] = []
+    for value in values:
+        try:
+            date = datetime.fromisoformat(str(value or "").removesuffix("Z"))
+        except ValueError:
+            parsed.append(None)
+            continue
+        if date.tzinfo is not None:
+            date = date.astimezone(timezone.utc).replace(tzinfo=None)
+        parsed.append(date)
+    return parsed
+
+
+def msgspec_available() -> bool:
+    try:
+        import msgspec  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _record_type(include_content: bool):
+    import msgspec
+
+    fields = [
+        ("id", int),
+        ("title", Optional[str], None),
+        ("link", Optional[str], None),
+        ("date", Optional[str], None),
+        ("word_count", Optional[int], None),
+        ("category_names", Optional[list[str]], None),
+        ("tag_names", Optional[list[str]], None),
+        ("slug", Optional[str], None),
+    ]
+    if include_content:
+        fields.append(("content", Optional[str], None))
+    return msgspec.defstruct("PostRecord", fields)
+
+
+def _rows_msgspec(path: Path, include_content: bool) -> Iterator[list[tuple]]:
+    import msgspec
+
+    # Lax like the dict path: numeric strings such as "id": "12" decode as ints.
+    decoder = msgspec.json.Decoder(_record_type(include_content), strict=False)
+    astuple = msgspec.structs.astuple
+    for chunk, first_line in io.iter_line_chunks(path):
+        try:
+            records = decoder.decode_lines(chunk)
+        except msgspec.DecodeError:
+            # Decode line by line to report where the bad record is.
+            records = []
+            for lineno, line in enumerate(chunk.split(b"\n"), start=first_line):
+                if not line.strip():
+                    continue
+                try:
+                    records.append(decoder.decode(line))
+                except msgspec.DecodeError as e:
+                    raise ValueError(f"{path}:{lineno}: invalid post record: {e}") from e
+        yield [astuple(r) for r in records]
+
+
+def _rows_dicts(path: Path, include_content: bool) -> Iterator[list[tuple]]:
+    keys = FIELDS + (("content",) if include_content else ())
+    for batch in io.iter_jsonl_batches(path):
+        yield [tuple(obj.get(key) for key in keys) for obj in batch]
+
+
+def iter_posts(
+    path: Path, include_content: bool = False, stats: LoadStats | None = None
+) -> Iterator[Post]:
+    """Yield a ``Post`` per JSONL record with a valid date, in file order."""
+    stats = stats if stats is not None else LoadStats()
+    use_msgspec = msgspec_available()
+    stats.decoder = "msgspec structs" if use_msgspec else f"{io.JSON_BACKEND} dicts"
+    stats.bytes += path.stat().st_size
+    batches = (_rows_msgspec if use_msgspec else _rows_dicts)(path, include_content)
+    start = time.perf_counter()
+    for rows in batches:
+        dates = parse_dates([r[3] for r in rows])
+        posts = [
+            Post(
+                int(r[0]),
+                (r[1] or "").strip(),
+                r[2] or "",
+                date,
+                int(r[4] or 0),
+                r[5] or [],
+                r[6] or [],
+                r[7] or "",
+                r[8] if include_content else None,
+            )
+            for r, date in zip(rows, dates)
+            if date is not None
+        ]
+        stats.records += len(posts)
+        stats.skipped += len(rows) - len(posts)
+        stats.seconds += time.perf_counter() - start
+        yield from posts
+        start = time.perf_counter()
+
+
+def load_posts(
+    path: Path, include_content: bool = False, stats: LoadStats | None = None
+) -> list[Post]:
+    """Read every post in ``path``; see ``iter_posts``."""
+    return list(iter_posts(path, include_content=include_content, stats=stats))
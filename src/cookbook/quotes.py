@@ -0,0 +1,233 @@
+"""Quotable sentences mined from the posts, for quote cards and the bot.
+
+``split_sentences`` segments ``plain_text`` with one boundary regex. It
+treats each line as its own paragraph, and it does not split after common
+abbreviations (``e.g.``, ``Dr.``, ``Mt.``) or single initials
+(``John D. Cook``). ``iter_candidates`` keeps sentences inside a length
+window that end like sentences and stand on their own. It skips sentences
+that open by pointing back (``This``, ``But``, ``So``) and sentences that
+contain URLs or code. It needs a single pass over the index records.
+
+``rank`` scores all candidates at once. ``feature_matrix`` turns each
+sentence into a row of counts and flags: first person, aphoristic
+structure (general claims, always/never, "not ... but", "the more ... the
+more", imperatives, generic "you"), and what makes a sentence a poor quote
+out of context (digits, proper nouns, references to "this post" or "the
+code below", attributions of someone else's words). The score is that
+matrix times ``WEIGHTS`` plus a preference for about 18 words.
+Near-identical sentences (same words, case and punctuation aside) are kept
+once, and each post contributes at most ``per_post`` quotes.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+MIN_WORDS = 8
+MAX_WORDS = 35
+MAX_CHARS = 200  # leaves room for attribution and a link in a tweet
+IDEAL_WORDS = 18
+
+_ABBREVIATIONS = frozenset(
+    "al approx cf dr eg etc fig ie jr mr mrs ms mt no prof sr st vol vs".split()
+)
+_BOUNDARY = re.compile(r"[.!?]+[\"'”’)\]]*(?=\s+[\"“‘(\[]?[A-Z0-9])")
+_END = re.compile(r"[.!?][\"'”’)]*$")
+_START = re.compile(r"^[\"“‘]?[A-Z]")
+_BACK_REFERENCE = re.compile(
+    r"^[\"“‘]?(This|That|These|Those|It|Its|Here|There|So|But|And|Or|Also|Then|Now|See|"
+    r"Thanks|Update|Note|Yes|No|Which|Such|Similarly|However|Therefore|Hence|Thus)\b"
+)
+# URLs, code, and the double spaces or " ." left where the index dropped link markup.
+_UNQUOTABLE = re.compile(r"https?://|www\.|[{}<>=$_\\|#;@]|\.\w+\(|\S\s{2,}\S|\s[.,;:!?]")
+
+FEATURES = (
+    "first_person",
+    "general_claim",
+    "always_never",
+    "contrast",
+    "comparison",
+    "imperative",
+    "generic_you",
+    "question",
+    "digits",
+    "brackets",
+    "colon",
+    "proper_nouns",
+    "post_reference",
+    "attribution",
+)
+WEIGHTS = {
+    "first_person": 1.0,
+    "general_claim": 1.5,
+    "always_never": 1.0,
+    "contrast": 1.5,
+    "comparison": 1.0,
+    "imperative": 1.0,
+    "generic_you": 0.75,
+    "question": -0.5,
+    "digits": -1.0,
+    "brackets": -1.0,
+    "colon": -0.75,
+    "proper_nouns": -4.0,
+    "post_reference": -2.5,
+    "attribution": -2.0,
+}
+_PATTERNS = {
+    "first_person": re.compile(r"\b(I|I'm|I’m|I've|I’ve|I'd|I’d|my|me|myself)\b"),
+    "general_claim": re.compile(
+        r"^[\"“]?(The|A|An|Every|Most|Many|Some|No|All|Good|Bad|Nobody|Everyone|People)\b"
+        r".*\b(is|are|isn't|aren't|isn’t|aren’t|can|can't|can’t|will|won't|won’t)\b"
+    ),
+    "always_never": re.compile(
+        r"\b(always|never|often|rarely|seldom|usually|nothing|everything)\b", re.I
+    ),
+    "contrast": re.compile(
+        r"\b(not|isn't|isn’t|aren't|aren’t|doesn't|doesn’t|don't|don’t)\b[^.;]*\bbut\b"
+        r"|\b(rather than|instead of|the opposite)\b",
+        re.I,
+    ),
+    "comparison": re.compile(
+        r"\bthe (more|less|better|worse|harder|easier)\b"
+        r".*\bthe (more|less|better|worse|harder|easier)\b"
+        r"|\b(more|less|better|worse|harder|easier) than\b",
+        re.I,
+    ),
+    "imperative": re.compile(r"^[\"“]?(Don't|Don’t|Never|Always|Beware|Avoid|Keep|Make|Be)\b"),
+    "generic_you": re.compile(
+        r"\byou (can|can't|can’t|should|need|have to|don't|don’t|might|may)\b", re.I
+    ),
+    "question": re.compile(r"\?[\"'”’)]*$"),
+    "digits": re.compile(r"\d"),
+    "brackets": re.compile(r"[()\[\]]"),
+    "colon": re.compile(r":"),
+    "post_reference": re.compile(
+        r"\b(this post|the post|previous post|next post|blog|below|above|following|"
+        r"here|here's|here’s|"
+        r"click|link|figure|table|code|example|script|download|email|comment)\b",
+        re.I,
+    ),
+    "attribution": re.compile(r"\b(said|says|wrote|writes|according to|quoted?|quotes)\b", re.I),
+}
+_CAPITALIZED = re.compile(r"(?<![.!?:]\s)(?<!^)(?<![\"“‘(])\b[A-Z][a-z]+")
+
+
+def _np():
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError(
+            "NumPy is required to rank quotes. Install with: pip install -e .[analysis]"
+        ) from e
+    return np
+
+
+def split_sentences(text: str) -> Iterator[str]:
+    """Sentences of ``text``; each line is a separate paragraph."""
+    for paragraph in text.splitlines():
+        start = 0
+        for m in _BOUNDARY.finditer(paragraph):
+            before = paragraph[start : m.start()].rsplit(None, 1)
+            word = before[-1].lstrip('"“‘(').replace(".", "").lower() if before else ""
+            if word in _ABBREVIATIONS or (len(word) == 1 and word.isalpha()):
+                continue
+            sentence = paragraph[start : m.end()].strip()
+            if sentence:
+                yield sentence
+            start = m.end()
+        rest = paragraph[start:].strip()
+        if rest:
+            yield rest
+
+
+@dataclass(slots=True)
+class Quote:
+    post_id: int
+    date: str
+    text: str
+    words: int
+    score: float = 0.0
+
+
+def is_candidate(sentence: str) -> bool:
+    """Within the length window, a complete sentence, and readable on its own."""
+    n = len(sentence.split())
+    return (
+        MIN_WORDS <= n <= MAX_WORDS
+        and len(sentence) <= MAX_CHARS
+        and bool(_START.match(sentence))
+        and bool(_END.search(sentence))
+        and not _BACK_REFERENCE.match(sentence)
+        and not _UNQUOTABLE.search(sentence)
+    )
+
+
+def iter_candidates(records: Iterable[dict]) -> Iterator[Quote]:
+    """Candidate sentences from text index records (``id``, ``date``, ``plain_text``)."""
+    for rec in records:
+        text = rec.get("plain_text") or ""
+        for sentence in split_sentences(text):
+            if is_candidate(sentence):
+                date = str(rec.get("date") or "")[:10]
+                yield Quote(int(rec["id"]), date, sentence, len(sentence.split()))
+
+
+def feature_matrix(sentences: list[str]):
+    """``len(sentences) × len(FEATURES)`` float array of feature counts and flags."""
+    np = _np()
+    matrix = np.zeros((len(sentences), len(FEATURES)))
+    for j, name in enumerate(FEATURES):
+        if name == "proper_nouns":
+            # Share of capitalized words past the first; names tie a sentence to its context.
+            matrix[:, j] = [
+                len(_CAPITALIZED.findall(s)) / max(len(s.split()) - 1, 1) for s in sentences
+            ]
+        else:
+            pattern = _PATTERNS[name]
+            matrix[:, j] = [bool(pattern.search(s)) for s in sentences]
+    return matrix
+
+
+def _key(text: str) -> str:
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+def rank(quotes: Iterable[Quote], per_post: Optional[int] = 2) -> list[Quote]:
+    """Score ``quotes``, best first, without repeats and with at most ``per_post`` per post."""
+    np = _np()
+    quotes = list(quotes)
+    if not quotes:
+        return []
+    weights = np.array([WEIGHTS[name] for name in FEATURES])
+    words = np.array([q.words for q in quotes], dtype=np.float64)
+    scores = feature_matrix([q.text for q in quotes]) @ weights
+    scores -= np.abs(words - IDEAL_WORDS) / IDEAL_WORDS
+    ranked: list[Quote] = []
+    seen: set[str] = set()
+    per: dict[int, int] = {}
+    for i in np.argsort(-scores, kind="stable"):
+        quote = quotes[i]
+        key = _key(quote.text)
+        if key in seen or (per_post is not None and per.get(quote.post_id, 0) >= per_post):
+            continue
+        seen.add(key)
+        per[quote.post_id] = per.get(quote.post_id, 0) + 1
+        quote.score = round(float(scores[i]), 4)
+        ranked.append(quote)
+    return ranked
+
+
+def mine_index(index_path: Path, per_post: Optional[int] = 2) -> list[Quote]:
+    """Ranked quotes from a text index JSONL, in one pass over its records."""
+    from . import io
+
+    return rank(iter_candidates(io.read_jsonl(index_path)), per_post)
+
+
+def quote_fact(quote: Quote, title: str) -> str:
+    """Bot/calendar text for a quote: the sentence, attributed to its post."""
+    year = f" ({quote.date[:4]})" if quote.date[:4].isdigit() else ""
+    return f"“{quote.text}” — from “{title}”{year}" if title else f"“{quote.text}”{year}"
@@ -0,0 +1,240 @@
+"""Join the SQL dump, REST API and HTML mirror post sources and report drift.
+
+Every record is reduced to a ``SourcePost``: post ID, slug, normalized URL,
+normalized title, word count and a hash of its normalized text. Markup,
+entities, case, typographic quotes and whitespace are folded first, so the
+HTML-bodied SQL/API records compare with the mirror's extracted text. Posts
+are joined in one pass with one hash index over their keys: ``p:<id>``, the
+slug, the post key of the URL (``cookbook.graph.link_key``, so ``?p=<id>``
+GUIDs and dated or bare permalinks agree) and the normalized URL. A record
+joins the first group that shares any key with it, then registers its own.
+Mirror slugs such as ``2008/01/05/foo`` are reduced to their last segment.
+A second record from the same source for one post (the mirror keeps
+``index.html?p=<id>`` copies of pages) is counted as a duplicate.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import html
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from . import io
+from .graph import link_key
+
+SOURCES = ("sql", "api", "html")
+ISSUES = ("missing", "duplicate", "content", "word_count", "title")
+REPORT_FIELDS = ["key", "id", "issue", "sources", "detail"]
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WORD_RE = re.compile(r"\w+")
+_TYPOGRAPHY = str.maketrans({"‘": "'", "’": "'", "“": '"', "”": '"', "–": "-", "—": "-"})
+
+
+def normalize_text(text: Optional[str]) -> list[str]:
+    """Lower-cased word tokens of ``text`` with markup and entities removed."""
+    if not text:
+        return []
+    plain = html.unescape(_TAG_RE.sub(" ", text)).translate(_TYPOGRAPHY)
+    return _WORD_RE.findall(plain.casefold())
+
+
+def text_hash(words: list[str]) -> str:
+    return hashlib.blake2b(" ".join(words).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def normalize_url(url: Optional[str]) -> tuple[Optional[str], Optional[int]]:
+    """``(host/path, post ID)`` for ``url``; the ID comes from a ``?p=`` query."""
+    if not url:
+        return None, None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    post_id = parse_qs(parts.query).get("p", [""])[0]
+    if post_id.isdigit():
+        return None, int(post_id)
+    return f"{host}{parts.path.rstrip('/')}", None
+
+
+@dataclass(slots=True)
+class SourcePost:
+    source: str
+    id: Optional[int]
+    slug: Optional[str]
+    url: Optional[str]
+    title: str
+    words: int
+    text_hash: str
+    keys: tuple[str, ...] = ()
+
+
+def post_keys(post_id: Optional[int], slug: Optional[str], url: Optional[str]) -> tuple[str, ...]:
+    """Join keys of a record: ``p:<id>``, slug, the URL's post key and the URL itself."""
+    keys = []
+    if post_id is not None:
+        keys.append(f"p:{post_id}")
+    if slug:
+        keys.append(slug)
+    own = link_key(url) if url else None
+    if own:
+        keys.append(own)
+    normalized, _ = normalize_url(url)
+    if normalized:
+        keys.append(f"url:{normalized}")
+    return tuple(dict.fromkeys(keys))
+
+
+def source_post(source: str, record: dict) -> SourcePost:
+    """Reduce a record from any of the three sources to comparable keys."""
+    url_field = {"sql": "guid", "api": "link", "html": "canonical_url"}[source]
+    raw_url = record.get(url_field)
+    url, url_id = normalize_url(raw_url)
+    raw_id = record.get("id")
+    post_id = int(raw_id) if raw_id not in (None, "") else url_id
+    slug = (record.get("slug") or "").strip("/").rsplit("/", 1)[-1] or None
+    words = normalize_text(record.get("content"))
+    return SourcePost(
+        source=source,
+        id=post_id,
+        slug=slug,
+        url=url,
+        title=" ".join(normalize_text(record.get("title"))),
+        words=len(words),
+        text_hash=text_hash(words),
+        keys=post_keys(post_id, slug, raw_url),
+    )
+
+
+def load_source(source: str, path: Path) -> Iterator[SourcePost]:
+    for record in io.read_jsonl(path):
+        yield source_post(source, record)
+
+
+@dataclass(slots=True)
+class PostGroup:
+    """One post as seen by each source that has it."""
+
+    members: dict[str, SourcePost] = field(default_factory=dict)
+    duplicates: Counter = field(default_factory=Counter)
+
+    @property
+    def key(self) -> str:
+        first = next(iter(self.members.values()))
+        return first.slug or first.url or str(first.id)
+
+    @property
+    def id(self) -> Optional[int]:
+        return next((m.id for m in self.members.values() if m.id is not None), None)
+
+
+def join(posts: Iterable[SourcePost]) -> list[PostGroup]:
+    """Group posts from all sources in a single pass over hash indexes."""
+    groups: list[PostGroup] = []
+    by_key: dict[str, PostGroup] = {}
+    for post in posts:
+        group = next((by_key[k] for k in post.keys if k in by_key), None)
+        if group is None:
+            group = PostGroup()
+            groups.append(group)
+        if post.source in group.members:
+            group.duplicates[post.source] += 1
+        else:
+            group.members[post.source] = post
+        for key in post.keys:
+            by_key.setdefault(key, group)
+    return groups
+
+
+@dataclass(slots=True)
+class Issue:
+    key: str
+    id: Optional[int]
+    issue: str  # one of ISSUES
+    sources: str
+    detail: str
+
+    def row(self) -> dict:
+        return {
+            "key": self.key,
+            "id": "" if self.id is None else self.id,
+            "issue": self.issue,
+            "sources": self.sources,
+            "detail": self.detail,
+        }
+
+
+def _split(members: dict[str, SourcePost], value) -> str:
+    by_value: dict[object, list[str]] = {}
+    for name, post in members.items():
+        by_value.setdefault(value(post), []).append(name)
+    return " vs ".join("+".join(names) for names in by_value.values())
+
+
+def check_group(
+    group: PostGroup, sources: Iterable[str], tolerance: float = 0.1, min_words: int = 5
+) -> Iterator[Issue]:
+    """Yield the issues for one joined post."""
+    members = group.members
+    present = "+".join(members)
+    missing = [s for s in sources if s not in members]
+    if missing:
+        yield Issue(group.key, group.id, "missing", present, "not in " + ", ".join(missing))
+    if group.duplicates:
+        detail = ", ".join(f"{name} x{n + 1}" for name, n in group.duplicates.items())
+        yield Issue(group.key, group.id, "duplicate", present, detail)
+    if len(members) < 2:
+        return
+    if len({m.text_hash for m in members.values()}) > 1:
+        yield Issue(group.key, group.id, "content", present, _split(members, lambda m: m.text_hash))
+    counts = {name: m.words for name, m in members.items()}
+    low, high = min(counts.values()), max(counts.values())
+    if high - low >= min_words and high - low > tolerance * high:
+        detail = ", ".join(f"{name} {words}" for name, words in counts.items())
+        yield Issue(group.key, group.id, "word_count", present, detail)
+    if len({m.title for m in members.values()}) > 1:
+        detail = " | ".join(f"{name}: {m.title}" for name, m in members.items())
+        yield Issue(group.key, group.id, "title", present, detail)
+
+
+@dataclass(slots=True)
+class Reconciliation:
+    sources: list[str]
+    groups: list[PostGroup]
+    issues: list[Issue]
+
+    def coverage(self) -> Counter:
+        """Number of posts per combination of sources, e.g. ``{"sql+api": 690}``."""
+        return Counter("+".join(g.members) for g in self.groups)
+
+    def summary(self) -> str:
+        lines = [f"{len(self.groups)} posts across {', '.join(self.sources)}"]
+        for combo, count in self.coverage().most_common():
+            lines.append(f"  {combo:<14} {count:>6}")
+        issue_counts = Counter(issue.issue for issue in self.issues)
+        for name in ISSUES:
+            lines.append(f"{name:<16} {issue_counts[name]:>6}")
+        return "\n".join(lines)
+
+
+def reconcile(paths: dict[str, Path], tolerance: float = 0.1, min_words: int = 5) -> Reconciliation:
+    """Load each source (``{"sql": path, ...}``), join them and collect issues."""
+    sources = [s for s in SOURCES if s in paths]
+
+    def posts() -> Iterator[SourcePost]:
+        for source in sources:
+            yield from load_source(source, paths[source])
+
+    groups = join(posts())
+    issues = [
+        issue for group in groups for issue in check_group(group, sources, tolerance, min_words)
+    ]
+    return Reconciliation(sources, groups, issues)
+
+
+def write_report(path: Path, result: Reconciliation) -> int:
+    io.write_csv_rows(path, REPORT_FIELDS, (issue.row() for issue in result.issues))
+    return len(result.issues)
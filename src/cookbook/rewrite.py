@@ -0,0 +1,254 @@
+"""Compiled regex rewrite rules for trimming fact text.
+
+Rules live in a CSV (``data/rewrite/trim_rules.csv``) with columns
+``group,pattern,replacement``. Rules in the same group are compiled into a
+single alternation, so a fact is scanned once per group instead of once per
+rule; groups run in file order, which lets later groups (e.g. the ``dots``
+cleanup) see the output of earlier ones. Within a group, earlier rules win
+where several could match at the same position.
+
+When every pattern in a group starts with the same literal text (``—`` for
+the em-dash rules, ``. `` for the sentence-final ones) the prefix is factored
+out and used as a cheap ``in`` check before the regex runs at all.
+"""
+
+from __future__ import annotations
+
+import difflib
+import json
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from . import io
+
+_META = set(".^$*+?{}[]|()\\")
+
+
+@dataclass(slots=True)
+class Rule:
+    group: str
+    pattern: str
+    replacement: str = "."
+
+
+def load_rules(path: Path) -> list[Rule]:
+    """Read rules from a ``group,pattern,replacement`` CSV, skipping blank patterns."""
+    rules = []
+    for row in io.read_csv_rows(path):
+        pattern = row.get("pattern") or ""
+        if not pattern:
+            continue
+        replacement = row.get("replacement")
+        if replacement is None:
+            replacement = "."
+        rules.append(Rule(row.get("group") or "default", pattern, replacement))
+    return rules
+
+
+def _literal_prefix(patterns: list[str]) -> str:
+    """Longest shared prefix of ``patterns`` that is plain literal regex text."""
+    if not patterns:
+        return ""
+    shared = patterns[0]
+    for pattern in patterns[1:]:
+        while not pattern.startswith(shared):
+            shared = shared[:-1]
+    end, i = 0, 0
+    while i < len(shared):
+        ch = shared[i]
+        if ch == "\\":
+            if i + 1 >= len(shared) or shared[i + 1].isalnum():
+                break
+            i += 2
+        elif ch in _META:
+            break
+        else:
+            i += 1
+        # A quantifier applies to the preceding atom, so it cannot be split off.
+        if i < len(shared) and shared[i] in "*+?{":
+            break
+        end = i
+    return shared[:end]
+
+
+def _unescape(literal: str) -> str:
+    return re.sub(r"\\(.)", r"\1", literal)
+
+
+class _Group:
+    def __init__(self, name: str, rules: list[Rule], first_index: int) -> None:
+        self.name = name
+        self.rules = rules
+        prefix = _literal_prefix([r.pattern for r in rules])
+        self.literal = _unescape(prefix)
+        self.keys = [f"r{first_index + i}" for i in range(len(rules))]
+        body = "|".join(
+            f"(?P<{key}>{rule.pattern[len(prefix):]})" for key, rule in zip(self.keys, rules)
+        )
+        self.regex = re.compile(f"{prefix}(?:{body})")
+        self.replacements = {key: rule.replacement for key, rule in zip(self.keys, rules)}
+
+
+@dataclass(slots=True)
+class RewriteStats:
+    """Hit counts per rule and wall time per group across all rewritten texts."""
+
+    hits: Counter = field(default_factory=Counter)
+    seconds: Counter = field(default_factory=Counter)
+    texts: int = 0
+    changed: int = 0
+
+
+class RewriteEngine:
+    """Apply grouped rewrite rules, tracking which rules fire."""
+
+    def __init__(self, rules: Iterable[Rule]) -> None:
+        self.rules = list(rules)
+        by_group: dict[str, list[Rule]] = {}
+        for rule in self.rules:
+            by_group.setdefault(rule.group, []).append(rule)
+        self.groups: list[_Group] = []
+        offset = 0
+        for name, members in by_group.items():
+            self.groups.append(_Group(name, members, offset))
+            offset += len(members)
+        self._rule_by_key = {f"r{i}": rule for i, rule in enumerate(self.rules)}
+        self.stats = RewriteStats()
+
+    @classmethod
+    def from_file(cls, path: Path) -> RewriteEngine:
+        return cls(load_rules(path))
+
+    def rewrite(self, text: str) -> str:
+        """Return ``text`` with every group applied in order, then stripped."""
+        hits = self.stats.hits
+        seconds = self.stats.seconds
+        original = text
+        for group in self.groups:
+            if group.literal and group.literal not in text:
+                continue
+            replacements = group.replacements
+
+            def substitute(match: re.Match) -> str:
+                key = match.lastgroup
+                hits[key] += 1
+                return replacements[key]
+
+            start = time.perf_counter()
+            text = group.regex.sub(substitute, text)
+            seconds[group.name] += time.perf_counter() - start
+        text = text.strip()
+        self.stats.texts += 1
+        if text != original:
+            self.stats.changed += 1
+        return text
+
+    def rewrite_many(self, texts: Iterable[str]) -> Iterator[str]:
+        for text in texts:
+            yield self.rewrite(text)
+
+    def rule_hits(self) -> list[tuple[Rule, int]]:
+        """Rules with their hit counts, most frequent first (rules that never fired last)."""
+        hits = self.stats.hits
+        ranked = [(self._rule_by_key[f"r{i}"], hits[f"r{i}"]) for i in range(len(self.rules))]
+        return sorted(ranked, key=lambda item: -item[1])
+
+    def report(self, top: int | None = None) -> list[str]:
+        """Human-readable summary lines: totals, per-group timings, per-rule hits."""
+        stats = self.stats
+        lines = [f"{stats.changed} of {stats.texts} texts changed by {len(self.rules)} rules"]
+        for group in self.groups:
+            group_hits = sum(stats.hits[key] for key in group.keys)
+            lines.append(
+                f"  group {group.name}: {len(group.rules)} rules, {group_hits} hits, "
+                f"{stats.seconds[group.name] * 1000:.2f} ms"
+            )
+        fired = [(rule, n) for rule, n in self.rule_hits() if n]
+        for rule, n in fired[:top] if top else fired:
+            lines.append(f"  {n:5d}  [{rule.group}] {rule.pattern}")
+        unused = len(self.rules) - len(fired)
+        if unused:
+            lines.append(f"  {unused} rules never matched")
+        return lines
+
+    def profile(self, texts: list[str]) -> list[tuple[Rule, float]]:
+        """Time each rule on its own over ``texts`` (seconds), slowest first."""
+        timings = []
+        for rule in self.rules:
+            regex = re.compile(rule.pattern)
+            start = time.perf_counter()
+            for text in texts:
+                regex.search(text)
+            timings.append((rule, time.perf_counter() - start))
+        return sorted(timings, key=lambda item: -item[1])
+
+
+def format_diff(label: str, before: str, after: str) -> str:
+    """A compact word-level diff: removed text in ``[-…-]``, added in ``{+…+}``."""
+    a, b = before.split(" "), after.split(" ")
+    parts = []
+    for op, i1, i2, j1, j2 in difflib.SequenceMatcher(a=a, b=b, autojunk=False).get_opcodes():
+        if op == "equal":
+            parts.append(" ".join(a[i1:i2]))
+            continue
+        if i2 > i1:
+            parts.append("[-" + " ".join(a[i1:i2]) + "-]")
+        if j2 > j1:
+            parts.append("{+" + " ".join(b[j1:j2]) + "+}")
+    return f"{label}: " + " ".join(parts)
+
+
+@dataclass(slots=True)
+class Change:
+    label: str
+    before: str
+    after: str
+
+
+def rewrite_records(engine: RewriteEngine, records: list[dict], column: str) -> list[Change]:
+    """Rewrite ``record[column]`` in place for every record; return what changed."""
+    changes = []
+    for index, record in enumerate(records, start=1):
+        before = record.get(column)
+        if not isinstance(before, str):
+            continue
+        after = engine.rewrite(before)
+        if after != before:
+            record[column] = after
+            changes.append(Change(str(record.get("id") or index), before, after))
+    return changes
+
+
+def load_records(path: Path) -> tuple[list[dict], str]:
+    """Load a facts JSON list or a CSV, with its default text column."""
+    if path.suffix == ".json":
+        with path.open(encoding="utf-8") as fh:
+            return json.load(fh), "text"
+    return io.read_csv_rows(path), "fact"
+
+
+def rewrite_file(
+    engine: RewriteEngine,
+    path: Path,
+    column: str | None = None,
+    output: Path | None = None,
+    dry_run: bool = False,
+) -> list[Change]:
+    """Rewrite a facts JSON list or a CSV in place (or to ``output``)."""
+    records, default_column = load_records(path)
+    changes = rewrite_records(engine, records, column or default_column)
+    if dry_run:
+        return changes
+    target = output or path
+    if path.suffix == ".json":
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with target.open("w", encoding="utf-8") as fh:
+            json.dump(records, fh, indent=2, ensure_ascii=False)
+    else:
+        fieldnames = list(records[0].keys()) if records else [column or default_column]
+        io.write_csv_rows(target, fieldnames, records)
+    return changes
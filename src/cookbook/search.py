@@ -0,0 +1,289 @@
+"""BM25 search over the post corpus.
+
+The search index lives beside the text index and token store (see
+``cookbook.token_store``) and is built once by ``build_post_text_index``:
+
+- ``<base>.postings_offsets.bin``: uint64 start of each term's postings (vocab + 1 entries)
+- ``<base>.postings.bin``: uint32 document slots, ascending within a term
+- ``<base>.postings_tf.bin``: uint32 term frequency for each posting
+- ``<base>.text.bin`` / ``<base>.text_offsets.bin``: UTF-8 plain text per slot, for snippets
+- ``<base>.meta.tsv``: ``date<TAB>link<TAB>title`` per slot
+
+Everything is memory-mapped at query time, so a cold start reads no JSON.
+
+Query syntax: words are ANDed; ``"quoted words"`` must appear as a phrase;
+``OR`` separates alternatives; ``NOT word`` or ``-word`` excludes posts.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from .token_store import TokenStore, little_endian, map_array, side_path, store_base
+from .tokenizer import Tokenizer
+
+POSTINGS_SUFFIX = ".postings.bin"
+POSTINGS_TF_SUFFIX = ".postings_tf.bin"
+POSTINGS_OFFSETS_SUFFIX = ".postings_offsets.bin"
+TEXT_SUFFIX = ".text.bin"
+TEXT_OFFSETS_SUFFIX = ".text_offsets.bin"
+META_SUFFIX = ".meta.tsv"
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_QUERY_TOKENIZER = Tokenizer(phrases=())
+_QUERY_RE = re.compile(r'(-?)"([^"]*)"|(\S+)')
+
+
+class SearchIndexWriter:
+    """Stream per-post display data, then write postings from the token store."""
+
+    def __init__(self, base: Path) -> None:
+        self.base = base
+        base.parent.mkdir(parents=True, exist_ok=True)
+        self._text_fh = side_path(base, TEXT_SUFFIX).open("wb")
+        self._meta_fh = side_path(base, META_SUFFIX).open("w", encoding="utf-8")
+        self._text_offsets = array("Q", [0])
+
+    def add(self, title: str, date: str, link: str, text: str) -> None:
+        """Record display fields for the next document slot."""
+        data = text.encode("utf-8")
+        self._text_fh.write(data)
+        self._text_offsets.append(self._text_offsets[-1] + len(data))
+        fields = (" ".join(str(v or "").split()) for v in (date, link, title))
+        self._meta_fh.write("\t".join(fields) + "\n")
+
+    def finish(self, store: TokenStore) -> None:
+        """Close the display files and write the inverted index for ``store``."""
+        self._text_fh.close()
+        self._meta_fh.close()
+        with side_path(self.base, TEXT_OFFSETS_SUFFIX).open("wb") as fh:
+            little_endian(self._text_offsets).tofile(fh)
+        write_postings(self.base, store)
+
+
+def write_postings(base: Path, store: TokenStore) -> None:
+    docs_by_term: list[array] = [array("I") for _ in store.vocab]
+    tf_by_term: list[array] = [array("I") for _ in store.vocab]
+    for slot in range(len(store)):
+        for tid, tf in Counter(store.doc(slot)).items():
+            docs_by_term[tid].append(slot)
+            tf_by_term[tid].append(tf)
+    offsets = array("Q", [0])
+    with side_path(base, POSTINGS_SUFFIX).open("wb") as docs_fh, side_path(
+        base, POSTINGS_TF_SUFFIX
+    ).open("wb") as tf_fh:
+        for docs, tfs in zip(docs_by_term, tf_by_term):
+            little_endian(docs).tofile(docs_fh)
+            little_endian(tfs).tofile(tf_fh)
+            offsets.append(offsets[-1] + len(docs))
+    with side_path(base, POSTINGS_OFFSETS_SUFFIX).open("wb") as fh:
+        little_endian(offsets).tofile(fh)
+
+
+def build_search_index(index_path: Path, records: Iterable[dict]) -> None:
+    """Build search files for an existing text index from its JSONL records."""
+    base = store_base(index_path)
+    writer = SearchIndexWriter(base)
+    for rec in records:
+        writer.add(
+            rec.get("title", ""), rec.get("date", ""), rec.get("link", ""), rec.get("plain_text", "")
+        )
+    with TokenStore(base) as store:
+        writer.finish(store)
+
+
+def search_index_exists(index_path: Path) -> bool:
+    return side_path(store_base(index_path), POSTINGS_OFFSETS_SUFFIX).exists()
+
+
+@dataclass(slots=True)
+class Clause:
+    """One OR-alternative: every ``required`` group must match, no ``excluded`` may."""
+
+    required: list[list[str]] = field(default_factory=list)
+    excluded: list[list[str]] = field(default_factory=list)
+
+
+def parse_query(query: str) -> list[Clause]:
+    clauses = [Clause()]
+    negate_next = False
+    for match in _QUERY_RE.finditer(query):
+        minus, phrase, word = match.groups()
+        if word == "OR":
+            clauses.append(Clause())
+            continue
+        if word in ("AND",):
+            continue
+        if word == "NOT":
+            negate_next = True
+            continue
+        negate = negate_next or bool(minus)
+        if word is not None and word.startswith("-") and len(word) > 1:
+            negate, word = True, word[1:]
+        tokens = _QUERY_TOKENIZER.tokenize(phrase if phrase is not None else word)
+        negate_next = False
+        if not tokens:
+            continue
+        # An unquoted hyphenated word tokenizes to one term; quoted text may be several.
+        target = clauses[-1].excluded if negate else clauses[-1].required
+        target.append(tokens)
+    return [c for c in clauses if c.required]
+
+
+@dataclass(slots=True)
+class Hit:
+    slot: int
+    post_id: int
+    score: float
+    title: str
+    date: str
+    link: str
+    snippet: str
+
+
+class SearchIndex:
+    """Memory-mapped BM25 index over the token store."""
+
+    def __init__(self, index_path: Path) -> None:
+        self.base = store_base(index_path)
+        self.store = TokenStore(self.base)
+        self._maps = []
+        for suffix, code, attr in (
+            (POSTINGS_SUFFIX, "I", "postings"),
+            (POSTINGS_TF_SUFFIX, "I", "postings_tf"),
+            (POSTINGS_OFFSETS_SUFFIX, "Q", "postings_offsets"),
+            (TEXT_OFFSETS_SUFFIX, "Q", "text_offsets"),
+        ):
+            mm, view = map_array(side_path(self.base, suffix), code)
+            self._maps.append(mm)
+            setattr(self, attr, view)
+        self._text, _ = map_array(side_path(self.base, TEXT_SUFFIX), "B")
+        self._meta: list[str] | None = None
+        offsets = self.store.offsets
+        self.doc_lengths = [offsets[i + 1] - offsets[i] for i in range(len(self.store))]
+        self.avg_length = (sum(self.doc_lengths) / len(self.doc_lengths)) if self.doc_lengths else 0.0
+
+    def __enter__(self) -> SearchIndex:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for name in ("postings", "postings_tf", "postings_offsets", "text_offsets"):
+            getattr(self, name).release()
+        for mm in [*self._maps, self._text]:
+            if mm is not None:
+                try:
+                    mm.close()
+                except BufferError:
+                    pass
+        self.store.close()
+
+    def _postings(self, tid: int) -> tuple[memoryview, memoryview]:
+        start, end = self.postings_offsets[tid], self.postings_offsets[tid + 1]
+        return self.postings[start:end], self.postings_tf[start:end]
+
+    def _term_ids(self, tokens: list[str]) -> list[int] | None:
+        ids = [self.store.term_id(t) for t in tokens]
+        return None if any(tid is None for tid in ids) else ids
+
+    def _docs_with_all(self, ids: list[int]) -> set[int]:
+        # Intersect starting from the rarest term.
+        ordered = sorted(ids, key=lambda t: self.postings_offsets[t + 1] - self.postings_offsets[t])
+        docs = set(self._postings(ordered[0])[0])
+        for tid in ordered[1:]:
+            if not docs:
+                break
+            docs.intersection_update(self._postings(tid)[0])
+        return docs
+
+    def _group_docs(self, tokens: list[str]) -> set[int]:
+        ids = self._term_ids(tokens)
+        if ids is None:
+            return set()
+        docs = self._docs_with_all(ids)
+        if len(ids) > 1:
+            docs = {slot for slot in docs if self.store.contains_sequence(slot, ids)}
+        return docs
+
+    def _match(self, clause: Clause) -> set[int]:
+        docs: set[int] | None = None
+        for group in sorted(clause.required, key=len):
+            found = self._group_docs(group)
+            docs = found if docs is None else docs & found
+            if not docs:
+                return set()
+        for group in clause.excluded:
+            docs -= self._group_docs(group)
+        return docs or set()
+
+    def _bm25(self, docs: set[int], term_ids: set[int]) -> dict[int, float]:
+        n_docs = len(self.doc_lengths)
+        lengths = self.doc_lengths
+        avg = self.avg_length or 1.0
+        scores = dict.fromkeys(docs, 0.0)
+        for tid in term_ids:
+            slots, tfs = self._postings(tid)
+            df = len(slots)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for slot, tf in zip(slots, tfs):
+                if slot in scores:
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[slot] / avg)
+                    scores[slot] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return scores
+
+    def text(self, slot: int) -> str:
+        if self._text is None:
+            return ""
+        return self._text[self.text_offsets[slot] : self.text_offsets[slot + 1]].decode("utf-8")
+
+    def meta(self, slot: int) -> tuple[str, str, str]:
+        if self._meta is None:
+            self._meta = side_path(self.base, META_SUFFIX).read_text(encoding="utf-8").splitlines()
+        date, link, title = (self._meta[slot].split("\t") + ["", "", ""])[:3]
+        return date, link, title
+
+    def snippet(self, slot: int, terms: Iterable[str], width: int = 160) -> str:
+        text = self.text(slot)
+        pattern = "|".join(re.escape(t) for t in sorted(set(terms), key=len, reverse=True))
+        match = re.search(pattern, text, re.IGNORECASE) if pattern else None
+        start = max(0, (match.start() if match else 0) - width // 3)
+        piece = " ".join(text[start : start + width].split())
+        return ("…" if start else "") + piece + ("…" if start + width < len(text) else "")
+
+    def search(self, query: str, limit: int = 10) -> list[Hit]:
+        clauses = parse_query(query)
+        docs: set[int] = set()
+        positive: set[int] = set()
+        terms: list[str] = []
+        for clause in clauses:
+            docs |= self._match(clause)
+            for group in clause.required:
+                terms.append(" ".join(group))
+                positive.update(tid for tid in (self.store.term_id(t) for t in group) if tid is not None)
+        scores = self._bm25(docs, positive)
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[:limit]
+        hits = []
+        for slot, score in ranked:
+            date, link, title = self.meta(slot)
+            hits.append(
+                Hit(
+                    slot=slot,
+                    post_id=int(self.store.post_ids[slot]),
+                    score=score,
+                    title=title,
+                    date=date,
+                    link=link,
+                    snippet=self.snippet(slot, terms),
+                )
+            )
+        return hits
@@ -0,0 +1,296 @@
+"""Corpus statistics behind the ``stats`` calendar facts.
+
+Computes Zipf rank-frequency fits, Heaps vocabulary growth, per-year word
+entropy and posting-interval autocorrelation from the interned token store
+(see ``cookbook.token_store``). ``CorpusStats`` is an accumulator: feed it
+posts in publication order with ``update``, persist it with ``save``, and
+resume with ``load`` when new posts arrive instead of recomputing from
+scratch. It keeps its own vocabulary, so a rebuilt token store with
+different term IDs can still be appended to saved statistics.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - optional dependency
+    raise ImportError(
+        "NumPy is required for cookbook.stats. Install with: pip install -e .[analysis]"
+    ) from e
+
+from .token_store import TokenStore
+
+
+@dataclass(slots=True)
+class PowerLawFit:
+    """``y ≈ scale * x ** exponent`` fitted by least squares in log-log space."""
+
+    exponent: float
+    scale: float
+    r2: float
+    points: int
+
+
+def fit_power_law(x: np.ndarray, y: np.ndarray) -> PowerLawFit:
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    mask = (x > 0) & (y > 0)
+    lx, ly = np.log(x[mask]), np.log(y[mask])
+    if lx.size < 2:
+        return PowerLawFit(float("nan"), float("nan"), float("nan"), int(lx.size))
+    slope, intercept = np.polyfit(lx, ly, 1)
+    resid = ly - (slope * lx + intercept)
+    ss_tot = float(((ly - ly.mean()) ** 2).sum())
+    r2 = 1.0 - float((resid**2).sum()) / ss_tot if ss_tot else 1.0
+    return PowerLawFit(float(slope), float(np.exp(intercept)), r2, int(lx.size))
+
+
+def rank_frequency(counts: np.ndarray) -> np.ndarray:
+    """Term frequencies sorted descending, zeros dropped (rank = index + 1)."""
+    return np.sort(counts[counts > 0])[::-1]
+
+
+def zipf_fit(counts: np.ndarray, max_rank: int | None = 1000) -> PowerLawFit:
+    """Fit ``freq ∝ rank ** -s``; the returned exponent is ``-s``."""
+    freq = rank_frequency(counts)
+    if max_rank:
+        freq = freq[:max_rank]
+    ranks = np.arange(1, freq.size + 1)
+    return fit_power_law(ranks, freq)
+
+
+def shannon_entropy(counts: np.ndarray) -> float:
+    """Entropy in bits of the distribution given by ``counts``."""
+    counts = counts[counts > 0].astype(np.float64)
+    if counts.size == 0:
+        return 0.0
+    p = counts / counts.sum()
+    return float(-(p * np.log2(p)).sum())
+
+
+def autocorrelation(series: np.ndarray, max_lag: int = 10) -> np.ndarray:
+    """Sample autocorrelation for lags ``1..max_lag`` via one FFT."""
+    x = np.asarray(series, dtype=np.float64)
+    x = x - x.mean()
+    n = x.size
+    if n < 2 or not x.any():
+        return np.zeros(max_lag)
+    size = 1 << (2 * n - 1).bit_length()
+    spec = np.fft.rfft(x, size)
+    acov = np.fft.irfft(spec * np.conj(spec), size)[:n]
+    acf = acov / acov[0]
+    out = np.zeros(max_lag)
+    upto = min(max_lag, n - 1)
+    out[:upto] = acf[1 : upto + 1]
+    return out
+
+
+def _utc_timestamp(when: datetime) -> float:
+    """POSIX timestamp of ``when``, reading naive datetimes as UTC."""
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.timestamp()
+
+
+class CorpusStats:
+    """Running term counts, vocabulary growth and posting times."""
+
+    def __init__(self) -> None:
+        self.vocab: list[str] = []
+        self._term_ids: dict[str, int] = {}
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.year_counts: dict[int, np.ndarray] = {}
+        self.growth_tokens: list[int] = []
+        self.growth_types: list[int] = []
+        self.timestamps: list[float] = []
+        self.post_ids: set[int] = set()
+
+    @property
+    def total_tokens(self) -> int:
+        return self.growth_tokens[-1] if self.growth_tokens else 0
+
+    @property
+    def vocab_size(self) -> int:
+        return self.growth_types[-1] if self.growth_types else 0
+
+    @property
+    def last_date(self) -> datetime | None:
+        if not self.timestamps:
+            return None
+        return datetime.fromtimestamp(self.timestamps[-1], timezone.utc)
+
+    def intern(self, term: str) -> int:
+        tid = self._term_ids.get(term)
+        if tid is None:
+            tid = self._term_ids[term] = len(self.vocab)
+            self.vocab.append(term)
+        return tid
+
+    def _grow(self, arr: np.ndarray, size: int) -> np.ndarray:
+        if arr.size >= size:
+            return arr
+        grown = np.zeros(max(size, 2 * arr.size), dtype=arr.dtype)
+        grown[: arr.size] = arr
+        return grown
+
+    def update(self, post_id: int, token_ids, when: datetime) -> None:
+        """Add one post given term IDs from ``intern``, in publication order."""
+        post_id = int(post_id)
+        if post_id in self.post_ids:
+            return
+        ids = np.asarray(token_ids, dtype=np.int64)
+        uniq, freq = np.unique(ids, return_counts=True)
+        needed = int(uniq[-1]) + 1 if uniq.size else 0
+        self.counts = self._grow(self.counts, needed)
+        new_types = int(np.count_nonzero(self.counts[uniq] == 0))
+        self.counts[uniq] += freq
+        year = self.year_counts.get(when.year)
+        year = self._grow(np.zeros(0, dtype=np.int64) if year is None else year, needed)
+        year[uniq] += freq
+        self.year_counts[when.year] = year
+        self.growth_tokens.append(self.total_tokens + int(ids.size))
+        self.growth_types.append(self.vocab_size + new_types)
+        self.timestamps.append(_utc_timestamp(when))
+        self.post_ids.add(post_id)
+
+    @classmethod
+    def from_store(
+        cls,
+        store: TokenStore,
+        dates: dict[int, datetime],
+        resume: CorpusStats | None = None,
+    ) -> CorpusStats:
+        """Accumulate every dated post in ``store``; with ``resume``, only new ones."""
+        stats = resume or cls()
+        remap = np.fromiter(
+            (stats.intern(t) for t in store.vocab), dtype=np.int64, count=len(store.vocab)
+        )
+        order = sorted(
+            (dt, int(pid), slot)
+            for slot, pid in enumerate(store.post_ids)
+            if (dt := dates.get(int(pid))) is not None and int(pid) not in stats.post_ids
+        )
+        last = stats.timestamps[-1] if stats.timestamps else None
+        for dt, pid, slot in order:
+            if last is not None and _utc_timestamp(dt) < last:
+                raise ValueError(
+                    f"Post {pid} ({dt:%Y-%m-%d}) predates the saved statistics; rebuild instead."
+                )
+            stats.update(pid, remap[np.frombuffer(store.doc(slot), dtype="<u4")], dt)
+        return stats
+
+    def zipf(self, max_rank: int | None = 1000) -> PowerLawFit:
+        return zipf_fit(self.counts, max_rank=max_rank)
+
+    def heaps(self) -> PowerLawFit:
+        """Fit ``V(N) ≈ K * N ** beta`` over the growth curve."""
+        return fit_power_law(np.array(self.growth_tokens), np.array(self.growth_types))
+
+    def growth_curve(self) -> tuple[np.ndarray, np.ndarray]:
+        """Cumulative tokens and distinct terms after each post."""
+        return np.array(self.growth_tokens), np.array(self.growth_types)
+
+    def entropy_by_year(self) -> dict[int, float]:
+        return {year: shannon_entropy(c) for year, c in sorted(self.year_counts.items())}
+
+    def intervals_days(self) -> np.ndarray:
+        return np.diff(np.array(self.timestamps)) / 86400.0
+
+    def interval_autocorrelation(self, max_lag: int = 10) -> np.ndarray:
+        return autocorrelation(self.intervals_days(), max_lag=max_lag)
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        years = sorted(self.year_counts)
+        with path.open("wb") as fh:
+            np.savez_compressed(
+                fh,
+                vocab=np.array(self.vocab, dtype=str),
+                counts=self.counts,
+                years=np.array(years, dtype=np.int64),
+                **{f"year_{y}": self.year_counts[y] for y in years},
+                growth_tokens=np.array(self.growth_tokens, dtype=np.int64),
+                growth_types=np.array(self.growth_types, dtype=np.int64),
+                timestamps=np.array(self.timestamps, dtype=np.float64),
+                post_ids=np.array(sorted(self.post_ids), dtype=np.int64),
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> CorpusStats:
+        with np.load(path) as data:
+            stats = cls()
+            for term in data["vocab"].tolist():
+                stats.intern(term)
+            stats.counts = data["counts"].copy()
+            stats.year_counts = {int(y): data[f"year_{y}"].copy() for y in data["years"]}
+            stats.growth_tokens = data["growth_tokens"].tolist()
+            stats.growth_types = data["growth_types"].tolist()
+            stats.timestamps = data["timestamps"].tolist()
+            stats.post_ids = set(data["post_ids"].tolist())
+        return stats
+
+
+def iter_stats_facts(stats: CorpusStats) -> Iterator[dict]:
+    """Yield ``stats`` facts one at a time as each statistic is computed."""
+    if not stats.post_ids:
+        return
+    zipf = stats.zipf()
+    yield {
+        "type": "stats",
+        "fact": (
+            f"Word frequencies follow Zipf's law: across {stats.total_tokens:,} words the "
+            f"top {zipf.points:,} terms fall off as rank^{zipf.exponent:.2f} (R² = {zipf.r2:.2f})."
+        ),
+    }
+    heaps = stats.heaps()
+    yield {
+        "type": "stats",
+        "fact": (
+            f"Heaps' law holds: the vocabulary grew to {stats.vocab_size:,} distinct words, "
+            f"scaling as N^{heaps.exponent:.2f} with total words written (R² = {heaps.r2:.2f})."
+        ),
+    }
+    entropy = stats.entropy_by_year()
+    if entropy:
+        top_year = max(entropy, key=entropy.get)
+        low_year = min(entropy, key=entropy.get)
+        yield {
+            "type": "stats",
+            "fact": (
+                f"Word entropy peaked in {top_year} at {entropy[top_year]:.2f} bits per word; "
+                f"the least varied year was {low_year} at {entropy[low_year]:.2f} bits."
+            ),
+        }
+    intervals = stats.intervals_days()
+    if intervals.size > 2:
+        lag1 = float(stats.interval_autocorrelation(max_lag=1)[0])
+        reading = (
+            "so one gap barely predicts the next"
+            if abs(lag1) < 0.2
+            else "so busy and quiet stretches cluster"
+        )
+        yield {
+            "type": "stats",
+            "fact": (
+                f"The gap between posts has a median of {np.median(intervals):.1f} days and a "
+                f"lag-1 autocorrelation of {lag1:.2f}, {reading}."
+            ),
+        }
+
+
+def load_post_dates(records: Iterable[dict]) -> dict[int, datetime]:
+    """Map post ID to publication datetime (UTC) from text-index style records."""
+    dates: dict[int, datetime] = {}
+    for rec in records:
+        raw = rec.get("date") or ""
+        try:
+            when = datetime.fromisoformat(raw.replace("Z", ""))
+            dates[int(rec["id"])] = when.replace(tzinfo=timezone.utc)
+        except (KeyError, TypeError, ValueError):
+            continue
+    return dates
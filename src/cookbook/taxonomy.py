@@ -0,0 +1,220 @@
+"""Category and tag co-occurrence from sparse post × term incidence matrices.
+
+``TermMatrix`` holds one row per post and one column per category (or tag),
+built once from ``cookbook.models.Post`` objects or ``posts_metadata.csv``.
+Columns keep first-seen order, so ties in ``most_common`` rank like
+``collections.Counter``. Term counts are column sums. Co-occurrence is the
+product ``X.T @ X``, whose diagonal holds the term counts. Lift is
+``N * C_ab / (C_a * C_b)`` and PMI is ``log2`` of it, computed only for
+pairs that actually co-occur. ``era`` and ``select`` return the matrix for
+a subset of posts, so per-era comparisons reuse the same columns. Eras are
+``(label, start_year, end_year)`` tuples; the facts and the book figures take
+them from ``cookbook.timeseries.PostingSeries.eras``, so they agree.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError as e:  # pragma: no cover - optional dependency
+    raise ImportError(
+        "NumPy and SciPy are required for cookbook.taxonomy. "
+        "Install with: pip install -e .[analysis]"
+    ) from e
+
+from . import io
+from .models import Post
+
+KINDS = ("categories", "tags")
+
+
+def split_terms(value) -> list[str]:
+    """Terms from a list or a ``;``-joined metadata CSV cell, blanks dropped."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(";")
+    return [term.strip() for term in value if term and term.strip()]
+
+
+@dataclass(slots=True)
+class TermPair:
+    a: str
+    b: str
+    count: int
+    lift: float
+
+    @property
+    def pmi(self) -> float:
+        return float(np.log2(self.lift))
+
+
+class TermMatrix:
+    def __init__(self, terms: list[str], matrix, post_ids, years, word_counts) -> None:
+        self.terms = terms
+        self.index = {term: j for j, term in enumerate(terms)}
+        self.matrix = matrix  # CSR, posts × terms, 1 where a post has a term
+        self.post_ids = post_ids
+        self.years = years
+        self.word_counts = word_counts
+        self._cooccurrence = None
+
+    @classmethod
+    def build(cls, rows: Iterable[tuple[int, int, int, Sequence[str]]]) -> TermMatrix:
+        """From ``(post_id, year, word_count, terms)`` rows; repeated terms count once."""
+        index: dict[str, int] = {}
+        indptr = [0]
+        indices: list[int] = []
+        post_ids, years, words = [], [], []
+        for post_id, year, word_count, terms in rows:
+            columns = {index.setdefault(term, len(index)) for term in terms}
+            indices.extend(sorted(columns))
+            indptr.append(len(indices))
+            post_ids.append(post_id)
+            years.append(year)
+            words.append(word_count)
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), indices, indptr),
+            shape=(len(post_ids), len(index)),
+        )
+        return cls(
+            list(index),
+            matrix,
+            np.array(post_ids, dtype=np.int64),
+            np.array(years, dtype=np.int32),
+            np.array(words, dtype=np.int64),
+        )
+
+    @classmethod
+    def from_posts(cls, posts: Iterable[Post], kind: str = "categories") -> TermMatrix:
+        if kind not in KINDS:
+            raise ValueError(f"kind must be one of {KINDS}, not {kind!r}")
+        return cls.build((p.id, p.date.year, p.word_count, getattr(p, kind)) for p in posts)
+
+    @classmethod
+    def from_metadata(cls, path: Path, kind: str = "categories") -> TermMatrix:
+        """From ``posts_metadata.csv`` (``;``-joined ``categories``/``tags`` columns)."""
+        if kind not in KINDS:
+            raise ValueError(f"kind must be one of {KINDS}, not {kind!r}")
+        return cls.build(
+            (int(r["id"]), int(r["year"]), int(r["word_count"] or 0), split_terms(r[kind]))
+            for r in io.read_csv_rows(path)
+        )
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def counts(self):
+        """Posts per term, in column order."""
+        return np.asarray(self.matrix.sum(axis=0)).ravel()
+
+    def most_common(self, n: Optional[int] = None) -> list[tuple[str, int]]:
+        counts = self.counts()
+        order = np.argsort(-counts, kind="stable")[:n]
+        return [(self.terms[j], int(counts[j])) for j in order if counts[j]]
+
+    def mean_words(self):
+        """Average post word count per term (0 for unused terms)."""
+        counts = self.counts()
+        totals = self.matrix.T @ self.word_counts
+        return np.divide(totals, counts, out=np.zeros(len(self.terms)), where=counts > 0)
+
+    def cooccurrence(self):
+        """Symmetric CSR ``terms × terms`` matrix of shared posts."""
+        if self._cooccurrence is None:
+            self._cooccurrence = (self.matrix.T @ self.matrix).tocsr()
+        return self._cooccurrence
+
+    def lift(self):
+        """Lift for every co-occurring pair, same sparsity as ``cooccurrence``."""
+        co = self.cooccurrence().tocoo()
+        counts = self.counts().astype(np.float64)
+        values = len(self) * co.data / (counts[co.row] * counts[co.col])
+        return sparse.csr_matrix((values, (co.row, co.col)), shape=co.shape)
+
+    def pairs(self, min_count: int = 1) -> list[TermPair]:
+        """Distinct term pairs sharing at least ``min_count`` posts, most shared first."""
+        co = sparse.triu(self.cooccurrence(), k=1).tocoo()
+        keep = co.data >= min_count
+        rows, cols, shared = co.row[keep], co.col[keep], co.data[keep]
+        counts = self.counts().astype(np.float64)
+        lifts = len(self) * shared / (counts[rows] * counts[cols])
+        order = np.lexsort((cols, rows, -shared))
+        return [
+            TermPair(self.terms[rows[i]], self.terms[cols[i]], int(shared[i]), float(lifts[i]))
+            for i in order
+        ]
+
+    def count_posts(self, terms: Iterable[str]) -> int:
+        """Posts carrying any of ``terms``."""
+        columns = [self.index[t] for t in terms if t in self.index]
+        if not columns:
+            return 0
+        return int((self.matrix[:, columns].sum(axis=1) > 0).sum())
+
+    def select(self, mask) -> TermMatrix:
+        """The rows where ``mask`` is true, keeping every column."""
+        mask = np.asarray(mask, dtype=bool)
+        return TermMatrix(
+            self.terms,
+            self.matrix[mask],
+            self.post_ids[mask],
+            self.years[mask],
+            self.word_counts[mask],
+        )
+
+    def era(self, start: int, end: int) -> TermMatrix:
+        """Posts published in the years ``start`` to ``end`` inclusive."""
+        return self.select((self.years >= start) & (self.years <= end))
+
+    def era_counts(self, eras: Sequence[tuple[str, int, int]]):
+        """``terms × eras`` array of post counts."""
+        return np.column_stack([self.era(start, end).counts() for _, start, end in eras])
+
+
+def iter_taxonomy_facts(
+    categories: TermMatrix,
+    tags: TermMatrix,
+    eras: Sequence[tuple[str, int, int]],
+    min_count: int = 10,
+) -> Iterator[dict]:
+    """Yield co-occurrence and era facts for categories and tags."""
+    skip = {"Uncategorized"}
+    pairs = [p for p in categories.pairs() if not {p.a, p.b} & skip]
+    if pairs:
+        top = pairs[0]
+        yield {
+            "type": "taxonomy",
+            "fact": f"“{top.a}” and “{top.b}” are the categories most often shared: "
+            f"{top.count} posts carry both.",
+        }
+    for verb, matrix in (("in", categories), ("tagged", tags)):
+        strong = [p for p in matrix.pairs(min_count) if not {p.a, p.b} & skip]
+        if strong:
+            best = max(strong, key=lambda p: p.lift)
+            yield {
+                "type": "taxonomy",
+                "fact": f"Posts {verb} “{best.a}” are {best.lift:.1f}× more likely than chance "
+                f"to also be {verb} “{best.b}” ({best.count} posts are both).",
+            }
+    shares = categories.era_counts(eras).astype(np.float64)
+    sizes = np.array([len(categories.era(start, end)) for _, start, end in eras])
+    if len(categories.terms) and len(eras) >= 2 and sizes[0] and sizes[-1]:
+        before, after = shares[:, 0] / sizes[0], shares[:, -1] / sizes[-1]
+        change = after - before
+        # Biggest rise and biggest fall; with one category these are the same column.
+        for j in dict.fromkeys((int(change.argmax()), int(change.argmin()))):
+            if categories.terms[j] in skip or f"{before[j]:.0%}" == f"{after[j]:.0%}":
+                continue
+            first, last = eras[0], eras[-1]
+            yield {
+                "type": "taxonomy",
+                "fact": f"“{categories.terms[j]}” went from {before[j]:.0%} of "
+                f"posts in {first[1]}–{first[2]} to {after[j]:.0%} in "
+                f"{last[1]}–{last[2]}.",
+            }
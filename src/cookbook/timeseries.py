@@ -0,0 +1,327 @@
+"""Posting rhythm: daily post and word-count series, eras, streaks and gaps.
+
+``PostingSeries`` holds two NumPy arrays, posts and words, with one slot per
+calendar day from the first post to the last. It is built once from posts or
+``posts_metadata.csv``. Weekly, monthly and yearly series and the weekday
+profile are then ``np.bincount`` aggregations of those arrays. Streaks
+(runs of consecutive posting days), gaps (pauses between posting days) and
+the intervals between posts come from the same arrays.
+
+Eras are found by changepoint detection on a series, with a least-squares
+(Gaussian mean-shift) cost computed from cumulative sums in O(1) per
+segment. ``binary_segmentation`` splits into a fixed number of segments in
+O(n log n). ``pelt`` picks the number of segments itself for a given
+penalty (Killick et al., 2012), in close to linear time.
+``autocorrelation`` uses the FFT.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - optional dependency
+    raise ImportError(
+        "NumPy is required for cookbook.timeseries. Install with: pip install -e .[analysis]"
+    ) from e
+
+from . import io
+from .models import Post
+
+FREQS = ("day", "week", "month", "year")
+MEASURES = ("posts", "words")
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+# Labels for a three-way split, matching the book's text.
+ERA_NAMES = ("Early", "Middle", "Recent")
+
+
+def _segment_cost(csum, csum2, s, t):
+    """Sum of squared deviations from the mean of ``x[s:t]``; broadcasts over arrays."""
+    n = t - s
+    total = csum[t] - csum[s]
+    return (csum2[t] - csum2[s]) - total * total / n
+
+
+def _cumsums(x) -> tuple:
+    x = np.asarray(x, dtype=np.float64)
+    return np.concatenate(([0.0], np.cumsum(x))), np.concatenate(([0.0], np.cumsum(x * x)))
+
+
+def default_penalty(x) -> float:
+    """BIC-style penalty ``2 σ² log n``, σ estimated robustly from first differences."""
+    x = np.asarray(x, dtype=np.float64)
+    diffs = np.diff(x)
+    sigma = 1.4826 * np.median(np.abs(diffs - np.median(diffs))) / np.sqrt(2) if len(diffs) else 0
+    if not sigma:
+        sigma = x.std() or 1.0
+    return 2 * sigma * sigma * np.log(max(len(x), 2))
+
+
+def pelt(x, penalty: Optional[float] = None, min_size: int = 2) -> list[int]:
+    """Indices where new segments start, minimising cost plus ``penalty`` per change."""
+    n = len(x)
+    if n < 2 * min_size:
+        return []
+    if penalty is None:
+        penalty = default_penalty(x)
+    csum, csum2 = _cumsums(x)
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    previous = np.zeros(n + 1, dtype=np.int64)
+    candidates = np.array([], dtype=np.int64)
+    for t in range(min_size, n + 1):
+        s_new = t - min_size
+        if np.isfinite(best[s_new]):
+            candidates = np.append(candidates, s_new)
+        costs = best[candidates] + _segment_cost(csum, csum2, candidates, t)
+        i = int(np.argmin(costs))
+        best[t] = costs[i] + penalty
+        previous[t] = candidates[i]
+        # A start that cannot beat the optimum now never will (PELT pruning).
+        candidates = candidates[costs <= best[t]]
+    changes = []
+    t = n
+    while t > 0:
+        t = int(previous[t])
+        if t > 0:
+            changes.append(t)
+    return sorted(changes)
+
+
+def binary_segmentation(x, n_segments: int, min_size: int = 2) -> list[int]:
+    """Indices where new segments start, splitting greedily into ``n_segments``."""
+    csum, csum2 = _cumsums(x)
+    segments = [(0, len(x))]
+    changes: list[int] = []
+    while len(segments) < n_segments:
+        best = None
+        for a, b in segments:
+            splits = np.arange(a + min_size, b - min_size + 1)
+            if not len(splits):
+                continue
+            gains = (
+                _segment_cost(csum, csum2, a, b)
+                - _segment_cost(csum, csum2, a, splits)
+                - _segment_cost(csum, csum2, splits, b)
+            )
+            i = int(np.argmax(gains))
+            if best is None or gains[i] > best[0]:
+                best = (gains[i], int(splits[i]), (a, b))
+        if best is None:
+            break
+        _, k, (a, b) = best
+        segments.remove((a, b))
+        segments += [(a, k), (k, b)]
+        changes.append(k)
+    return sorted(changes)
+
+
+def autocorrelation(x, max_lag: int):
+    """Sample autocorrelation at lags ``0..max_lag``, via the FFT."""
+    x = np.asarray(x, dtype=np.float64)
+    x = x - x.mean()
+    size = 1 << (2 * len(x) - 1).bit_length()
+    spectrum = np.fft.rfft(x, size)
+    acf = np.fft.irfft(spectrum * np.conj(spectrum), size)[: max_lag + 1]
+    return acf / acf[0] if acf[0] else np.zeros(max_lag + 1)
+
+
+@dataclass(frozen=True, slots=True)
+class Run:
+    """A streak (``days`` consecutive posting days) or a gap (``days`` until the next post)."""
+
+    start: date
+    days: int
+
+
+def _as_date(value: Union[date, datetime, str]) -> date:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return value.date() if isinstance(value, datetime) else value
+
+
+class PostingSeries:
+    def __init__(self, start: date, posts, words) -> None:
+        self.start = start
+        self.posts = posts  # int32 posts per day
+        self.words = words  # int64 words per day
+
+    @classmethod
+    def build(cls, items: Iterable[tuple[Union[date, datetime, str], int]]) -> PostingSeries:
+        """From ``(date, word_count)`` pairs, one per post, in any order."""
+        ordinals, counts = [], []
+        for when, word_count in items:
+            ordinals.append(_as_date(when).toordinal())
+            counts.append(word_count or 0)
+        if not ordinals:
+            raise ValueError("a posting series needs at least one post")
+        days = np.array(ordinals, dtype=np.int64)
+        first = int(days.min())
+        offsets = days - first
+        length = int(offsets.max()) + 1
+        posts = np.bincount(offsets, minlength=length).astype(np.int32)
+        words = np.bincount(offsets, weights=counts, minlength=length).astype(np.int64)
+        return cls(date.fromordinal(first), posts, words)
+
+    @classmethod
+    def from_posts(cls, posts: Iterable[Post]) -> PostingSeries:
+        return cls.build((p.date, p.word_count) for p in posts)
+
+    @classmethod
+    def from_metadata(cls, path: Path) -> PostingSeries:
+        return cls.build((r["date"], int(r["word_count"] or 0)) for r in io.read_csv_rows(path))
+
+    def __len__(self) -> int:
+        return len(self.posts)
+
+    @property
+    def end(self) -> date:
+        return self.day(len(self) - 1)
+
+    def day(self, offset: int) -> date:
+        return self.start + timedelta(days=int(offset))
+
+    def dates(self):
+        """``datetime64[D]`` date of every slot."""
+        return np.datetime64(self.start, "D") + np.arange(len(self))
+
+    def _measure(self, measure: str):
+        if measure not in MEASURES:
+            raise ValueError(f"measure must be one of {MEASURES}, not {measure!r}")
+        return self.posts if measure == "posts" else self.words
+
+    def resample(self, freq: str = "year", measure: str = "posts"):
+        """``(labels, values)``; labels are ``datetime64`` period starts (years as ints)."""
+        if freq not in FREQS:
+            raise ValueError(f"freq must be one of {FREQS}, not {freq!r}")
+        values = self._measure(measure)
+        if freq == "day":
+            return self.dates(), values
+        dates = self.dates()
+        if freq == "week":
+            # Weeks start on Monday.
+            slots = (np.arange(len(self)) + self.start.weekday()) // 7
+            first = np.datetime64(self.start - timedelta(days=self.start.weekday()), "D")
+            labels = first + 7 * np.arange(slots[-1] + 1)
+        else:
+            unit = "M" if freq == "month" else "Y"
+            periods = dates.astype(f"datetime64[{unit}]")
+            slots = (periods - periods[0]).astype(np.int64)
+            labels = periods[0] + np.arange(slots[-1] + 1)
+            if freq == "year":
+                labels = labels.astype(np.int64) + 1970
+        return labels, np.bincount(slots, weights=values, minlength=len(labels)).astype(np.int64)
+
+    def by_year(self):
+        """``(years, posts, words)`` arrays."""
+        years, posts = self.resample("year", "posts")
+        return years, posts, self.resample("year", "words")[1]
+
+    def weekday_counts(self):
+        """Posts per weekday, Monday first."""
+        weekdays = (np.arange(len(self)) + self.start.weekday()) % 7
+        return np.bincount(weekdays, weights=self.posts, minlength=7).astype(np.int64)
+
+    def posting_days(self):
+        """Offsets of the days with at least one post."""
+        return np.flatnonzero(self.posts)
+
+    def streaks(self, min_days: int = 2) -> list[Run]:
+        """Runs of at least ``min_days`` consecutive posting days, longest first."""
+        active = np.concatenate(([0], (self.posts > 0).astype(np.int8), [0]))
+        edges = np.diff(active)
+        starts, stops = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+        lengths = stops - starts
+        order = np.lexsort((starts, -lengths))
+        return [Run(self.day(starts[i]), int(lengths[i])) for i in order if lengths[i] >= min_days]
+
+    def gaps(self, n: Optional[int] = None) -> list[Run]:
+        """Pauses between consecutive posting days, longest first; ``start`` is the last post."""
+        days = self.posting_days()
+        lengths = np.diff(days)
+        order = np.lexsort((days[:-1], -lengths))[:n]
+        return [Run(self.day(days[i]), int(lengths[i])) for i in order]
+
+    def intervals(self):
+        """Days between consecutive posts (0 for posts on the same day)."""
+        return np.diff(np.repeat(np.arange(len(self)), self.posts))
+
+    def autocorrelation(self, max_lag: int, freq: str = "day", measure: str = "posts"):
+        return autocorrelation(self.resample(freq, measure)[1], max_lag)
+
+    def changepoints(
+        self,
+        freq: str = "month",
+        measure: str = "posts",
+        penalty: Optional[float] = None,
+        min_size: int = 2,
+    ) -> list:
+        """Period labels at which PELT finds a shift in the mean of a series."""
+        labels, values = self.resample(freq, measure)
+        return [labels[i] for i in pelt(values, penalty, min_size)]
+
+    def eras(self, n: int = 3, measure: str = "posts", min_years: int = 2) -> tuple:
+        """``(label, start_year, end_year)`` eras from the yearly series."""
+        years, values = self.resample("year", measure)
+        bounds = [0, *binary_segmentation(values, n, min_years), len(years)]
+        spans = [(int(years[a]), int(years[b - 1])) for a, b in zip(bounds, bounds[1:])]
+        names = ERA_NAMES if len(spans) == len(ERA_NAMES) else [f"{a}–{b}" for a, b in spans]
+        return tuple((name, a, b) for name, (a, b) in zip(names, spans))
+
+
+def iter_rhythm_facts(series: PostingSeries, n_eras: int = 3) -> Iterator[dict]:
+    """Yield streak, gap, interval, weekday, weekly-cycle and era facts."""
+    streaks = series.streaks()
+    if streaks:
+        top = streaks[0]
+        yield {
+            "type": "rhythm",
+            "fact": f"The longest run of consecutive posting days is {top.days} days, from "
+            f"{top.start:%B %d, %Y} to {top.start + timedelta(days=top.days - 1):%B %d, %Y}.",
+        }
+    gaps = series.gaps(1)
+    if gaps:
+        gap = gaps[0]
+        yield {
+            "type": "rhythm",
+            "fact": f"The longest pause between posts is {gap.days} days, "
+            f"after {gap.start:%B %d, %Y}.",
+        }
+    intervals = series.intervals()
+    if len(intervals):
+        median = float(np.median(intervals))
+        same_day = float((intervals == 0).mean())
+        yield {
+            "type": "rhythm",
+            "fact": f"Half of all posts follow the previous one within {median:g} "
+            f"day{'' if median == 1 else 's'}; {same_day:.0%} share a day with another post.",
+        }
+    weekdays = series.weekday_counts()
+    if weekdays.sum():
+        top = int(weekdays.argmax())
+        yield {
+            "type": "rhythm",
+            "fact": f"{WEEKDAYS[top]} is the busiest posting day, with "
+            f"{weekdays[top] / weekdays.sum():.0%} of all posts.",
+        }
+    if len(series) > 28:
+        acf = series.autocorrelation(7)
+        if acf[7] > acf[1:7].max():
+            yield {
+                "type": "rhythm",
+                "fact": f"Posting runs on a weekly cycle: daily post counts correlate at "
+                f"{acf[7]:.2f} with the same weekday a week earlier.",
+            }
+    years, posts, words = series.by_year()
+    for name, start, end in series.eras(n_eras):
+        mask = (years >= start) & (years <= end)
+        total = int(posts[mask].sum())
+        yield {
+            "type": "rhythm",
+            "fact": f"{name} era ({start}–{end}): {total / mask.sum():.0f} posts a year, "
+            f"averaging {words[mask].sum() / max(total, 1):.0f} words.",
+        }
@@ -0,0 +1,265 @@
+"""Integer-interned token arrays stored beside the text index.
+
+For an index at ``data/johndcook_text_index.jsonl`` the store consists of:
+
+- ``johndcook_text_index.vocab.txt``: one term per line; the line number is the term ID
+- ``johndcook_text_index.tokens.bin``: every post's term IDs as little-endian uint32
+- ``johndcook_text_index.offsets.bin``: uint64 start offsets (n_docs + 1 entries)
+- ``johndcook_text_index.docs.bin``: int64 post ID for each document slot
+
+Documents are numbered in the order they were written, which matches the
+line order of the JSONL index. Readers memory-map the binary files and hand
+out ``memoryview`` slices, so no per-token Python objects are created.
+
+The other tables built beside the index (links, outlinks, entities, code,
+math) are written by ``SideFileWriter`` subclasses, which the build feeds
+one ``IndexedPost`` at a time.
+"""
+
+from __future__ import annotations
+
+import mmap
+import sys
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Iterable, Iterator
+
+from .html_extract import PostText
+
+VOCAB_SUFFIX = ".vocab.txt"
+TOKENS_SUFFIX = ".tokens.bin"
+OFFSETS_SUFFIX = ".offsets.bin"
+DOCS_SUFFIX = ".docs.bin"
+
+
+def store_base(index_path: Path) -> Path:
+    """Return the shared prefix for the store files of a JSONL index."""
+    return index_path.with_suffix("")
+
+
+def side_path(base: Path, suffix: str) -> Path:
+    """Path of one store file: ``base`` plus ``suffix``."""
+    return base.with_name(base.name + suffix)
+
+
+def little_endian(arr: array) -> array:
+    """Return ``arr`` in little-endian byte order (a copy on big-endian hosts)."""
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedPost:
+    """One post as the text index build has parsed it."""
+
+    id: int
+    date: str
+    slug: str
+    link: str
+    title: str  # HTML entities unescaped
+    text: str
+    page: PostText
+    math: Counter  # ``cookbook.math_index.scan_math`` of ``text``
+
+
+class SideFileWriter:
+    """Write one table beside a text index while it is built.
+
+    Subclasses set ``SUFFIX``, add rows in ``add`` and map a parsed post to
+    those rows in ``add_post``.
+    """
+
+    SUFFIX = ""
+
+    def __init__(self, base: Path) -> None:
+        self.path = side_path(base, self.SUFFIX)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self._open()
+
+    def _open(self) -> IO:
+        return self.path.open("w", encoding="utf-8")
+
+    def add_post(self, post: IndexedPost) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def __enter__(self) -> SideFileWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class TokenStoreWriter:
+    """Append documents to a token store, interning terms as they arrive."""
+
+    def __init__(self, base: Path) -> None:
+        self.base = base
+        base.parent.mkdir(parents=True, exist_ok=True)
+        self._term_ids: dict[str, int] = {}
+        self._vocab: list[str] = []
+        self._offsets = array("Q", [0])
+        self._docs = array("q")
+        self._tokens_fh = side_path(base, TOKENS_SUFFIX).open("wb")
+
+    def intern(self, term: str) -> int:
+        tid = self._term_ids.get(term)
+        if tid is None:
+            tid = len(self._vocab)
+            self._term_ids[term] = tid
+            self._vocab.append(term)
+        return tid
+
+    def add(self, post_id: int, terms: Iterable[str]) -> int:
+        """Write one document and return its slot number."""
+        intern = self.intern
+        ids = array("I", (intern(t) for t in terms))
+        little_endian(ids).tofile(self._tokens_fh)
+        self._offsets.append(self._offsets[-1] + len(ids))
+        self._docs.append(int(post_id))
+        return len(self._docs) - 1
+
+    def close(self) -> None:
+        if self._tokens_fh.closed:
+            return
+        self._tokens_fh.close()
+        with side_path(self.base, OFFSETS_SUFFIX).open("wb") as fh:
+            little_endian(self._offsets).tofile(fh)
+        with side_path(self.base, DOCS_SUFFIX).open("wb") as fh:
+            little_endian(self._docs).tofile(fh)
+        text = "".join(term + "\n" for term in self._vocab)
+        side_path(self.base, VOCAB_SUFFIX).write_text(text, encoding="utf-8")
+
+    def __enter__(self) -> TokenStoreWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def map_array(path: Path, typecode: str) -> tuple[mmap.mmap | None, memoryview]:
+    """Memory-map a little-endian array file; the map is ``None`` for empty files."""
+    with path.open("rb") as fh:
+        if path.stat().st_size == 0:
+            return None, memoryview(array(typecode))
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    if sys.byteorder == "big":  # pragma: no cover - stored little-endian
+        arr = array(typecode, mm[:])
+        arr.byteswap()
+        mm.close()
+        return None, memoryview(arr)
+    with memoryview(mm) as raw:
+        return mm, raw.cast(typecode)
+
+
+class TokenStore:
+    """Read-only, memory-mapped view over a token store."""
+
+    def __init__(self, base: Path) -> None:
+        self.base = base
+        self.vocab: list[str] = side_path(base, VOCAB_SUFFIX).read_text(encoding="utf-8").splitlines()
+        self._term_ids: dict[str, int] | None = None
+        self._maps = []
+        for suffix, code, attr in (
+            (TOKENS_SUFFIX, "I", "tokens"),
+            (OFFSETS_SUFFIX, "Q", "offsets"),
+            (DOCS_SUFFIX, "q", "post_ids"),
+        ):
+            mm, view = map_array(side_path(base, suffix), code)
+            self._maps.append(mm)
+            setattr(self, attr, view)
+        self._slots: dict[int, int] | None = None
+
+    @classmethod
+    def for_index(cls, index_path: Path) -> TokenStore:
+        return cls(store_base(index_path))
+
+    @staticmethod
+    def exists(index_path: Path) -> bool:
+        return side_path(store_base(index_path), VOCAB_SUFFIX).exists()
+
+    def __len__(self) -> int:
+        return len(self.post_ids)
+
+    def term_id(self, term: str) -> int | None:
+        if self._term_ids is None:
+            self._term_ids = {t: i for i, t in enumerate(self.vocab)}
+        return self._term_ids.get(term)
+
+    def slot(self, post_id: int) -> int | None:
+        if self._slots is None:
+            self._slots = {int(pid): i for i, pid in enumerate(self.post_ids)}
+        return self._slots.get(int(post_id))
+
+    def doc(self, slot: int) -> memoryview:
+        """Term IDs of the document in ``slot`` (a zero-copy slice)."""
+        return self.tokens[self.offsets[slot] : self.offsets[slot + 1]]
+
+    def doc_for(self, post_id: int) -> memoryview:
+        slot = self.slot(post_id)
+        if slot is None:
+            return memoryview(array("I"))
+        return self.doc(slot)
+
+    def contains_sequence(self, slot: int, term_ids: list[int]) -> bool:
+        """Whether ``term_ids`` occur consecutively in the document in ``slot``."""
+        if not term_ids:
+            return False
+        raw = self._maps[0] if self._maps else None
+        if raw is None:
+            doc, n = list(self.doc(slot)), len(term_ids)
+            return any(doc[i : i + n] == term_ids for i in range(len(doc) - n + 1))
+        start, end = self.offsets[slot] * 4, self.offsets[slot + 1] * 4
+        needle = little_endian(array("I", term_ids)).tobytes()
+        pos = raw.find(needle, start, end)
+        while pos != -1 and (pos - start) % 4:
+            pos = raw.find(needle, pos + 1, end)
+        return pos != -1
+
+    def terms(self, slot: int) -> list[str]:
+        vocab = self.vocab
+        return [vocab[tid] for tid in self.doc(slot)]
+
+    def iter_docs(self) -> Iterator[tuple[int, memoryview]]:
+        for slot, post_id in enumerate(self.post_ids):
+            yield post_id, self.doc(slot)
+
+    def as_numpy(self):
+        """Return ``(tokens, offsets, post_ids)`` as zero-copy NumPy arrays."""
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError(
+                "NumPy is required for array access to the token store. "
+                "Install with: pip install numpy"
+            ) from e
+        return (
+            np.frombuffer(self.tokens, dtype="<u4"),
+            np.frombuffer(self.offsets, dtype="<u8"),
+            np.frombuffer(self.post_ids, dtype="<i8"),
+        )
+
+    def close(self) -> None:
+        for name in ("tokens", "offsets", "post_ids"):
+            getattr(self, name).release()
+        for mm in self._maps:
+            if mm is None:
+                continue
+            try:
+                mm.close()
+            except BufferError:
+                # A caller still holds a doc() slice; the map is freed with it.
+                pass
+        self._maps = []
+
+    def __enter__(self) -> TokenStore:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
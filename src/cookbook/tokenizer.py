@@ -0,0 +1,171 @@
+"""Unicode-aware tokenizer with phrase matching for the text index.
+
+A single left-to-right pass over the normalized text yields unigrams and,
+through a sliding window, any multi-word phrase from a configured
+vocabulary. Hyphenated and apostrophe terms ("runge-kutta", "don't"),
+digits and non-ASCII letters ("erdős") survive as single tokens; a
+possessive "'s" is dropped.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator
+
+# Letters/digits (no underscore), optionally joined by internal hyphens or apostrophes.
+TOKEN_RE = re.compile(r"[^\W_]+(?:['\-][^\W_]+)*")
+# Word counts keep the original index's definition: runs of ASCII letters.
+WORD_RE = re.compile(r"[A-Za-z]+")
+
+_PUNCT_MAP = str.maketrans(
+    {
+        "’": "'",  # right single quotation mark
+        "‘": "'",
+        "ʼ": "'",
+        "‐": "-",  # hyphen
+        "‑": "-",  # non-breaking hyphen
+        "–": "-",  # en dash, as in "Runge–Kutta"
+    }
+)
+
+# Multi-word terms the fact generators and figures ask about.
+DEFAULT_PHRASES: tuple[str, ...] = (
+    "golden ratio",
+    "monte carlo",
+    "linear algebra",
+    "machine learning",
+    "deep learning",
+    "neural network",
+    "elliptic curve",
+    "gamma function",
+    "beta function",
+    "zeta function",
+    "hash function",
+    "normal distribution",
+    "differential equation",
+    "taylor series",
+    "continued fraction",
+    "complex analysis",
+    "number theory",
+    "graph theory",
+    "information theory",
+    "prime number",
+    "fourier transform",
+    "floating point",
+    "random walk",
+    "brownian motion",
+    "time series",
+    "clinical trial",
+    "survival analysis",
+    "hypothesis test",
+    "confidence interval",
+    "maximum likelihood",
+    "gradient descent",
+    "public key",
+    "private key",
+    "differential privacy",
+    "central limit theorem",
+    "law of large numbers",
+)
+
+
+def count_words(text: str) -> int:
+    """Words in ``text`` as the index counts them; digits are not words."""
+    return sum(1 for _ in WORD_RE.finditer(text))
+
+
+def light_stem(token: str) -> str:
+    """Strip regular English plural endings; leaves everything else alone.
+
+    "-ies" words are kept whole: the ending can mean "-y" (theories), "-ie"
+    (movies) or no plural at all (series), and spelling cannot tell them apart.
+    """
+    if len(token) <= 3 or not token.isalpha() or token.endswith("ies"):
+        return token
+    if token.endswith("sses"):
+        return token[:-2]
+    if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+@dataclass(slots=True)
+class Analysis:
+    tokens: list[str] = field(default_factory=list)
+    phrases: Counter = field(default_factory=Counter)
+
+
+class Tokenizer:
+    """Stream unigrams and phrase matches from text in one pass.
+
+    ``phrases`` are normalized with the same rules as the text, so
+    "Golden Ratio" and "golden ratio" are the same entry. Phrase matching
+    sees every token; ``stopwords`` and ``stem`` only affect emitted
+    unigrams.
+    """
+
+    def __init__(
+        self,
+        phrases: Iterable[str] = DEFAULT_PHRASES,
+        stopwords: Iterable[str] = (),
+        stem: Callable[[str], str] | None = None,
+        fold_accents: bool = False,
+    ) -> None:
+        self.fold_accents = fold_accents
+        self.stopwords = frozenset(self.normalize(w) for w in stopwords)
+        self.stem = stem
+        self._phrases: dict[tuple[str, ...], str] = {}
+        for phrase in phrases:
+            parts = tuple(TOKEN_RE.findall(self.normalize(phrase)))
+            if len(parts) > 1:
+                self._phrases[parts] = " ".join(parts)
+        self._phrase_lengths = sorted({len(p) for p in self._phrases})
+        self._window = max(self._phrase_lengths, default=1)
+
+    def normalize(self, text: str) -> str:
+        text = unicodedata.normalize("NFKC", text).translate(_PUNCT_MAP).casefold()
+        if self.fold_accents:
+            decomposed = unicodedata.normalize("NFKD", text)
+            text = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+        return text
+
+    def stream(self, text: str) -> Iterator[tuple[str, bool]]:
+        """Yield ``(term, is_phrase)``; a phrase follows its final word."""
+        window: deque[str] = deque(maxlen=self._window)
+        phrases = self._phrases
+        lengths = self._phrase_lengths
+        stopwords = self.stopwords
+        stem = self.stem
+        for match in TOKEN_RE.finditer(self.normalize(text)):
+            token = match.group()
+            if token.endswith("'s"):
+                token = token[:-2]
+            if token not in stopwords:
+                yield (stem(token) if stem else token), False
+            if not phrases:
+                continue
+            window.append(token)
+            tail = tuple(window)
+            for n in lengths:
+                if n > len(tail):
+                    break
+                hit = phrases.get(tail[-n:])
+                if hit:
+                    yield hit, True
+
+    def analyze(self, text: str) -> Analysis:
+        result = Analysis()
+        tokens = result.tokens
+        phrases = result.phrases
+        for term, is_phrase in self.stream(text):
+            if is_phrase:
+                phrases[term] += 1
+            else:
+                tokens.append(term)
+        return result
+
+    def tokenize(self, text: str) -> list[str]:
+        return [term for term, is_phrase in self.stream(text) if not is_phrase]
@@ -0,0 +1,281 @@
+"""Topics of the blog: TF-IDF over the token store, factored by NMF.
+
+``term_matrix`` builds a sparse post × term count matrix straight from the
+interned token arrays (``cookbook.token_store``). It drops stopwords, terms
+with digits, and terms that are too rare or too common. ``tfidf`` applies
+sublinear term frequency and smoothed IDF, then scales rows to unit length.
+
+``fit_nmf`` factors the TF-IDF matrix as X ≈ W H with k topics. It runs
+online NMF over mini-batches of rows. For each batch it solves the batch
+weights with H fixed (multiplicative updates). It then folds WᵀW and WᵀX
+into running statistics with a forgetting factor and takes one HALS sweep
+over H. With a single batch, the default, this is plain alternating NMF.
+Beyond X, memory is O(k × terms), so a larger corpus only needs a smaller
+batch size. The run is seeded, so it gives the same topics every time.
+
+``TopicModel`` keeps the per-post weights and each topic's term loadings.
+It reports top terms, per-post shares and per-year topic shares, and it
+saves to ``.npz``.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .token_store import TokenStore
+
+EPS = 1e-10
+STOPWORDS = frozenset(
+    """
+    about above after again against all also am an and any are around as at be because been
+    before being between both but by can cannot could did does doing done down during each even
+    every few for from further get gets got had has have having he her here hers him his how
+    however if in into is it its itself just let like made make makes many may me might more
+    most much must my no nor not now of off often on once one only or other our out over own
+    per same see she should since so some such than that the their them then there these they
+    this those through thus to too two under until up upon use used uses using very via was way
+    we well were what when where whether which while who whom why will with within without
+    would yet you your
+    """.split()
+)
+
+
+def _np_sparse():
+    try:
+        import numpy as np
+        from scipy import sparse
+    except ImportError as e:
+        raise ImportError(
+            "NumPy and SciPy are required for topic models. "
+            "Install with: pip install -e .[analysis]"
+        ) from e
+    return np, sparse
+
+
+def _eligible(term: str, stopwords: frozenset) -> bool:
+    return len(term) >= 3 and term not in stopwords and not any(ch.isdigit() for ch in term)
+
+
+def term_matrix(
+    store: TokenStore,
+    min_df: int = 5,
+    max_df: float = 0.5,
+    stopwords: Iterable[str] = STOPWORDS,
+):
+    """``(counts, terms)``: CSR post × term counts, one row per store slot.
+
+    Terms are kept if they occur in at least ``min_df`` posts and in at most
+    a ``max_df`` fraction of them.
+    """
+    np, sparse = _np_sparse()
+    tokens, offsets, _ = store.as_numpy()
+    n = len(store)
+    rows = np.repeat(np.arange(n, dtype=np.int32), np.diff(offsets).astype(np.int64))
+    counts = sparse.csr_matrix(
+        (np.ones(len(tokens), dtype=np.float64), (rows, tokens.astype(np.int32))),
+        shape=(n, len(store.vocab)),
+    )
+    del tokens, offsets
+    stopwords = frozenset(stopwords)
+    eligible = np.fromiter(
+        (_eligible(term, stopwords) for term in store.vocab), dtype=bool, count=len(store.vocab)
+    )
+    df = counts.getnnz(axis=0)
+    keep = np.flatnonzero(eligible & (df >= min_df) & (df <= max_df * n))
+    return counts[:, keep], [store.vocab[i] for i in keep]
+
+
+def tfidf(counts):
+    """Sublinear TF × smoothed IDF, rows scaled to unit L2 norm (empty rows stay zero)."""
+    np, sparse = _np_sparse()
+    X = sparse.csr_matrix(counts, dtype=np.float64, copy=True)
+    n = X.shape[0]
+    df = np.bincount(X.indices, minlength=X.shape[1])
+    idf = np.log((1 + n) / (1 + df)) + 1
+    X.data = (1 + np.log(X.data)) * idf[X.indices]
+    norms = np.sqrt(np.bincount(np.repeat(np.arange(n), np.diff(X.indptr)), X.data**2, n))
+    X.data /= np.repeat(np.where(norms > 0, norms, 1), np.diff(X.indptr))
+    return X
+
+
+def _solve_weights(np, X, H, iters: int):
+    """Nonnegative W minimising ‖X − W H‖ for fixed H, by multiplicative updates."""
+    XHt = np.asarray(X @ H.T)
+    HHt = H @ H.T
+    W = XHt.copy()
+    for _ in range(iters):
+        W *= XHt / (W @ HHt + EPS)
+    return W
+
+
+def _normalize_rows(np, H):
+    norms = np.linalg.norm(H, axis=1, keepdims=True)
+    return H / np.where(norms > 0, norms, 1)
+
+
+def transform(X, H, batch_size: Optional[int] = None, iters: int = 50):
+    """Topic weights of the rows of ``X`` under topics ``H``."""
+    np, _ = _np_sparse()
+    n = X.shape[0]
+    step = batch_size or max(n, 1)
+    return np.vstack(
+        [_solve_weights(np, X[i : i + step], H, iters) for i in range(0, n, step)]
+        or [np.zeros((0, H.shape[0]))]
+    )
+
+
+def fit_nmf(
+    X,
+    n_topics: int = 12,
+    seed: int = 0,
+    batch_size: Optional[int] = None,
+    epochs: Optional[int] = None,
+    inner: int = 10,
+    forget: float = 0.7,
+    tol: float = 1e-4,
+):
+    """Factor nonnegative ``X`` (posts × terms) as ``W @ H``; returns ``(W, H)``.
+
+    ``batch_size`` of ``None`` fits on all rows at once. Otherwise each epoch
+    visits the rows in a seeded random order, ``batch_size`` at a time, and
+    older batch statistics decay by ``forget``. ``epochs`` defaults to 200
+    for a single batch and 20 for mini-batches; the fit stops early once an
+    epoch changes ``H`` by less than ``tol`` (relative). Topic rows of ``H``
+    have unit norm.
+    """
+    np, _ = _np_sparse()
+    rng = np.random.default_rng(seed)
+    n, n_terms = X.shape
+    step = n if not batch_size or batch_size >= n else batch_size
+    rho = forget if step < n else 0.0
+    if epochs is None:
+        epochs = 20 if step < n else 200
+
+    # Each topic starts as the mean of a few random posts, plus a little noise.
+    picks = rng.integers(0, max(n, 1), size=(n_topics, max(1, min(10, n // max(n_topics, 1)))))
+    H = np.vstack([np.asarray(X[p].mean(axis=0)).ravel() for p in picks])
+    H = _normalize_rows(np, H + 1e-3 * rng.random((n_topics, n_terms)))
+    A = np.zeros((n_topics, n_topics))
+    B = np.zeros((n_topics, n_terms))
+    for _ in range(epochs):
+        previous = H.copy()
+        order = rng.permutation(n) if step < n else None
+        for start in range(0, n, step):
+            Xb = X if order is None else X[order[start : start + step]]
+            Wb = _solve_weights(np, Xb, H, inner)
+            A = rho * A + Wb.T @ Wb
+            B = rho * B + np.asarray(Xb.T @ Wb).T
+            for t in range(n_topics):
+                if A[t, t] > 0:
+                    H[t] = np.maximum(H[t] + (B[t] - A[t] @ H) / A[t, t], EPS)
+            H = _normalize_rows(np, H)
+        if np.linalg.norm(H - previous) <= tol * np.linalg.norm(previous):
+            break
+    return transform(X, H, batch_size), H
+
+
+class TopicModel:
+    """Per-post topic weights and topic term loadings from ``fit_nmf``."""
+
+    def __init__(self, terms: list[str], components, weights, post_ids, years) -> None:
+        self.terms = terms
+        self.components = components  # topics × terms
+        self.weights = weights  # posts × topics
+        self.post_ids = post_ids
+        self.years = years
+
+    @classmethod
+    def fit(
+        cls,
+        store: TokenStore,
+        years: dict[int, int],
+        n_topics: int = 12,
+        seed: int = 0,
+        batch_size: Optional[int] = None,
+        min_df: int = 5,
+        max_df: float = 0.5,
+    ) -> TopicModel:
+        """Fit on every post in ``store``; ``years`` maps post ID to year (0 if unknown)."""
+        np, _ = _np_sparse()
+        counts, terms = term_matrix(store, min_df=min_df, max_df=max_df)
+        weights, components = fit_nmf(tfidf(counts), n_topics, seed=seed, batch_size=batch_size)
+        post_ids = np.array(store.post_ids, dtype=np.int64)
+        post_years = np.array([years.get(int(p), 0) for p in post_ids], dtype=np.int32)
+        return cls(terms, components, weights, post_ids, post_years)
+
+    @classmethod
+    def from_index(cls, index_path: Path, **kwargs) -> TopicModel:
+        from . import io
+
+        years = {}
+        for rec in io.read_jsonl(index_path):
+            date = str(rec.get("date") or "")
+            years[rec["id"]] = int(date[:4]) if date[:4].isdigit() else 0
+        with TokenStore.for_index(index_path) as store:
+            return cls.fit(store, years, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.post_ids)
+
+    @property
+    def n_topics(self) -> int:
+        return self.components.shape[0]
+
+    def top_terms(self, topic: int, n: int = 10) -> list[str]:
+        np, _ = _np_sparse()
+        return [self.terms[j] for j in np.argsort(-self.components[topic], kind="stable")[:n]]
+
+    def labels(self, n: int = 3) -> list[str]:
+        """A short name per topic: its top ``n`` terms."""
+        return [" / ".join(self.top_terms(t, n)) for t in range(self.n_topics)]
+
+    def shares(self):
+        """Weights scaled to sum to 1 per post; posts with no kept terms are all zero."""
+        np, _ = _np_sparse()
+        totals = self.weights.sum(axis=1, keepdims=True)
+        return self.weights / np.where(totals > 0, totals, 1)
+
+    def dominant(self):
+        """Each post's strongest topic, or -1 for posts with no kept terms."""
+        np, _ = _np_sparse()
+        return np.where(self.weights.sum(axis=1) > 0, self.weights.argmax(axis=1), -1)
+
+    def per_year(self, years: Optional[Iterable[int]] = None):
+        """``(years, shares)``: the mean topic shares of each year's posts (years × topics)."""
+        np, _ = _np_sparse()
+        if years is None:
+            years = sorted(set(self.years.tolist()) - {0})
+        years = [int(y) for y in years]
+        lookup = {year: i for i, year in enumerate(years)}
+        slot = np.array([lookup.get(int(y), -1) for y in self.years], dtype=np.int64)
+        keep = (slot >= 0) & (self.dominant() >= 0)
+        totals = np.zeros((len(years), self.n_topics))
+        np.add.at(totals, slot[keep], self.shares()[keep])
+        posts = np.bincount(slot[keep], minlength=len(years))[:, None]
+        return years, totals / np.where(posts > 0, posts, 1)
+
+    def save(self, path: Path) -> None:
+        np, _ = _np_sparse()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as fh:
+            np.savez_compressed(
+                fh,
+                terms=np.array(self.terms, dtype=str),
+                components=self.components,
+                weights=self.weights,
+                post_ids=self.post_ids,
+                years=self.years,
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> TopicModel:
+        np, _ = _np_sparse()
+        with np.load(path) as data:
+            return cls(
+                data["terms"].tolist(),
+                data["components"].copy(),
+                data["weights"].copy(),
+                data["post_ids"].copy(),
+                data["years"].copy(),
+            )
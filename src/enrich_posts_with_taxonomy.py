@@ -1,5 +1,10 @@
 #!/usr/bin/env python3
-"""Join post JSONL with taxonomy names and emit enriched JSONL."""
+"""Join post JSONL with taxonomy names and emit enriched JSONL.
+
+Posts are streamed through ``cookbook.io``: they are decoded in small batches
+and written as they are joined, so memory is bounded by one batch, not the
+corpus.
+"""
 
 from __future__ import annotations
 
@@ -7,10 +12,9 @@ import argparse
 import json
 from collections import Counter
 from pathlib import Path
+from typing import Iterable, Iterator
 
-
-def load_jsonl(path: Path) -> list[dict]:
-    return [json.loads(line) for line in path.open()]
+from cookbook import io
 
 
 def load_taxonomy(path: Path) -> dict[int, str]:
@@ -18,6 +22,41 @@ def load_taxonomy(path: Path) -> dict[int, str]:
     return {int(item["id"]): item.get("name", "") for item in items}
 
 
+def enrich(
+    posts: Iterable[dict],
+    cat_map: dict[int, str],
+    tag_map: dict[int, str],
+    cat_counts: Counter | None = None,
+    tag_counts: Counter | None = None,
+) -> Iterator[dict]:
+    """Yield each post with ``category_names``/``tag_names``, updating the counters."""
+    for post in posts:
+        cats = [cat_map.get(int(cid), str(cid)) for cid in post.get("categories", [])]
+        tags = [tag_map.get(int(tid), str(tid)) for tid in post.get("tags", [])]
+        if cat_counts is not None:
+            cat_counts.update(cats)
+        if tag_counts is not None:
+            tag_counts.update(tags)
+        post["category_names"] = cats
+        post["tag_names"] = tags
+        yield post
+
+
+def write_enriched(
+    posts_path: Path,
+    categories_path: Path,
+    tags_path: Path,
+    output_path: Path,
+    cat_counts: Counter | None = None,
+    tag_counts: Counter | None = None,
+) -> int:
+    """Stream ``posts_path`` through ``enrich`` into ``output_path``; return the post count."""
+    cat_map = load_taxonomy(categories_path)
+    tag_map = load_taxonomy(tags_path)
+    posts = enrich(io.read_jsonl(posts_path), cat_map, tag_map, cat_counts, tag_counts)
+    return io.write_jsonl_atomic(output_path, posts)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Enrich posts with category/tag names.")
     parser.add_argument(
@@ -46,29 +85,13 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    posts = load_jsonl(args.posts)
-    cat_map = load_taxonomy(args.categories)
-    tag_map = load_taxonomy(args.tags)
-
-    cat_counts = Counter()
-    tag_counts = Counter()
-
-    enriched = []
-    for post in posts:
-        cats = [cat_map.get(int(cid), str(cid)) for cid in post.get("categories", [])]
-        tags = [tag_map.get(int(tid), str(tid)) for tid in post.get("tags", [])]
-        cat_counts.update(cats)
-        tag_counts.update(tags)
-        post["category_names"] = cats
-        post["tag_names"] = tags
-        enriched.append(post)
-
-    args.output.parent.mkdir(parents=True, exist_ok=True)
-    with args.output.open("w", encoding="utf-8") as f:
-        for post in enriched:
-            f.write(json.dumps(post, ensure_ascii=False) + "\n")
+    cat_counts: Counter = Counter()
+    tag_counts: Counter = Counter()
+    written = write_enriched(
+        args.posts, args.categories, args.tags, args.output, cat_counts, tag_counts
+    )
 
-    print(f"Wrote {len(enriched)} posts to {args.output}")
+    print(f"Wrote {written} posts to {args.output}")
     print("Top 10 categories:")
     for name, count in cat_counts.most_common(10):
         print(f"  {name}: {count}")
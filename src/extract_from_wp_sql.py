@@ -4,11 +4,12 @@
 from __future__ import annotations
 
 import argparse
-import json
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable, List, Optional
 
+from cookbook import io
+
 
 POST_COLUMNS = [
     "ID",
@@ -199,24 +200,23 @@ def extract_posts(dump_path: Path) -> List[PostRow]:
     return posts
 
 
-def write_jsonl(posts: Iterable[PostRow], destination: Path) -> None:
-    destination.parent.mkdir(parents=True, exist_ok=True)
-    with destination.open("w", encoding="utf-8") as f:
-        for post in posts:
-            content = unescape_mysql(post.content)
-            excerpt = unescape_mysql(post.excerpt)
-            record = {
-                "id": post.id,
-                "slug": post.slug,
-                "title": post.title,
-                "date": post.date,
-                "modified": post.modified,
-                "guid": post.guid,
-                "content": content,
-                "excerpt": excerpt,
-                "word_count": len(content.split()),
-            }
-            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+def post_record(post: PostRow) -> dict:
+    content = unescape_mysql(post.content)
+    return {
+        "id": post.id,
+        "slug": post.slug,
+        "title": post.title,
+        "date": post.date,
+        "modified": post.modified,
+        "guid": post.guid,
+        "content": content,
+        "excerpt": unescape_mysql(post.excerpt),
+        "word_count": len(content.split()),
+    }
+
+
+def write_jsonl(posts: Iterable[PostRow], destination: Path) -> int:
+    return io.write_jsonl(destination, (post_record(post) for post in posts))
 
 
 def main() -> None:
@@ -1,131 +1,37 @@
 #!/usr/bin/env python3
-"""Extract blog content from the downloaded johndcook.com site."""
+"""Extract blog content from the downloaded johndcook.com site.
+
+Re-runs are incremental: a manifest beside the output records each page's
+``(path, mtime, size)``, and pages whose stat is unchanged reuse their entry
+from the previous output instead of being reparsed. ``--workers N`` parses
+the changed pages in a process pool; results are merged back in sorted path
+order as they arrive, so the output is identical to a serial run.
+"""
 
 from __future__ import annotations
 
 import argparse
 import json
-from dataclasses import dataclass
-from html.parser import HTMLParser
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Iterable, Iterator, List, Optional
 from urllib.parse import urlparse
 
+from cookbook import io
+from cookbook.html_extract import (  # noqa: F401
+    BACKENDS,
+    BLOCK_TAGS,
+    ParsedPage,
+    parse_page,
+    resolve_backend,
+)
 
-BLOCK_TAGS = {"p", "li", "h1", "h2", "h3", "pre", "blockquote"}
-
-
-@dataclass
-class ParsedPage:
-    canonical: Optional[str]
-    title: Optional[str]
-    description: Optional[str]
-    blocks: List[dict]
-
-
-class MainContentParser(HTMLParser):
-    """Minimal HTML extractor tailored to johndcook.com pages."""
-
-    def __init__(self) -> None:
-        super().__init__(convert_charrefs=True)
-        self.in_title = False
-        self.title_parts: List[str] = []
-        self.description: Optional[str] = None
-        self.canonical: Optional[str] = None
-        self.in_main = False
-        self.main_depth = 0
-        self.skip_depth = 0
-        self.block_stack: List[dict] = []
-        self.blocks: List[dict] = []
-
-    def handle_starttag(self, tag: str, attrs) -> None:
-        attrs_dict = {k.lower(): v for k, v in attrs}
-
-        if tag == "title":
-            self.in_title = True
-
-        if tag == "meta" and attrs_dict.get("name", "").lower() == "description":
-            self.description = attrs_dict.get("content")
-
-        rel_value = attrs_dict.get("rel", "")
-        if tag == "link" and rel_value.lower() == "canonical":
-            href = attrs_dict.get("href")
-            if href:
-                if self.canonical is None or "/blog/" in href:
-                    self.canonical = href
-
-        if tag == "div" and attrs_dict.get("id") == "main":
-            self.in_main = True
-            self.main_depth = 1
-            return
-
-        if self.in_main and tag == "div":
-            self.main_depth += 1
+MANIFEST_VERSION = 1
 
-        if not self.in_main:
-            return
 
-        if tag in {"script", "style"}:
-            self.skip_depth += 1
-            return
-
-        if self.skip_depth > 0:
-            return
-
-        if tag in BLOCK_TAGS:
-            self.block_stack.append({"tag": tag, "parts": []})
-        elif tag == "br" and self.block_stack:
-            self.block_stack[-1]["parts"].append("\n")
-
-    def handle_endtag(self, tag: str) -> None:
-        if tag == "title":
-            self.in_title = False
-
-        if tag in {"script", "style"} and self.skip_depth > 0:
-            self.skip_depth -= 1
-            return
-
-        if self.in_main and tag == "div":
-            self.main_depth -= 1
-            if self.main_depth <= 0:
-                self.in_main = False
-            return
-
-        if not self.in_main or self.skip_depth > 0:
-            return
-
-        if tag in BLOCK_TAGS and self.block_stack:
-            block = self.block_stack.pop()
-            text = "".join(block["parts"])
-            if block["tag"] != "pre":
-                text = " ".join(text.split())
-            else:
-                text = text.strip("\n")
-            if text.strip():
-                self.blocks.append({"tag": block["tag"], "text": text.strip()})
-
-    def handle_data(self, data: str) -> None:
-        if self.in_title:
-            self.title_parts.append(data.strip())
-
-        if not self.in_main or self.skip_depth > 0 or not self.block_stack:
-            return
-
-        self.block_stack[-1]["parts"].append(data)
-
-
-def parse_html(path: Path) -> ParsedPage:
-    parser = MainContentParser()
-    parser.feed(path.read_text(encoding="utf-8", errors="ignore"))
-    parser.close()
-
-    title = " ".join(part for part in parser.title_parts if part).strip() or None
-    return ParsedPage(
-        canonical=parser.canonical,
-        title=title,
-        description=parser.description,
-        blocks=parser.blocks,
-    )
+def parse_html(path: Path, backend: str = "stdlib") -> ParsedPage:
+    return parse_page(path.read_text(encoding="utf-8", errors="ignore"), backend)
 
 
 def is_blog_page(canonical: Optional[str], path: Path) -> bool:
@@ -193,11 +99,68 @@ def iter_html_files(root: Path) -> Iterable[Path]:
         yield path
 
 
-def write_jsonl(entries: Iterable[dict], destination: Path) -> None:
-    destination.parent.mkdir(parents=True, exist_ok=True)
-    with destination.open("w", encoding="utf-8") as f:
-        for entry in entries:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+def write_jsonl(entries: Iterable[dict], destination: Path) -> int:
+    """Stream entries to ``destination`` via a temp file; return the count written."""
+    return io.write_jsonl_atomic(destination, entries)
+
+
+def manifest_path(output: Path) -> Path:
+    return output.with_name(output.stem + ".manifest.json")
+
+
+def load_manifest(path: Path, backend: str) -> dict:
+    """Return ``{relative path: [mtime_ns, size, has_entry]}``, empty if stale."""
+    if not path.exists():
+        return {}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("version") != MANIFEST_VERSION or data.get("parser") != backend:
+        return {}
+    return data.get("files", {})
+
+
+def save_manifest(path: Path, backend: str, files: dict) -> None:
+    payload = {"version": MANIFEST_VERSION, "parser": backend, "files": files}
+    path.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+
+
+def load_previous_entries(output: Path) -> dict[str, dict]:
+    """Previous output entries keyed by ``source_path``."""
+    if not output.exists():
+        return {}
+    return {entry["source_path"]: entry for entry in io.read_jsonl(output)}
+
+
+def extract_file(path: Path, backend: str = "stdlib") -> Optional[dict]:
+    return build_entry(path, parse_html(path, backend))
+
+
+def _extract_worker(args: tuple[str, str]) -> Optional[dict]:
+    path, backend = args
+    return extract_file(Path(path), backend)
+
+
+def iter_entries(
+    html_files: List[Path],
+    stale: List[Path],
+    cached: dict[str, dict],
+    backend: str,
+    workers: int,
+) -> Iterator[Optional[dict]]:
+    """Yield an entry (or None) per file in order, parsing only ``stale`` files."""
+    stale_set = set(stale)
+    if workers > 1 and len(stale) > 1:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        chunksize = max(1, len(stale) // (workers * 8))
+        fresh = pool.map(_extract_worker, [(str(p), backend) for p in stale], chunksize=chunksize)
+    else:
+        pool = None
+        fresh = (extract_file(p, backend) for p in stale)
+    try:
+        for path in html_files:
+            yield next(fresh) if path in stale_set else cached.get(str(path))
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
 
 
 def main() -> None:
@@ -220,6 +183,23 @@ def main() -> None:
         default=default_output,
         help="Where to write JSONL output (default: %(default)s)",
     )
+    parser.add_argument(
+        "--parser",
+        choices=("auto", *BACKENDS),
+        default="stdlib",
+        help="HTML parser backend; auto prefers selectolax, then lxml (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Parse changed pages in this many processes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the manifest and reparse every page.",
+    )
     parser.add_argument(
         "--limit",
         type=int,
@@ -229,20 +209,41 @@ def main() -> None:
 
     args = parser.parse_args()
     source_root: Path = args.source
+    backend = resolve_backend(args.parser)
+    start = time.perf_counter()
 
     html_files = list(iter_html_files(source_root))
     if args.limit:
         html_files = html_files[: args.limit]
 
-    entries: List[dict] = []
+    manifest_file = manifest_path(args.output)
+    previous = {} if args.full else load_manifest(manifest_file, backend)
+    cached = load_previous_entries(args.output) if previous else {}
+    files: dict = {}
+    stale: List[Path] = []
     for path in html_files:
-        parsed = parse_html(path)
-        entry = build_entry(path, parsed)
-        if entry:
-            entries.append(entry)
-
-    write_jsonl(entries, args.output)
-    print(f"Wrote {len(entries)} blog entries to {args.output}")
+        stat = path.stat()
+        key = str(path.relative_to(source_root))
+        old = previous.get(key)
+        files[key] = [stat.st_mtime_ns, stat.st_size, False]
+        unchanged = old is not None and old[:2] == files[key][:2]
+        if not unchanged or (old[2] and str(path) not in cached):
+            stale.append(path)
+
+    def tracked() -> Iterator[dict]:
+        entries = iter_entries(html_files, stale, cached, backend, args.workers)
+        for path, entry in zip(html_files, entries):
+            if entry:
+                files[str(path.relative_to(source_root))][2] = True
+                yield entry
+
+    written = write_jsonl(tracked(), args.output)
+    save_manifest(manifest_file, backend, files)
+    print(
+        f"Wrote {written} blog entries to {args.output} "
+        f"(parsed {len(stale)} of {len(html_files)} pages with {backend}, "
+        f"{time.perf_counter() - start:.1f}s)"
+    )
 
 
 if __name__ == "__main__":
@@ -1,39 +1,42 @@
 #!/usr/bin/env python3
-"""Fetch all published posts via the WordPress REST API."""
+"""Fetch all published posts via the WordPress REST API.
+
+Responses go through the shared HTTP cache (cookbook.http_cache), so a
+repeated run only revalidates pages; --offline replays the cache.
+"""
 
 from __future__ import annotations
 
 import argparse
-import json
-import ssl
 from pathlib import Path
 from typing import Iterable
 from urllib.parse import urlencode
-from urllib.request import Request, urlopen
 
+from cookbook import io
+from cookbook.http_cache import HttpCache
 
-def fetch_page(base_url: str, page: int, per_page: int, verify_ssl: bool) -> tuple[list[dict], dict]:
-    ctx = ssl.create_default_context()
-    if not verify_ssl:
-        ctx.check_hostname = False
-        ctx.verify_mode = ssl.CERT_NONE
 
+def fetch_page(
+    base_url: str,
+    page: int,
+    per_page: int,
+    verify_ssl: bool,
+    cache: HttpCache | None = None,
+) -> tuple[list[dict], dict]:
+    cache = cache or HttpCache(None, verify_ssl=verify_ssl)
     params = {"per_page": per_page, "page": page}
     url = f"{base_url}?{urlencode(params)}"
-    req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-    with urlopen(req, context=ctx) as resp:
-        data = json.load(resp)
-        headers = {k.lower(): v for k, v in resp.getheaders()}
-    return data, headers
+    return cache.get_json(url)
 
 
-def iter_posts(base_url: str, verify_ssl: bool) -> Iterable[dict]:
+def iter_posts(base_url: str, verify_ssl: bool, cache: HttpCache | None = None) -> Iterable[dict]:
     per_page = 100
-    first_page, headers = fetch_page(base_url, 1, per_page, verify_ssl)
+    cache = cache or HttpCache(None, verify_ssl=verify_ssl)
+    first_page, headers = fetch_page(base_url, 1, per_page, verify_ssl, cache)
     total_pages = int(headers.get("x-wp-totalpages", "1"))
     yield from first_page
     for page in range(2, total_pages + 1):
-        data, _ = fetch_page(base_url, page, per_page, verify_ssl)
+        data, _ = fetch_page(base_url, page, per_page, verify_ssl, cache)
         yield from data
 
 
@@ -75,20 +78,26 @@ def main() -> None:
         action="store_true",
         help="Verify SSL certificates (default: disabled).",
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=Path("data/http_cache"),
+        help="HTTP cache directory (default: %(default)s).",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Always download in full.")
+    parser.add_argument("--offline", action="store_true", help="Replay the cache; no network.")
     args = parser.parse_args()
 
-    posts = []
-    for post in iter_posts(args.base_url, args.verify_ssl):
-        posts.append(normalize(post))
-
-    args.output.parent.mkdir(parents=True, exist_ok=True)
-    with args.output.open("w", encoding="utf-8") as f:
-        for post in posts:
-            f.write(json.dumps(post, ensure_ascii=False) + "\n")
+    cache = HttpCache(
+        None if args.no_cache else args.cache_dir, offline=args.offline, verify_ssl=args.verify_ssl
+    )
+    posts = [normalize(post) for post in iter_posts(args.base_url, args.verify_ssl, cache)]
+    io.write_jsonl(args.output, posts)
 
     total_words = sum(p["word_count"] for p in posts)
     print(f"Wrote {len(posts)} posts to {args.output}")
     print(f"Total words: {total_words}")
+    print(cache.summary())
 
 
 if __name__ == "__main__":
@@ -1,31 +1,25 @@
 #!/usr/bin/env python3
-"""Fetch WordPress categories and tags via REST API."""
+"""Fetch WordPress categories and tags via REST API (through the HTTP cache)."""
 
 from __future__ import annotations
 
 import argparse
 import json
-import ssl
 from pathlib import Path
 from urllib.parse import urlencode
-from urllib.request import Request, urlopen
 
+from cookbook.http_cache import HttpCache
 
-def fetch_all(base_url: str, verify_ssl: bool = False) -> list[dict]:
-    ctx = ssl.create_default_context()
-    if not verify_ssl:
-        ctx.check_hostname = False
-        ctx.verify_mode = ssl.CERT_NONE
 
+def fetch_all(base_url: str, verify_ssl: bool = False, cache: HttpCache | None = None) -> list[dict]:
+    cache = cache or HttpCache(None, verify_ssl=verify_ssl)
     per_page = 100
     page = 1
     items: list[dict] = []
     while True:
         params = {"per_page": per_page, "page": page}
         url = f"{base_url}?{urlencode(params)}"
-        req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urlopen(req, context=ctx) as resp:
-            data = json.load(resp)
+        data, _ = cache.get_json(url)
         if not data:
             break
         items.extend(data)
@@ -53,16 +47,28 @@ def main() -> None:
         action="store_true",
         help="Verify SSL certificates (default: disabled).",
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=Path("data/http_cache"),
+        help="HTTP cache directory (default: %(default)s).",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Always download in full.")
+    parser.add_argument("--offline", action="store_true", help="Replay the cache; no network.")
     args = parser.parse_args()
 
     args.output_dir.mkdir(parents=True, exist_ok=True)
+    cache = HttpCache(
+        None if args.no_cache else args.cache_dir, offline=args.offline, verify_ssl=args.verify_ssl
+    )
 
     for kind in ("categories", "tags"):
         url = f"{args.base}/{kind}"
-        items = fetch_all(url, verify_ssl=args.verify_ssl)
+        items = fetch_all(url, verify_ssl=args.verify_ssl, cache=cache)
         out_path = args.output_dir / f"{kind}.json"
         out_path.write_text(json.dumps(items, ensure_ascii=False, indent=2), encoding="utf-8")
         print(f"Wrote {len(items)} {kind} to {out_path}")
+    print(cache.summary())
 
 
 if __name__ == "__main__":
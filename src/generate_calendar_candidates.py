@@ -4,13 +4,17 @@
 from __future__ import annotations
 
 import csv
-import json
 from collections import Counter, defaultdict
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Set, Tuple
 
+from cookbook import io
+from cookbook.corpus import DateIndex
+from cookbook.posts import load_posts as load_enriched_posts, parse_dates
+from cookbook.token_store import TokenStore
+
 TEXT_INDEX = Path("data/johndcook_text_index.jsonl")
 POSTS_ENRICHED = Path("data/johndcook_posts_enriched.jsonl")
 OUT = Path("data/johndcook_calendar_candidates_v4.csv")
@@ -104,71 +108,71 @@ class Post:
     link_count: int
     image_count: int
     symbols: Dict[str, int]
-    tokens: List[str]
+    tokens: memoryview  # term IDs into the token store vocabulary
+    phrases: Dict[str, int]
     categories: List[str]
     tags: List[str]
 
 
-def load_posts() -> List[Post]:
-    by_id = {}
-    with POSTS_ENRICHED.open() as f:
-        for line in f:
-            obj = json.loads(line)
-            by_id[obj["id"]] = obj
+def load_posts() -> Tuple[List[Post], TokenStore]:
+    store = TokenStore.for_index(TEXT_INDEX)
+    by_id = {post.id: post for post in load_enriched_posts(POSTS_ENRICHED)}
+    records = list(io.read_jsonl(TEXT_INDEX))
+    index_dates = parse_dates([idx.get("date") for idx in records])
     posts: List[Post] = []
-    with TEXT_INDEX.open() as f:
-        for line in f:
-            idx = json.loads(line)
-            base = by_id.get(idx["id"], {})
-            date_str = base.get("date") or idx.get("date") or ""
-            try:
-                dt = datetime.fromisoformat(date_str.replace("Z", ""))
-            except Exception:
-                continue
-            posts.append(
-                Post(
-                    id=idx["id"],
-                    title=base.get("title") or idx.get("title") or "",
-                    link=base.get("link") or idx.get("link") or "",
-                    date=dt,
-                    word_count=idx.get("word_count", 0),
-                    link_count=idx.get("link_count", 0),
-                    image_count=idx.get("image_count", 0),
-                    symbols=idx.get("symbols", {}),
-                    tokens=idx.get("tokens", []),
-                    categories=base.get("category_names", []),
-                    tags=base.get("tag_names", []),
-                )
+    for idx, idx_date in zip(records, index_dates):
+        base = by_id.get(idx["id"])
+        dt = base.date if base else idx_date
+        if dt is None:
+            continue
+        posts.append(
+            Post(
+                id=idx["id"],
+                title=(base and base.title) or idx.get("title") or "",
+                link=(base and base.link) or idx.get("link") or "",
+                date=dt,
+                word_count=idx.get("word_count", 0),
+                link_count=idx.get("link_count", 0),
+                image_count=idx.get("image_count", 0),
+                symbols=idx.get("symbols", {}),
+                tokens=store.doc_for(idx["id"]),
+                phrases=idx.get("phrases", {}),
+                categories=base.categories if base else [],
+                tags=base.tags if base else [],
             )
-    return posts
+        )
+    return posts, store
 
 
-def rare_terms(posts: List[Post], max_terms: int = 400) -> List[Tuple[str, Post]]:
+def rare_terms(posts: List[Post], store: TokenStore, max_terms: int = 400) -> List[Tuple[str, Post]]:
+    vocab = store.vocab
+    eligible = [len(t) >= 4 and t.isalpha() and t not in STOPWORDS for t in vocab]
     tf = Counter()
-    posting = defaultdict(list)
+    first_post: Dict[int, Post] = {}
     for p in posts:
-        seen = set()
-        for t in p.tokens:
-            if not t or t in STOPWORDS or len(t) < 4:
+        for tid in set(p.tokens):
+            if not eligible[tid]:
                 continue
-            seen.add(t)
-        for t in seen:
-            tf[t] += 1
-            posting[t].append(p)
-    rares = [(t, posting[t][0]) for t, c in tf.items() if c == 1]
+            tf[tid] += 1
+            first_post.setdefault(tid, p)
+    rares = [(vocab[tid], first_post[tid]) for tid, c in tf.items() if c == 1]
     # sort by length then alphabetically
     rares.sort(key=lambda x: (-len(x[0]), x[0]))
     return rares[:max_terms]
 
 
-def first_last_terms(posts: List[Post], targets: List[str]) -> List[Tuple[str, str, Post]]:
+def first_last_terms(
+    posts: List[Post], store: TokenStore, targets: List[str]
+) -> List[Tuple[str, str, Post]]:
     # returns list of (label, mode[first/last], post)
     results = []
     by_term = defaultdict(list)
+    target_ids = {t: store.term_id(t) for t in targets}
     for p in posts:
         toks = set(p.tokens)
         for t in targets:
-            if t in toks:
+            # Multi-word targets are looked up in the precomputed phrase counts.
+            if target_ids[t] in toks or t in p.phrases:
                 by_term[t].append(p)
     for t in targets:
         if by_term[t]:
@@ -182,15 +186,12 @@ def top_outliers(posts: List[Post], key, n=10, reverse=True) -> List[Post]:
     return sorted(posts, key=key, reverse=reverse)[:n]
 
 
-def on_this_day(posts: List[Post], limit: int = 150) -> List[Post]:
-    by_doy = defaultdict(list)
-    for p in posts:
-        by_doy[p.date.timetuple().tm_yday].append(p)
+def on_this_day(posts: List[Post], dates: DateIndex, limit: int = 150) -> List[Post]:
+    by_id = {p.id: p for p in posts}
     picks = []
-    for doy, plist in by_doy.items():
-        pick = max(plist, key=lambda p: p.word_count)
-        picks.append(pick)
-    picks.sort(key=lambda p: p.date.timetuple().tm_yday)
+    for month, day in dates.month_days():
+        plist = [by_id[pid] for pid in dates.on_this_day(month, day)]
+        picks.append(max(plist, key=lambda p: p.word_count))
     return picks[:limit]
 
 
@@ -199,7 +200,8 @@ def fmt_date(dt: datetime) -> str:
 
 
 def main() -> None:
-    posts = load_posts()
+    posts, store = load_posts()
+    dates = DateIndex.build((p.id, p.date) for p in posts)
     facts = []
     idx = 1
     seen_text: Set[str] = set()
@@ -213,7 +215,7 @@ def main() -> None:
         idx += 1
 
     # Rare terms
-    for term, p in rare_terms(posts, max_terms=400):
+    for term, p in rare_terms(posts, store, max_terms=400):
         add_fact(
             "rarity",
             f"Only one post mentions “{term}”: “{p.title}” on {fmt_date(p.date)}.",
@@ -226,20 +228,18 @@ def main() -> None:
         "markov",
         "prime",
         "fibonacci",
-        "golden",
+        "golden ratio",
         "riemann",
         "zeta",
         "elliptic",
         "fft",
         "pde",
-        "monte",
-        "carlo",
+        "monte carlo",
         "lambda",
         "category",
         "graph",
         "topology",
-        "linear",
-        "algebra",
+        "linear algebra",
         "cryptography",
         "crypto",
         "hipaa",
@@ -262,7 +262,7 @@ def main() -> None:
         "normal",
         "erf",
     ]
-    for term, mode, p in first_last_terms(posts, targets):
+    for term, mode, p in first_last_terms(posts, store, targets):
         add_fact(
             "first-last",
             f"{mode.title()} “{term}” post: “{p.title}” on {fmt_date(p.date)}.",
@@ -306,7 +306,7 @@ def main() -> None:
             )
 
     # On this day (pick long/interesting)
-    for p in on_this_day(posts, limit=200):
+    for p in on_this_day(posts, dates, limit=200):
         add_fact(
             "on-this-day",
             f"On {p.date.strftime('%b %d')}: “{p.title}” ({p.word_count} words, {p.date.year}).",
@@ -315,7 +315,7 @@ def main() -> None:
 
     # Code-ish keywords
     code_terms = ["python", "c++", "cuda", "rust", "haskell", "fortran", "regex", "unicode"]
-    for term, mode, p in first_last_terms(posts, code_terms):
+    for term, mode, p in first_last_terms(posts, store, code_terms):
         add_fact(
             "code",
             f"{mode.title()} “{term}” mention: “{p.title}” on {fmt_date(p.date)}.",
@@ -324,7 +324,7 @@ def main() -> None:
 
     # Privacy/crypto mix
     privacy_terms = ["hipaa", "gdpr", "ccpa", "privacy", "cryptography", "crypto"]
-    for term, mode, p in first_last_terms(posts, privacy_terms):
+    for term, mode, p in first_last_terms(posts, store, privacy_terms):
         add_fact(
             "privacy",
             f"{mode.title()} “{term}” mention: “{p.title}” on {fmt_date(p.date)}.",
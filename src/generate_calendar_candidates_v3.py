@@ -10,12 +10,16 @@ This script:
 from __future__ import annotations
 
 import csv
-import json
-from collections import Counter, defaultdict
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Tuple
+
+from cookbook import io
+from cookbook.corpus import DateIndex
+from cookbook.posts import load_posts as load_enriched_posts, parse_dates
+from cookbook.token_store import TokenStore
 
 TEXT_INDEX = Path("data/johndcook_text_index.jsonl")
 POSTS_ENRICHED = Path("data/johndcook_posts_enriched.jsonl")
@@ -33,48 +37,43 @@ class Post:
     link_count: int
     image_count: int
     symbols: Dict[str, int]
-    tokens: List[str]
+    tokens: memoryview  # term IDs into the token store vocabulary
+    phrases: Dict[str, int]
     categories: List[str]
     tags: List[str]
 
 
-def load_posts() -> List[Post]:
-    by_id = {}
-    with POSTS_ENRICHED.open() as f:
-        for line in f:
-            obj = json.loads(line)
-            by_id[obj["id"]] = obj
+def load_posts() -> Tuple[List[Post], TokenStore]:
+    store = TokenStore.for_index(TEXT_INDEX)
+    by_id = {post.id: post for post in load_enriched_posts(POSTS_ENRICHED)}
+    records = list(io.read_jsonl(TEXT_INDEX))
+    index_dates = parse_dates([idx.get("date") for idx in records])
     posts: List[Post] = []
-    with TEXT_INDEX.open() as f:
-        for line in f:
-            idx = json.loads(line)
-            base = by_id.get(idx["id"], {})
-            date_str = base.get("date") or idx.get("date") or ""
-            try:
-                dt = datetime.fromisoformat(date_str.replace("Z", ""))
-            except Exception:
-                continue
-            posts.append(
-                Post(
-                    id=idx["id"],
-                    title=base.get("title") or idx.get("title") or "",
-                    link=base.get("link") or idx.get("link") or "",
-                    date=dt,
-                    word_count=idx.get("word_count", 0),
-                    link_count=idx.get("link_count", 0),
-                    image_count=idx.get("image_count", 0),
-                    symbols=idx.get("symbols", {}),
-                    tokens=idx.get("tokens", []),
-                    categories=base.get("category_names", []),
-                    tags=base.get("tag_names", []),
-                )
+    for idx, idx_date in zip(records, index_dates):
+        base = by_id.get(idx["id"])
+        dt = base.date if base else idx_date
+        if dt is None:
+            continue
+        posts.append(
+            Post(
+                id=idx["id"],
+                title=(base and base.title) or idx.get("title") or "",
+                link=(base and base.link) or idx.get("link") or "",
+                date=dt,
+                word_count=idx.get("word_count", 0),
+                link_count=idx.get("link_count", 0),
+                image_count=idx.get("image_count", 0),
+                symbols=idx.get("symbols", {}),
+                tokens=store.doc_for(idx["id"]),
+                phrases=idx.get("phrases", {}),
+                categories=base.categories if base else [],
+                tags=base.tags if base else [],
             )
-    return posts
+        )
+    return posts, store
 
 
 def load_metadata():
-    by_doy = Counter()
-    by_monthday = Counter()
     by_weekday = Counter()
     by_year = Counter()
     with POSTS_META.open() as f:
@@ -83,20 +82,16 @@ def load_metadata():
             if not row["date"]:
                 continue
             dt = datetime.fromisoformat(row["date"].replace("Z", ""))
-            doy = dt.timetuple().tm_yday
-            by_doy[doy] += 1
-            by_monthday[(dt.month, dt.day)] += 1
             by_weekday[dt.strftime("%A")] += 1
             by_year[dt.year] += 1
-    return by_doy, by_monthday, by_weekday, by_year
+    return by_weekday, by_year
 
 
-def build_term_doc_counts(posts: List[Post]) -> Counter:
-    df = Counter()
+def build_term_doc_counts(posts: List[Post], store: TokenStore) -> Counter:
+    df_ids = Counter()
     for p in posts:
-        for t in set(p.tokens):
-            df[t] += 1
-    return df
+        df_ids.update(set(p.tokens))
+    return Counter({store.vocab[tid]: c for tid, c in df_ids.items()})
 
 
 def format_date(dt: datetime) -> str:
@@ -108,9 +103,11 @@ def month_day_str(month: int, day: int) -> str:
 
 
 def main() -> None:
-    posts = load_posts()
-    by_doy, by_monthday, by_weekday, by_year = load_metadata()
-    df = build_term_doc_counts(posts)
+    posts, store = load_posts()
+    by_id = {p.id: p for p in posts}
+    dates = DateIndex.build((p.id, p.date) for p in posts)
+    by_weekday, by_year = load_metadata()
+    df = build_term_doc_counts(posts, store)
 
     total_posts = len(posts)
 
@@ -127,7 +124,7 @@ def main() -> None:
         next_id += 1
 
     # 1) Date-density "on-this-day" style facts
-    top_days = by_monthday.most_common(10)
+    top_days = Counter(dates.month_day_counts()).most_common(10)
     if top_days:
         (m0, d0), c0 = top_days[0]
         add(
@@ -288,14 +285,15 @@ def main() -> None:
             )
 
     # 6) Rare term facts (many, but with varied phrasing)
-    rares = [(t, df[t]) for t in df if df[t] == 1 and len(t) >= 6]
+    rares = [(t, df[t]) for t in df if df[t] == 1 and len(t) >= 6 and t.isalpha()]
     rares_sorted = sorted(rares, key=lambda kv: (-len(kv[0]), kv[0]))
 
     # Map term -> first post containing it
     term_post: Dict[str, Post] = {}
     for p in posts:
-        for t in set(p.tokens):
-            if t in df and df[t] == 1 and len(t) >= 6 and t not in term_post:
+        for tid in set(p.tokens):
+            t = store.vocab[tid]
+            if t in df and df[t] == 1 and len(t) >= 6 and t.isalpha() and t not in term_post:
                 term_post[t] = p
 
     def rare_phrase(i: int, term: str, p: Post) -> str:
@@ -319,12 +317,8 @@ def main() -> None:
         add("rarity", rare_phrase(i, term, p), p.link)
 
     # 7) On-this-day picks: per day-of-year, choose an interesting post but phrase by density
-    by_doy_posts: Dict[int, List[Post]] = defaultdict(list)
-    for p in posts:
-        doy = p.date.timetuple().tm_yday
-        by_doy_posts[doy].append(p)
-
-    for doy, plist in sorted(by_doy_posts.items()):
+    for month, day in dates.month_days():
+        plist = [by_id[pid] for pid in dates.on_this_day(month, day)]
         count = len(plist)
         best = max(plist, key=lambda p: p.word_count)
         add(
@@ -335,14 +329,15 @@ def main() -> None:
 
     # 8) Co-occurrence quirks for a few term pairs
     def posts_with_terms(a: str, b: str) -> List[Post]:
+        a_id, b_id = store.term_id(a), store.term_id(b)
         result = []
         for p in posts:
             toks = set(p.tokens)
-            if a in toks and b in toks:
+            if (a_id in toks or a in p.phrases) and (b_id in toks or b in p.phrases):
                 result.append(p)
         return result
 
-    for a, b in [("fibonacci", "prime"), ("fibonacci", "golden"), ("bayesian", "markov"), ("cryptography", "privacy")]:
+    for a, b in [("fibonacci", "prime"), ("fibonacci", "golden ratio"), ("bayesian", "markov"), ("cryptography", "privacy")]:
         plist = posts_with_terms(a, b)
         if plist:
             add(
@@ -4,55 +4,20 @@
 from __future__ import annotations
 
 import csv
-import json
 from collections import Counter, defaultdict
-from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from statistics import mean, median
-from typing import Dict, List, Set, Tuple
+from typing import List, Set, Tuple
+
+from cookbook.corpus import DateIndex
+from cookbook.models import Post
+from cookbook.posts import load_posts
 
 INPUT_PATH = Path("data/johndcook_posts_enriched.jsonl")
 OUTPUT_PATH = Path("data/johndcook_calendar_facts.csv")
 
 
-@dataclass
-class Post:
-    id: int
-    title: str
-    link: str
-    date: datetime
-    word_count: int
-    categories: List[str]
-    tags: List[str]
-    slug: str
-
-
-def load_posts(path: Path) -> List[Post]:
-    posts: List[Post] = []
-    with path.open() as f:
-        for line in f:
-            obj = json.loads(line)
-            date_str = obj.get("date") or ""
-            try:
-                dt = datetime.fromisoformat(date_str.replace("Z", ""))
-            except Exception:
-                continue
-            posts.append(
-                Post(
-                    id=obj.get("id"),
-                    title=(obj.get("title") or "").strip(),
-                    link=obj.get("link") or "",
-                    date=dt,
-                    word_count=int(obj.get("word_count", 0)),
-                    categories=obj.get("category_names", []) or [],
-                    tags=obj.get("tag_names", []) or [],
-                    slug=obj.get("slug") or "",
-                )
-            )
-    return posts
-
-
 def format_date(dt: datetime) -> str:
     return dt.strftime("%b %d, %Y")
 
@@ -146,15 +111,19 @@ def add_length_facts(posts: List[Post], facts: List[dict], seen: Set[str]) -> No
     )
 
 
-def add_category_facts(posts: List[Post], facts: List[dict], seen: Set[str]) -> None:
-    cat_counts = Counter()
-    cat_words = defaultdict(int)
+def top_terms(posts: List[Post], kind: str, n: int) -> List[Tuple[str, int, int]]:
+    """Top ``n`` categories or tags as ``(term, posts, mean words)``; ties keep first-seen order."""
+    counts: Counter = Counter()
+    words: defaultdict = defaultdict(int)
     for p in posts:
-        for c in p.categories:
-            cat_counts[c] += 1
-            cat_words[c] += p.word_count
-    for cat, count in cat_counts.most_common(12):
-        avg = int(cat_words[cat] / count)
+        for term in dict.fromkeys(getattr(p, kind)):
+            counts[term] += 1
+            words[term] += p.word_count
+    return [(term, count, int(words[term] / count)) for term, count in counts.most_common(n)]
+
+
+def add_category_facts(posts: List[Post], facts: List[dict], seen: Set[str]) -> None:
+    for cat, count, avg in top_terms(posts, "categories", 12):
         ensure_unique(
             facts,
             seen,
@@ -167,14 +136,7 @@ def add_category_facts(posts: List[Post], facts: List[dict], seen: Set[str]) ->
 
 
 def add_tag_facts(posts: List[Post], facts: List[dict], seen: Set[str]) -> None:
-    tag_counts = Counter()
-    tag_words = defaultdict(int)
-    for p in posts:
-        for t in p.tags:
-            tag_counts[t] += 1
-            tag_words[t] += p.word_count
-    for tag, count in tag_counts.most_common(20):
-        avg = int(tag_words[tag] / count)
+    for tag, count, avg in top_terms(posts, "tags", 20):
         ensure_unique(
             facts,
             seen,
@@ -245,15 +207,15 @@ def add_gap_facts(posts: List[Post], facts: List[dict], seen: Set[str]) -> None:
         )
 
 
-def add_on_this_day(posts: List[Post], facts: List[dict], seen: Set[str], limit: int = 60) -> None:
-    by_doy: Dict[int, List[Post]] = defaultdict(list)
-    for p in posts:
-        doy = p.date.timetuple().tm_yday
-        by_doy[doy].append(p)
+def add_on_this_day(
+    posts: List[Post], dates: DateIndex, facts: List[dict], seen: Set[str], limit: int = 60
+) -> None:
+    by_id = {p.id: p for p in posts}
     count = 0
-    for doy, plist in sorted(by_doy.items()):
+    for month, day in dates.month_days():
         if count >= limit:
             break
+        plist = [by_id[pid] for pid in dates.on_this_day(month, day)]
         pick = max(plist, key=lambda p: p.word_count)
         ensure_unique(
             facts,
@@ -316,6 +278,7 @@ def add_first_last(posts: List[Post], facts: List[dict], seen: Set[str]) -> None
 
 def main() -> None:
     posts = load_posts(INPUT_PATH)
+    dates = DateIndex.build((p.id, p.date) for p in posts)
     facts: List[dict] = []
     seen: Set[str] = set()
 
@@ -326,7 +289,7 @@ def main() -> None:
     add_weekday_facts(posts, facts, seen)
     add_month_facts(posts, facts, seen)
     add_gap_facts(posts, facts, seen)
-    add_on_this_day(posts, facts, seen, limit=80)
+    add_on_this_day(posts, dates, facts, seen, limit=80)
     add_symbol_facts(posts, facts, seen)
     add_first_last(posts, facts, seen)
 
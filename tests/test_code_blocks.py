@@ -0,0 +1,54 @@
+from cookbook.code_blocks import UNKNOWN, CodeTable, classify, iter_code_facts
+from cookbook.html_extract import CodeSpan, extract_post_text
+
+
+def test_extract_code_spans():
+    extracted = extract_post_text(
+        "<p>Call <code>f(x)</code>.</p><pre><code>import numpy as np\nx = 1</code></pre>",
+        "stdlib",
+    )
+    text = extracted.text()
+    assert [(s.tag, s.text) for s in extracted.code_blocks] == [
+        ("code", "f(x)"),
+        ("pre", "import numpy as np\nx = 1"),
+    ]
+    for span in extracted.code_blocks:
+        assert text[span.offset :].startswith(span.text.split("\n")[0])
+
+
+def test_classify():
+    assert classify("import numpy as np\ndef f(x):\n    return np.sin(x)") == "Python"
+    assert classify("my $x = 1;\nprint $x if $line =~ /foo/;") == "Perl"
+    assert classify("Plot[Sin[x], {x, 0, Pi}]") == "Mathematica"
+    assert classify("Get-ChildItem | Where-Object { $_.Length -gt 100 }") == "PowerShell"
+    assert classify("#include <iostream>\nint main() { std::cout << 1; }") == "C++"
+    assert classify("1/7 = 0.142857...\n2/7 = 0.285714...") == UNKNOWN
+
+
+def test_code_table():
+    perl = "use strict;\nmy $n = 0;\n"
+    python = "import math\nprint(math.pi)\n"
+    table = CodeTable.from_spans(
+        [
+            (1, "2009-01-01", [CodeSpan("pre", 0, perl), CodeSpan("code", 9, "$n")]),
+            (2, "2016-01-01", [CodeSpan("pre", 0, python), CodeSpan("pre", 40, python)]),
+            (3, "2017-01-01", [CodeSpan("pre", 5, python)]),
+        ]
+    )
+    first = table.blocks[0]
+    assert (first.language, first.lines, first.chars) == ("Perl", 2, len(perl.strip()))
+    assert len(table) == 5
+    assert table.language_posts() == {"Perl": 1, "Python": 2}
+    assert table.per_year("Python") == {"2016": 1, "2017": 1}
+    assert table.span("Perl") == ("2009", "2009")
+    assert table.blocks_per_post() == {1: 1, 2: 2, 3: 1}
+    assert table.longest_per_post()[2].offset == 0
+
+    facts = list(iter_code_facts(table, {2: "Two listings"}, min_posts=1))
+    assert facts[0]["fact"].startswith("Python code listings appear in 2 posts")
+    assert any("From 2016 on, more posts carry Python listings" in f["fact"] for f in facts)
+    assert {
+        "fact": "“Two listings” has more code listings than any other post: 2.",
+        "type": "code",
+        "post_id": 2,
+    } in facts
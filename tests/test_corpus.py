@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from cookbook.corpus import DateIndex
+
+
+def _index() -> DateIndex:
+    return DateIndex.build(
+        [
+            (30, datetime(2020, 3, 14, 9, 0)),
+            (10, datetime(2010, 3, 14, 12, 0)),
+            (20, datetime(2015, 3, 14, 8, 0)),
+            (21, datetime(2015, 3, 14, 7, 0)),
+            (40, datetime(2012, 2, 29, 10, 0)),
+        ]
+    )
+
+
+def test_on_this_day_is_in_publication_order() -> None:
+    index = _index()
+    assert index.on_this_day(3, 14) == [10, 21, 20, 30]
+    assert index.on_this_day(1, 1) == []
+    assert index.month_days() == [(2, 29), (3, 14)]
+    assert index.month_day_counts() == {(2, 29): 1, (3, 14): 4}
+
+
+def test_exact_date_and_anniversary_lookups() -> None:
+    index = _index()
+    assert index.on_date(2015, 3, 14) == [21, 20]
+    assert index.anniversaries(30, 5) == [21, 20]
+    assert index.anniversaries(30, 10) == [10]
+    assert index.anniversaries(10, 5) == []
+    assert [d.year for d in index.days()] == [2010, 2012, 2015, 2020]
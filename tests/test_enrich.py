@@ -0,0 +1,29 @@
+import json
+from collections import Counter
+
+from src import enrich_posts_with_taxonomy as enrich_script
+
+
+def test_write_enriched_streams_and_counts(tmp_path) -> None:
+    posts = tmp_path / "posts.jsonl"
+    posts.write_text(
+        "\n".join(
+            json.dumps(p)
+            for p in [{"id": 1, "categories": [3], "tags": [7, 8]}, {"id": 2, "categories": [3, 4]}]
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "categories.json").write_text(json.dumps([{"id": 3, "name": "Math"}]))
+    (tmp_path / "tags.json").write_text(json.dumps([{"id": 7, "name": "Primes"}]))
+    cats, tags = Counter(), Counter()
+
+    written = enrich_script.write_enriched(
+        posts, tmp_path / "categories.json", tmp_path / "tags.json", tmp_path / "out.jsonl", cats, tags
+    )
+
+    rows = [json.loads(line) for line in (tmp_path / "out.jsonl").read_text().splitlines()]
+    assert written == 2
+    assert [r["category_names"] for r in rows] == [["Math"], ["Math", "4"]]
+    assert rows[0]["tag_names"] == ["Primes", "8"]
+    assert cats == Counter({"Math": 2, "4": 1}) and tags == Counter({"Primes": 1, "8": 1})
@@ -0,0 +1,53 @@
+import pytest
+
+from cookbook.entities import EntityMatcher
+
+
+def test_matcher_aliases_and_boundaries():
+    matcher = EntityMatcher()
+    counts = matcher.count(
+        "Erdős and Erdos; C++ and C#; Runge–Kutta. The Fourier transform, then Fourier. "
+        "Euler’s number, pi, π, pixel. R code, a random r, Scheme and a scheme."
+    )
+    assert counts == {
+        "Erdős": 2,
+        "C++": 1,
+        "C#": 1,
+        "Runge-Kutta": 1,
+        "Fourier transform": 1,
+        "Fourier": 1,
+        "e": 1,
+        "Pi": 2,
+        "R": 1,
+        "Scheme": 1,
+    }
+
+
+def test_common_words_and_symbols():
+    counts = EntityMatcher().count(
+        "A hardy plant, a big bash, up an octave, a ruby ring, log(2). "
+        "Hardy and Ruby, a Bash script in GNU Octave: 2π and Γ function."
+    )
+    assert counts == {"Hardy": 1, "Ruby": 1, "Bash": 1, "MATLAB": 1, "Pi": 1, "Gamma function": 1}
+
+
+def test_entity_matrix():
+    pytest.importorskip("scipy")
+    from cookbook.entities import EntityMatrix
+
+    matrix = EntityMatrix.from_texts(
+        [
+            (1, "2009-01-01", "Python and Python and Gauss"),
+            (2, "2012-06-01", "Nothing to see"),
+            (3, "2015-03-14", "Gauss meets Python"),
+        ]
+    )
+    assert len(matrix) == 2
+    python, gauss = matrix.index["Python"], matrix.index["Gauss"]
+    assert matrix.mentions()[[python, gauss]].tolist() == [3, 2]
+    assert matrix.posts("Gauss") == [1, 3]
+    assert matrix.span("Python") == (2009, 2015)
+    assert matrix.span("Euler") is None
+    assert matrix.by_year(["Python", "Gauss"], [2009, 2015]).tolist() == [[1, 1], [1, 1]]
+    eras = (("a", 2008, 2012), ("b", 2013, 2017))
+    assert matrix.by_era(["Python"], eras).tolist() == [[1, 1]]
@@ -0,0 +1,39 @@
+import os
+import sys
+
+from src import extract_johndcook
+
+PAGE = (
+    '<html><head><title>{title}</title>'
+    '<link rel="canonical" href="https://www.johndcook.com/blog/{slug}/"></head>'
+    '<body><div id="main"><p>{body}</p></div></body></html>'
+)
+
+
+def _run(monkeypatch, source, output, *extra):
+    argv = ["extract_johndcook.py", "--source", str(source), "--output", str(output), *extra]
+    monkeypatch.setattr(sys, "argv", argv)
+    extract_johndcook.main()
+    return output.read_text(encoding="utf-8")
+
+
+def test_rerun_reparses_only_changed_pages(tmp_path, monkeypatch, capsys) -> None:
+    source = tmp_path / "site"
+    for slug in ("alpha", "beta", "gamma"):
+        page = source / "blog" / slug / "index.html"
+        page.parent.mkdir(parents=True)
+        page.write_text(PAGE.format(title=slug, slug=slug, body=f"About {slug}."), encoding="utf-8")
+    output = tmp_path / "posts.jsonl"
+
+    first = _run(monkeypatch, source, output, "--parser", "stdlib", "--workers", "2")
+    assert "parsed 3 of 3" in capsys.readouterr().out
+    assert _run(monkeypatch, source, output, "--parser", "stdlib") == first
+    assert "parsed 0 of 3" in capsys.readouterr().out
+
+    beta = source / "blog" / "beta" / "index.html"
+    beta.write_text(PAGE.format(title="beta", slug="beta", body="Rewritten."), encoding="utf-8")
+    os.utime(beta, ns=(1, 1))
+    updated = _run(monkeypatch, source, output, "--parser", "stdlib")
+    assert "parsed 1 of 3" in capsys.readouterr().out
+    assert "Rewritten." in updated and "About alpha." in updated
+    assert updated == _run(monkeypatch, source, tmp_path / "full.jsonl", "--parser", "stdlib", "--full")
@@ -0,0 +1,61 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from cookbook.graph import LinkGraph, LinksWriter, iter_graph_facts, link_key, read_links
+
+B = "https://www.johndcook.com/blog"
+POSTS = [
+    (1, "alpha", f"{B}/2008/01/01/alpha/", [f"{B}/2008/01/02/beta/", f"{B}/gamma/"]),
+    (2, "beta", f"{B}/2008/01/02/beta/", [f"{B}/?p=3", "https://example.com/x"]),
+    (3, "gamma", f"{B}/2008/01/03/gamma/", [f"{B}/2008/01/01/alpha/", f"{B}/2008/01/01/alpha/"]),
+    (4, "delta", f"{B}/2008/01/04/delta/", [f"{B}/2009/02/02/future/", f"{B}/category/math/"]),
+    (5, "future", f"{B}/2009/02/02/future/", [f"{B}/2009/02/02/future/"]),
+]
+
+
+def _links(tmp_path, posts):
+    base = tmp_path / "index"
+    with LinksWriter(base) as writer:
+        for post_id, slug, link, hrefs in posts:
+            writer.add(post_id, slug, link, hrefs)
+    return list(read_links(writer.path))
+
+
+def test_link_key():
+    assert link_key(f"{B}/2008/01/02/beta/") == "beta"
+    assert link_key("//johndcook1.wpenginepowered.com/blog/gamma/") == "gamma"
+    assert link_key(f"{B}/?p=12") == "p:12"
+    assert link_key(f"{B}/category/math/") is None
+    assert link_key("https://example.com/blog/beta/") is None
+
+
+def test_graph_degrees_pagerank_and_reach(tmp_path):
+    graph = LinkGraph.from_links(_links(tmp_path, POSTS))
+    # Duplicate links and the self link on post 5 are dropped.
+    assert graph.edge_count == 5
+    assert graph.in_degree().tolist() == [1, 1, 2, 0, 1]
+    assert graph.cited_by(graph.node(1)) == [graph.node(3)]
+    ranks = graph.pagerank()
+    assert ranks.sum() == pytest.approx(1.0)
+    assert ranks[graph.node(4)] == ranks.min()
+    assert graph.reachable(graph.node(1)) == 2
+    assert graph.reachable(graph.node(5)) == 0
+    facts = list(iter_graph_facts(graph, {1: "Alpha"}))
+    assert "5 internal links" in facts[0]["fact"]
+
+
+def test_incremental_update_matches_full_build(tmp_path):
+    rows = _links(tmp_path, POSTS)
+    full = LinkGraph.from_links(rows)
+    partial = LinkGraph.from_links(rows[:4])
+    assert partial.pending == [(3, "future")]
+    state = tmp_path / "graph.npz"
+    partial.pagerank()
+    partial.save(state)
+    updated = LinkGraph.load(state).add_posts(rows)
+    assert updated.post_ids.tolist() == full.post_ids.tolist()
+    assert updated.offsets.tolist() == full.offsets.tolist()
+    assert updated.targets.tolist() == full.targets.tolist()
+    assert updated.pending == []
+    assert updated.pagerank() == pytest.approx(full.pagerank())
@@ -0,0 +1,85 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+import numpy as np
+
+from cookbook.graph import PostUrls
+from cookbook.gsc import (
+    Snapshot,
+    Snapshots,
+    Table,
+    gini,
+    iter_gsc_facts,
+    non_post_share,
+    parse_percent,
+    per_post,
+    top_share,
+)
+
+B = "https://www.johndcook.com"
+PAGES = f"""Top pages,Clicks,Impressions,CTR,Position
+{B}/interpolator.html,600,4000,15%,1.2
+{B}/blog/2010/01/02/alpha/,300,6000,5%,2.4
+{B}/blog/2010/01/02/alpha/#comments,50,1000,5%,9.6
+{B}/blog/beta/,50,5000,1%,9.4
+"""
+DATES = """Date,Clicks,Impressions,CTR,Position
+2025-01-02,20,100,20%,3
+2025-01-01,10,100,10%,4
+"""
+
+
+def write_export(root, name, pages=PAGES, dates=DATES):
+    folder = root / f"https___www.johndcook.com_-Performance-on-{name}"
+    folder.mkdir()
+    (folder / "Pages.csv").write_text(pages, encoding="utf-8")
+    (folder / "Dates.csv").write_text(dates, encoding="utf-8")
+    (folder / "Filters.csv").write_text("Filter,Value\nDate,Last 3 months", encoding="utf-8")
+    return folder
+
+
+def test_table_parsing(tmp_path):
+    table = Table.from_csv(write_export(tmp_path, "Search-2025-01-03") / "Pages.csv")
+    assert table.dimension == "Pages" and len(table) == 4
+    assert table.clicks.dtype == np.int64 and table.clicks.tolist() == [600, 300, 50, 50]
+    assert table.ctr.tolist() == pytest.approx([0.15, 0.05, 0.05, 0.01])
+    assert table.top_share(1) == 0.6
+    positions, ctr, shown = table.ctr_curve(10)
+    assert shown[[0, 1, 8, 9]].tolist() == [4000, 6000, 5000, 1000]
+    assert ctr[8] == pytest.approx(0.01) and np.isnan(ctr[4])
+    assert parse_percent(["72.8%", "0%", ""])[:2].tolist() == [0.728, 0.0]
+
+
+def test_concentration():
+    assert gini([5, 5, 5]) == 0.0
+    assert gini([0, 0, 0, 10]) == pytest.approx(0.75)
+    assert top_share([1, 3, 6], 2) == 0.9
+
+
+def test_post_join_and_snapshots(tmp_path):
+    urls = PostUrls([(1, "alpha", f"{B}/blog/2010/01/02/alpha/"), (2, "beta", "")])
+    write_export(tmp_path, "Search-2025-01-03")
+    newer = PAGES.replace("300,6000", "400,6000")
+    write_export(tmp_path, "Search-2025-02-03", newer, DATES.replace("20,100", "25,100"))
+    write_export(tmp_path, "Discover-2025-01-03")
+
+    snapshots = Snapshots.load(tmp_path)
+    assert [s.date.month for s in snapshots] == [1, 2]
+    latest = snapshots.latest
+    assert urls.join(latest["Pages"].keys).tolist() == [-1, 1, 1, 2]
+    assert per_post(latest["Pages"], urls) == {1: (450, 7000), 2: (50, 5000)}
+    # Only the tool page is off the blog; the share does not depend on which posts are indexed.
+    assert non_post_share(latest["Pages"]) == pytest.approx(600 / 1100)
+
+    days, clicks, _ = snapshots.daily()
+    assert days.astype(str).tolist() == ["2025-01-01", "2025-01-02"]
+    assert clicks.tolist() == [10, 25]
+    post_ids, by_snapshot = snapshots.post_clicks(urls)
+    assert post_ids.tolist() == [1, 2]
+    assert by_snapshot.tolist() == [[350, 50], [450, 50]]
+
+    facts = list(iter_gsc_facts(latest, urls, {1: "Alpha"}))
+    assert facts[0]["fact"].endswith("over the last 3 months.")
+    assert any(f.get("post_id") == 1 for f in facts)
+    assert Snapshot.load(tmp_path / "missing-name").search_type == ""
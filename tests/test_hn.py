@@ -0,0 +1,67 @@
+import gzip
+from dataclasses import replace
+from pathlib import Path
+
+from cookbook.graph import PostUrls
+from cookbook.hn import (
+    canonical_url,
+    filter_dump,
+    iter_hn_facts,
+    iter_items,
+    per_post,
+    read_submissions,
+    write_submissions,
+)
+
+FIXTURE = Path(__file__).parent / "fixtures" / "hn_items.jsonl"
+B = "http://www.johndcook.com/blog"
+URLS = PostUrls(
+    [
+        (6, "tricky-code", f"{B}/2008/04/07/tricky-code/"),
+        (19, "good-opening-lines", f"{B}/2008/01/11/good-opening-lines/"),
+        (4014, "function-plots-inkscape", f"{B}/?p=4014"),
+    ]
+)
+
+
+def test_canonical_url():
+    same = {
+        canonical_url("https://www.johndcook.com/blog/x/"),
+        canonical_url("http://JohnDCook.com:80/blog/x?utm_source=hn#comments"),
+    }
+    assert same == {"johndcook.com/blog/x"}
+    assert canonical_url("https://www.johndcook.com/blog/?p=1&ref=hn") == "johndcook.com/blog?p=1"
+    assert canonical_url("https://example.com/?q=johndcook.com") is None
+
+
+def test_filter_dump_and_per_post(tmp_path):
+    # The byte prefilter skips lines that never mention the site.
+    assert 106 not in [item.get("id") for item in iter_items(FIXTURE)]
+    submissions = list(filter_dump(FIXTURE, URLS))
+    assert [s.id for s in submissions] == [100, 101, 102, 107]
+    assert [s.post_id for s in submissions] == [6, 6, None, 4014]
+    assert submissions[0].time == "2009-01-01T00:00:00Z"
+    assert submissions[3].points == 50 and submissions[3].comments == 7
+
+    table = per_post(submissions)
+    assert list(table) == [6, 4014]
+    row = table[6]
+    assert (row.submissions, row.points, row.comments, row.best_points) == (2, 720, 230, 600)
+    assert (row.first_id, row.first_time[:4]) == (100, "2009")
+
+    dump = tmp_path / "items.jsonl.gz"
+    with gzip.open(dump, "wb") as fh:
+        fh.write(FIXTURE.read_bytes())
+    assert [s.id for s in filter_dump(dump, URLS)] == [100, 101, 102, 107]
+    write_submissions(tmp_path / "hn.jsonl", submissions)
+    assert list(read_submissions(tmp_path / "hn.jsonl")) == submissions
+
+    facts = list(iter_hn_facts(submissions, table, {6: "Tricky code"}))
+    assert facts[0]["fact"].startswith("The site has been submitted to Hacker News 4 times")
+    # 107 is a blog post the index lacks; only the calculator page is off the blog.
+    unindexed = [s if s.id != 107 else replace(s, post_id=None) for s in submissions]
+    links = list(iter_hn_facts(unindexed, per_post(unindexed), {}))[1]["fact"]
+    assert links.startswith("3 of the submissions link to blog posts (1 distinct post(s)")
+    assert links.endswith("1 link to tools and other pages.")
+    assert "“Tricky code” (600)" in facts[2]["fact"]
+    assert facts[3]["post_id"] == 6
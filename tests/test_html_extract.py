@@ -0,0 +1,41 @@
+import pytest
+
+from cookbook.html_extract import available_backends, extract_post_text, parse_page
+
+PAGE = """<html><head><title>Primes &amp; more</title>
+<meta name="description" content="About primes">
+<link rel="canonical" href="https://www.johndcook.com/blog/primes/"></head>
+<body><div id="nav"><p>Home</p></div>
+<div id="main"><h1>Primes</h1><div class="entry">
+<p>Two is <em>even</em>.<br>Others are odd.</p>
+<script>var p = "<p>not text</p>";</script>
+<ul><li>3</li><li>5 <blockquote>quoted</blockquote></li></ul>
+<pre>
+x = 1
+  y = 2
+</pre></div></div><p>footer</p></body></html>"""
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_backends_extract_same_blocks(backend) -> None:
+    page = parse_page(PAGE, backend)
+    assert page.title == "Primes & more"
+    assert page.description == "About primes"
+    assert page.canonical == "https://www.johndcook.com/blog/primes/"
+    assert page.blocks == [
+        {"tag": "h1", "text": "Primes"},
+        {"tag": "p", "text": "Two is even. Others are odd."},
+        {"tag": "li", "text": "3"},
+        {"tag": "blockquote", "text": "quoted"},
+        {"tag": "li", "text": "5"},
+        {"tag": "pre", "text": "x = 1\n  y = 2"},
+    ]
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_backends_extract_post_text(backend) -> None:
+    body = '<p>See <a href="/x">this</a> plot:</p><img src="a.png"><p>Done &amp; dusted.</p>'
+    text = extract_post_text(body, backend)
+    assert " ".join(text.text().split()) == "See this plot: Done & dusted."
+    assert (text.link_count, text.image_count) == (1, 1)
+    assert text.hrefs == ["/x"]
@@ -0,0 +1,72 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cookbook.http_cache import CacheMiss, HttpCache
+from src import fetch_wp_taxonomies
+
+TAGS = [{"id": 1, "name": "primes"}, {"id": 2, "name": "python"}]
+LAST_MODIFIED = "Wed, 02 Jan 2030 00:00:00 GMT"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    statuses: list[int] = []
+    since: list[str | None] = []
+
+    def do_GET(self):  # noqa: N802 - http.server API
+        self.since.append(self.headers.get("If-Modified-Since"))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.statuses.append(304)
+            self.send_response(304)
+            self.send_header("Last-Modified", LAST_MODIFIED)
+            self.end_headers()
+            return
+        body = json.dumps(TAGS).encode()
+        self.statuses.append(200)
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server():
+    _Handler.statuses = []
+    _Handler.since = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}/wp-json/wp/v2/tags"
+    httpd.shutdown()
+
+
+def test_revalidates_with_etag_and_replays_offline(tmp_path, server) -> None:
+    cache = HttpCache(tmp_path / "cache")
+    assert fetch_wp_taxonomies.fetch_all(server, cache=cache) == TAGS
+    assert fetch_wp_taxonomies.fetch_all(server, cache=cache) == TAGS
+    assert _Handler.statuses == [200, 304]
+    assert (cache.stats["network"], cache.stats["revalidated"]) == (1, 1)
+
+    offline = HttpCache(tmp_path / "cache", offline=True)
+    assert fetch_wp_taxonomies.fetch_all(server, cache=offline) == TAGS
+    assert _Handler.statuses == [200, 304]
+    with pytest.raises(CacheMiss):
+        offline.get(server + "?page=99")
+
+
+def test_304_headers_refresh_the_stored_validators(tmp_path, server) -> None:
+    cache = HttpCache(tmp_path / "cache")
+    cache.get(server)
+    revalidated = cache.get(server)
+    assert revalidated.headers["last-modified"] == LAST_MODIFIED
+    assert revalidated.headers["etag"] == '"v1"'
+    assert revalidated.headers["content-length"] == str(len(revalidated.body))
+    cache.get(server)
+    assert _Handler.since == [None, None, LAST_MODIFIED]
@@ -1,5 +1,8 @@
+import csv
+
 from typer.testing import CliRunner
 
+from cookbook import io
 from cookbook.cli import app
 
 
@@ -10,3 +13,28 @@ def test_ingest_help_lists_commands() -> None:
     assert "taxonomies" in result.stdout
     assert "enrich" in result.stdout
     assert "index" in result.stdout
+    assert "metadata" in result.stdout
+    assert "all" in result.stdout
+    assert "decode" in result.stdout
+    assert "reconcile" in result.stdout
+
+
+def test_ingest_metadata_skips_bad_dates(tmp_path) -> None:
+    posts = tmp_path / "posts.jsonl"
+    io.write_jsonl(
+        posts,
+        [
+            {"id": 1, "date": "2020-01-02T03:04:05Z", "title": "Good", "tag_names": ["a", "b"]},
+            {"id": 2, "date": ""},
+            {"id": 3, "date": "not a date"},
+        ],
+    )
+    output = tmp_path / "metadata.csv"
+    args = ["ingest", "metadata", "--posts", str(posts), "-o", str(output)]
+    result = CliRunner().invoke(app, args)
+    assert result.exit_code == 0
+    assert "Skipped 2 posts" in result.stdout
+    rows = list(csv.DictReader(output.open(encoding="utf-8")))
+    assert [(r["id"], r["date"], r["weekday"], r["tags"]) for r in rows] == [
+        ("1", "2020-01-02T03:04:05", "Thursday", "a;b")
+    ]
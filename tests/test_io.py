@@ -0,0 +1,51 @@
+import pytest
+
+from cookbook import io
+
+
+@pytest.mark.parametrize("name", ["rows.jsonl", "rows.jsonl.gz"])
+def test_jsonl_round_trip(tmp_path, name):
+    rows = [{"id": i, "title": f"Post {i} — é"} for i in range(5)]
+    path = tmp_path / name
+    assert io.write_jsonl(path, rows) == 5
+    assert list(io.read_jsonl(path)) == rows
+
+
+def test_gzip_output_is_deterministic(tmp_path):
+    path = tmp_path / "rows.jsonl.gz"
+    io.write_jsonl(path, [{"x": 1}])
+    first = path.read_bytes()
+    io.write_jsonl(path, [{"x": 1}])
+    assert path.read_bytes() == first
+
+
+def test_batches_skip_blank_lines(tmp_path):
+    path = tmp_path / "rows.jsonl"
+    path.write_text('{"a": 1}\n\n{"a": 2}\n{"a": 3}\n', encoding="utf-8")
+    batches = list(io.iter_jsonl_batches(path, batch_size=2))
+    assert batches == [[{"a": 1}, {"a": 2}], [{"a": 3}]]
+
+
+def test_bad_line_reports_line_number(tmp_path):
+    path = tmp_path / "rows.jsonl"
+    path.write_text('{"a": 1}\n\n{"a": \n', encoding="utf-8")
+    with pytest.raises(ValueError, match=r"rows.jsonl:3"):
+        list(io.read_jsonl(path))
+
+
+def test_atomic_write_keeps_suffix(tmp_path):
+    path = tmp_path / "rows.jsonl.gz"
+    assert io.temp_path(path).name.endswith(".jsonl.gz")
+    io.write_jsonl_atomic(path, [{"a": 1}])
+    assert list(io.read_jsonl(path)) == [{"a": 1}]
+    assert [p.name for p in tmp_path.iterdir()] == ["rows.jsonl.gz"]
+
+
+def test_line_chunks_hold_whole_lines(tmp_path):
+    path = tmp_path / "rows.jsonl"
+    io.write_jsonl(path, [{"n": i} for i in range(10)])
+    chunks = list(io.iter_line_chunks(path, chunk_size=16))
+    assert b"".join(chunk for chunk, _ in chunks) == path.read_bytes()
+    for chunk, first_line in chunks:
+        assert chunk.endswith(b"\n")
+        assert io.loads(chunk.splitlines()[0]) == {"n": first_line - 1}
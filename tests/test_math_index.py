@@ -0,0 +1,51 @@
+import pytest
+
+from cookbook.math_index import index_symbols, scan_equation_images, scan_math
+
+
+def test_scan_math():
+    counts = scan_math(r"π and ∞, $\frac{1}{2} + \pi$ costs $5 and $10; \[ \sum_n x \] − 1")
+    assert counts == {
+        ("symbol", "π"): 1,
+        ("symbol", "∞"): 1,
+        ("equation", "inline"): 1,
+        ("command", "\\frac"): 1,
+        ("command", "\\pi"): 1,
+        ("equation", "display"): 1,
+        ("command", "\\sum"): 1,
+    }
+    assert index_symbols(counts) == {"pi": 1, "phi": 0, "Phi": 0, "infty": 1}
+
+
+def test_scan_equation_images():
+    counts = scan_equation_images([r"\int_0^1 x\, dx", "a photo of a cat", "x^2 + y^2 = z^2"])
+    assert counts["equation", "image"] == 2
+    assert counts["command", "\\int"] == 1
+
+
+def test_math_table():
+    pytest.importorskip("scipy")
+    from cookbook.math_index import MathTable, iter_math_facts
+
+    table = MathTable.from_texts(
+        [
+            (1, "2009-01-01", "π π and $\\alpha$", []),
+            (2, "2012-06-01", "no math", []),
+            (3, "2015-03-14", "π", ["\\frac{a}{b}"]),
+        ]
+    )
+    assert table.keys[0] == ("symbol", "π")
+    assert len(table) == 2
+    assert table.totals("symbol") == {"π": 3}
+    assert table.post_counts("symbol") == {"π": 2}
+    assert table.posts("equation") == [1, 3]
+    assert table.posts("symbol", "φ") == []
+    assert table.per_post("equation") == {1: 1, 3: 1}
+    assert table.by_year("symbol", ["π", "φ"], [2009, 2015]).tolist() == [[1, 1], [0, 0]]
+
+    facts = list(iter_math_facts(table, {1: "One"}))
+    assert (
+        facts[0]["fact"]
+        == "2 posts contain typeset equations (1 with equation images, 1 with inline LaTeX)."
+    )
+    assert facts[1]["post_id"] == 1
@@ -0,0 +1,45 @@
+from cookbook.outlinks import LinkTable, OutlinksWriter, normalize_href
+
+POSTS = [
+    (
+        1,
+        "2010-03-01T09:00:00",
+        [
+            "https://twitter.com/AlgebraFact",
+            "https://twitter.com/share?url=x",
+            "https://www.johndcook.com/blog/other/",
+            "/relative/",
+        ],
+    ),
+    (2, "2012-05-01T09:00:00", ["http://en.wikipedia.org/wiki/Pi#History", "mailto:a@b.c"]),
+    (
+        3,
+        "2012-06-01T09:00:00",
+        ["https://twitter.com/algebrafact/status/1", "https://oeis.org/A000045/"],
+    ),
+]
+
+
+def _table(tmp_path):
+    with OutlinksWriter(tmp_path / "index") as writer:
+        for post_id, date, hrefs in POSTS:
+            writer.add(post_id, date, hrefs)
+    return LinkTable.load(writer.path)
+
+
+def test_normalize_href():
+    assert normalize_href("https://www.Example.com:8080/a/b/?q=1#f") == ("example.com", "/a/b")
+    assert normalize_href("//oeis.org") == ("oeis.org", "/")
+    assert normalize_href("https://johndcook1.wpenginepowered.com/blog/x/") is None
+    assert normalize_href("/blog/x/") is None
+    assert normalize_href("mailto:a@b.c") is None
+
+
+def test_link_table_lookups(tmp_path):
+    table = _table(tmp_path)
+    assert len(table) == 5
+    assert table.domain_counts() == {"twitter.com": 3, "en.wikipedia.org": 1, "oeis.org": 1}
+    assert table.twitter_handles() == {"algebrafact": 2}
+    assert table.posts("wikipedia.org") == {2}
+    assert table.per_year("twitter.com") == {"2010": 2, "2012": 1}
+    assert table.per_year() == {"2010": 2, "2012": 3}
@@ -0,0 +1,40 @@
+from cookbook.pipeline import Pipeline, Stage
+
+
+def test_skips_up_to_date_stages_and_blocks_on_failure(tmp_path) -> None:
+    raw, clean, report = tmp_path / "raw.txt", tmp_path / "clean.txt", tmp_path / "report.txt"
+    calls = []
+
+    def fetch():
+        calls.append("fetch")
+        raw.write_text("a b c")
+
+    def tidy():
+        calls.append("tidy")
+        clean.write_text(raw.read_text().upper())
+
+    def summarize():
+        calls.append("summarize")
+        report.write_text(str(len(clean.read_text().split())))
+
+    stages = [
+        Stage("summarize", summarize, inputs=[clean], outputs=[report]),
+        Stage("fetch", fetch, outputs=[raw], volatile=True),
+        Stage("tidy", tidy, inputs=[raw], outputs=[clean]),
+    ]
+    pipeline = Pipeline(stages, tmp_path / "state.json")
+    assert pipeline.deps == {"summarize": ["tidy"], "fetch": [], "tidy": ["fetch"]}
+
+    assert [r.status for r in pipeline.run()] == ["ran", "ran", "ran"]
+    assert calls == ["fetch", "tidy", "summarize"]
+    assert [r.status for r in pipeline.run()] == ["skipped", "ran", "skipped"]
+
+    report.write_text("edited")
+    assert [r.status for r in pipeline.run()] == ["ran", "ran", "skipped"]
+
+    def broken():
+        raise RuntimeError("offline")
+
+    stages[1].run = broken
+    results = Pipeline(stages, tmp_path / "state.json").run(force=True)
+    assert [r.status for r in results] == ["blocked", "failed", "blocked"]
@@ -0,0 +1,85 @@
+from datetime import datetime
+
+import pytest
+
+from cookbook import io
+from cookbook import posts as posts_module
+from cookbook.posts import LoadStats, load_posts, parse_dates
+
+ROWS = [
+    {
+        "id": 1,
+        "title": " First ",
+        "link": "https://example.com/1",
+        "date": "2008-04-01 01:34:35",
+        "word_count": 120,
+        "category_names": ["Math"],
+        "tag_names": ["Primes"],
+        "slug": "first",
+        "content": "<p>Body</p>",
+    },
+    {"id": 2, "title": "No date", "date": ""},
+    {"id": 3, "title": "Third", "date": "2020-01-02T03:04:05Z", "word_count": None},
+]
+
+
+@pytest.mark.parametrize("name", ["posts.jsonl", "posts.jsonl.gz"])
+def test_load_posts(tmp_path, name):
+    path = tmp_path / name
+    io.write_jsonl(path, ROWS)
+    stats = LoadStats()
+    posts = load_posts(path, stats=stats)
+    assert [p.id for p in posts] == [1, 3]
+    first = posts[0]
+    assert first.title == "First"
+    assert first.date == datetime(2008, 4, 1, 1, 34, 35)
+    assert (first.categories, first.tags, first.content) == (["Math"], ["Primes"], None)
+    assert posts[1].word_count == 0
+    assert (stats.records, stats.skipped) == (2, 1)
+    assert "2 posts" in str(stats)
+
+
+def test_load_posts_with_content(tmp_path):
+    path = tmp_path / "posts.jsonl"
+    io.write_jsonl(path, ROWS[:1])
+    assert load_posts(path, include_content=True)[0].content == "<p>Body</p>"
+
+
+@pytest.mark.parametrize("use_msgspec", [True, False])
+def test_decoders_coerce_numeric_strings(tmp_path, monkeypatch, use_msgspec):
+    if use_msgspec:
+        pytest.importorskip("msgspec")
+    monkeypatch.setattr(posts_module, "msgspec_available", lambda: use_msgspec)
+    path = tmp_path / "posts.jsonl"
+    io.write_jsonl(path, [{"id": "12", "date": "2010-05-06", "word_count": "40"}])
+    stats = LoadStats()
+    (post,) = load_posts(path, stats=stats)
+    assert (post.id, post.word_count) == (12, 40)
+    assert stats.decoder.startswith("msgspec" if use_msgspec else io.JSON_BACKEND)
+
+
+def test_parse_dates():
+    assert parse_dates(["2008-04-01T01:34:35", None, "nope"]) == [
+        datetime(2008, 4, 1, 1, 34, 35),
+        None,
+        None,
+    ]
+
+
+
+def test_parse_dates_mixed_utc_suffix_sorts():
+    values = ["2020-01-02T03:04:05Z", "2020-01-01T00:00:00", "2020-01-01T12:00:00+02:00"]
+    dates = parse_dates(values)
+    assert all(d.tzinfo is None for d in dates)
+    assert sorted(dates) == [
+        datetime(2020, 1, 1, 0, 0),
+        datetime(2020, 1, 1, 10, 0),
+        datetime(2020, 1, 2, 3, 4, 5),
+    ]
+
+
+def test_bad_record_reports_line(tmp_path):
+    path = tmp_path / "posts.jsonl"
+    path.write_text('{"id": 1, "date": "2008-04-01 01:34:35"}\n{"id": \n', encoding="utf-8")
+    with pytest.raises(ValueError, match=r"posts.jsonl:2"):
+        load_posts(path)
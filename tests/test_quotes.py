@@ -0,0 +1,67 @@
+import pytest
+
+from cookbook.quotes import Quote, is_candidate, iter_candidates, quote_fact, split_sentences
+
+
+def test_split_sentences_skips_abbreviations_and_initials():
+    text = "Dr. Smith met John D. Cook, e.g. at lunch. It rained! Did it?\nNew line here"
+    assert list(split_sentences(text)) == [
+        "Dr. Smith met John D. Cook, e.g. at lunch.",
+        "It rained!",
+        "Did it?",
+        "New line here",
+    ]
+
+
+@pytest.mark.parametrize(
+    "sentence, expected",
+    [
+        ("I have learned that simple tools are often better than clever ones.", True),
+        ("Too short to quote.", False),
+        ("This is why the previous argument falls apart so quickly here.", False),
+        ("See https://example.com for the full list of options and details.", False),
+        ("You can call x.sum() on the array to get the total right away.", False),
+        ("a lowercase start makes this look like a fragment of something", False),
+    ],
+)
+def test_is_candidate(sentence, expected):
+    assert is_candidate(sentence) is expected
+
+
+def test_iter_candidates_keeps_post_id_and_date():
+    records = [
+        {
+            "id": 7,
+            "date": "2012-03-04T10:00:00",
+            "plain_text": "Short. Most problems are easier than they look once you draw a picture.",
+        }
+    ]
+    (quote,) = iter_candidates(records)
+    assert (quote.post_id, quote.date, quote.words) == (7, "2012-03-04", 12)
+
+
+def test_rank_dedupes_and_caps_per_post():
+    pytest.importorskip("numpy")
+    from cookbook.quotes import rank
+
+    good = "I have learned that simple tools are often better than clever ones."
+    loop = "Sometimes a plain loop is the clearest way to say what you mean."
+    names = "Python and NumPy and SciPy and Pandas work together in Jupyter."
+    quotes = [
+        Quote(1, "2010-01-01", good, 12),
+        Quote(2, "2011-01-01", good.upper(), 12),
+        Quote(1, "2010-01-01", "The best code is the code you never had to write at all.", 13),
+        Quote(1, "2010-01-01", loop, 13),
+        Quote(3, "2012-01-01", names, 11),
+    ]
+    ranked = rank(quotes, per_post=2)
+    assert [q.post_id for q in ranked].count(1) == 2
+    assert sum(q.text.lower() == good.lower() for q in ranked) == 1
+    assert ranked[-1].post_id == 3  # proper nouns score low
+    assert ranked == sorted(ranked, key=lambda q: -q.score)
+
+
+def test_quote_fact():
+    quote = Quote(1, "2015-06-01", "Simple is hard.", 3)
+    assert quote_fact(quote, "On simplicity") == "“Simple is hard.” — from “On simplicity” (2015)"
+    assert quote_fact(Quote(1, "", "Simple is hard.", 3), "") == "“Simple is hard.”"
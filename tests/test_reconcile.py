@@ -0,0 +1,84 @@
+from cookbook import io
+from cookbook.io import read_csv_rows
+from cookbook.reconcile import join, normalize_url, reconcile, source_post, write_report
+
+
+def _write(tmp_path, name, rows):
+    path = tmp_path / f"{name}.jsonl"
+    io.write_jsonl(path, rows)
+    return path
+
+
+def test_reconcile_joins_sources_and_reports_drift(tmp_path):
+    body = "<p>Primes &amp; the  zeta function.</p>"
+    sql = [
+        {
+            "id": 1,
+            "slug": "zeta",
+            "title": "Zeta",
+            "guid": "http://www.example.com/blog/?p=1",
+            "content": body,
+        },
+        {"id": 2, "slug": "gone", "title": "Gone", "guid": "", "content": "x"},
+    ]
+    api = [
+        {
+            "id": 1,
+            "slug": "zeta",
+            "title": "Zeta",
+            "link": "http://example.com/blog/2008/zeta/",
+            "content": body,
+        },
+        {"id": 2, "slug": "gone", "title": "Gone &#8211; too", "link": "", "content": "x"},
+    ]
+    html = [
+        {
+            "slug": "zeta-page",
+            "canonical_url": "https://example.com/blog/2008/zeta",
+            "title": "Zeta",
+            "content": "Primes & the zeta function.",
+        },
+        {
+            "slug": "zeta-page",
+            "canonical_url": "https://example.com/blog/2008/zeta",
+            "title": "Zeta",
+            "content": "Primes & the zeta function.",
+        },
+    ]
+    paths = {
+        "sql": _write(tmp_path, "sql", sql),
+        "api": _write(tmp_path, "api", api),
+        "html": _write(tmp_path, "html", html),
+    }
+    result = reconcile(paths)
+
+    assert result.coverage() == {"sql+api+html": 1, "sql+api": 1}
+    issues = {(i.key, i.issue) for i in result.issues}
+    assert issues == {("gone", "missing"), ("gone", "title"), ("zeta", "duplicate")}
+
+    out = tmp_path / "report.csv"
+    assert write_report(out, result) == 3
+    assert {row["issue"] for row in read_csv_rows(out)} == {"missing", "title", "duplicate"}
+
+
+def test_normalize_url():
+    assert normalize_url("https://www.Example.com/blog/a/") == ("example.com/blog/a", None)
+    assert normalize_url("http://example.com/blog/?p=42") == (None, 42)
+
+
+def test_sql_guid_joins_dated_mirror_page():
+    sql = source_post(
+        "sql",
+        {"id": 5, "slug": "foo", "guid": "https://www.johndcook.com/blog/?p=5", "content": "x"},
+    )
+    page = source_post(
+        "html",
+        {
+            "slug": "2008/01/05/foo",
+            "canonical_url": "https://www.johndcook.com/blog/2008/01/05/foo/",
+            "content": "x",
+        },
+    )
+    (group,) = join([sql, page])
+    assert list(group.members) == ["sql", "html"]
+    assert group.id == 5
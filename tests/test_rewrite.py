@@ -0,0 +1,31 @@
+from cookbook.rewrite import RewriteEngine, Rule, rewrite_file
+from cookbook.io import read_csv_rows, write_csv_rows
+
+RULES = [
+    Rule("em_dash", r"—the power of[^.]+\."),
+    Rule("em_dash", r"—where [^.]+\."),
+    Rule("sentence_final", r"\. The blog [^.]+\.$"),
+    Rule("dots", r"\.\.+"),
+]
+
+
+def test_groups_share_one_alternation_and_count_hits() -> None:
+    engine = RewriteEngine(RULES)
+    assert [g.literal for g in engine.groups] == ["—", ". The blog ", "."]
+    text = "Euler wrote 800 papers—the power of focus. The blog agrees."
+    assert engine.rewrite(text) == "Euler wrote 800 papers."
+    assert engine.rewrite("No commentary here.") == "No commentary here."
+    hits = {rule.pattern: n for rule, n in engine.rule_hits()}
+    assert hits[r"—the power of[^.]+\."] == 1
+    assert hits[r"\. The blog [^.]+\.$"] == 1
+    assert hits[r"—where [^.]+\."] == 0
+    assert (engine.stats.texts, engine.stats.changed) == (2, 1)
+
+
+def test_rewrite_csv_dry_run_leaves_file(tmp_path) -> None:
+    path = tmp_path / "candidates.csv"
+    rows = [{"id": "7", "fact": "Primes—where order hides. Nice."}]
+    write_csv_rows(path, ["id", "fact"], rows)
+    changes = rewrite_file(RewriteEngine(RULES), path, dry_run=True)
+    assert [(c.label, c.after) for c in changes] == [("7", "Primes. Nice.")]
+    assert read_csv_rows(path) == rows
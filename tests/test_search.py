@@ -0,0 +1,40 @@
+from cookbook.search import SearchIndex, SearchIndexWriter, parse_query
+from cookbook.token_store import TokenStore, TokenStoreWriter, store_base
+from cookbook.tokenizer import Tokenizer
+
+POSTS = [
+    (1, "Golden ratio", "The golden ratio and Fibonacci numbers."),
+    (2, "Fibonacci primes", "Fibonacci numbers that are prime."),
+    (3, "Ratio tests", "A ratio test; golden rules of thumb."),
+]
+
+
+def _index(tmp_path):
+    index_path = tmp_path / "idx.jsonl"
+    base = store_base(index_path)
+    tokenizer = Tokenizer(phrases=())
+    search = SearchIndexWriter(base)
+    with TokenStoreWriter(base) as store:
+        for post_id, title, text in POSTS:
+            store.add(post_id, tokenizer.tokenize(text))
+            search.add(title, f"2020-01-0{post_id}", f"https://example.com/{post_id}", text)
+    with TokenStore(base) as store:
+        search.finish(store)
+    return SearchIndex(index_path)
+
+
+def test_parse_query_handles_phrases_or_and_not() -> None:
+    clauses = parse_query('"golden ratio" OR fibonacci -prime NOT test')
+    assert [c.required for c in clauses] == [[["golden", "ratio"]], [["fibonacci"]]]
+    assert clauses[1].excluded == [["prime"], ["test"]]
+
+
+def test_search_phrase_boolean_and_snippets(tmp_path) -> None:
+    with _index(tmp_path) as index:
+        assert [h.post_id for h in index.search('"golden ratio"')] == [1]
+        assert {h.post_id for h in index.search("golden ratio")} == {1, 3}
+        assert [h.post_id for h in index.search("fibonacci -prime")] == [1]
+        assert {h.post_id for h in index.search('"ratio test" OR prime')} == {2, 3}
+        hit = index.search("primes OR prime")[0]
+        assert (hit.title, hit.date) == ("Fibonacci primes", "2020-01-02")
+        assert "prime" in hit.snippet
@@ -0,0 +1,79 @@
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import numpy as np
+from typer.testing import CliRunner
+
+from cookbook import io
+from cookbook.cli import app
+from cookbook.stats import CorpusStats, load_post_dates, zipf_fit
+from cookbook.token_store import TokenStore, TokenStoreWriter, store_base
+
+DOCS = [
+    (1, datetime(2008, 1, 5), "a b a c a b"),
+    (2, datetime(2008, 3, 1), "a d e a"),
+    (3, datetime(2009, 2, 2), "f a b g"),
+]
+
+
+def _store(tmp_path, docs):
+    index_path = tmp_path / "idx.jsonl"
+    with TokenStoreWriter(store_base(index_path)) as writer:
+        for post_id, _, text in docs:
+            writer.add(post_id, text.split())
+    return TokenStore.for_index(index_path)
+
+
+def test_zipf_fit_recovers_exponent() -> None:
+    counts = (1000 / np.arange(1, 200)).astype(np.int64)
+    fit = zipf_fit(counts)
+    assert fit.exponent == pytest.approx(-1.0, abs=0.05)
+
+
+def test_incremental_update_matches_full_build(tmp_path) -> None:
+    dates = {pid: dt for pid, dt, _ in DOCS}
+    with _store(tmp_path, DOCS) as store:
+        full = CorpusStats.from_store(store, dates)
+
+    assert full.growth_types == [3, 5, 7]
+    assert full.total_tokens == 14
+    assert set(full.entropy_by_year()) == {2008, 2009}
+
+    first = tmp_path / "first"
+    first.mkdir()
+    with _store(first, DOCS[:2]) as store:
+        CorpusStats.from_store(store, dates).save(tmp_path / "state.npz")
+    # The rebuilt store interns terms in a different order than the saved state.
+    second = tmp_path / "second"
+    second.mkdir()
+    with _store(second, list(reversed(DOCS))) as store:
+        resumed = CorpusStats.from_store(store, dates, resume=CorpusStats.load(tmp_path / "state.npz"))
+
+    assert resumed.growth_types == full.growth_types
+    assert resumed.zipf().exponent == pytest.approx(full.zipf().exponent)
+    assert resumed.entropy_by_year() == pytest.approx(full.entropy_by_year())
+
+
+def test_post_dates_are_utc() -> None:
+    dates = load_post_dates([{"id": 1, "date": "2008-01-05T10:00:00"}, {"id": 2, "date": "?"}])
+    assert dates == {1: datetime(2008, 1, 5, 10, tzinfo=timezone.utc)}
+    stats = CorpusStats()
+    stats.update(1, [], dates[1])
+    assert stats.timestamps == [1199527200.0]
+    assert stats.last_date == dates[1]
+
+
+def test_stats_facts_reports_posts_older_than_the_state(tmp_path) -> None:
+    index_path = tmp_path / "idx.jsonl"
+    state = tmp_path / "state.npz"
+    output = tmp_path / "facts.csv"
+    args = ["stats", "facts", "-i", str(index_path), "-s", str(state), "-o", str(output)]
+    for docs, exit_code in ((DOCS[::2], 0), (DOCS, 1)):
+        io.write_jsonl(index_path, [{"id": pid, "date": dt.isoformat()} for pid, dt, _ in docs])
+        _store(tmp_path, docs).close()
+        result = CliRunner().invoke(app, args)
+        assert result.exit_code == exit_code
+    assert "ERROR: Post 2 (2008-03-01) predates the saved statistics" in result.output
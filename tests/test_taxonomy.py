@@ -0,0 +1,53 @@
+import pytest
+
+pytest.importorskip("scipy")
+
+from cookbook.taxonomy import TermMatrix, iter_taxonomy_facts, split_terms
+
+ROWS = [
+    (1, 2009, 100, ["Math", "Python"]),
+    (2, 2010, 300, ["Math"]),
+    (3, 2015, 200, ["Math", "Python", "Math"]),
+    (4, 2020, 400, ["Statistics"]),
+    (5, 2021, 0, []),
+]
+
+
+def test_split_terms():
+    assert split_terms("Math; Computing;;") == ["Math", "Computing"]
+    assert split_terms(["Math", " "]) == ["Math"]
+    assert split_terms("") == []
+
+
+def test_counts_cooccurrence_and_lift():
+    m = TermMatrix.build(ROWS)
+    assert m.terms == ["Math", "Python", "Statistics"]
+    assert m.most_common() == [("Math", 3), ("Python", 2), ("Statistics", 1)]
+    assert m.mean_words().tolist() == [200.0, 150.0, 400.0]
+    co = m.cooccurrence().toarray()
+    assert co.tolist() == [[3, 2, 0], [2, 2, 0], [0, 0, 1]]
+    (pair,) = m.pairs()
+    assert (pair.a, pair.b, pair.count) == ("Math", "Python", 2)
+    assert pair.lift == pytest.approx(5 * 2 / (3 * 2))
+    assert m.lift()[0, 1] == pytest.approx(pair.lift)
+
+
+def test_eras_and_facts():
+    m = TermMatrix.build(ROWS)
+    eras = (("a", 2008, 2012), ("b", 2013, 2017), ("c", 2018, 2025))
+    assert m.era_counts(eras).tolist() == [[2, 1, 0], [1, 1, 0], [0, 0, 1]]
+    assert m.era(2008, 2012).count_posts(["Python", "Statistics"]) == 1
+    facts = list(iter_taxonomy_facts(m, m, min_count=2, eras=eras))
+    assert facts[0]["fact"].startswith("“Math” and “Python”")
+    assert all(f["type"] == "taxonomy" for f in facts)
+
+
+def test_era_facts_one_category_and_none():
+    eras = (("a", 2008, 2012), ("c", 2018, 2025))
+    one = TermMatrix.build([(1, 2009, 10, ["Math"]), (2, 2020, 10, ["Math"])])
+    assert [f for f in iter_taxonomy_facts(one, one, eras=eras) if "went from" in f["fact"]] == []
+    shifted = TermMatrix.build([(1, 2009, 10, ["Math"]), (2, 2020, 10, [])])
+    (era_fact,) = [f for f in iter_taxonomy_facts(shifted, shifted, eras=eras)]
+    assert "from 100%" in era_fact["fact"] and "to 0%" in era_fact["fact"]
+    empty = TermMatrix.build([(1, 2009, 10, []), (2, 2020, 10, [])])
+    assert list(iter_taxonomy_facts(empty, empty, eras=eras)) == []
@@ -0,0 +1,71 @@
+from datetime import date, datetime
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import numpy as np
+
+from cookbook.timeseries import (
+    PostingSeries,
+    autocorrelation,
+    binary_segmentation,
+    iter_rhythm_facts,
+    pelt,
+)
+
+POSTS = [
+    (datetime(2020, 1, 6, 9), 100),  # Monday
+    (datetime(2020, 1, 7, 9), 200),
+    (datetime(2020, 1, 7, 18), 50),
+    (datetime(2020, 1, 8, 9), 300),
+    (date(2020, 1, 20), 400),
+    ("2020-02-03T08:00:00", 500),
+]
+
+
+def test_series_aggregates():
+    series = PostingSeries.build(POSTS)
+    assert (series.start, series.end, len(series)) == (date(2020, 1, 6), date(2020, 2, 3), 29)
+    assert series.posts.sum() == 6 and series.words.sum() == 1550
+    labels, posts = series.resample("week")
+    assert posts.tolist() == [4, 0, 1, 0, 1]
+    assert str(labels[0]) == "2020-01-06"
+    labels, words = series.resample("month", "words")
+    assert [str(m) for m in labels] == ["2020-01", "2020-02"]
+    assert words.tolist() == [1050, 500]
+    assert series.weekday_counts().tolist() == [3, 2, 1, 0, 0, 0, 0]
+
+
+def test_streaks_gaps_intervals():
+    series = PostingSeries.build(POSTS)
+    (streak,) = series.streaks()
+    assert (streak.start, streak.days) == (date(2020, 1, 6), 3)
+    assert [(g.start, g.days) for g in series.gaps(2)] == [
+        (date(2020, 1, 20), 14),
+        (date(2020, 1, 8), 12),
+    ]
+    assert series.intervals().tolist() == [1, 0, 1, 12, 14]
+    facts = [f["fact"] for f in iter_rhythm_facts(series, n_eras=1)]
+    assert facts[0].startswith("The longest run of consecutive posting days is 3 days")
+
+
+def test_changepoints():
+    rng = np.random.default_rng(1)
+    x = np.concatenate([rng.normal(0, 1, 200), rng.normal(5, 1, 300), rng.normal(1, 1, 100)])
+    assert pelt(x) == [200, 500]
+    assert binary_segmentation(x, 3) == [200, 500]
+    assert binary_segmentation(x, 2) == [200]
+    assert pelt(np.ones(50)) == []
+
+
+def test_eras_and_autocorrelation():
+    years = {2008: 300, 2009: 320, 2010: 310, 2011: 150, 2012: 140, 2013: 160, 2014: 400, 2015: 420}
+    series = PostingSeries.build(
+        (date(year, 1 + i % 12, 1 + i % 28), 100) for year, n in years.items() for i in range(n)
+    )
+    assert series.eras(3) == (("Early", 2008, 2010), ("Middle", 2011, 2013), ("Recent", 2014, 2015))
+    weekly = np.tile([3, 0, 0, 0, 0, 0, 0], 20)
+    acf = autocorrelation(weekly, 7)
+    assert acf[0] == pytest.approx(1)
+    assert acf[7] > acf[1:7].max()
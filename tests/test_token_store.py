@@ -0,0 +1,73 @@
+import pytest
+
+from cookbook.code_blocks import CodeWriter, read_code_blocks
+from cookbook.entities import EntitiesWriter, read_entities
+from cookbook.graph import LinksWriter, read_links
+from cookbook.html_extract import extract_post_text
+from cookbook.math_index import MathWriter, read_math, scan_math
+from cookbook.outlinks import LinkTable, OutlinksWriter
+from cookbook.token_store import (
+    IndexedPost,
+    TokenStore,
+    TokenStoreWriter,
+    side_path,
+    store_base,
+)
+
+
+def test_round_trip_interns_terms_and_maps_docs(tmp_path) -> None:
+    index_path = tmp_path / "text_index.jsonl"
+    with TokenStoreWriter(store_base(index_path)) as writer:
+        writer.add(101, ["golden", "ratio", "golden"])
+        writer.add(102, [])
+        writer.add(103, ["ratio", "erdős"])
+
+    with TokenStore.for_index(index_path) as store:
+        assert len(store) == 3
+        assert store.vocab == ["golden", "ratio", "erdős"]
+        assert list(store.doc(0)) == [0, 1, 0]
+        assert list(store.doc_for(102)) == []
+        assert store.terms(store.slot(103)) == ["ratio", "erdős"]
+        assert store.term_id("ratio") == 1
+        assert store.term_id("missing") is None
+        assert list(store.offsets) == [0, 3, 3, 5]
+
+
+def _indexed_post() -> IndexedPost:
+    page = extract_post_text(
+        '<p>Euler knew π. See <a href="https://oeis.org/A000796/">OEIS</a> and '
+        '<a href="https://www.johndcook.com/blog/2008/01/02/beta/">beta</a>.</p>'
+        "<pre><code>import math</code></pre>",
+        "stdlib",
+    )
+    text = page.text()
+    link = "https://www.johndcook.com/blog/2008/01/01/alpha/"
+    return IndexedPost(7, "2008-01-01", "alpha", link, "On π", text, page, scan_math(text))
+
+
+@pytest.mark.parametrize(
+    "writer_cls, read, expected",
+    [
+        (LinksWriter, read_links, [(7, ["p:7", "alpha"], ["beta"])]),
+        (OutlinksWriter, lambda path: LinkTable.load(path).paths, ["/A000796"]),
+        # The title is matched and scanned too.
+        (
+            EntitiesWriter,
+            read_entities,
+            [(7, "2008-01-01", "Pi", 2), (7, "2008-01-01", "Euler", 1)],
+        ),
+        (MathWriter, read_math, [(7, "2008-01-01", "symbol", "π", 2)]),
+        (
+            CodeWriter,
+            lambda path: [(b.post_id, b.language, b.text) for b in read_code_blocks(path)],
+            [(7, "Python", "import math")],
+        ),
+    ],
+)
+def test_side_file_writers(tmp_path, writer_cls, read, expected) -> None:
+    base = tmp_path / "data" / "index"
+    with writer_cls(base) as writer:
+        writer.add_post(_indexed_post())
+    assert writer.path == side_path(base, writer_cls.SUFFIX)
+    assert writer._fh.closed
+    assert list(read(writer.path)) == expected
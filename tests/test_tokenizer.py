@@ -0,0 +1,30 @@
+from cookbook.tokenizer import Tokenizer, count_words, light_stem
+
+
+def test_tokens_keep_digits_hyphens_and_unicode() -> None:
+    tokens = Tokenizer(phrases=()).tokenize("Erdős’s Runge–Kutta solver beats RK4 in 2 steps.")
+    assert tokens == ["erdős", "runge-kutta", "solver", "beats", "rk4", "in", "2", "steps"]
+
+
+def test_phrases_counted_across_stopwords_in_one_pass() -> None:
+    tokenizer = Tokenizer(
+        phrases=["Golden Ratio", "law of large numbers"], stopwords=["of", "the"], stem=light_stem
+    )
+    analysis = tokenizer.analyze("The golden ratio and the Law of Large Numbers; golden ratios.")
+    assert analysis.phrases == {"golden ratio": 1, "law of large numbers": 1}
+    assert "of" not in analysis.tokens
+    assert analysis.tokens.count("ratio") == 2
+
+
+def test_fold_accents_matches_ascii_spelling() -> None:
+    assert Tokenizer(phrases=(), fold_accents=True).tokenize("Erdős") == ["erdos"]
+
+
+def test_light_stem_plurals() -> None:
+    words = ["theories", "classes", "ratios", "series", "species", "movies"]
+    stems = ["theories", "class", "ratio", "series", "species", "movies"]
+    assert [light_stem(w) for w in words] == stems
+
+
+def test_count_words_skips_digits_and_splits_compounds() -> None:
+    assert count_words("Runge-Kutta beats RK4 in 2 steps.") == 6
@@ -0,0 +1,65 @@
+import pytest
+
+from cookbook.token_store import TokenStore, TokenStoreWriter
+
+pytest.importorskip("scipy")
+
+from cookbook.topics import TopicModel, fit_nmf, term_matrix, tfidf
+
+DOCS = [
+    (1, 2010, "prime numbers and prime factors of integers"),
+    (2, 2010, "integers prime factors and prime numbers again"),
+    (3, 2011, "python code and python functions in code"),
+    (4, 2011, "python code with functions and more code"),
+    (5, 2012, "prime integers in python code"),
+    (6, 2012, "the and of"),
+]
+
+
+@pytest.fixture()
+def store(tmp_path):
+    base = tmp_path / "index"
+    with TokenStoreWriter(base) as writer:
+        for post_id, _, text in DOCS:
+            writer.add(post_id, text.split())
+    with TokenStore(base) as store:
+        yield store
+
+
+def test_term_matrix_filters_vocabulary(store):
+    counts, terms = term_matrix(store, min_df=2, max_df=0.6)
+    assert "the" not in terms and "and" not in terms
+    assert {"prime", "python", "code", "integers"} <= set(terms)
+    assert counts.shape == (len(DOCS), len(terms))
+    assert counts[0, terms.index("prime")] == 2
+    X = tfidf(counts)
+    assert X[5].nnz == 0
+    assert abs(X[0].multiply(X[0]).sum() - 1) < 1e-9
+
+
+def test_nmf_is_seeded_and_batches_agree(store):
+    X = tfidf(term_matrix(store, min_df=2, max_df=0.6)[0])
+    W, H = fit_nmf(X, 2, seed=3)
+    W2, H2 = fit_nmf(X, 2, seed=3)
+    assert (W == W2).all() and (H == H2).all()
+    assert (W >= 0).all() and (H >= 0).all()
+    Wb, _ = fit_nmf(X, 2, seed=3, batch_size=2)
+    for weights in (W, Wb):
+        assert weights[0].argmax() == weights[1].argmax() != weights[2].argmax()
+        assert weights[2].argmax() == weights[3].argmax()
+
+
+def test_topic_model(store, tmp_path):
+    model = TopicModel.fit(store, {p: y for p, y, _ in DOCS}, n_topics=2, min_df=2, max_df=0.6)
+    prime = model.dominant()[0]
+    assert model.dominant()[5] == -1
+    assert model.top_terms(prime, 2)[0] in {"prime", "integers", "factors", "numbers"}
+    years, shares = model.per_year()
+    assert years == [2010, 2011, 2012]
+    assert shares.sum(axis=1) == pytest.approx([1, 1, 1])
+    assert shares[0, prime] > 0.9 and shares[1, prime] < 0.1
+
+    model.save(tmp_path / "topics.npz")
+    loaded = TopicModel.load(tmp_path / "topics.npz")
+    assert loaded.labels() == model.labels()
+    assert (loaded.weights == model.weights).all()